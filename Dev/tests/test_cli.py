@@ -60,6 +60,41 @@ class TestAlexaMain(unittest.TestCase):
             mock_command_instance.execute.assert_called_with(mock_args)
             mock_context.cleanup.assert_called_once()
 
+    def test_main_skips_ping_when_session_known_good(self):
+        from cli.context import Context
+
+        with patch('alexa_auth.alexa_auth.AlexaAuth.load_cookies', return_value=True), \
+             patch('alexa_auth.alexa_auth.AlexaAuth.session_known_good', return_value=True), \
+             patch('alexa_auth.alexa_auth.AlexaAuth.get') as mock_get:
+
+            mock_context = MagicMock(http_session=None)
+            self.assertTrue(Context.load_saved_auth(mock_context))
+
+            mock_get.assert_not_called()
+            mock_context.initialize_auth.assert_called_once()
+
+    def test_main_skips_auth_for_daemon_category(self):
+        with patch('alexa.create_parser') as mock_create_parser, \
+             patch('alexa.register_all_commands'), \
+             patch('alexa.create_context') as mock_create_context, \
+             patch('alexa.setup_logging'):
+
+            mock_parser = MagicMock()
+            mock_args = MagicMock()
+            mock_args.category, mock_args.action = 'daemon', 'status'
+            mock_args.verbose, mock_args.debug, mock_args.config = False, False, None
+            mock_parser.parse_args.return_value = mock_args
+            mock_parser.get_command_class.return_value.return_value.execute.return_value = True
+            mock_create_parser.return_value = mock_parser
+            mock_context = MagicMock()
+            mock_create_context.return_value = mock_context
+
+            with patch.object(sys, 'argv', ['alexa', 'daemon', 'status']):
+                result = self.alexa.main()
+
+            self.assertEqual(result, 0)
+            mock_context.load_saved_auth.assert_not_called()
+
     def test_main_keyboard_interrupt(self):
         with patch('alexa.create_parser', side_effect=KeyboardInterrupt), \
              patch('alexa.logger') as mock_logger, \
@@ -93,6 +128,15 @@ class TestAlexaMain(unittest.TestCase):
         self.assertIn(call('music', MusicCommand), mock_parser.register_command.call_args_list)
         self.assertGreater(mock_parser.register_command.call_count, 5)
 
+    def test_register_only_requested_category(self):
+        self.assertEqual(self.alexa.requested_category(['--debug', 'device', 'list']), 'device')
+        self.assertIsNone(self.alexa.requested_category(['--help']))
+
+        mock_parser = MagicMock()
+        self.alexa.register_all_commands(mock_parser, ['cache'])
+        mock_parser.register_command.assert_called_once()
+        self.assertEqual(mock_parser.register_command.call_args.args[0], 'cache')
+
     def test_main_with_h_argument_after_action(self):
         with patch('sys.argv', ['alexa', 'device', 'list', '-h']), \
              patch('alexa.create_parser') as mock_create_parser, \
@@ -110,3 +154,196 @@ class TestAlexaMain(unittest.TestCase):
 
 if __name__ == '__main__':
     unittest.main()
+
+
+class TestDaemon(unittest.TestCase):
+
+    def setUp(self):
+        import tempfile
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.socket = Path(self.tmpdir.name) / 'alexa.sock'
+        self.env = patch.dict('os.environ', {'ALEXA_DAEMON_SOCKET': str(self.socket)})
+        self.env.start()
+        __import__('os').environ.pop('ALEXA_NO_DAEMON', None)
+
+    def tearDown(self):
+        self.env.stop()
+        self.tmpdir.cleanup()
+
+    def test_should_forward(self):
+        from utils.daemon_ipc import should_forward
+
+        # Pas de socket : exécution locale
+        self.assertFalse(should_forward(['device', 'list']))
+
+        self.socket.touch()
+        self.assertTrue(should_forward(['--debug', 'device', 'list']))
+        self.assertFalse(should_forward(['device', 'list', '--help']))
+        self.assertFalse(should_forward(['auth', 'create']))
+        self.assertFalse(should_forward(['daemon', 'status']))
+        self.assertFalse(should_forward([]))
+        with patch.dict('os.environ', {'ALEXA_NO_DAEMON': '1'}):
+            self.assertFalse(should_forward(['device', 'list']))
+
+    def test_forward_falls_back_on_stale_socket(self):
+        from utils.daemon_ipc import forward
+
+        # Socket orphelin : la connexion échoue, la commande s'exécute localement
+        self.socket.touch()
+        self.assertIsNone(forward(['device', 'list']))
+
+    def test_daemon_round_trip(self):
+        import threading
+        from cli.daemon import AlexaDaemon
+        from utils.daemon_ipc import forward, request
+
+        class EchoCommand:
+            def __init__(self, context):
+                self.context = context
+
+            def execute(self, args):
+                print(f"echo {args.action}")
+                return args.action != 'fail'
+
+        daemon = AlexaDaemon(path=self.socket, context=MagicMock())
+
+        def prepare():
+            daemon.parser = MagicMock()
+            daemon.parser.parse_args.side_effect = lambda argv: MagicMock(category=argv[0], action=argv[1])
+            daemon.parser.get_command_class.return_value = EchoCommand
+            daemon._cookie_mtime = daemon._cookie_files_mtime()
+
+        # Sans chmod, le socket doit déjà naître en 0600 (umask appliqué avant le bind)
+        with patch.object(daemon, '_prepare', side_effect=prepare), patch('cli.daemon.os.chmod'):
+            thread = threading.Thread(target=daemon.serve_forever, daemon=True)
+            thread.start()
+            for _ in range(100):
+                if self.socket.exists():
+                    break
+                threading.Event().wait(0.02)
+
+            self.assertEqual(self.socket.stat().st_mode & 0o777, 0o600)
+            self.assertEqual(request({'op': 'ping'}, timeout=5)['requests'], 0)
+
+            # Un second démon ne remplace pas le socket d'un démon actif
+            with self.assertRaises(RuntimeError):
+                AlexaDaemon(path=self.socket, context=MagicMock()).serve_forever()
+            self.assertEqual(request({'op': 'ping'}, timeout=5)['requests'], 0)
+
+            with patch('sys.stdout') as mock_stdout:
+                mock_stdout.isatty.return_value = False
+                self.assertEqual(forward(['device', 'list']), 0)
+            mock_stdout.write.assert_any_call('echo list\n')
+            self.assertEqual(request({'op': 'run', 'argv': ['device', 'fail']}, timeout=5)['exit_code'], 1)
+
+            status = request({'op': 'ping'}, timeout=5)
+            self.assertEqual(status['requests'], 2)
+            self.assertTrue(request({'op': 'shutdown'}, timeout=5)['ok'])
+            thread.join(timeout=5)
+
+        self.assertFalse(thread.is_alive())
+        self.assertFalse(self.socket.exists())
+        daemon.context.cleanup.assert_called_once()
+
+    def test_stale_socket_replaced(self):
+        from cli.daemon import AlexaDaemon
+
+        # Socket orphelin : personne ne répond, il est supprimé avant l'écoute
+        self.socket.touch()
+        daemon = AlexaDaemon(path=self.socket, context=MagicMock())
+        daemon._claim_socket()
+        self.assertFalse(self.socket.exists())
+
+
+class TestBatchRunner(unittest.TestCase):
+
+    def setUp(self):
+        import threading
+        from cli.base_command import BaseCommand
+        from cli.command_parser import create_parser
+
+        calls = self.calls = []
+        lock = threading.Lock()
+
+        class EchoCommand(BaseCommand):
+            def setup_parser(self, parser):
+                subparsers = parser.add_subparsers(dest='action', required=True)
+                for action in ('say', 'fail'):
+                    action_parser = subparsers.add_parser(action)
+                    action_parser.add_argument('-d', '--device')
+                    action_parser.add_argument('text', nargs='?', default='')
+
+            def execute(self, args):
+                with lock:
+                    calls.append((args.device, args.text))
+                print(f"{args.device}:{args.text}")
+                if args.action == 'fail':
+                    print(f"erreur {args.text}", file=sys.stderr)
+                return args.action == 'say'
+
+        self.parser = create_parser()
+        self.parser.register_command('echo', EchoCommand)
+
+    def _run(self, lines, **kwargs):
+        from cli.batch import BatchRunner
+        return list(BatchRunner(MagicMock(auth=None), self.parser).run(lines, **kwargs))
+
+    def test_sequential_results_in_order(self):
+        results = self._run(['# commentaire', '', 'echo say -d Salon un', 'echo fail deux', 'echo bogus'])
+
+        self.assertEqual([r['line'] for r in results], [3, 4, 5])
+        self.assertTrue(results[0]['ok'])
+        self.assertEqual(results[0]['stdout'], 'Salon:un\n')
+        self.assertFalse(results[1]['ok'])
+        self.assertEqual(results[1]['stderr'], 'erreur deux\n')
+        self.assertEqual(results[2]['exit_code'], 2)
+        self.assertIn('error', results[2])
+
+    def test_stop_on_error_skips_remaining(self):
+        results = self._run(['echo fail', 'echo say'], stop_on_error=True)
+        self.assertTrue(results[1]['skipped'])
+        self.assertEqual(len(self.calls), 1)
+
+    def test_excluded_categories_rejected(self):
+        results = self._run(['auth create', 'daemon start'])
+        self.assertTrue(all(not r['ok'] and 'interdite' in r['error'] for r in results))
+
+    def test_parallel_keeps_device_order_and_captures_output(self):
+        lines = [f'echo say -d {device} {i}' for i in range(5) for device in ('Salon', 'Chambre', 'Cuisine')]
+        results = self._run(lines, parallel=3)
+
+        self.assertEqual([r['line'] for r in results], list(range(1, 16)))
+        for result, line in zip(results, lines):
+            device, text = line.split()[-2:]
+            self.assertEqual(result['stdout'], f'{device}:{text}\n')
+        for device in ('Salon', 'Chambre', 'Cuisine'):
+            self.assertEqual([t for d, t in self.calls if d == device], [str(i) for i in range(5)])
+
+    def test_parallel_captures_stderr_per_command(self):
+        lines = [f'echo {action} -d {device} {i}' for i in range(3) for device, action in (('A', 'say'), ('B', 'fail'))]
+        results = self._run(lines, parallel=2)
+
+        for result, line in zip(results, lines):
+            action, text = line.split()[1], line.split()[-1]
+            self.assertEqual(result['stderr'], f'erreur {text}\n' if action == 'fail' else '')
+
+    def test_context_lazy_managers_created_once_across_threads(self):
+        import threading
+        from cli.context import Context
+
+        context = Context(config=MagicMock())
+        context.auth = MagicMock()
+        created = []
+
+        def slow_manager(*args, **kwargs):
+            created.append(args)
+            threading.Event().wait(0.05)
+            return MagicMock()
+
+        with patch('core.dnd_manager.DNDManager', side_effect=slow_manager):
+            threads = [threading.Thread(target=lambda: context.dnd_mgr) for _ in range(5)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        self.assertEqual(len(created), 1)
@@ -131,11 +131,12 @@ class TestActivityManager(unittest.TestCase):
         self.assertEqual(activity['utterance'], 'Hello')
         self.assertEqual(activity['alexaResponse'], 'Hi')
 
-    @patch('builtins.open', new_callable=mock_open, read_data='{"devices": [{"serialNumber": "123", "accountName": "My Echo"}]}')
-    @patch('pathlib.Path.exists', return_value=True)
-    def test_get_device_info_from_cache(self, mock_exists, mock_file):
+    def test_get_device_info_from_cache(self):
+        self.activity_manager.cache_service = MagicMock()
+        self.activity_manager.cache_service.get.return_value = {"devices": [{"serialNumber": "123", "accountName": "My Echo"}]}
         info = self.activity_manager._get_device_info_from_cache("123")
         self.assertEqual(info['accountName'], 'My Echo')
+        self.activity_manager.cache_service.get.assert_called_once_with("devices", ignore_ttl=True)
 
     @patch('core.activity_manager.ActivityManager.get_activities')
     def test_get_activity(self, mock_get_activities):
@@ -286,9 +287,9 @@ class TestActivityManager(unittest.TestCase):
         activity = self.activity_manager._convert_privacy_record_to_activity(record)
         self.assertIsNone(activity)
 
-    @patch('builtins.open', side_effect=IOError)
-    @patch('pathlib.Path.exists', return_value=True)
-    def test_get_device_info_from_cache_exception(self, mock_exists, mock_open):
+    def test_get_device_info_from_cache_exception(self):
+        self.activity_manager.cache_service = MagicMock()
+        self.activity_manager.cache_service.get.side_effect = IOError
         info = self.activity_manager._get_device_info_from_cache("123")
         self.assertIsNone(info)
 
@@ -427,6 +428,50 @@ class TestCircuitBreaker(unittest.TestCase):
 
         self.assertIn(self.breaker.state, [CircuitState.CLOSED, CircuitState.OPEN, CircuitState.HALF_OPEN])
 
+
+class TestCircuitBreakerWindow(unittest.TestCase):
+
+    def _fail(self, breaker):
+        with self.assertRaises(ValueError):
+            breaker.call(lambda: exec("raise ValueError('failure')"))
+
+    def test_opens_on_failure_rate_not_consecutive_count(self):
+        breaker = CircuitBreaker(window_size=10, failure_rate_threshold=0.5, min_calls=4)
+        for _ in range(3):
+            self._fail(breaker)
+        self.assertEqual(breaker.state, CircuitState.CLOSED)  # min_calls non atteint
+
+        breaker = CircuitBreaker(window_size=10, failure_rate_threshold=0.5, min_calls=4)
+        breaker.call(lambda: "success")
+        self._fail(breaker)
+        breaker.call(lambda: "success")
+        self.assertEqual(breaker.state, CircuitState.CLOSED)
+        self._fail(breaker)  # 2 échecs sur 4, jamais consécutifs
+        self.assertEqual(breaker.state, CircuitState.OPEN)
+        self.assertEqual(breaker.get_stats()["window"]["failure_rate"], 0.5)
+
+    def test_time_window_forgets_old_calls(self):
+        breaker = CircuitBreaker(window_seconds=0.1, failure_rate_threshold=0.5, min_calls=2)
+        self._fail(breaker)
+        time.sleep(0.15)
+        self._fail(breaker)
+        self.assertEqual(breaker.state, CircuitState.CLOSED)
+        self._fail(breaker)
+        self.assertEqual(breaker.state, CircuitState.OPEN)
+
+    def test_latency_percentiles(self):
+        breaker = CircuitBreaker(window_size=100)
+        for _ in range(20):
+            breaker.call(lambda: "success")
+        breaker.call(time.sleep, 0.05)
+
+        window = breaker.get_stats()["window"]
+        self.assertEqual(window["calls"], 21)
+        self.assertEqual(window["failure_rate"], 0.0)
+        self.assertLess(window["p50_ms"], 5)
+        self.assertGreaterEqual(window["p99_ms"], 50)
+        self.assertNotIn("window", CircuitBreaker().get_stats())
+
 class TestAlexaStateMachine(unittest.TestCase):
 
     def setUp(self):
@@ -537,6 +582,12 @@ class TestConfig(unittest.TestCase):
         self.assertEqual(self.config.amazon_domain, "amazon.fr")
         self.assertEqual(self.config.speak_volume, 0)
         self.assertEqual(self.config.normal_volume, 10)
+        # Stale-while-revalidate désactivé par défaut
+        self.assertEqual(self.config.max_staleness_seconds, 0)
+
+    def test_max_staleness_opt_in(self):
+        self.mock_env['MAXSTALENESS'] = '86400'
+        self.assertEqual(Config().max_staleness_seconds, 86400)
 
     def test_environment_variables_override_defaults(self):
         self.mock_env['LANGUAGE'] = 'en_US'
@@ -596,6 +647,7 @@ class TestConfig(unittest.TestCase):
         self.assertEqual(config.get_api_base_url(), 'https://alexa.amazon.co.uk')
 
 from core.device_manager import DeviceManager
+from utils.device_index import Device
 
 class TestDeviceManager(unittest.TestCase):
 
@@ -665,6 +717,26 @@ class TestDeviceManager(unittest.TestCase):
         device = self.device_manager.find_device_by_name("Nonexistent")
         self.assertIsNone(device)
 
+    def test_near_miss_name_does_not_resolve(self):
+        devices = [{"accountName": "Chambre Enfants", "serialNumber": "789", "online": True}]
+        self.device_manager.get_devices = MagicMock(return_value=devices)
+
+        self.assertIsNone(self.device_manager.find_device_by_name("Chambre Parents"))
+        self.assertIsNone(self.device_manager.get_device_serial("Chambre Parents"))
+        self.assertEqual(self.device_manager.find_device_by_name("chambre enf")["serialNumber"], "789")
+        self.assertEqual(self.device_manager.find_device_by_name("ambre enfa")["serialNumber"], "789")
+
+    def test_index_follows_device_list(self):
+        self.device_manager.get_devices = MagicMock(return_value=self.mock_devices)
+        self.assertEqual(self.device_manager.find_device_by_name("echo show")["serialNumber"], "456")
+        self.assertIsNone(self.device_manager.find_device_by_name("Show", partial=False))
+
+        # Nouvelle liste (rafraîchissement) : l'index est mis à jour au prochain accès
+        refreshed = [{"accountName": "Echo Show 8", "serialNumber": "456", "online": True}]
+        self.device_manager.get_devices.return_value = refreshed
+        self.assertIsNone(self.device_manager.find_device_by_name("Echo Dot", partial=False))
+        self.assertEqual(self.device_manager.find_device_by_serial("456")["accountName"], "Echo Show 8")
+
     def test_find_device_by_serial(self):
         self.device_manager.get_devices = MagicMock(return_value=self.mock_devices)
 
@@ -686,6 +758,152 @@ class TestDeviceManager(unittest.TestCase):
         self.assertIsNone(self.device_manager._devices_cache)
         self.cache_service.invalidate.assert_called_once_with("devices")
 
+    @patch('core.device_manager.background_refresher')
+    def test_get_devices_stale_while_revalidate(self, mock_refresher):
+        manager = DeviceManager(
+            self.auth, self.state_machine, cache_service=self.cache_service,
+            stale_while_revalidate=True, max_staleness=3600,
+        )
+        self.cache_service.get.return_value = {"devices": self.mock_devices}
+        self.cache_service.get_age.return_value = 600
+
+        devices = manager.get_devices()
+
+        self.assertEqual(devices, self.mock_devices)
+        self.auth.get.assert_not_called()
+        mock_refresher.trigger.assert_called_once_with("devices", manager._refresh_cache)
+
+    @patch('core.device_manager.background_refresher')
+    def test_get_devices_too_stale_waits_for_api(self, mock_refresher):
+        manager = DeviceManager(
+            self.auth, self.state_machine, cache_service=self.cache_service,
+            stale_while_revalidate=True, max_staleness=3600,
+        )
+        self.cache_service.get.return_value = {"devices": [{"serialNumber": "old"}]}
+        self.cache_service.get_age.return_value = 7200
+        self.auth.get.return_value.status_code = 200
+        self.auth.get.return_value.json.return_value = {"devices": self.mock_devices}
+
+        self.assertEqual(manager.get_devices(), self.mock_devices)
+        mock_refresher.trigger.assert_not_called()
+
+    def test_concurrent_get_devices_share_one_request(self):
+        import threading
+        self.cache_service.get.return_value = None
+        release = threading.Event()
+
+        def slow_get(url, **kwargs):
+            release.wait(2)
+            response = MagicMock(status_code=200)
+            response.json.return_value = {"devices": self.mock_devices}
+            return response
+
+        self.auth.get.side_effect = slow_get
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(self.device_manager.get_devices()))
+                   for _ in range(4)]
+        for t in threads:
+            t.start()
+        time.sleep(0.1)
+        release.set()
+        for t in threads:
+            t.join(2)
+
+        self.assertEqual(results, [self.mock_devices] * 4)
+        self.auth.get.assert_called_once()
+
+    def test_get_devices_async(self):
+        import asyncio
+        self.cache_service.get.return_value = None
+        client = MagicMock()
+
+        async def fake_get(url, params=None):
+            response = MagicMock(status_code=200)
+            response.json.return_value = {"devices": self.mock_devices}
+            return response
+
+        client.get.side_effect = fake_get
+
+        devices = asyncio.run(self.device_manager.get_devices_async(client))
+
+        self.assertEqual(devices, self.mock_devices)
+        self.assertEqual(client.get.call_args.kwargs["params"], {"cached": "false"})
+        self.cache_service.set.assert_called_once()
+        key, payload = self.cache_service.set.call_args.args
+        self.assertEqual(key, "devices")
+        # Le cache disque garde les dicts API, lisibles par `alexa cache show`
+        self.assertEqual(payload["devices"], self.mock_devices)
+        self.assertIn("search_index", payload)
+
+
+from core.dnd_manager import DNDManager
+
+class TestDNDManagerAsync(unittest.TestCase):
+
+    def test_dnd_status_for_many_devices_shares_one_request(self):
+        import asyncio
+        from utils.async_http import AsyncAlexaClient
+        auth = MagicMock()
+        auth.session.request.return_value = MagicMock(
+            status_code=200,
+            content=json.dumps({"doNotDisturbDeviceStatusList": [
+                {"deviceSerialNumber": f"S{i}", "enabled": i % 2 == 0} for i in range(20)
+            ]}).encode(),
+            headers={},
+            url="https://alexa.amazon.fr/api/dnd/status",
+        )
+        state_machine = MagicMock(can_execute_commands=True)
+        manager = DNDManager(auth, MagicMock(alexa_domain="alexa.amazon.fr"), state_machine)
+
+        async def main():
+            async with AsyncAlexaClient(auth, backend="threads") as client:
+                return await asyncio.gather(*(manager.get_dnd_status_async(client, f"S{i}") for i in range(20)))
+
+        statuses = asyncio.run(main())
+        self.assertEqual([s["enabled"] for s in statuses], [i % 2 == 0 for i in range(20)])
+        auth.session.request.assert_called_once()
+
+from core.music.playback_manager import PlaybackManager
+
+class TestPlaybackManagerState(unittest.TestCase):
+
+    def setUp(self):
+        self.auth = MagicMock()
+        with patch('services.voice_command_service.VoiceCommandService'):
+            self.manager = PlaybackManager(
+                self.auth, MagicMock(alexa_domain="alexa.amazon.fr"), MagicMock(can_execute_commands=True)
+            )
+
+    def _responses(self, failing=()):
+        def fake_get(url, **kwargs):
+            path = url.split("alexa.amazon.fr")[1]
+            if path in failing:
+                raise requests.ConnectionError(path)
+            response = MagicMock()
+            response.json.return_value = {"path": path}
+            return response
+        self.auth.session.get.side_effect = fake_get
+
+    def test_partial_state_when_one_endpoint_fails(self):
+        self._responses(failing=("/api/media/state",))
+
+        state = self.manager.get_state("S1", "A3S5BH2HU6VAYF", parent_id="P1", parent_type="T")
+
+        self.assertEqual(state["player"], {"path": "/api/np/player"})
+        self.assertIsNone(state["media"])
+        self.assertEqual(state["queue"], {"path": "/api/np/queue"})
+        player_call = [c for c in self.auth.session.get.call_args_list if c.args[0].endswith("/api/np/player")][0]
+        self.assertEqual(player_call.kwargs["params"]["lemurId"], "P1")
+
+    def test_lightweight_mode_skips_queue_and_all_failures_return_none(self):
+        self._responses()
+        state = self.manager.get_state("S1", "A3S5BH2HU6VAYF", include_queue=False)
+        self.assertIsNone(state["queue"])
+        self.assertEqual(self.auth.session.get.call_count, 2)
+
+        self._responses(failing=("/api/np/player", "/api/media/state", "/api/np/queue"))
+        self.assertIsNone(self.manager.get_state("S1", "A3S5BH2HU6VAYF"))
+
 import requests
 from core.alarms.alarm_manager import AlarmManager
 
@@ -7,6 +7,8 @@ from pathlib import Path
 import time
 
 from services.cache_service import CacheService
+from services.notification_snapshot import NotificationSnapshotService
+from services.sync_service import SyncService
 
 class TestCacheService(unittest.TestCase):
 
@@ -98,5 +100,425 @@ class TestCacheService(unittest.TestCase):
         self.assertEqual(stats['writes'], 1)
         self.assertAlmostEqual(stats['hit_rate'], 0.5)
 
+    def test_memory_tier_skips_disk(self):
+        self.cache_service.set("key1", {"data": 1}, 60)
+
+        with patch('services.cache_service.serialization.decode') as mock_decode:
+            self.assertEqual(self.cache_service.get("key1"), {"data": 1})
+            self.assertEqual(self.cache_service.get("key1"), {"data": 1})
+            mock_decode.assert_not_called()
+
+        self.assertEqual(self.cache_service.get_stats()['memory_hits'], 2)
+
+    def test_memory_tier_detects_external_write(self):
+        self.cache_service.set("key1", {"data": 1}, 60)
+        self.assertEqual(self.cache_service.get("key1"), {"data": 1})
+
+        # Un autre processus réécrit le fichier
+        other = CacheService(cache_dir=self.cache_dir)
+        other.set("key1", {"data": 2, "extra": True}, 60)
+
+        self.assertEqual(self.cache_service.get("key1"), {"data": 2, "extra": True})
+
+    def test_memory_tier_isolated_from_caller_mutations(self):
+        for cache_service in (
+            self.cache_service,
+            CacheService(cache_dir=self.cache_dir, write_behind=True, write_behind_delay=60),
+        ):
+            data = {"items": [1, 2]}
+            cache_service.set("key1", data, 60)
+            data["items"].append(3)
+            self.assertEqual(cache_service.get("key1"), {"items": [1, 2]})
+
+            cache_service.get("key1")["items"].clear()
+            self.assertEqual(cache_service.get("key1"), {"items": [1, 2]})
+
+    def test_write_behind(self):
+        cache_service = CacheService(cache_dir=self.cache_dir, write_behind=True, write_behind_delay=60)
+        cache_service.set("key1", {"data": 1}, 60)
+
+        # Servi depuis la mémoire avant la persistance
+        self.assertEqual(cache_service.get("key1"), {"data": 1})
+        self.assertFalse((self.cache_dir / "key1.json.gz").exists())
+
+        self.assertEqual(cache_service.flush(), 1)
+        self.assertTrue((self.cache_dir / "key1.json.gz").exists())
+        self.assertEqual(CacheService(cache_dir=self.cache_dir).get("key1"), {"data": 1})
+
+    def test_exit_flush_does_not_keep_instances_alive(self):
+        import gc
+        import weakref
+        from services import cache_service as cache_module
+
+        cache_service = CacheService(cache_dir=self.cache_dir, write_behind=True, write_behind_delay=60)
+        cache_service.set("key1", {"data": 1}, 60)
+        self.assertIn(cache_service, cache_module._flush_on_exit)
+
+        # Le hook atexit unique persiste les écritures des instances vivantes
+        cache_module._flush_all_on_exit()
+        self.assertTrue((self.cache_dir / "key1.json.gz").exists())
+
+        ref = weakref.ref(cache_service)
+        writer = cache_service._writer
+        del cache_service
+        gc.collect()
+        self.assertIsNone(ref())
+        writer.join(timeout=2)
+        self.assertFalse(writer.is_alive())
+
+    def test_high_throughput_json_copy_on_demand(self):
+        cache_service = CacheService(cache_dir=self.cache_dir, high_throughput=True)
+        cache_service.set("key1", {"data": 1}, 60)
+
+        self.assertFalse((self.cache_dir / "key1.json").exists())
+        self.assertFalse(cache_service.metadata["key1"]["has_json_copy"])
+
+        path = cache_service.write_json_copy("key1")
+        self.assertEqual(path, self.cache_dir / "key1.json")
+        with open(path) as f:
+            self.assertEqual(json.load(f), {"data": 1})
+        self.assertTrue(cache_service.metadata["key1"]["has_json_copy"])
+        cache_service.flush()
+
+    def test_high_throughput_groups_metadata_commits(self):
+        cache_service = CacheService(
+            cache_dir=self.cache_dir, high_throughput=True, metadata_commit_interval=60
+        )
+        with patch.object(cache_service, '_append_journal', wraps=cache_service._append_journal) as mock_append:
+            for i in range(5):
+                cache_service.set(f"key{i}", {"data": i}, 60)
+            # Premier set journalisé, les suivants regroupés
+            self.assertEqual(mock_append.call_count, 1)
+
+            cache_service.flush()
+            self.assertEqual(mock_append.call_count, 2)
+            self.assertEqual(mock_append.call_args[0][0], ["key1", "key2", "key3", "key4"])
+        self.assertFalse(cache_service._dirty_keys)
+
+    def test_compression_ratio_incremental(self):
+        self.cache_service.set("key1", {"data": "x" * 1000}, 60)
+        self.cache_service.set("key2", {"data": "y" * 1000}, 60)
+        expected = sum(m["compression_ratio"] for m in self.cache_service.metadata.values()) / 2
+        self.assertAlmostEqual(self.cache_service.get_stats()['avg_compression_ratio'], expected)
+
+        self.cache_service.invalidate("key2")
+        self.assertAlmostEqual(
+            self.cache_service.get_stats()['avg_compression_ratio'],
+            self.cache_service.metadata["key1"]["compression_ratio"],
+        )
+
+        # Recalculé au chargement par une nouvelle instance
+        reloaded = CacheService(cache_dir=self.cache_dir)
+        self.assertAlmostEqual(
+            reloaded.get_stats()['avg_compression_ratio'],
+            self.cache_service.metadata["key1"]["compression_ratio"],
+        )
+
+    def test_metadata_journal_appends_without_snapshot_rewrite(self):
+        with patch.object(self.cache_service, '_save_metadata') as mock_save:
+            self.cache_service.set("key1", {"data": 1}, 60)
+            self.cache_service.set("key2", {"data": 2}, 60)
+            self.cache_service.invalidate("key1")
+            mock_save.assert_not_called()
+
+        with open(self.cache_dir / ".metadata.journal") as f:
+            self.assertEqual(len(f.readlines()), 3)
+
+        # Une nouvelle instance rejoue le journal
+        reloaded = CacheService(cache_dir=self.cache_dir)
+        self.assertEqual(set(reloaded.metadata), {"key2"})
+        self.assertEqual(reloaded.get("key2"), {"data": 2})
+
+    def test_metadata_journal_compaction(self):
+        cache_service = CacheService(cache_dir=self.cache_dir, journal_compact_threshold=3)
+        for i in range(3):
+            cache_service.set(f"key{i}", {"data": i}, 60)
+
+        self.assertEqual((self.cache_dir / ".metadata.journal").stat().st_size, 0)
+        with open(self.cache_dir / ".metadata.json") as f:
+            self.assertEqual(set(json.load(f)), {"key0", "key1", "key2"})
+
+    def test_metadata_journal_ignores_torn_line(self):
+        self.cache_service.set("key1", {"data": 1}, 60)
+        with open(self.cache_dir / ".metadata.journal", "a") as f:
+            f.write('{"key": "key2", "me')
+
+        reloaded = CacheService(cache_dir=self.cache_dir)
+        self.assertEqual(set(reloaded.metadata), {"key1"})
+
+        # Le journal a été compacté : les ajouts suivants restent lisibles
+        reloaded.set("key3", {"data": 3}, 60)
+        self.assertEqual(set(CacheService(cache_dir=self.cache_dir).metadata), {"key1", "key3"})
+
+    def test_codec_recorded_in_metadata(self):
+        cache_service = CacheService(cache_dir=self.cache_dir, codec="json", compressor="zlib")
+        cache_service.set("key1", {"data": 1}, 60)
+
+        self.assertTrue((self.cache_dir / "key1.json.zz").exists())
+        self.assertEqual(cache_service.metadata["key1"]["codec"], "json")
+        self.assertEqual(cache_service.metadata["key1"]["compressor"], "zlib")
+
+        # Une instance configurée autrement relit l'entrée et la remplace
+        other = CacheService(cache_dir=self.cache_dir, compressor="gzip")
+        self.assertEqual(other.get("key1"), {"data": 1})
+        other.set("key1", {"data": 2}, 60)
+        self.assertFalse((self.cache_dir / "key1.json.zz").exists())
+        self.assertEqual(CacheService(cache_dir=self.cache_dir).get("key1"), {"data": 2})
+
+    def test_legacy_gzip_entry_readable(self):
+        with gzip.open(self.cache_dir / "legacy.json.gz", "wt", encoding="utf-8") as f:
+            json.dump({"data": "old"}, f)
+
+        cache_service = CacheService(cache_dir=self.cache_dir, compressor="zlib")
+        self.assertEqual(cache_service.get("legacy", ignore_ttl=True), {"data": "old"})
+        self.assertTrue(cache_service.invalidate("legacy"))
+        self.assertFalse((self.cache_dir / "legacy.json.gz").exists())
+
+    def test_unknown_codec_rejected(self):
+        with self.assertRaises(ValueError):
+            CacheService(cache_dir=self.cache_dir, codec="pickle")
+
+    def test_clean_expired_uses_expiry_heap(self):
+        self.cache_service.set("key1", {"data": 1}, 60)
+        self.cache_service.set("key2", {"data": 2}, 60)
+        self.cache_service.metadata["key1"]["expires_at"] = time.time() - 1
+        self.cache_service._expiry.push("key1", time.time() - 1)
+
+        with patch.object(self.cache_service, '_is_expired') as mock_is_expired:
+            self.assertEqual(self.cache_service.clean_expired(), 1)
+            mock_is_expired.assert_not_called()
+
+        self.assertEqual(set(self.cache_service.metadata), {"key2"})
+        self.assertAlmostEqual(self.cache_service.next_expiry(), self.cache_service.metadata["key2"]["expires_at"])
+        self.assertEqual(self.cache_service.get_stats()['expired_entries'], 0)
+
+    def test_reaper_removes_expired_entries(self):
+        cache_service = CacheService(cache_dir=self.cache_dir, reaper_interval=0.05)
+        try:
+            cache_service.set("key1", {"data": 1}, 0)
+            deadline = time.time() + 2
+            while "key1" in cache_service.metadata and time.time() < deadline:
+                time.sleep(0.02)
+            self.assertNotIn("key1", cache_service.metadata)
+            self.assertFalse((self.cache_dir / "key1.json.gz").exists())
+        finally:
+            cache_service.stop_reaper()
+
+class TestSyncService(unittest.TestCase):
+
+    def setUp(self):
+        self.sync_service = SyncService(MagicMock(), MagicMock(), MagicMock(), cache_service=MagicMock())
+
+    def test_preload_all_data_parallel(self):
+        def slow(result):
+            def getter(force=False, raise_errors=False):
+                time.sleep(0.2)
+                return result
+            return getter
+
+        self.sync_service.get_smart_home_devices = slow([{"id": 1}, {"id": 2}])
+        self.sync_service.get_alarms_reminders = slow([{"id": 3}])
+        self.sync_service.get_lists = slow([])
+        self.sync_service.get_routines = MagicMock(side_effect=Exception("API Error"))
+        self.sync_service.get_activities = slow([])
+
+        start = time.time()
+        stats = self.sync_service.preload_all_data(parallel=True)
+        elapsed = time.time() - start
+
+        # Les catégories tournent en parallèle: ~ la plus lente, pas la somme
+        self.assertLess(elapsed, 0.6)
+        self.assertEqual(stats["preloaded"]["smart_home"], 2)
+        self.assertEqual(stats["preloaded"]["alarms_and_reminders"], 1)
+        self.assertNotIn("routines", stats["preloaded"])
+        self.assertEqual(stats["failed"], [{"category": "routines", "error": "API Error"}])
+        self.assertEqual(set(stats["latency_ms"]), {"smart_home", "alarms_and_reminders", "lists", "routines", "activities"})
+        self.assertGreaterEqual(stats["latency_ms"]["smart_home"], 150)
+
+    def test_preload_all_data_sequential(self):
+        for name in ("get_smart_home_devices", "get_alarms_reminders", "get_lists", "get_routines", "get_activities"):
+            setattr(self.sync_service, name, MagicMock(return_value=[{"id": name}]))
+
+        stats = self.sync_service.preload_all_data(force=True, parallel=False)
+
+        self.assertFalse(stats["parallel"])
+        self.assertEqual(sum(stats["preloaded"].values()), 5)
+        self.sync_service.get_routines.assert_called_once_with(force=True, raise_errors=True)
+        self.assertTrue(stats["success"])
+
+    def test_preload_isolates_failing_category(self):
+        self.sync_service.auth.session.get.side_effect = Exception("API Error")
+
+        stats = self.sync_service.preload_all_data(force=True, parallel=False)
+
+        # Les getters ne masquent plus l'échec : catégorie en échec, pas "0 préchargé"
+        failed = {entry["category"] for entry in stats["failed"]}
+        self.assertEqual(failed, {"smart_home", "alarms_and_reminders", "routines"})
+        self.assertEqual(stats["preloaded"], {"lists": 0, "activities": 0})
+        self.assertFalse(stats["success"])
+        # Appel direct : comportement inchangé (liste vide)
+        self.assertEqual(self.sync_service.get_routines(force=True), [])
+
+    def test_sync_smart_home_uses_shared_fetch(self):
+        self.sync_service.auth.session.get.return_value.json.return_value = [{"id": "light"}]
+
+        self.assertEqual(self.sync_service._sync_smart_home_devices(), [{"id": "light"}])
+        self.sync_service.cache_service.set.assert_called_once_with(
+            "smart_home_all", {"devices": [{"id": "light"}]}, ttl_seconds=1800
+        )
+
+        # Échecs comptés par le circuit breaker partagé des entités
+        self.sync_service.auth.session.get.side_effect = Exception("API Error")
+        self.assertEqual(self.sync_service._sync_smart_home_devices(), [])
+        self.assertEqual(self.sync_service.smart_home_breaker.failure_count, 1)
+
+class TestNotificationSnapshotService(unittest.TestCase):
+
+    def setUp(self):
+        self.cache_service = MagicMock()
+        self.cache_service.get.return_value = None
+        self.snapshots = NotificationSnapshotService(self.cache_service, ttl_seconds=60)
+        self.response = MagicMock()
+        self.response.json.return_value = {"notifications": [
+            {"id": "t1", "type": "Timer", "status": "ON", "deviceSerialNumber": "A"},
+            {"id": "t2", "type": "Timer", "status": "OFF", "deviceSerialNumber": "B"},
+            {"id": "a1", "type": "Alarm", "status": "ON", "deviceSerialNumber": "A"},
+            {"id": "r1", "type": "Reminder", "status": "ON", "deviceSerialNumber": "B"},
+        ]}
+        self.fetch = MagicMock(return_value=self.response)
+
+    def test_single_fetch_shared_by_consumers(self):
+        timers = self.snapshots.get_snapshot(self.fetch).select("Timer", status="ON")
+        alarms = self.snapshots.get_snapshot(self.fetch).select("Alarm")
+
+        self.fetch.assert_called_once()
+        self.assertEqual([t["id"] for t in timers], ["t1"])
+        self.assertEqual([a["id"] for a in alarms], ["a1"])
+        self.cache_service.set.assert_called_once()
+
+    def test_partitions(self):
+        snapshot = self.snapshots.get_snapshot(self.fetch)
+        self.assertEqual(len(snapshot.by_type["Timer"]), 2)
+        self.assertEqual([n["id"] for n in snapshot.by_device["B"]], ["t2", "r1"])
+        self.assertEqual([n["id"] for n in snapshot.select(device_serial="A", status="ON")], ["t1", "a1"])
+
+    def test_invalidate_forces_refetch(self):
+        self.snapshots.get_snapshot(self.fetch)
+        self.snapshots.invalidate()
+        self.snapshots.get_snapshot(self.fetch)
+
+        self.assertEqual(self.fetch.call_count, 2)
+        self.cache_service.invalidate.assert_called_once_with("alarms_and_reminders")
+
+    def test_served_from_disk_copy(self):
+        self.cache_service.get.return_value = {"notifications": [{"id": "a1", "type": "Alarm"}], "fetched_at": time.time()}
+
+        alarms = self.snapshots.get_snapshot(self.fetch).select("Alarm")
+
+        self.fetch.assert_not_called()
+        self.assertEqual(len(alarms), 1)
+
+    def test_managers_share_one_round_trip(self):
+        from core.alarms.alarm_manager import AlarmManager
+        from core.reminders.reminder_manager import ReminderManager
+
+        auth = MagicMock()
+        auth.session.get.return_value = self.response
+        alarm_mgr = AlarmManager(auth, MagicMock(), MagicMock(), self.cache_service, notification_snapshot=self.snapshots)
+        reminder_mgr = ReminderManager(auth, MagicMock(), MagicMock(), self.cache_service, notification_snapshot=self.snapshots)
+
+        self.assertEqual(len(alarm_mgr.list_alarms()), 1)
+        self.assertEqual(len(reminder_mgr.get_reminders()), 1)
+        auth.session.get.assert_called_once()
+
 if __name__ == '__main__':
     unittest.main()
+
+
+from services.fleet_status import FleetStatusService
+
+class TestFleetStatusService(unittest.TestCase):
+
+    def test_snapshot_collects_online_devices_concurrently(self):
+        import asyncio
+        from unittest.mock import AsyncMock
+        devices = [
+            {"accountName": f"Echo {i}", "serialNumber": f"S{i}", "deviceType": "T", "online": i != 2}
+            for i in range(4)
+        ]
+        device_mgr = MagicMock()
+        device_mgr.get_devices_async = AsyncMock(return_value=devices)
+        playback_mgr = MagicMock()
+        playback_mgr.get_state_async = AsyncMock(return_value={
+            "player": {"playerInfo": {"state": "PLAYING", "infoText": {"title": "Song", "subText1": "Artist"}}},
+            "media": None,
+            "queue": None,
+        })
+        from core.dnd_manager import DNDManager
+        from core.settings.device_settings_manager import DeviceSettingsManager
+        settings_mgr = MagicMock()
+        settings_mgr.get_all_volumes_async = AsyncMock(return_value={
+            "volumes": [{"dsn": f"S{i}", "speakerVolume": 30} for i in range(4)]
+        })
+        settings_mgr.find_volume = DeviceSettingsManager.find_volume
+        dnd_mgr = MagicMock()
+        dnd_mgr.get_all_dnd_status_async = AsyncMock(return_value={
+            "doNotDisturbDeviceStatusList": [{"deviceSerialNumber": "S0", "enabled": True}]
+        })
+        dnd_mgr.find_dnd_status = DNDManager.find_dnd_status
+        fleet = FleetStatusService(MagicMock(), device_mgr, playback_mgr, dnd_mgr, settings_mgr)
+
+        document = asyncio.run(fleet.snapshot_async(client=MagicMock(), max_concurrency=2))
+
+        self.assertEqual(document["device_count"], 4)
+        self.assertEqual(document["online_count"], 3)
+        self.assertEqual(document["devices"][0]["playback"]["title"], "Song")
+        self.assertEqual(document["devices"][0]["volume"], 30)
+        self.assertTrue(document["devices"][0]["dnd"])
+        self.assertIsNone(document["devices"][1]["dnd"])
+        self.assertIsNone(document["devices"][2]["playback"])
+        self.assertIsNone(document["devices"][2]["volume"])
+        # Endpoints de compte interrogés une seule fois pour tout l'instantané
+        settings_mgr.get_all_volumes_async.assert_awaited_once()
+        dnd_mgr.get_all_dnd_status_async.assert_awaited_once()
+        self.assertEqual(playback_mgr.get_state_async.await_count, 3)
+        self.assertFalse(playback_mgr.get_state_async.await_args.kwargs["include_queue"])
+        json.dumps(document)
+
+from services.voice_command_service import VoiceCommandService
+from utils.device_index import Device
+
+class TestVoiceCommandServiceDevices(unittest.TestCase):
+
+    def setUp(self):
+        self.devices = [
+            {"serialNumber": "T1", "accountName": "Fire TV", "deviceType": "A1", "deviceFamily": "FIRE_TV"},
+            {"serialNumber": "E1", "accountName": "Echo Bureau", "deviceType": "A2", "deviceFamily": "ECHO"},
+            {"serialNumber": "E2", "accountName": "Echo Salon", "deviceType": "A3", "deviceFamily": "KNIGHT"},
+        ]
+        self.cache = MagicMock()
+        self.entry = {"devices": [dict(device) for device in self.devices]}
+        self.cache.get.return_value = self.entry
+        self.service = VoiceCommandService(MagicMock(), MagicMock(), MagicMock(), cache_service=self.cache)
+
+    def test_targets_computed_once_per_cache_entry(self):
+        with patch.object(VoiceCommandService, "_build_targets", wraps=VoiceCommandService._build_targets) as build:
+            default = self.service._get_default_echo_device()
+            self.assertEqual(default, {"name": "Echo Salon", "serial": "E2", "type": "A3"})
+            self.assertEqual(self.service._find_device("E1").device_type, "A2")
+            self.assertEqual(build.call_count, 1)
+
+            self.cache.get.return_value = {"devices": self.entry["devices"][:2]}
+            self.assertEqual(self.service._get_default_echo_device()["serial"], "E1")
+            self.assertEqual(build.call_count, 2)
+
+    def test_serial_lookup_uses_device_manager_index(self):
+        device_mgr = MagicMock()
+        device_mgr.get_index.return_value.get_by_serial.return_value = Device.from_dict(self.devices[1])
+        service = VoiceCommandService(
+            MagicMock(), MagicMock(), MagicMock(), cache_service=self.cache, device_mgr=device_mgr
+        )
+
+        self.assertEqual(service._find_device("E1").account_name, "Echo Bureau")
+        device_mgr.get_index.return_value.get_by_serial.assert_called_once_with("E1")
+        self.cache.get.assert_not_called()
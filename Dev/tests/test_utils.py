@@ -1,7 +1,11 @@
 
 import unittest
 from unittest.mock import MagicMock, patch, call
+import json
+import os
+import requests
 import logging
+import time
 from pathlib import Path
 from datetime import datetime
 
@@ -12,6 +16,17 @@ from utils.logger import (
     InstallLogger,
     SharedIcons
 )
+from utils import serialization
+from utils.expiry import ExpiryHeap
+from utils.background_refresh import BackgroundRefresher
+from utils.single_flight import SingleFlight, request_key
+from utils.http_session import OptimizedHTTPSession
+from utils.async_http import AsyncAlexaClient
+from utils.http_guard import EndpointGuards, GuardedHTTPAdapter, endpoint_family
+from utils.rate_limiter import TokenBucket, parse_retry_after
+from utils.smart_cache import SmartCache
+from utils.device_index import Device, DeviceIndex
+from utils.name_search import NameSearchIndex, normalize
 
 class TestLogger(unittest.TestCase):
 
@@ -159,3 +174,605 @@ class TestLogger(unittest.TestCase):
 
 if __name__ == '__main__':
     unittest.main()
+
+
+class TestSerialization(unittest.TestCase):
+
+    def test_roundtrip_all_backends(self):
+        data = {"devices": [{"serialNumber": "123", "online": True}], "count": 1}
+        for codec in serialization.CODECS.values():
+            for compressor in serialization.COMPRESSORS.values():
+                payload = serialization.encode(data, codec, compressor)
+                path = Path(f"entry{codec.suffix}{compressor.suffix}")
+                self.assertEqual(serialization.decode(payload, *serialization.format_for_path(path)), data)
+
+    def test_format_for_path(self):
+        codec, compressor = serialization.format_for_path(Path("devices.json.gz"))
+        self.assertEqual((codec.name, compressor.name), ("json", "gzip"))
+        codec, compressor = serialization.format_for_path(Path("devices.json"))
+        self.assertEqual(compressor.name, "none")
+        with self.assertRaises(serialization.SerializationError):
+            serialization.format_for_path(Path("devices.txt"))
+
+    def test_decode_corrupted(self):
+        with self.assertRaises(serialization.SerializationError):
+            serialization.decode(b"not gzip", serialization.get_codec("json"), serialization.get_compressor("gzip"))
+
+
+class TestExpiryHeap(unittest.TestCase):
+
+    def test_pop_expired_skips_stale_deadlines(self):
+        heap = ExpiryHeap()
+        heap.push("a", 10)
+        heap.push("b", 20)
+        heap.push("a", 30)  # réécrite : l'échéance 10 est périmée
+        heap.push("c", 5)
+        heap.discard("c")
+
+        self.assertEqual(heap.count_expired(now=25), 1)
+        self.assertEqual(heap.pop_expired(now=25), ["b"])
+        self.assertEqual(heap.next_expiry(), 30)
+        self.assertEqual(len(heap), 1)
+
+
+class TestBackgroundRefresher(unittest.TestCase):
+
+    def test_trigger_deduplicates_inflight_refresh(self):
+        import threading
+        release = threading.Event()
+        calls = []
+
+        def refresh():
+            calls.append(1)
+            release.wait(2)
+
+        refresher = BackgroundRefresher()
+        self.assertTrue(refresher.trigger("devices", refresh))
+        self.assertFalse(refresher.trigger("devices", refresh))
+        self.assertTrue(refresher.is_refreshing("devices"))
+
+        release.set()
+        refresher.wait("devices", timeout=2)
+        self.assertFalse(refresher.is_refreshing("devices"))
+        self.assertEqual(len(calls), 1)
+
+
+class TestSingleFlight(unittest.TestCase):
+
+    def test_request_key_normalizes_params(self):
+        self.assertEqual(
+            request_key("get", "https://a/api", {"b": "2", "a": "1"}),
+            request_key("GET", "https://a/api", {"a": "1", "b": "2"}),
+        )
+        self.assertEqual(request_key("GET", "https://a/api?x=1", {"y": "2"}), "GET https://a/api?x=1&y=2")
+
+    def test_concurrent_calls_share_one_execution(self):
+        import threading
+        flight = SingleFlight()
+        started = threading.Event()
+        release = threading.Event()
+        calls = []
+
+        def fetch():
+            calls.append(1)
+            started.set()
+            release.wait(2)
+            return ["echo"]
+
+        results = []
+        leader = threading.Thread(target=lambda: results.append(flight.do("GET devices", fetch)))
+        leader.start()
+        started.wait(2)
+        followers = [threading.Thread(target=lambda: results.append(flight.do("GET devices", fetch))) for _ in range(3)]
+        for t in followers:
+            t.start()
+        while flight.shared_count < 3:
+            time.sleep(0.01)
+        release.set()
+        for t in [leader] + followers:
+            t.join(2)
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(results, [["echo"]] * 4)
+        self.assertEqual(flight.in_flight(), 0)
+        # Un appel ultérieur relance une récupération
+        flight.do("GET devices", fetch)
+        self.assertEqual(len(calls), 2)
+
+    def test_error_propagated_and_async_coalescing(self):
+        import asyncio
+        flight = SingleFlight()
+
+        def boom():
+            raise RuntimeError("HTTP 503")
+
+        with self.assertRaises(RuntimeError):
+            flight.do("GET routines", boom)
+
+        calls = []
+
+        async def fetch():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            return {"state": "ok"}
+
+        async def main():
+            return await asyncio.gather(*(flight.do_async("GET player", fetch) for _ in range(3)))
+
+        self.assertEqual(asyncio.run(main()), [{"state": "ok"}] * 3)
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(flight.in_flight(), 0)
+
+
+class TestHTTPSession(unittest.TestCase):
+
+    def test_urls_expire_after_follows_cache_ttl(self):
+        import requests_cache
+        from requests_cache.policy.expiration import get_url_expiration
+
+        patterns = OptimizedHTTPSession._urls_expire_after()
+        base = "https://alexa.amazon.fr"
+        self.assertEqual(get_url_expiration(f"{base}/api/devices-v2/device?cached=false", patterns), 300)
+        self.assertEqual(get_url_expiration(f"{base}/api/np/player", patterns), requests_cache.DO_NOT_CACHE)
+        self.assertIsNone(get_url_expiration(f"{base}/api/unknown", patterns))
+
+    def test_alexa_auth_pool(self):
+        from alexa_auth.alexa_auth import AlexaAuth
+
+        auth = AlexaAuth(pool_connections=4, pool_maxsize=32)
+        adapter = auth.session.get_adapter("https://alexa.amazon.fr")
+        self.assertEqual(adapter._pool_maxsize, 32)
+        self.assertEqual(auth.session.headers["Accept-Encoding"], "gzip, deflate")
+
+        shared = MagicMock()
+        self.assertIs(AlexaAuth(http_session=shared).session, shared.session)
+
+
+class TestAlexaAuthSession(unittest.TestCase):
+
+    def setUp(self):
+        import tempfile
+
+        self.tmp = tempfile.TemporaryDirectory()
+        self.data_dir = Path(self.tmp.name)
+        self.token_date = time.time() * 1000
+        self._write_cookies(self.token_date)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _write_cookies(self, token_date):
+        import json
+
+        payload = {"recapitulatif": {"cookie": "a=1; b=2", "csrf": "c", "tokenDate": token_date}}
+        (self.data_dir / "cookie-resultat.json").write_text(json.dumps(payload), encoding="utf-8")
+
+    def _auth(self):
+        from alexa_auth.alexa_auth import AlexaAuth
+
+        auth = AlexaAuth(data_dir=self.data_dir)
+        self.assertTrue(auth.load_cookies())
+        return auth
+
+    def _respond(self, auth, status, url="https://alexa.amazon.fr/api/devices-v2/device"):
+        auth._track_session_validity(MagicMock(status_code=status, from_cache=False, url=url))
+
+    def test_verified_session_is_known_good_until_401(self):
+        auth = self._auth()
+        self.assertFalse(auth.session_known_good())
+
+        self._respond(auth, 200)
+        self.assertTrue(self._auth().session_known_good())
+
+        self._respond(auth, 401)
+        self.assertFalse(self._auth().session_known_good())
+
+    def test_403_outside_session_check_keeps_session(self):
+        auth = self._auth()
+        self._respond(auth, 200)
+        auth._update_session_state({"bootstrap": {"customerId": "A1B2"}})
+
+        # 403 d'un endpoint quelconque (en-têtes) : session et bootstrap conservés
+        self._respond(auth, 403, url="https://alexa.amazon.fr/api/np/player?deviceSerialNumber=X")
+        self.assertTrue(self._auth().session_known_good())
+        self.assertEqual(self._auth().customer_id, "A1B2")
+
+        self._respond(auth, 403, url="https://alexa.amazon.fr/api/bootstrap?version=0")
+        self.assertFalse(self._auth().session_known_good())
+
+    def test_expired_or_replaced_cookies_need_verification(self):
+        auth = self._auth()
+        self._respond(auth, 200)
+
+        self._write_cookies(self.token_date - 31 * 24 * 3600 * 1000)
+        self.assertFalse(self._auth().session_known_good())
+
+    def test_shared_session_tracked_by_latest_auth_only(self):
+        from alexa_auth.alexa_auth import AlexaAuth
+
+        shared = MagicMock(session=requests.Session())
+        old = AlexaAuth(data_dir=self.data_dir, http_session=shared)
+        new = AlexaAuth(data_dir=self.data_dir, http_session=shared)
+
+        self.assertEqual(shared.session.hooks["response"], [new._track_session_validity])
+        self.assertTrue(new.load_cookies())
+        old.close()
+        self.assertEqual(shared.session.hooks["response"], [new._track_session_validity])
+        self.assertEqual(len(shared.session.cookies), 2)
+
+        new.close()
+        self.assertEqual(shared.session.hooks["response"], [])
+        self.assertEqual(len(shared.session.cookies), 0)
+
+    def test_bootstrap_persisted_until_session_invalidated(self):
+        bootstrap = {"authentication": {"customerId": "A1B2", "customerEmail": "x@y.z"}, "marketPlaceId": "A13V"}
+        auth = self._auth()
+        auth.session.get = MagicMock(return_value=MagicMock(status_code=200, **{"json.return_value": bootstrap}))
+
+        self.assertEqual(auth.get_bootstrap(), {"customerId": "A1B2", "marketplace": "A13V"})
+        self.assertEqual(auth.customer_id, "A1B2")
+        auth.session.get.assert_called_once()
+
+        second = self._auth()
+        second.session.get = MagicMock()
+        self.assertEqual(second.customer_id, "A1B2")
+        second.session.get.assert_not_called()
+
+        self._respond(second, 401)
+        third = self._auth()
+        third.session.get = MagicMock(side_effect=requests.ConnectionError("offline"))
+        self.assertIsNone(third.customer_id)
+
+
+class TestAsyncAlexaClient(unittest.TestCase):
+
+    def _auth(self, status=200, body=b'{"ok": true}'):
+        auth = MagicMock()
+        auth.csrf = "token"
+        auth.session.request.return_value = MagicMock(
+            status_code=status, content=body, headers={}, url="https://alexa.amazon.fr/api/dnd/status"
+        )
+        return auth
+
+    def test_threads_backend_coalesces_gets_and_injects_csrf(self):
+        import asyncio
+        auth = self._auth()
+
+        async def main():
+            async with AsyncAlexaClient(auth, backend="threads") as client:
+                return await asyncio.gather(*(client.get("https://alexa.amazon.fr/api/dnd/status") for _ in range(5)))
+
+        responses = asyncio.run(main())
+        self.assertEqual([r.json() for r in responses], [{"ok": True}] * 5)
+        auth.session.request.assert_called_once()
+        self.assertEqual(auth.session.request.call_args.kwargs["headers"], {"csrf": "token"})
+
+    def test_error_status_and_unknown_backend(self):
+        import asyncio
+        import requests
+        auth = self._auth(status=503, body=b"")
+
+        async def main():
+            async with AsyncAlexaClient(auth, backend="threads") as client:
+                return await client.post("https://alexa.amazon.fr/api/np/command", json={"type": "PlayCommand"})
+
+        response = asyncio.run(main())
+        with self.assertRaises(requests.HTTPError):
+            response.raise_for_status()
+        with self.assertRaises(ValueError):
+            AsyncAlexaClient(auth, backend="curl")
+
+
+class TestTokenBucket(unittest.TestCase):
+
+    def test_acquire_until_empty_then_refill(self):
+        bucket = TokenBucket(rate=100.0, capacity=2)
+        self.assertTrue(bucket.try_acquire())
+        self.assertTrue(bucket.try_acquire())
+        self.assertFalse(bucket.try_acquire())
+        self.assertTrue(bucket.acquire(timeout=1))
+
+    def test_throttle_halves_rate_and_recovers(self):
+        bucket = TokenBucket(rate=10.0, capacity=5, recovery_step=2.5)
+        bucket.on_throttled(retry_after=0.05)
+        self.assertEqual(bucket.rate, 5.0)
+        self.assertFalse(bucket.try_acquire())
+        self.assertEqual(bucket.get_stats()["throttled"], 1)
+        time.sleep(0.3)
+        self.assertTrue(bucket.try_acquire())
+        bucket.on_success()
+        bucket.on_success()
+        self.assertEqual(bucket.rate, 10.0)
+
+    def test_parse_retry_after(self):
+        self.assertEqual(parse_retry_after("5"), 5.0)
+        self.assertIsNone(parse_retry_after(None))
+        self.assertIsNone(parse_retry_after("bientôt"))
+        self.assertEqual(parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT"), 0.0)
+        self.assertIsNone(parse_retry_after("inf"))
+        self.assertIsNone(parse_retry_after("nan"))
+
+    def test_throttle_pause_is_capped(self):
+        bucket = TokenBucket(rate=10.0, capacity=5, max_pause=1.0)
+        bucket.on_throttled(retry_after=86400)
+        self.assertLessEqual(bucket.get_stats()["paused_for"], 1.0)
+
+
+class TestEndpointGuards(unittest.TestCase):
+
+    def test_endpoint_family(self):
+        base = "https://alexa.amazon.fr"
+        self.assertEqual(endpoint_family(f"{base}/api/namedLists/abc/items?x=1"), "namedLists")
+        self.assertEqual(endpoint_family(f"{base}/api/np/player"), "np")
+        self.assertEqual(endpoint_family(f"{base}/api/behaviors/preview"), "voice")
+        self.assertEqual(endpoint_family("https://www.amazon.fr/alexa-privacy/apd/rvh"), "alexa-privacy")
+        self.assertEqual(endpoint_family(base), "default")
+
+    def _session(self, guards, responses):
+        import requests
+
+        session = requests.Session()
+        session.mount("https://", GuardedHTTPAdapter(guards=guards))
+        fakes = []
+        for status, headers in responses:
+            fake = requests.Response()
+            fake.status_code = status
+            fake.headers.update(headers)
+            fakes.append(fake)
+        return session, fakes
+
+    def test_failing_family_does_not_open_other_circuits(self):
+        import requests
+        from core.circuit_breaker import CircuitBreakerError
+
+        guards = EndpointGuards(failure_threshold=2)
+        session, fakes = self._session(guards, [(503, {}), (503, {}), (200, {})])
+        with patch("requests.adapters.HTTPAdapter.send", side_effect=fakes):
+            self.assertEqual(session.get("https://alexa.amazon.fr/api/namedLists").status_code, 503)
+            session.get("https://alexa.amazon.fr/api/namedLists")
+            with self.assertRaises(CircuitBreakerError):
+                session.get("https://alexa.amazon.fr/api/namedLists")
+            # Vu aussi comme une erreur réseau par les managers (transition CIRCUIT_OPEN)
+            with self.assertRaises(requests.exceptions.RequestException):
+                session.get("https://alexa.amazon.fr/api/namedLists")
+            self.assertEqual(session.get("https://alexa.amazon.fr/api/np/player").status_code, 200)
+
+        stats = guards.get_stats()
+        self.assertEqual(stats["namedLists"]["breaker"]["state"], "OPEN")
+        self.assertEqual(stats["np"]["breaker"]["state"], "CLOSED")
+
+    def test_429_throttles_without_tripping_breaker(self):
+        guards = EndpointGuards(failure_threshold=1)
+        session, fakes = self._session(guards, [(429, {"Retry-After": "30"})])
+        with patch("requests.adapters.HTTPAdapter.send", side_effect=fakes):
+            session.get("https://alexa.amazon.fr/api/notifications")
+
+        stats = guards.get_stats()["notifications"]
+        self.assertEqual(stats["breaker"]["state"], "CLOSED")
+        self.assertEqual(stats["limiter"]["throttled"], 1)
+        self.assertGreater(stats["limiter"]["paused_for"], 25)
+        self.assertFalse(guards.bucket("notifications").try_acquire())
+
+    def test_throttled_wait_bounded_by_request_timeout(self):
+        from utils.http_guard import RateLimitTimeout
+
+        guards = EndpointGuards(max_retry_after=5)
+        session, fakes = self._session(guards, [(429, {"Retry-After": "86400"})])
+        with patch("requests.adapters.HTTPAdapter.send", side_effect=fakes):
+            session.get("https://alexa.amazon.fr/api/notifications")
+            self.assertLessEqual(guards.get_stats()["notifications"]["limiter"]["paused_for"], 5)
+
+            start = time.time()
+            with self.assertRaises(RateLimitTimeout):
+                session.get("https://alexa.amazon.fr/api/notifications", timeout=0.1)
+            self.assertLess(time.time() - start, 1)
+
+
+class TestDeviceIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.devices = [
+            {"serialNumber": "A", "accountName": "Echo Salon", "deviceType": "T1", "deviceFamily": "ECHO"},
+            {"serialNumber": "B", "accountName": "Echo Chambre", "deviceType": "T1", "deviceFamily": "ECHO"},
+            {"serialNumber": "C", "accountName": "Fire TV", "deviceType": "T2", "deviceFamily": "FIRE_TV"},
+        ]
+        self.index = DeviceIndex()
+        self.index.build_index(self.devices)
+
+    def test_lookups_return_device_records(self):
+        self.assertEqual(self.index.get_by_name("echo salon"), self.devices[0])
+        self.assertEqual(self.index.get_by_serial("C").account_name, "Fire TV")
+        self.assertEqual(self.index.search("chambre")[0].serial_number, "B")
+        self.assertEqual(len(self.index.get_by_family("ECHO")), 2)
+
+    def test_incremental_update(self):
+        renamed = dict(self.devices[1], accountName="Echo Bureau")
+        new = {"serialNumber": "D", "accountName": "Echo Cuisine", "deviceType": "T1", "deviceFamily": "ECHO"}
+
+        stats = self.index.update([self.devices[0], renamed, new])
+
+        self.assertEqual(stats, {"added": 1, "updated": 1, "removed": 1})
+        self.assertIsNone(self.index.get_by_name("Echo Chambre"))
+        self.assertEqual(self.index.get_by_name("echo bureau").serial_number, "B")
+        self.assertEqual(self.index.get_by_type("T2"), [])
+        self.assertEqual(self.index.count(), 3)
+        self.assertEqual(self.index.update([self.devices[0], renamed, new]), {"added": 0, "updated": 0, "removed": 0})
+
+    def test_duplicate_names_first_wins(self):
+        twin = {"serialNumber": "E", "accountName": "Echo Salon"}
+        self.index.update(self.devices + [twin])
+        self.assertEqual(self.index.get_by_name("Echo Salon").serial_number, "A")
+
+        self.index.update(self.devices[1:] + [twin])
+        self.assertEqual(self.index.get_by_name("Echo Salon").serial_number, "E")
+
+
+class TestDevice(unittest.TestCase):
+
+    def setUp(self):
+        self.data = {
+            "serialNumber": "G0911",
+            "accountName": "Écho Salon",
+            "deviceType": "A3S5BH2HU6VAYF",
+            "deviceFamily": "ECHO",
+            "online": True,
+            "parentClusters": ["G0000"],
+            "capabilities": ["VOLUME_SETTING"],
+        }
+
+    def test_reads_like_api_dict(self):
+        device = Device.from_dict(self.data)
+
+        self.assertEqual(device.account_name, "Écho Salon")
+        self.assertEqual(device["deviceType"], "A3S5BH2HU6VAYF")
+        self.assertEqual(device.get("capabilities"), ["VOLUME_SETTING"])
+        self.assertEqual(device.get("registrationId", "N/A"), "N/A")
+        self.assertEqual(device, self.data)
+        self.assertEqual(json.loads(json.dumps(device, default=dict)), self.data)
+
+    def test_missing_api_key_follows_mapping_contract(self):
+        device = Device.from_dict({"serialNumber": "A", "accountName": "Echo Salon", "online": False})
+
+        self.assertEqual(device.get("softwareVersion", "N/A"), "N/A")
+        self.assertNotIn("softwareVersion", device)
+        with self.assertRaises(KeyError):
+            device["deviceFamily"]
+        self.assertFalse(device["online"])
+        self.assertEqual(device.software_version, "")
+        self.assertEqual(set(device), set(device.keys()))
+        self.assertEqual(Device.from_row(device.to_row()).get("deviceType", "N/A"), "N/A")
+
+    def test_row_round_trip_keeps_payload_encoded(self):
+        row = json.loads(json.dumps(Device.from_dict(self.data).to_row()))
+        device = Device.from_row(row)
+
+        self.assertIsInstance(device._raw, str)
+        self.assertEqual(device.parent_clusters, ("G0000",))
+        self.assertEqual(device.raw, self.data)
+        self.assertEqual(Device.from_row(self.data), device)
+        self.assertFalse(hasattr(device, "__dict__"))
+
+
+class TestNameSearchIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.index = NameSearchIndex()
+        self.index.add("A", [("Écho Salon", 1.0), ("ECHO", 0.6)])
+        self.index.add("B", [("Echo Show Chambre", 1.0), ("KNIGHT", 0.6)])
+        self.index.add("C", [("Salon TV", 1.0), ("FIRE_TV", 0.6)])
+
+    def test_normalize_folds_accents(self):
+        self.assertEqual(normalize("  Écho-Salon  Été "), "echo salon ete")
+
+    def test_ranking(self):
+        self.assertEqual(self.index.search("echo salon")[0], ("A", 1.0))
+        self.assertEqual([key for key, _ in self.index.search("salon")], ["C", "A"])
+        self.assertEqual(self.index.search("ch")[0][0], "B")
+        self.assertEqual(self.index.search("ecxo shw")[0][0], "B")
+        self.assertEqual(self.index.search("zzz"), [])
+
+    def test_remove(self):
+        self.index.remove("A")
+        self.assertNotIn("A", self.index)
+        self.assertEqual([key for key, _ in self.index.search("salon")], ["C"])
+
+    def test_state_round_trip(self):
+        state = json.loads(json.dumps(self.index.get_state("v1")))
+        restored = NameSearchIndex()
+
+        self.assertFalse(restored.load_state(state, "v2"))
+        self.assertTrue(restored.load_state(state, "v1"))
+        self.assertEqual(restored.search("salon"), self.index.search("salon"))
+        restored.add("D", [("Cuisine", 1.0)])
+        self.assertEqual(restored.search("cuis")[0][0], "D")
+
+
+class TestSmartCache(unittest.TestCase):
+
+    def setUp(self):
+        self.cache_dir = Path("test_smart_cache")
+        self.cache = SmartCache(cache_dir=self.cache_dir, compressor="zlib")
+
+    def tearDown(self):
+        for item in self.cache_dir.iterdir():
+            item.unlink()
+        self.cache_dir.rmdir()
+
+    def test_persist_and_reload_other_format(self):
+        self.cache.set("devices_list", {"devices": [1, 2]}, tags=["devices"])
+        self.assertTrue((self.cache_dir / "devices_list.json.zz").exists())
+
+        other = SmartCache(cache_dir=self.cache_dir, compressor="gzip")
+        self.assertEqual(other.get("devices_list"), {"devices": [1, 2]})
+
+        self.assertTrue(other.invalidate("devices_list"))
+        remaining = [p.name for p in self.cache_dir.iterdir() if not p.name.endswith(".lock")]
+        self.assertEqual(remaining, [SmartCache.MANIFEST_NAME])
+
+    def test_index_persisted_across_instances(self):
+        self.cache.set("devices_echo", [1], tags=["devices", "echo"])
+        self.cache.set("devices_smart", [2], tags=["devices", "smart"])
+        self.cache.set("routines", [3], tags=["routines"])
+
+        # Nouveau processus : manifeste chargé seulement au premier besoin
+        other = SmartCache(cache_dir=self.cache_dir)
+        self.assertFalse(other._index_loaded)
+        self.assertEqual(other.invalidate_by_tag("devices"), 2)
+        self.assertIsNone(SmartCache(cache_dir=self.cache_dir).get("devices_echo"))
+        self.assertEqual(SmartCache(cache_dir=self.cache_dir).get("routines"), [3])
+
+    def test_invalidate_dependencies_reverse_index(self):
+        self.cache.set("devices_list", [1], tags=["devices"])
+        self.cache.set("device_1", {"id": 1}, dependencies=["devices_list"])
+        self.cache.set("device_1_state", {"on": True}, dependencies=["device_1"])
+        self.cache.set("unrelated", {})
+
+        other = SmartCache(cache_dir=self.cache_dir)
+        self.assertEqual(other.invalidate_dependencies("devices_list"), 1)
+        self.assertEqual(other.get("device_1_state"), {"on": True})
+
+        self.cache.set("device_1", {"id": 1}, dependencies=["devices_list"])
+        other = SmartCache(cache_dir=self.cache_dir)
+        self.assertEqual(other.invalidate_dependencies("devices_list", recursive=True), 2)
+        self.assertIsNone(other.get("device_1_state"))
+        self.assertEqual(other.get("unrelated"), {})
+
+    def test_retag_updates_index(self):
+        self.cache.set("key", 1, tags=["old"])
+        self.cache.set("key", 2, tags=["new"])
+        self.assertEqual(self.cache.invalidate_by_tag("old"), 0)
+        self.assertEqual(self.cache.invalidate_by_tag("new"), 1)
+
+    def test_clean_expired_across_instances(self):
+        self.cache.set("short", 1, ttl=1)
+        self.cache.set("long", 2, ttl=60)
+        time.sleep(1.1)
+
+        other = SmartCache(cache_dir=self.cache_dir)
+        self.assertEqual(other.get_stats()["expired_count"], 1)
+        self.assertEqual(other.clean_expired(), 1)
+        self.assertFalse(any(p.name.startswith("short") for p in self.cache_dir.iterdir()))
+        self.assertEqual(other.get("long"), 2)
+
+    def test_manifest_merges_concurrent_writers(self):
+        other = SmartCache(cache_dir=self.cache_dir)
+        self.cache.set("devices_echo", [1], tags=["devices"])
+        other.set("routines", [2], tags=["routines"])
+        other.set("devices_smart", [3], tags=["devices"])
+
+        # Aucune instance n'écrase les entrées de l'autre
+        manifest = json.loads((self.cache_dir / SmartCache.MANIFEST_NAME).read_text(encoding="utf-8"))
+        self.assertEqual(set(manifest), {"devices_echo", "routines", "devices_smart"})
+        self.cache.invalidate("routines")
+        self.assertEqual(self.cache.invalidate_by_tag("devices"), 2)
+        manifest = json.loads((self.cache_dir / SmartCache.MANIFEST_NAME).read_text(encoding="utf-8"))
+        self.assertEqual(manifest, {})
+
+    def test_batch_saves_manifest_once(self):
+        with patch("utils.smart_cache.os.replace", wraps=os.replace) as mock_replace:
+            with self.cache.batch():
+                for i in range(5):
+                    self.cache.set(f"device_{i}", i, tags=["devices"])
+                mock_replace.assert_not_called()
+        mock_replace.assert_called_once()
+        self.assertEqual(SmartCache(cache_dir=self.cache_dir).invalidate_by_tag("devices"), 5)
@@ -45,6 +45,7 @@ import contextlib  # noqa: E402
 
 # Import du logger utilitaire (doit être en haut pour Ruff E402)
 from utils.logger import SharedIcons, setup_loguru_logger  # noqa: E402
+from utils.serialization import ENTRY_SUFFIXES  # noqa: E402
 
 
 def ensure_utf8_console() -> None:
@@ -823,7 +824,9 @@ class InstallationManager:
         # Suppression des fichiers cache
         cache_dir = self.install_dir / "data" / "cache"
         if cache_dir.exists():
-            cache_files = list(cache_dir.glob("*.json")) + list(cache_dir.glob("*.json.gz"))
+            # Entrées dans tous les formats (codec/compresseur), journal metadata et verrous
+            patterns = [f"*{suffix}" for suffix in ENTRY_SUFFIXES] + [".metadata.journal", ".*.lock"]
+            cache_files = list(dict.fromkeys(path for pattern in patterns for path in cache_dir.glob(pattern)))
             if cache_files:
                 if LOGURU_AVAILABLE and logger:
                     logger.info(f"Suppression de {len(cache_files)} fichiers cache")
@@ -10,14 +10,21 @@ Date: 7 octobre 2025
 """
 
 import json
+import threading
+import time
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import TYPE_CHECKING, Any, Dict, Optional
+from urllib.parse import urlsplit
 
 import requests
 from loguru import logger
-from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
 
+from utils.http_guard import GuardedHTTPAdapter
+
+if TYPE_CHECKING:
+    from utils.http_session import OptimizedHTTPSession
+
 
 class AlexaAuth:
     """
@@ -42,6 +49,19 @@ class AlexaAuth:
         ...     devices = response.json()
     """
 
+    # Répertoire par défaut des fichiers de cookies
+    DEFAULT_DATA_DIR = Path(__file__).parent / "data"
+
+    # Fichier de suivi de validité de la session (horodatage de dernière vérification)
+    SESSION_STATE_FILE = "session-state.json"
+    # Données de compte lues via /api/bootstrap (persistées dans SESSION_STATE_FILE)
+    BOOTSTRAP_PATH = "/api/bootstrap?version=0"
+    # Endpoints de vérification de session : un 403 n'y vient que des cookies
+    # (ailleurs, il peut venir d'en-têtes manquants et n'invalide pas la session)
+    SESSION_CHECK_PATHS = ("/api/devices-v2/device", "/api/bootstrap")
+    # Durée de vie des cookies générés par alexa_auth/nodejs (cookie.txt : 30 jours)
+    COOKIE_LIFETIME_SECONDS = 30 * 24 * 3600
+
     # Annotations de classe pour les analyseurs statiques
     session: requests.Session
     amazon_domain: str
@@ -49,7 +69,14 @@ class AlexaAuth:
     refresh_token: Optional[str]
     cookies_loaded: bool
 
-    def __init__(self, data_dir: Optional[Path] = None, cache_service: Optional[Any] = None):
+    def __init__(
+        self,
+        data_dir: Optional[Path] = None,
+        cache_service: Optional[Any] = None,
+        http_session: Optional["OptimizedHTTPSession"] = None,
+        pool_connections: int = 10,
+        pool_maxsize: int = 20,
+    ):
         """
         Initialise le gestionnaire d'authentification.
 
@@ -57,19 +84,31 @@ class AlexaAuth:
             data_dir: Répertoire contenant les fichiers de cookies
                      (défaut: alexa_auth/data)
             cache_service: Service de cache optionnel (non utilisé pour l'auth)
+            http_session: Session partagée (pool, retries, cache HTTP par endpoint).
+                     Si None, une session dédiée est créée.
+            pool_connections: Nombre de pools d'hôtes gardés (session dédiée)
+            pool_maxsize: Connexions conservées par hôte (session dédiée)
         """
         if data_dir is None:
             # Chemin par défaut
-            self.data_dir = Path(__file__).parent / "data"
+            self.data_dir = self.DEFAULT_DATA_DIR
         else:
             self.data_dir = Path(data_dir)
 
         # Session HTTP et champs d'état
-        self.session = requests.Session()
+        # Tous les managers passent par auth.session : la partager réutilise les connexions
+        self.session = http_session.session if http_session is not None else requests.Session()
         self.amazon_domain = "amazon.fr"  # Défaut
         self.csrf = None
         self.refresh_token = None
         self.cookies_loaded = False
+        # Validité de la session : fichier de cookies chargé (mtime) et date d'expiration
+        self.cookie_mtime: Optional[float] = None
+        self.cookie_expires_at: Optional[float] = None
+        self._session_verified = False
+        # Bootstrap (customerId, locale, marketplace) des cookies chargés
+        self._bootstrap: Optional[Dict[str, Any]] = None
+        self._bootstrap_lock = threading.Lock()
         # Note: cache_service n'est plus utilisé pour l'authentification
         # Les données d'auth restent uniquement dans alexa_auth/data/
 
@@ -79,10 +118,31 @@ class AlexaAuth:
                 "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36",
                 "Accept": "application/json",
                 "Accept-Language": "fr-FR,fr;q=0.9",
+                "Accept-Encoding": "gzip, deflate",
             }
         )
 
-        # Résilience réseau: retries avec backoff (429/5xx)
+        # Résilience réseau: retries avec backoff (429/5xx), déjà configurés sur une session partagée
+        if http_session is None:
+            self._mount_adapter(pool_connections, pool_maxsize)
+
+        # Vérification paresseuse : chaque réponse API confirme ou invalide la session.
+        # Une session partagée n'a qu'un hook de suivi : celui de la dernière AlexaAuth créée
+        # (une ancienne instance, aux cookies périmés, ne doit plus écrire session-state.json)
+        hooks = self.session.hooks["response"]
+        hooks[:] = [hook for hook in hooks if getattr(hook, "__func__", None) is not AlexaAuth._track_session_validity]
+        hooks.append(self._track_session_validity)
+
+        logger.debug(f"AlexaAuth initialisé (data_dir={self.data_dir})")
+
+    def _mount_adapter(self, pool_connections: int, pool_maxsize: int) -> None:
+        """
+        Monte un GuardedHTTPAdapter (retries, pool, breaker et limiteur par famille) sur la session dédiée.
+
+        Args:
+            pool_connections: Nombre de pools d'hôtes gardés
+            pool_maxsize: Connexions conservées par hôte
+        """
         try:
             retry = Retry(
                 total=3,
@@ -93,14 +153,16 @@ class AlexaAuth:
                 allowed_methods=("HEAD", "GET", "OPTIONS", "POST", "PUT", "DELETE"),
                 raise_on_status=False,
             )
-            adapter = HTTPAdapter(max_retries=retry)
+            adapter = GuardedHTTPAdapter(
+                pool_connections=pool_connections,
+                pool_maxsize=pool_maxsize,
+                max_retries=retry,
+            )
             self.session.mount("https://", adapter)
             self.session.mount("http://", adapter)
         except Exception as e:  # pragma: no cover - environnement sans urllib3 Retry
             logger.debug(f"Configuration Retry ignorée: {e}")
 
-        logger.debug(f"AlexaAuth initialisé (data_dir={self.data_dir})")
-
     def load_cookies(self) -> bool:
         """
         Charge les cookies depuis les fichiers de données.
@@ -117,11 +179,14 @@ class AlexaAuth:
             ... else:
             ...     print("Pas de cookies valides")
         """
+        self._bootstrap = None
+
         # Essai 1: cookie-resultat.json (format complet)
         cookie_json = self.data_dir / "cookie-resultat.json"
         if cookie_json.exists() and self._load_from_json(cookie_json):
             logger.info("Cookies chargés depuis cookie-resultat.json")
             self.cookies_loaded = True
+            self.cookie_mtime = cookie_json.stat().st_mtime
             return True
 
         # Essai 2: cookie.txt (format Netscape)
@@ -129,6 +194,7 @@ class AlexaAuth:
         if cookie_txt.exists() and self._load_from_txt(cookie_txt):
             logger.info("Cookies chargés depuis cookie.txt")
             self.cookies_loaded = True
+            self.cookie_mtime = cookie_txt.stat().st_mtime
             return True
 
         logger.warning("Aucun fichier de cookies valide trouvé")
@@ -165,6 +231,11 @@ class AlexaAuth:
             amazon_page = donnees_completes.get("amazonPage", "amazon.fr")
             self.amazon_domain = amazon_page
 
+            # Expiration : date de génération (ms) + durée de vie des cookies
+            token_date = recapitulatif.get("tokenDate") or donnees_completes.get("tokenDate")
+            if token_date:
+                self.cookie_expires_at = token_date / 1000 + self.COOKIE_LIFETIME_SECONDS
+
             logger.debug(
                 f"Cookies JSON chargés: {len(self.session.cookies)} cookies, domain={self.amazon_domain}"
             )
@@ -203,6 +274,12 @@ class AlexaAuth:
 
                 domain, _, path, secure, expiration, name, value = parts
 
+                # Expiration de la session : celle du premier cookie à expirer
+                if expiration.isdigit() and int(expiration) > 0:
+                    expires_at = float(expiration)
+                    if self.cookie_expires_at is None or expires_at < self.cookie_expires_at:
+                        self.cookie_expires_at = expires_at
+
                 # Déterminer le domaine Amazon
                 if "amazon." in domain and not self.amazon_domain:
                     # Extraire amazon.XX du domain
@@ -377,6 +454,173 @@ class AlexaAuth:
         """
         return self.cookies_loaded and len(self.session.cookies) > 0
 
+    def session_known_good(self) -> bool:
+        """
+        Indique si la session a déjà été vérifiée pour les cookies chargés.
+
+        La session est considérée valide sans requête réseau si un appel API a
+        réussi depuis le dernier chargement du fichier de cookies et que ces
+        cookies ne sont pas expirés. Une réponse 401 (ou 403 de SESSION_CHECK_PATHS) l'invalide.
+
+        Returns:
+            True si la vérification réseau au démarrage peut être évitée
+        """
+        if not self.cookies_loaded or self.cookie_mtime is None:
+            return False
+        if self.cookie_expires_at is not None and time.time() >= self.cookie_expires_at:
+            return False
+
+        state = self._read_session_state()
+        if state.get("cookie_mtime") != self.cookie_mtime or "verified_at" not in state:
+            return False
+        self._session_verified = True
+        return True
+
+    def mark_session_verified(self) -> None:
+        """Enregistre qu'un appel API authentifié vient de réussir."""
+        if self._session_verified or self.cookie_mtime is None:
+            return
+        self._session_verified = True
+        self._update_session_state({"verified_at": time.time()})
+
+    def invalidate_session(self) -> None:
+        """
+        Oublie la dernière vérification : le prochain démarrage revérifiera la session.
+
+        Le bootstrap persisté, lié à la session, est oublié avec elle.
+        """
+        self._session_verified = False
+        self._bootstrap = None
+        state_file = self.data_dir / self.SESSION_STATE_FILE
+        try:
+            state_file.unlink()
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            logger.debug(f"Suppression {state_file.name} impossible: {e}")
+
+    def get_bootstrap(self, force_refresh: bool = False) -> Optional[Dict[str, Any]]:
+        """
+        Données de compte de /api/bootstrap (customerId, locale, marketplace).
+
+        La réponse est gardée en mémoire et dans le fichier de suivi de session,
+        lié aux cookies chargés : les commandes suivantes ne rappellent pas
+        l'API tant que les cookies ne changent pas et qu'aucune réponse 401 (ou 403 de vérification)
+        n'invalide la session.
+
+        Args:
+            force_refresh: Rappeler l'API même si un bootstrap est connu
+
+        Returns:
+            {"customerId", ...} ou None si les cookies ne sont pas chargés
+
+        Raises:
+            requests.RequestException: Si l'appel API échoue
+        """
+        if not self.cookies_loaded:
+            return None
+        with self._bootstrap_lock:
+            if not force_refresh:
+                if self._bootstrap is None:
+                    state = self._read_session_state()
+                    if state.get("cookie_mtime") == self.cookie_mtime and isinstance(state.get("bootstrap"), dict):
+                        self._bootstrap = state["bootstrap"]
+                        logger.debug("Bootstrap lu depuis le suivi de session")
+                if self._bootstrap is not None:
+                    return self._bootstrap
+
+            response = self.get(f"https://alexa.{self.amazon_domain}{self.BOOTSTRAP_PATH}", timeout=10)
+            response.raise_for_status()
+            bootstrap = self._parse_bootstrap(response.json())
+            if bootstrap.get("customerId"):
+                self._bootstrap = bootstrap
+                self._update_session_state({"bootstrap": bootstrap})
+            return bootstrap
+
+    @property
+    def customer_id(self) -> Optional[str]:
+        """Customer ID du compte (bootstrap), ou None s'il n'est pas disponible."""
+        try:
+            bootstrap = self.get_bootstrap()
+        except Exception as e:
+            logger.debug(f"Bootstrap indisponible: {e}")
+            return None
+        return bootstrap.get("customerId") if bootstrap else None
+
+    @staticmethod
+    def _parse_bootstrap(data: Dict[str, Any]) -> Dict[str, Any]:
+        """Extrait les champs utiles (sans email ni jetons) d'une réponse /api/bootstrap."""
+        authentication = data.get("authentication") or {}
+        fields = {
+            "customerId": authentication.get("customerId"),
+            "customerName": authentication.get("customerName"),
+            "locale": authentication.get("locale") or data.get("locale"),
+            "marketplace": authentication.get("marketPlaceId") or data.get("marketPlaceId"),
+        }
+        return {key: value for key, value in fields.items() if value}
+
+    def _track_session_validity(self, response: requests.Response, *args: Any, **kwargs: Any) -> None:
+        """Hook de réponse : 2xx confirme la session, 401 (ou 403 d'un SESSION_CHECK_PATHS) l'invalide."""
+        if not self.cookies_loaded:
+            return
+        if response.status_code == 403 and not self._is_session_check(response):
+            logger.debug(f"403 sur {urlsplit(response.url or '').path} : session conservée")
+            return
+        if response.status_code in (401, 403):
+            if self._session_verified or self.session_known_good():
+                logger.warning(
+                    f"🔒 Session refusée ({response.status_code}) - relancez 'alexa auth create' si cela persiste"
+                )
+            self.invalidate_session()
+        elif 200 <= response.status_code < 300 and not getattr(response, "from_cache", False):
+            self.mark_session_verified()
+
+    @classmethod
+    def _is_session_check(cls, response: requests.Response) -> bool:
+        """Indique si la réponse vient d'un endpoint de vérification de session."""
+        path = urlsplit(response.url or "").path
+        return path.startswith(cls.SESSION_CHECK_PATHS)
+
+    def _read_session_state(self) -> Dict[str, Any]:
+        """Lit le fichier de suivi de session (vide si absent ou illisible)."""
+        try:
+            with open(self.data_dir / self.SESSION_STATE_FILE, encoding="utf-8") as f:
+                state = json.load(f)
+            return state if isinstance(state, dict) else {}
+        except (OSError, ValueError):
+            return {}
+
+    def _update_session_state(self, values: Dict[str, Any]) -> None:
+        """Complète le suivi de session des cookies chargés (repart de zéro si les cookies ont changé)."""
+        state = self._read_session_state()
+        if state.get("cookie_mtime") != self.cookie_mtime:
+            state = {"cookie_mtime": self.cookie_mtime}
+        state.update(values)
+        self._write_session_state(state)
+
+    def _write_session_state(self, state: Dict[str, Any]) -> None:
+        """Écrit le fichier de suivi de session (best-effort)."""
+        try:
+            self.data_dir.mkdir(parents=True, exist_ok=True)
+            with open(self.data_dir / self.SESSION_STATE_FILE, "w", encoding="utf-8") as f:
+                json.dump(state, f)
+        except OSError as e:
+            logger.debug(f"Écriture {self.SESSION_STATE_FILE} impossible: {e}")
+
+    def close(self) -> None:
+        """
+        Détache l'authentification de sa session HTTP (hook de suivi et cookies).
+
+        À appeler avant de recréer une AlexaAuth sur la même session partagée. Les
+        cookies ne sont vidés que si cette instance est encore celle de la session.
+        """
+        hooks = self.session.hooks["response"]
+        if self._track_session_validity in hooks:
+            hooks[:] = [hook for hook in hooks if hook != self._track_session_validity]
+            self.session.cookies.clear()
+        self.cookies_loaded = False
+        self._bootstrap = None
+
     def get_cookie_info(self) -> Dict[str, Any]:
         """
         Récupère les informations sur les cookies chargés.
@@ -396,6 +640,7 @@ class AlexaAuth:
             "has_csrf": bool(self.csrf),
             "has_refresh_token": bool(self.refresh_token),
             "csrf_present": self.csrf is not None,
+            "expires_at": self.cookie_expires_at,
         }
 
     def __repr__(self) -> str:
@@ -15,6 +15,8 @@ from abc import ABC, abstractmethod
 from typing import TYPE_CHECKING, Any, Callable, Optional
 
 if TYPE_CHECKING:
+    from utils.device_index import Device
+
     from .types import ContextProtocol
 
 from loguru import logger
@@ -180,7 +182,12 @@ class BaseCommand(ABC):
 
     @property
     def breaker(self) -> Optional[Any]:
-        return self._context.breaker if self._context else None
+        # Un circuit par commande : les erreurs d'une fonctionnalité n'ouvrent pas celui des autres
+        if not self._context:
+            return None
+        if hasattr(self._context, "breaker_for"):
+            return self._context.breaker_for(self.__class__.__name__)
+        return self._context.breaker
 
     def require_context(self) -> "ContextProtocol":
         """Return the context cast to ContextProtocol or raise RuntimeError.
@@ -285,6 +292,20 @@ class BaseCommand(ABC):
         self.logger.info(message)
         print(f"\033[1;34mℹ️  {message}\033[0m", flush=True)
 
+    def find_device(self, device_name: str) -> Optional["Device"]:
+        """
+        Recherche un appareil par son nom exact (insensible à la casse) via l'index du DeviceManager.
+
+        Args:
+            device_name: Nom de l'appareil
+
+        Returns:
+            Enregistrement de l'appareil (lisible comme le dict API) ou None si non trouvé
+            (ou gestionnaire indisponible)
+        """
+        index = self.device_mgr.get_index() if self.device_mgr else None
+        return index.get_by_name(device_name) if index else None
+
     def get_device_serial(self, device_name: str) -> Optional[str]:
         """
         Récupère le serial d'un appareil depuis son nom.
@@ -300,10 +321,9 @@ class BaseCommand(ABC):
             return None
 
         try:
-            devices = self.device_mgr.get_devices()
-            for device in devices:
-                if device.get("accountName") == device_name:
-                    return device.get("serialNumber")
+            device = self.find_device(device_name)
+            if device:
+                return device.get("serialNumber")
 
             self.error(f"Appareil '{device_name}' non trouvé")
             return None
@@ -327,13 +347,12 @@ class BaseCommand(ABC):
             return None
 
         try:
-            devices = self.device_mgr.get_devices()
-            for device in devices:
-                if device.get("accountName") == device_name:
-                    serial = device.get("serialNumber")
-                    device_type = device.get("deviceType")
-                    if serial and device_type:
-                        return (serial, device_type)
+            device = self.find_device(device_name)
+            if device:
+                serial = device.get("serialNumber")
+                device_type = device.get("deviceType")
+                if serial and device_type:
+                    return (serial, device_type)
 
             self.error(f"Appareil '{device_name}' non trouvé")
             return None
@@ -0,0 +1,253 @@
+"""
+Exécution en lot de commandes CLI dans un seul processus.
+
+Chaque ligne est une commande ``alexa`` sans le nom du script, parsée par
+le CommandParser complet et exécutée avec un Context partagé : le
+démarrage, le chargement des cookies et le ping de session ne sont payés
+qu'une fois pour tout le lot.
+
+Format du fichier :
+    # commentaire
+    device volume set -d "Salon" --level 30
+    smarthome control --entity "Lumière salon" --operation off
+    dnd enable -d "Chambre"
+
+En mode parallèle, les commandes visant le même appareil ou la même
+entité (ou, sans cible, la même catégorie) restent exécutées dans l'ordre du fichier ;
+les groupes indépendants s'exécutent en même temps. Les sorties standard et
+d'erreur de chaque commande sont capturées par thread.
+
+Usage:
+    from cli.batch import BatchRunner
+
+    runner = BatchRunner(context, parser)
+    for result in runner.run(lines, parallel=4):
+        print(json.dumps(result))
+"""
+
+import io
+import shlex
+import sys
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import redirect_stderr, redirect_stdout
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from loguru import logger
+
+# Catégories refusées dans un lot (interactives ou pilotant le processus)
+EXCLUDED_CATEGORIES = {"auth", "batch", "daemon"}
+
+
+class _ThreadLocalStream(io.TextIOBase):
+    """Flux de sortie (stdout ou stderr) redirigé, par thread, vers le tampon de la commande en cours."""
+
+    def __init__(self, fallback: Any):
+        super().__init__()
+        self._fallback = fallback
+        self._local = threading.local()
+
+    def capture(self, buffer: Optional[io.StringIO]) -> None:
+        """Redirige (ou rétablit avec None) la sortie du thread courant."""
+        self._local.buffer = buffer
+
+    def _target(self) -> Any:
+        return getattr(self._local, "buffer", None) or self._fallback
+
+    def write(self, text: str) -> int:  # type: ignore[override]
+        return self._target().write(text)
+
+    def flush(self) -> None:
+        self._target().flush()
+
+    def isatty(self) -> bool:
+        return False
+
+
+class BatchCommandLine:
+    """Ligne du lot après parsing."""
+
+    def __init__(self, index: int, line: str, args: Any = None, error: Optional[str] = None):
+        self.index = index
+        self.line = line
+        self.args = args
+        self.error = error
+
+    @property
+    def group(self) -> Tuple[str, str]:
+        """Clé d'ordonnancement : appareil ou entité visé, sinon catégorie."""
+        for target in ("device", "entity"):
+            value = getattr(self.args, target, None)
+            if isinstance(value, str) and value:
+                return (target, value.lower())
+        return ("category", str(getattr(self.args, "category", "")))
+
+
+class BatchRunner:
+    """
+    Exécute une liste de commandes CLI avec un Context partagé.
+
+    Example:
+        >>> runner = BatchRunner(context, parser)
+        >>> results = list(runner.run(["device list", "dnd status -d Salon"]))
+        >>> results[0]["ok"]
+        True
+    """
+
+    def __init__(self, context: Any, parser: Any):
+        """
+        Initialise le lot.
+
+        Args:
+            context: Contexte partagé par toutes les commandes
+            parser: CommandParser avec les catégories enregistrées
+        """
+        self.context = context
+        self.parser = parser
+        self._failed = threading.Event()
+
+    def parse(self, lines: Iterable[str]) -> List[BatchCommandLine]:
+        """
+        Parse les lignes du lot (lignes vides et commentaires ignorés).
+
+        Args:
+            lines: Lignes de commande sans le nom du script
+
+        Returns:
+            Commandes numérotées par leur ligne d'origine ; les erreurs de
+            syntaxe sont conservées dans BatchCommandLine.error
+        """
+        commands: List[BatchCommandLine] = []
+        for number, raw in enumerate(lines, start=1):
+            line = raw.strip()
+            if not line or line.startswith("#"):
+                continue
+            try:
+                argv = shlex.split(line)
+            except ValueError as e:
+                commands.append(BatchCommandLine(number, line, error=str(e)))
+                continue
+            if argv[0] in EXCLUDED_CATEGORIES:
+                commands.append(BatchCommandLine(number, line, error=f"catégorie '{argv[0]}' interdite en lot"))
+                continue
+
+            stderr = io.StringIO()
+            try:
+                with redirect_stderr(stderr):
+                    args = self.parser.parse_args(argv)
+            except SystemExit:
+                # Garder la ligne "error:" d'argparse plutôt que l'aide qui la suit
+                messages = [text.strip() for text in stderr.getvalue().splitlines() if text.strip()]
+                error = next((text for text in messages if "error:" in text), messages[0] if messages else None)
+                commands.append(BatchCommandLine(number, line, error=error or "syntaxe invalide"))
+                continue
+            commands.append(BatchCommandLine(number, line, args=args))
+        return commands
+
+    def run(self, lines: Iterable[str], parallel: int = 1, stop_on_error: bool = False) -> Iterator[Dict[str, Any]]:
+        """
+        Exécute le lot et produit un résultat par commande, dans l'ordre du fichier.
+
+        Args:
+            lines: Lignes de commande
+            parallel: Nombre de groupes exécutés simultanément (1 = séquentiel)
+            stop_on_error: Ne plus lancer de commande après le premier échec
+
+        Yields:
+            {"line", "command", "ok", "exit_code", "stdout", "stderr", "duration_ms"} (+ "error", "skipped")
+        """
+        commands = self.parse(lines)
+        self._failed.clear()
+
+        if parallel <= 1:
+            for command in commands:
+                yield self._execute(command, stop_on_error)
+            return
+
+        groups: Dict[Tuple[str, str], List[BatchCommandLine]] = {}
+        for command in commands:
+            groups.setdefault(command.group, []).append(command)
+
+        # Charger le DeviceManager avant les threads (partagé par la résolution des noms)
+        if self.context is not None and getattr(self.context, "auth", None):
+            _ = self.context.device_mgr
+
+        results: Dict[int, Future] = {}
+        stdout, stderr = sys.stdout, sys.stderr
+        streams = (_ThreadLocalStream(stdout), _ThreadLocalStream(stderr))
+        sys.stdout, sys.stderr = streams
+        try:
+            with ThreadPoolExecutor(max_workers=parallel, thread_name_prefix="alexa-batch") as executor:
+                for group in groups.values():
+                    future = executor.submit(self._execute_group, group, streams, stop_on_error)
+                    for command in group:
+                        results[command.index] = future
+                for command in commands:
+                    yield results[command.index].result()[command.index]
+        finally:
+            sys.stdout, sys.stderr = stdout, stderr
+
+    def _execute_group(
+        self,
+        group: List[BatchCommandLine],
+        streams: Tuple[_ThreadLocalStream, _ThreadLocalStream],
+        stop_on_error: bool,
+    ) -> Dict[int, Dict[str, Any]]:
+        """Exécute dans l'ordre les commandes d'un groupe (thread du pool)."""
+        return {command.index: self._execute(command, stop_on_error, streams) for command in group}
+
+    def _execute(
+        self,
+        command: BatchCommandLine,
+        stop_on_error: bool,
+        streams: Optional[Tuple[_ThreadLocalStream, _ThreadLocalStream]] = None,
+    ) -> Dict[str, Any]:
+        """Exécute une commande et retourne son résultat sérialisable."""
+        result: Dict[str, Any] = {"line": command.index, "command": command.line}
+        if command.error is not None:
+            self._failed.set()
+            result.update(ok=False, exit_code=2, stdout="", stderr="", duration_ms=0.0, error=command.error)
+            return result
+        if stop_on_error and self._failed.is_set():
+            result.update(ok=False, exit_code=None, stdout="", stderr="", duration_ms=0.0, skipped=True)
+            return result
+
+        out_buffer, err_buffer = io.StringIO(), io.StringIO()
+        start = time.perf_counter()
+        ok = False
+        try:
+            if streams is not None:
+                streams[0].capture(out_buffer)
+                streams[1].capture(err_buffer)
+                ok = self._dispatch(command.args)
+            else:
+                with redirect_stdout(out_buffer), redirect_stderr(err_buffer):
+                    ok = self._dispatch(command.args)
+        except SystemExit as e:
+            ok = e.code in (0, None)
+        except Exception as e:
+            logger.exception(f"Erreur non gérée pour: {command.line}")
+            result["error"] = str(e)
+        finally:
+            if streams is not None:
+                streams[0].capture(None)
+                streams[1].capture(None)
+
+        if not ok:
+            self._failed.set()
+        result.update(
+            ok=ok,
+            exit_code=0 if ok else 1,
+            stdout=out_buffer.getvalue(),
+            stderr=err_buffer.getvalue(),
+            duration_ms=round((time.perf_counter() - start) * 1000, 1),
+        )
+        return result
+
+    def _dispatch(self, args: Any) -> bool:
+        """Instancie et exécute la commande de la catégorie."""
+        command_class = self.parser.get_command_class(args.category)
+        if not command_class:
+            raise ValueError(f"Catégorie '{args.category}' non reconnue")
+        return bool(command_class(self.context).execute(args))
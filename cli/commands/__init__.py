@@ -22,32 +22,56 @@ Catégories disponibles:
     - routine: Routines
     - multiroom: Groupes multi-pièces
 
+Les modules de commandes sont importés à la première utilisation (PEP 562) :
+``from cli.commands import DeviceCommand`` n'importe que cli.commands.device.
+
 Auteur: M@nu
 Date: 7 octobre 2025
 """
 
-from cli.commands.activity import ActivityCommand
-from cli.commands.alarm import AlarmCommand
-from cli.commands.announcement import AnnouncementCommand
-from cli.commands.auth import AuthCommand
-from cli.commands.cache import CacheCommand
-from cli.commands.calendar import CalendarCommand
-from cli.commands.device import DeviceCommand
-from cli.commands.dnd import DNDCommand
-from cli.commands.lists import ListsCommand
-from cli.commands.multiroom import MultiroomCommand
-from cli.commands.music import MusicCommand
-from cli.commands.reminder import ReminderCommand
-from cli.commands.routine import RoutineCommand
-from cli.commands.smarthome import SmartHomeCommand
-from cli.commands.timers import TimerCommand
+import importlib
+from typing import Any, Dict
+
+# Nom de classe -> module qui la définit
+_COMMAND_MODULES: Dict[str, str] = {
+    "ActivityCommand": "cli.commands.activity",
+    "AlarmCommand": "cli.commands.alarm",
+    "AnnouncementCommand": "cli.commands.announcement",
+    "AuthCommand": "cli.commands.auth",
+    "BatchCommand": "cli.commands.batch",
+    "CacheCommand": "cli.commands.cache",
+    "CalendarCommand": "cli.commands.calendar",
+    "DaemonCommand": "cli.commands.daemon",
+    "DeviceCommand": "cli.commands.device",
+    "DNDCommand": "cli.commands.dnd",
+    "ListsCommand": "cli.commands.lists",
+    "MultiroomCommand": "cli.commands.multiroom",
+    "MusicCommand": "cli.commands.music",
+    "ReminderCommand": "cli.commands.reminder",
+    "RoutineCommand": "cli.commands.routine",
+    "SmartHomeCommand": "cli.commands.smarthome",
+    "TimerCommand": "cli.commands.timers",
+}
+
+
+def __getattr__(name: str) -> Any:
+    """Importe le module d'une commande au premier accès à sa classe."""
+    module_name = _COMMAND_MODULES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    command_class = getattr(importlib.import_module(module_name), name)
+    globals()[name] = command_class
+    return command_class
+
 
 __all__ = [
     "ActivityCommand",
     "AlarmCommand",
     "AuthCommand",
+    "BatchCommand",
     "CacheCommand",
     "CalendarCommand",
+    "DaemonCommand",
     "DeviceCommand",
     "DNDCommand",
     "ListsCommand",
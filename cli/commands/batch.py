@@ -0,0 +1,96 @@
+"""Commande d'exécution en lot (plusieurs commandes, un seul processus)."""
+
+import json
+import sys
+from argparse import ArgumentParser, Namespace
+from pathlib import Path
+from typing import List, Optional
+
+from cli.base_command import BaseCommand
+from cli.batch import EXCLUDED_CATEGORIES, BatchRunner
+from cli.command_parser import CommandParser, UniversalHelpFormatter, create_parser
+from cli.context import Context
+from cli.help_texts.batch_help import BATCH_DESCRIPTION
+from utils.lazy_loader import get_command_loader
+
+
+class BatchCommand(BaseCommand):
+    """Commande batch : exécute un fichier de commandes avec un contexte partagé (JSON lines)."""
+
+    def __init__(self, context: Context):
+        super().__init__(context)
+        self.category = "batch"
+
+    def setup_parser(self, parser: ArgumentParser) -> None:
+        """Configure le parser pour batch."""
+        parser.formatter_class = UniversalHelpFormatter
+        parser.description = BATCH_DESCRIPTION
+
+        parser.add_argument(
+            "-f",
+            "--file",
+            type=str,
+            metavar="FICHIER",
+            help="Fichier de commandes (défaut: entrée standard)",
+        )
+        parser.add_argument(
+            "-p",
+            "--parallel",
+            type=int,
+            default=1,
+            metavar="N",
+            help="Groupes indépendants exécutés en parallèle (défaut: 1)",
+        )
+        parser.add_argument(
+            "-o",
+            "--output",
+            type=str,
+            metavar="FICHIER",
+            help="Écrire les résultats JSON lines dans un fichier",
+        )
+        parser.add_argument(
+            "--stop-on-error",
+            action="store_true",
+            help="Ne plus lancer de commande après le premier échec",
+        )
+
+    def execute(self, args: Namespace) -> bool:
+        """Exécute le lot ; retourne True si toutes les commandes ont réussi."""
+        try:
+            lines = self._read_lines(getattr(args, "file", None))
+        except OSError as e:
+            self.error(f"Lecture du lot impossible: {e}")
+            return False
+
+        runner = BatchRunner(self._context, self._build_parser())
+        output = getattr(args, "output", None)
+        stream = open(output, "w", encoding="utf-8") if output else sys.stdout
+        all_ok = True
+        try:
+            for result in runner.run(
+                lines,
+                parallel=max(1, getattr(args, "parallel", 1) or 1),
+                stop_on_error=getattr(args, "stop_on_error", False),
+            ):
+                all_ok = all_ok and result["ok"]
+                stream.write(json.dumps(result, ensure_ascii=False) + "\n")
+                stream.flush()
+        finally:
+            if output:
+                stream.close()
+        return all_ok
+
+    def _read_lines(self, file: Optional[str] = None) -> List[str]:
+        """Lignes du lot depuis un fichier ou l'entrée standard."""
+        if file and file != "-":
+            return Path(file).read_text(encoding="utf-8").splitlines()
+        return sys.stdin.read().splitlines()
+
+    def _build_parser(self) -> CommandParser:
+        """Parser complet, sans les catégories interdites en lot."""
+        parser = create_parser()
+        loader = get_command_loader()
+        loader.register_commands(
+            parser, [name for name in loader.get_available_commands() if name not in EXCLUDED_CATEGORIES]
+        )
+        return parser
@@ -2,7 +2,6 @@
 
 import json
 from argparse import ArgumentParser, Namespace
-from pathlib import Path
 
 from loguru import logger
 
@@ -146,11 +145,9 @@ class CacheCommand(BaseCommand):
                     print(key_part + time_part)
 
             # Statistiques de synchronisation si disponibles
-            sync_stats_file = Path("data/cache/sync_stats.json")
-            if sync_stats_file.exists():
+            sync_stats = cache_service.get("sync_stats", ignore_ttl=True)
+            if sync_stats:
                 try:
-                    with open(sync_stats_file) as f:
-                        sync_stats = json.load(f)
                     print("\n� Statistiques synchronisation:\n")
                     print(f"  Dernière sync: {sync_stats.get('timestamp', 'N/A')}")
                     print(f"  Durée: {sync_stats.get('duration_seconds', 0):.2f}s")
@@ -198,6 +195,11 @@ class CacheCommand(BaseCommand):
             print("\n✅ Synchronisation terminée")
             if result and "duration_seconds" in result:
                 print(f"   Durée: {result.get('duration_seconds', 0):.2f}s")
+            preload = result.get("preload") if result else None
+            if preload:
+                print(f"   Durée préchargement: {preload.get('duration_seconds', 0):.2f}s")
+                for name, latency in preload.get("latency_ms", {}).items():
+                    print(f"   {name:22} {latency:>8.1f} ms")
 
         except Exception as e:
             logger.error(f"Erreur refresh: {e}")
@@ -240,6 +242,10 @@ class CacheCommand(BaseCommand):
             # Afficher le JSON formaté
             print(json.dumps(data, indent=2, ensure_ascii=False))
 
+            # Copie JSON lisible écrite à la demande (non produite par set en mode haut débit)
+            if cache_service.save_json_copy:
+                cache_service.write_json_copy(category)
+
         except Exception as e:
             logger.error(f"Erreur show: {e}")
             print(f"\n❌ Erreur: {e}")
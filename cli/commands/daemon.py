@@ -0,0 +1,162 @@
+"""Commande de gestion du démon local (contexte CLI persistant)."""
+
+import subprocess
+import sys
+import time
+from argparse import ArgumentParser, Namespace
+from pathlib import Path
+
+from loguru import logger
+
+from cli.base_command import BaseCommand
+from cli.command_parser import ActionHelpFormatter, UniversalHelpFormatter
+from cli.context import Context
+from cli.help_texts.daemon_help import DAEMON_DESCRIPTION, START_HELP, STATUS_HELP, STOP_HELP
+from utils.daemon_ipc import DaemonError, is_supported, request, socket_path
+
+# Script d'entrée relancé en arrière-plan par `daemon start`
+ALEXA_SCRIPT = Path(__file__).resolve().parents[2] / "alexa"
+START_TIMEOUT = 15.0
+
+
+class DaemonCommand(BaseCommand):
+    """Commande daemon : démarrage, arrêt et état du démon local (start, stop, status)."""
+
+    def __init__(self, context: Context):
+        super().__init__(context)
+        self.category = "daemon"
+
+    def setup_parser(self, parser: ArgumentParser) -> None:
+        """Configure le parser pour daemon."""
+        parser.formatter_class = UniversalHelpFormatter
+        parser.description = DAEMON_DESCRIPTION
+
+        subparsers = parser.add_subparsers(dest="action", help="Actions du démon", required=True)
+
+        start_parser = subparsers.add_parser(
+            "start",
+            help="Démarrer le démon",
+            description=START_HELP,
+            formatter_class=ActionHelpFormatter,
+            add_help=False,
+        )
+        start_parser.add_argument(
+            "--foreground",
+            action="store_true",
+            help="Rester au premier plan (logs dans le terminal)",
+        )
+
+        subparsers.add_parser(
+            "status",
+            help="État du démon",
+            description=STATUS_HELP,
+            formatter_class=ActionHelpFormatter,
+            add_help=False,
+        )
+
+        subparsers.add_parser(
+            "stop",
+            help="Arrêter le démon",
+            description=STOP_HELP,
+            formatter_class=ActionHelpFormatter,
+            add_help=False,
+        )
+
+    def execute(self, args: Namespace) -> bool:
+        """Exécute daemon start/status/stop."""
+        if not is_supported():
+            print("\n❌ Mode démon indisponible : sockets Unix non supportés sur cette plateforme")
+            return False
+
+        if args.action == "start":
+            return self._start(foreground=getattr(args, "foreground", False))
+        if args.action == "status":
+            return self._status()
+        if args.action == "stop":
+            return self._stop()
+        return False
+
+    def _ping(self):
+        """État du démon, ou None s'il ne répond pas."""
+        try:
+            return request({"op": "ping"}, timeout=5)
+        except DaemonError:
+            return None
+
+    def _start(self, foreground: bool) -> bool:
+        """Démarre le démon (au premier plan ou détaché)."""
+        status = self._ping()
+        if status:
+            print(f"\nℹ️  Démon déjà actif (pid {status['pid']})")
+            return True
+
+        if foreground:
+            from cli.daemon import AlexaDaemon
+
+            try:
+                AlexaDaemon(context=self._context).serve_forever()
+            except RuntimeError as e:
+                logger.error(str(e))
+                print(f"\n❌ {e}")
+                return False
+            return True
+
+        log_file = Path("logs") / "alexa_daemon.log"
+        log_file.parent.mkdir(parents=True, exist_ok=True)
+        with open(log_file, "ab") as log:
+            process = subprocess.Popen(
+                [sys.executable, str(ALEXA_SCRIPT), "daemon", "start", "--foreground"],
+                stdin=subprocess.DEVNULL,
+                stdout=log,
+                stderr=log,
+                start_new_session=True,
+            )
+
+        deadline = time.monotonic() + START_TIMEOUT
+        while time.monotonic() < deadline:
+            status = self._ping()
+            if status:
+                print(f"\n✅ Démon démarré (pid {status['pid']}, socket {socket_path()})")
+                return True
+            if process.poll() is not None:
+                break
+            time.sleep(0.1)
+
+        logger.error(f"Le démon n'a pas démarré (voir {log_file})")
+        print(f"\n❌ Le démon n'a pas démarré (voir {log_file})")
+        return False
+
+    def _status(self) -> bool:
+        """Affiche l'état du démon et de ses circuits par famille d'endpoints."""
+        status = self._ping()
+        if not status:
+            print("\n⚪ Démon arrêté")
+            return False
+
+        print(f"\n🟢 Démon actif (pid {status['pid']})\n")
+        print(f"  Socket: {socket_path()}")
+        print(f"  Uptime: {status['uptime']:.0f}s")
+        print(f"  Commandes servies: {status['requests']}")
+        print(f"  Authentifié: {'Oui' if status['authenticated'] else 'Non'}")
+
+        endpoints = status.get("endpoints") or {}
+        if endpoints:
+            print("\n🛡️  Familles d'endpoints:\n")
+            for family, stats in endpoints.items():
+                breaker = stats.get("breaker") or {}
+                limiter = stats.get("limiter") or {}
+                line = f"  {family:24} {breaker.get('state', '-'):10}"
+                if limiter:
+                    line += f"  jetons {limiter['fill']:.0%}  {limiter['rate']:.1f} req/s"
+                print(line)
+        return True
+
+    def _stop(self) -> bool:
+        """Demande l'arrêt du démon."""
+        try:
+            request({"op": "shutdown"}, timeout=5)
+        except DaemonError:
+            print("\n⚪ Démon déjà arrêté")
+            return True
+        print("\n✅ Démon arrêté")
+        return True
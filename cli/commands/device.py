@@ -4,6 +4,7 @@ Commandes de gestion des appareils Alexa.
 Ce module gère toutes les opérations liées aux appareils:
 - list: Lister tous les appareils
 - info: Informations détaillées sur un appareil
+- snapshot: État de tous les appareils (lecture, volume, DND) en JSON
 
 Auteur: M@nu
 Date: 7 octobre 2025
@@ -19,6 +20,7 @@ from cli.help_texts.device_help import (
     DEVICE_DESCRIPTION,
     INFO_HELP,
     LIST_HELP,
+    SNAPSHOT_HELP,
     VOLUME_HELP,
 )
 from data.device_family_mapping import get_device_display_name
@@ -33,6 +35,7 @@ class DeviceCommand(BaseCommand):
     Actions:
         - list: Lister tous les appareils Alexa
         - info: Informations sur un appareil spécifique
+        - snapshot: Instantané JSON de l'état de tous les appareils
 
     Example:
         >>> python alexa.py device list
@@ -106,6 +109,25 @@ class DeviceCommand(BaseCommand):
             "--json", action="store_true", help="Afficher les données au format JSON"
         )
 
+        # Action: snapshot
+        snapshot_parser = subparsers.add_parser(
+            "snapshot",
+            help="État de tous les appareils (JSON)",
+            description=SNAPSHOT_HELP,
+            formatter_class=ActionHelpFormatter,
+            add_help=False,
+        )
+        snapshot_parser.add_argument(
+            "--concurrency",
+            type=int,
+            default=10,
+            metavar="N",
+            help="Nombre d'appareils interrogés simultanément (défaut: 10)",
+        )
+        snapshot_parser.add_argument(
+            "--online-only", action="store_true", help="Exclure les appareils hors ligne"
+        )
+
         # Action: volume
         volume_parser = subparsers.add_parser(
             "volume",
@@ -176,6 +198,8 @@ class DeviceCommand(BaseCommand):
             return self._list_devices(args)
         elif args.action == "info":
             return self._device_info(args)
+        elif args.action == "snapshot":
+            return self._snapshot(args)
         elif args.action == "volume":
             return self._manage_volume(args)
         else:
@@ -234,7 +258,7 @@ class DeviceCommand(BaseCommand):
 
             # Affichage
             if hasattr(args, "json_output") and args.json_output:
-                print(json.dumps(devices, indent=2, ensure_ascii=False))
+                print(json.dumps(devices, indent=2, ensure_ascii=False, default=dict))
             else:
                 self._display_devices_table(devices)
 
@@ -285,19 +309,15 @@ class DeviceCommand(BaseCommand):
                 self.error("Gestionnaire d'appareils non disponible")
                 return False
 
-            # Récupérer tous les appareils
-            devices = self.call_with_breaker(self.device_mgr.get_devices)
+            # Index de la liste des appareils (récupérée si nécessaire)
+            index = self.call_with_breaker(self.device_mgr.get_index)
 
-            if devices is None:
+            if index is None:
                 self.error("Impossible de récupérer la liste des appareils")
                 return False
 
             # Trouver l'appareil
-            device = None
-            for d in devices:
-                if d.get("accountName") == args.device:
-                    device = d
-                    break
+            device = index.get_by_name(args.device)
 
             if not device:
                 self.error(f"Appareil '{args.device}' non trouvé")
@@ -305,7 +325,7 @@ class DeviceCommand(BaseCommand):
 
             # Affichage
             if hasattr(args, "json_output") and args.json_output:
-                print(json.dumps(device, indent=2, ensure_ascii=False))
+                print(json.dumps(device, indent=2, ensure_ascii=False, default=dict))
             else:
                 self._display_device_info(device)
 
@@ -351,6 +371,33 @@ class DeviceCommand(BaseCommand):
         if "registrationId" in device:
             print(f"  Registration ID:    {device['registrationId']}")
 
+    def _snapshot(self, args: argparse.Namespace) -> bool:
+        """
+        Affiche l'état de tous les appareils sous forme d'un document JSON unique.
+
+        Args:
+            args: Arguments (concurrency, online_only)
+
+        Returns:
+            True si succès
+        """
+        try:
+            ctx = self.require_context()
+            if not ctx.fleet_status:
+                self.error("Service d'instantané non disponible")
+                return False
+
+            document = ctx.fleet_status.snapshot(
+                max_concurrency=max(1, args.concurrency), online_only=args.online_only
+            )
+            print(json.dumps(document, indent=2, ensure_ascii=False))
+            return True
+
+        except Exception as e:
+            self.logger.exception("Erreur lors de l'instantané des appareils")
+            self.error(f"Erreur: {e}")
+            return False
+
     def _manage_volume(self, args: argparse.Namespace) -> bool:
         """
         Gère les commandes de volume pour un appareil.
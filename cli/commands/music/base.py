@@ -9,6 +9,8 @@ from typing import Any, Callable, Optional, Tuple
 
 from loguru import logger
 
+from utils.device_index import Device, DeviceIndex
+
 
 class MusicSubCommand:
     """
@@ -23,26 +25,37 @@ class MusicSubCommand:
         self.context = None
         self.logger = logger
 
-    def get_device_serial(self, device_name: str) -> Optional[str]:
+    def find_device(self, device_name: str) -> Optional[Device]:
         """
-        Récupère le serial d'un appareil par son nom.
+        Recherche un appareil par son nom exact (insensible à la casse) via l'index du DeviceManager.
 
         Args:
             device_name: Nom de l'appareil
 
         Returns:
-            Serial de l'appareil ou None
+            Enregistrement de l'appareil (lisible comme le dict API) ou None
         """
+        index = self._device_index()
+        return index.get_by_name(device_name) if index else None
+
+    def _device_index(self) -> Optional[DeviceIndex]:
+        """Index des appareils du DeviceManager du contexte (None si indisponible)."""
         ctx = getattr(self, "context", None)
-        if ctx is None or getattr(ctx, "device_mgr", None) is None:
-            return None
+        device_mgr = getattr(ctx, "device_mgr", None) if ctx is not None else None
+        return device_mgr.get_index() if device_mgr is not None else None
+
+    def get_device_serial(self, device_name: str) -> Optional[str]:
+        """
+        Récupère le serial d'un appareil par son nom.
 
-        devices = ctx.device_mgr.get_devices()
-        for device in devices:
-            if device.get("accountName") == device_name:
-                return device.get("serialNumber")
+        Args:
+            device_name: Nom de l'appareil
 
-        return None
+        Returns:
+            Serial de l'appareil ou None
+        """
+        device = self.find_device(device_name)
+        return device.get("serialNumber") if device else None
 
     def error(self, message: str):
         """Affiche un message d'erreur."""
@@ -72,6 +85,8 @@ class MusicSubCommand:
         BaseCommand mais qui ont néanmoins accès au `context`.
         """
         ctx = getattr(self, "context", None)
+        if ctx and hasattr(ctx, "breaker_for"):
+            return ctx.breaker_for("music").call(func, *args, **kwargs)
         if ctx and getattr(ctx, "breaker", None):
             return ctx.breaker.call(func, *args, **kwargs)
         return func(*args, **kwargs)
@@ -95,16 +110,8 @@ class MusicSubCommand:
 
     def _get_device_type(self, device_name: str) -> str:
         """Récupère le type d'appareil."""
-        ctx = getattr(self, "context", None)
-        if ctx is None or getattr(ctx, "device_mgr", None) is None:
-            return "ECHO"
-
-        devices = ctx.device_mgr.get_devices()
-        for device in devices:
-            if device.get("accountName") == device_name:
-                return device.get("deviceType", "ECHO")
-
-        return "ECHO"
+        device = self.find_device(device_name)
+        return device.get("deviceType", "ECHO") if device else "ECHO"
 
     def _get_parent_multiroom(self, device_name: str) -> Tuple[Optional[str], Optional[str]]:
         """
@@ -116,23 +123,18 @@ class MusicSubCommand:
         Returns:
             Tuple (parent_id, parent_type) ou (None, None)
         """
-        ctx = getattr(self, "context", None)
-        if ctx is None or getattr(ctx, "device_mgr", None) is None:
+        device = self.find_device(device_name)
+        clusters = device.get("parentClusters", []) if device else []
+        if not clusters:
             return (None, None)
 
-        devices = ctx.device_mgr.get_devices()
-        for device in devices:
-            if device.get("accountName") == device_name:
-                clusters = device.get("parentClusters", [])
-                if clusters:
-                    parent_id = clusters[0]
-                    # Trouver le type du parent
-                    for parent_dev in devices:
-                        if parent_dev.get("serialNumber") == parent_id:
-                            return (parent_id, parent_dev.get("deviceType"))
-                break
-
-        return (None, None)
+        # Trouver le type du parent
+        parent_id = clusters[0]
+        index = self._device_index()
+        parent = index.get_by_serial(parent_id) if index else None
+        if parent is None:
+            return (None, None)
+        return (parent_id, parent.device_type)
 
     def get_media_owner_id(self) -> str:
         """Récupère le media owner customer ID."""
@@ -51,16 +51,20 @@ class StatusCommands(MusicSubCommand):
         status_parser.add_argument(
             "--complete",
             action="store_true",
-            help="Afficher l'état complet avec détails qualité audio",
+            help="Afficher l'état complet avec détails qualité audio et file d'attente",
         )
 
     def queue(self, args: argparse.Namespace) -> bool:
-        """Afficher la file d'attente (identique à status)."""
-        # Queue et status utilisent la même logique
-        return self.status(args)
+        """Afficher la file d'attente (état complet, comme status --complete)."""
+        return self._show_state(args, include_queue=True)
 
     def status(self, args: argparse.Namespace) -> bool:
         """Afficher l'état actuel de la lecture (comme le script shell -q)."""
+        # Mode léger par défaut : la file d'attente n'est récupérée qu'avec --complete
+        return self._show_state(args, include_queue=bool(getattr(args, "complete", False)))
+
+    def _show_state(self, args: argparse.Namespace, include_queue: bool) -> bool:
+        """Récupère et affiche l'état de la lecture."""
         try:
             device_info = self.get_device_info(args.device)
             if not device_info:
@@ -78,12 +82,13 @@ class StatusCommands(MusicSubCommand):
             # Récupérer parent multiroom si applicable
             parent_id, parent_type = self._get_parent_multiroom(args.device)
 
-            # Récupérer l'état complet (3 endpoints API comme le shell)
+            # Récupérer l'état (endpoints API interrogés en parallèle, queue optionnelle)
             state = ctx.playback_mgr.get_state(
                 serial,
                 device_type,
                 parent_id,
                 parent_type,
+                include_queue=include_queue,
             )
 
             if state:
@@ -178,7 +183,7 @@ class StatusCommands(MusicSubCommand):
             print(f"🔊 Multiroom  : {parent_name} (appareil parent)")
 
         # Queue info
-        queue_data = state.get("queue", {})
+        queue_data = state.get("queue") or {}
         if queue_data:
             queue_size = len(queue_data.get("entries", []))
             if queue_size > 0:
@@ -290,17 +290,14 @@ class RoutineCommand(BaseCommand):
                 ctx2 = self.require_context()
                 device_mgr = getattr(ctx2, "device_mgr", None)
                 if device_mgr:
-                    devices = self.call_with_breaker(device_mgr.get_devices) or []
-                    device_name_lower = args.device.lower().strip()
-
-                    for dev in devices:
-                        if dev.get("accountName", "").lower().strip() == device_name_lower:
-                            device_serial = dev.get("serialNumber")
-                            device_type = dev.get("deviceType")
-                            self.logger.debug(
-                                f"Device cible: {dev.get('accountName')} (serial={device_serial}, type={device_type})"
-                            )
-                            break
+                    index = self.call_with_breaker(device_mgr.get_index)
+                    dev = index.get_by_name(args.device) if index else None
+                    if dev:
+                        device_serial = dev.serial_number
+                        device_type = dev.device_type
+                        self.logger.debug(
+                            f"Device cible: {dev.account_name} (serial={device_serial}, type={device_type})"
+                        )
 
                     if not device_serial:
                         self.logger.warning(
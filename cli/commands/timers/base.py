@@ -11,6 +11,8 @@ from typing import Any, Callable, Optional
 
 from loguru import logger
 
+from utils.device_index import Device, DeviceIndex
+
 
 class TimeSubCommand:
     """
@@ -24,26 +26,37 @@ class TimeSubCommand:
         self.context = None
         self.logger = logger
 
-    def get_device_serial(self, device_name: str) -> Optional[str]:
+    def find_device(self, device_name: str) -> Optional[Device]:
         """
-        Récupère le serial d'un appareil par son nom.
+        Recherche un appareil par son nom exact (insensible à la casse) via l'index du DeviceManager.
 
         Args:
             device_name: Nom de l'appareil
 
         Returns:
-            Serial de l'appareil ou None
+            Enregistrement de l'appareil (lisible comme le dict API) ou None
         """
+        index = self._device_index()
+        return index.get_by_name(device_name) if index else None
+
+    def _device_index(self) -> Optional[DeviceIndex]:
+        """Index des appareils du DeviceManager du contexte (None si indisponible)."""
         ctx = getattr(self, "context", None)
-        if ctx is None or getattr(ctx, "device_mgr", None) is None:
-            return None
+        device_mgr = getattr(ctx, "device_mgr", None) if ctx is not None else None
+        return device_mgr.get_index() if device_mgr is not None else None
 
-        devices = ctx.device_mgr.get_devices()
-        for device in devices:
-            if device.get("accountName") == device_name:
-                return device.get("serialNumber")
+    def get_device_serial(self, device_name: str) -> Optional[str]:
+        """
+        Récupère le serial d'un appareil par son nom.
 
-        return None
+        Args:
+            device_name: Nom de l'appareil
+
+        Returns:
+            Serial de l'appareil ou None
+        """
+        device = self.find_device(device_name)
+        return device.get("serialNumber") if device else None
 
     def error(self, message: str):
         """Affiche un message d'erreur."""
@@ -75,16 +88,8 @@ class TimeSubCommand:
         Returns:
             Type d'appareil (ex: "ECHO")
         """
-        ctx = getattr(self, "context", None)
-        if ctx is None or getattr(ctx, "device_mgr", None) is None:
-            return "ECHO"
-
-        devices = ctx.device_mgr.get_devices()
-        for device in devices:
-            if device.get("accountName") == device_name:
-                return device.get("deviceType", "ECHO")
-
-        return "ECHO"
+        device = self.find_device(device_name)
+        return device.get("deviceType", "ECHO") if device else "ECHO"
 
     def _parse_duration(self, duration_str: str) -> Optional[int]:
         """
@@ -181,6 +186,8 @@ class TimeSubCommand:
             Résultat de la fonction
         """
         ctx = getattr(self, "context", None)
+        if ctx and hasattr(ctx, "breaker_for"):
+            return ctx.breaker_for("timers").call(func, *args, **kwargs)
         if ctx and getattr(ctx, "breaker", None):
             return ctx.breaker.call(func, *args, **kwargs)
         return func(*args, **kwargs)
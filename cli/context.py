@@ -12,7 +12,8 @@ Date: 7 octobre 2025
 """
 
 from pathlib import Path
-from typing import TYPE_CHECKING, Optional
+from threading import RLock
+from typing import TYPE_CHECKING, Any, Dict, Optional
 
 if TYPE_CHECKING:
     # Importer uniquement pour annotations afin d'éviter cycles d'import
@@ -33,9 +34,12 @@ if TYPE_CHECKING:
     from core.settings import DeviceSettingsManager
     from core.smart_home import LightController, SmartDeviceController, ThermostatController
     from core.timers import TimerManager
+    from services.fleet_status import FleetStatusService
     from services.music_library import MusicLibraryService
+    from services.notification_snapshot import NotificationSnapshotService
     from services.sync_service import SyncService
     from services.voice_command_service import VoiceCommandService
+    from utils.http_session import OptimizedHTTPSession
 
 from loguru import logger
 
@@ -43,6 +47,7 @@ from core.circuit_breaker import CircuitBreaker
 from core.config import Config
 from core.state_machine import AlexaStateMachine
 from services.cache_service import CacheService
+from utils.http_guard import EndpointGuards, endpoint_guards
 
 
 class Context:
@@ -55,7 +60,7 @@ class Context:
     - La configuration (config)
     - La state machine (état de connexion)
     - Le gestionnaire d'appareils (device_mgr)
-    - Le circuit breaker (protection API)
+    - Les circuit breakers par famille (protection API)
     - Tous les managers de fonctionnalités
 
     Attributes:
@@ -63,7 +68,8 @@ class Context:
         auth: Objet d'authentification AlexaAuth
         state_machine (AlexaStateMachine): Machine à états de connexion
         device_mgr: Gestionnaire d'appareils
-        breaker (CircuitBreaker): Circuit breaker pour protection API
+        breaker (CircuitBreaker): Circuit breaker générique ("cli.default")
+        breakers (EndpointGuards): Breakers et limiteurs par famille d'endpoints
 
         # Managers de fonctionnalités
         timer_mgr: Gestionnaire de timers
@@ -103,16 +109,28 @@ class Context:
         # State machine (état de connexion)
         self.state_machine = AlexaStateMachine()
 
-        # Circuit breaker (protection API)
-        self.breaker = CircuitBreaker(failure_threshold=3, timeout=30.0, half_open_max_calls=1)
+        # Circuit breakers et limiteurs par famille d'endpoints (partagés par le processus)
+        self.breakers: EndpointGuards = endpoint_guards
+        # Breaker générique conservé pour les appelants sans famille
+        self.breaker: CircuitBreaker = self.breaker_for("default")
 
-        # Services centraux
-        self.cache_service = CacheService()
+        # Services centraux (mode haut débit: metadata et écritures flushées à la sortie)
+        self.cache_service = CacheService(high_throughput=True)
+
+        # Session HTTP partagée par AlexaAuth (lazy-loaded)
+        self._http_session: Optional[OptimizedHTTPSession] = None
 
         # Auth et device manager (initialisés à None, créés au login)
         self.auth: Optional[AlexaAuth] = None
         self._device_mgr_instance: Optional[DeviceManager] = None
         self._sync_service: Optional[SyncService] = None
+        # Snapshot /api/notifications partagé (timers, alarmes, rappels, sync)
+        self._notification_snapshot: Optional[NotificationSnapshotService] = None
+
+        # Création des managers lazy-loaded : une seule instance même si plusieurs
+        # threads (batch --parallel) y accèdent en même temps (réentrant : un manager
+        # peut dépendre d'un autre)
+        self._lock = RLock()
 
         # Managers de fonctionnalités (lazy-loaded)
         self._timer_mgr: Optional[TimerManager] = None
@@ -137,10 +155,18 @@ class Context:
         self._equalizer_mgr: Optional[EqualizerManager] = None
         self._bluetooth_mgr: Optional[BluetoothManager] = None
         self._device_settings_mgr: Optional[DeviceSettingsManager] = None
+        self._fleet_status: Optional[FleetStatusService] = None
         self._voice_service: Optional[VoiceCommandService] = None  # Service de commandes vocales
 
         logger.debug("Context initialisé")
 
+    def _stale_options(self) -> Dict[str, Any]:
+        """Options stale-while-revalidate des listes appareils / smart home (Config.max_staleness_seconds)."""
+        max_staleness = getattr(self.config, "max_staleness_seconds", 0)
+        if not isinstance(max_staleness, (int, float)) or max_staleness <= 0:
+            return {}
+        return {"stale_while_revalidate": True, "max_staleness": max_staleness}
+
     # ========================================================================
     # PROPRIÉTÉS LAZY-LOADED POUR LES MANAGERS
     # ========================================================================
@@ -148,76 +174,137 @@ class Context:
     @property
     def device_mgr(self) -> Optional["DeviceManager"]:
         """Gestionnaire d'appareils (lazy-loaded)."""
-        if self._device_mgr_instance is None and self.auth:
-            from core.device_manager import DeviceManager
+        with self._lock:
+            if self._device_mgr_instance is None and self.auth:
+                from core.device_manager import DeviceManager
 
-            self._device_mgr_instance = DeviceManager(self.auth, self.state_machine)
-            logger.debug("DeviceManager chargé")
-        return self._device_mgr_instance
+                self._device_mgr_instance = DeviceManager(
+                    self.auth, self.state_machine, cache_service=self.cache_service, **self._stale_options()
+                )
+                logger.debug("DeviceManager chargé")
+            return self._device_mgr_instance
+
+    @property
+    def http_session(self) -> "OptimizedHTTPSession":
+        """Session HTTP partagée du processus (pool de connexions configurable, lazy-loaded)."""
+        with self._lock:
+            if self._http_session is None:
+                from utils.http_session import get_shared_session
+
+                self._http_session = get_shared_session(
+                    cache_enabled=self.config.http_cache_enabled,
+                    pool_connections=self.config.http_pool_connections,
+                    pool_maxsize=self.config.http_pool_maxsize,
+                )
+            return self._http_session
+
+    @property
+    def notification_snapshot(self) -> "NotificationSnapshotService":
+        """Snapshot /api/notifications partagé entre timers, alarmes, rappels et sync (lazy-loaded)."""
+        with self._lock:
+            if self._notification_snapshot is None:
+                from services.notification_snapshot import NotificationSnapshotService
+
+                self._notification_snapshot = NotificationSnapshotService(self.cache_service)
+                logger.debug("NotificationSnapshotService chargé")
+            return self._notification_snapshot
 
     @property
     def timer_mgr(self) -> Optional["TimerManager"]:
         """Gestionnaire de timers (lazy-loaded)."""
-        if self._timer_mgr is None and self.auth:
-            from core.timers import TimerManager
-
-            self._timer_mgr = TimerManager(self.auth, self.config, self.state_machine)
-            logger.debug("TimerManager chargé")
-        return self._timer_mgr
+        with self._lock:
+            if self._timer_mgr is None and self.auth:
+                from core.timers import TimerManager
+
+                self._timer_mgr = TimerManager(
+                    self.auth,
+                    self.config,
+                    self.state_machine,
+                    self.cache_service,
+                    notification_snapshot=self.notification_snapshot,
+                )
+                logger.debug("TimerManager chargé")
+            return self._timer_mgr
 
     @property
     def alarm_mgr(self) -> Optional["AlarmManager"]:
         """Gestionnaire d'alarmes (lazy-loaded)."""
-        if self._alarm_mgr is None and self.auth:
-            from core.alarms import AlarmManager
-
-            self._alarm_mgr = AlarmManager(
-                self.auth, self.config, self.state_machine, self.cache_service
-            )
-            logger.debug("AlarmManager chargé")
-        return self._alarm_mgr
+        with self._lock:
+            if self._alarm_mgr is None and self.auth:
+                from core.alarms import AlarmManager
+
+                self._alarm_mgr = AlarmManager(
+                    self.auth,
+                    self.config,
+                    self.state_machine,
+                    self.cache_service,
+                    notification_snapshot=self.notification_snapshot,
+                )
+                logger.debug("AlarmManager chargé")
+            return self._alarm_mgr
 
     @property
     def reminder_mgr(self) -> Optional["ReminderManager"]:
         """Gestionnaire de rappels (lazy-loaded)."""
-        if self._reminder_mgr is None and self.auth:
-            from core.reminders import ReminderManager
-
-            self._reminder_mgr = ReminderManager(
-                self.auth, self.config, self.state_machine, self.cache_service
-            )
-            logger.debug("ReminderManager chargé")
-        return self._reminder_mgr
+        with self._lock:
+            if self._reminder_mgr is None and self.auth:
+                from core.reminders import ReminderManager
+
+                self._reminder_mgr = ReminderManager(
+                    self.auth,
+                    self.config,
+                    self.state_machine,
+                    self.cache_service,
+                    notification_snapshot=self.notification_snapshot,
+                )
+                logger.debug("ReminderManager chargé")
+            return self._reminder_mgr
 
     @property
     def light_ctrl(self) -> Optional["LightController"]:
         """Contrôleur de lumières (lazy-loaded)."""
-        if self._light_ctrl is None and self.auth:
-            from core.smart_home import LightController
-
-            self._light_ctrl = LightController(self.auth, self.config, self.state_machine)
-            logger.debug("LightController chargé")
-        return self._light_ctrl
+        with self._lock:
+            if self._light_ctrl is None and self.auth:
+                from core.smart_home import LightController
+
+                self._light_ctrl = LightController(
+                    self.auth,
+                    self.config,
+                    self.state_machine,
+                    cache_service=self.cache_service,
+                    voice_service=self.voice_service,
+                    **self._stale_options(),
+                )
+                logger.debug("LightController chargé")
+            return self._light_ctrl
 
     @property
     def thermostat_ctrl(self) -> Optional["ThermostatController"]:
         """Contrôleur de thermostats (lazy-loaded)."""
-        if self._thermostat_ctrl is None and self.auth:
-            from core.smart_home import ThermostatController
+        with self._lock:
+            if self._thermostat_ctrl is None and self.auth:
+                from core.smart_home import ThermostatController
 
-            self._thermostat_ctrl = ThermostatController(self.auth, self.config, self.state_machine)
-            logger.debug("ThermostatController chargé")
-        return self._thermostat_ctrl
+                self._thermostat_ctrl = ThermostatController(self.auth, self.config, self.state_machine)
+                logger.debug("ThermostatController chargé")
+            return self._thermostat_ctrl
 
     @property
     def smarthome_ctrl(self) -> Optional["SmartDeviceController"]:
         """Contrôleur smart home général (lazy-loaded)."""
-        if self._smarthome_ctrl is None and self.auth:
-            from core.smart_home import SmartDeviceController
-
-            self._smarthome_ctrl = SmartDeviceController(self.auth, self.config, self.state_machine)
-            logger.debug("SmartDeviceController chargé")
-        return self._smarthome_ctrl
+        with self._lock:
+            if self._smarthome_ctrl is None and self.auth:
+                from core.smart_home import SmartDeviceController
+
+                self._smarthome_ctrl = SmartDeviceController(
+                    self.auth,
+                    self.config,
+                    self.state_machine,
+                    cache_service=self.cache_service,
+                    **self._stale_options(),
+                )
+                logger.debug("SmartDeviceController chargé")
+            return self._smarthome_ctrl
 
     @property
     def device_ctrl(self):
@@ -227,34 +314,39 @@ class Context:
     @property
     def playback_mgr(self) -> Optional["PlaybackManager"]:
         """Gestionnaire de playback musique (lazy-loaded)."""
-        if self._playback_mgr is None and self.auth:
-            from core.music import PlaybackManager
+        with self._lock:
+            if self._playback_mgr is None and self.auth:
+                from core.music import PlaybackManager
 
-            self._playback_mgr = PlaybackManager(self.auth, self.config, self.state_machine)
-            logger.debug("PlaybackManager chargé")
-        return self._playback_mgr
+                self._playback_mgr = PlaybackManager(
+                    self.auth, self.config, self.state_machine, voice_service=self.voice_service
+                )
+                logger.debug("PlaybackManager chargé")
+            return self._playback_mgr
 
     @property
     def tunein_mgr(self) -> Optional["TuneInManager"]:
         """Gestionnaire TuneIn (lazy-loaded)."""
-        if self._tunein_mgr is None and self.auth:
-            from core.music import TuneInManager
+        with self._lock:
+            if self._tunein_mgr is None and self.auth:
+                from core.music import TuneInManager
 
-            self._tunein_mgr = TuneInManager(self.auth, self.state_machine)
-            logger.debug("TuneInManager chargé")
-        return self._tunein_mgr
+                self._tunein_mgr = TuneInManager(self.auth, self.state_machine)
+                logger.debug("TuneInManager chargé")
+            return self._tunein_mgr
 
     @property
     def library_mgr(self) -> Optional["LibraryManager"]:
         """Gestionnaire de bibliothèque musicale (lazy-loaded)."""
-        if self._library_mgr is None and self.auth:
-            from core.music import LibraryManager
+        with self._lock:
+            if self._library_mgr is None and self.auth:
+                from core.music import LibraryManager
 
-            self._library_mgr = LibraryManager(
-                self.auth, self.config, self.state_machine, self.voice_service
-            )
-            logger.debug("LibraryManager chargé")
-        return self._library_mgr
+                self._library_mgr = LibraryManager(
+                    self.auth, self.config, self.state_machine, self.voice_service
+                )
+                logger.debug("LibraryManager chargé")
+            return self._library_mgr
 
     @property
     def music_library(self):
@@ -271,42 +363,52 @@ class Context:
         Returns:
             MusicLibraryService instance ou None si pas authentifié
         """
-        if self._music_library is None and self.auth:
-            from services.music_library import MusicLibraryService
+        with self._lock:
+            if self._music_library is None and self.auth:
+                from services.music_library import MusicLibraryService
 
-            self._music_library = MusicLibraryService(self.auth, self.config, self.breaker)
-            logger.debug("MusicLibraryService chargé (shell script parity)")
-        return self._music_library
+                self._music_library = MusicLibraryService(self.auth, self.config, self.breaker)
+                logger.debug("MusicLibraryService chargé (shell script parity)")
+            return self._music_library
 
     @property
     def notification_mgr(self) -> Optional["NotificationManager"]:
         """Gestionnaire de notifications (lazy-loaded)."""
-        if self._notification_mgr is None and self.auth:
-            from core.notification_manager import NotificationManager
+        with self._lock:
+            if self._notification_mgr is None and self.auth:
+                from core.notification_manager import NotificationManager
 
-            self._notification_mgr = NotificationManager(self.auth, self.state_machine)
-            logger.debug("NotificationManager chargé")
-        return self._notification_mgr
+                self._notification_mgr = NotificationManager(self.auth, self.state_machine)
+                logger.debug("NotificationManager chargé")
+            return self._notification_mgr
 
     @property
     def dnd_mgr(self) -> Optional["DNDManager"]:
         """Gestionnaire Do Not Disturb (lazy-loaded)."""
-        if self._dnd_mgr is None and self.auth:
-            from core.dnd_manager import DNDManager
+        with self._lock:
+            if self._dnd_mgr is None and self.auth:
+                from core.dnd_manager import DNDManager
 
-            self._dnd_mgr = DNDManager(self.auth, self.state_machine)
-            logger.debug("DNDManager chargé")
-        return self._dnd_mgr
+                self._dnd_mgr = DNDManager(self.auth, self.config, self.state_machine)
+                logger.debug("DNDManager chargé")
+            return self._dnd_mgr
 
     @property
     def activity_mgr(self) -> Optional["ActivityManager"]:
         """Gestionnaire d'activités (lazy-loaded)."""
-        if self._activity_mgr is None and self.auth:
-            from core.activity_manager import ActivityManager
-
-            self._activity_mgr = ActivityManager(self.auth, self.config, self.state_machine)
-            logger.debug("ActivityManager chargé")
-        return self._activity_mgr
+        with self._lock:
+            if self._activity_mgr is None and self.auth:
+                from core.activity_manager import ActivityManager
+
+                self._activity_mgr = ActivityManager(
+                    self.auth,
+                    self.config,
+                    self.state_machine,
+                    device_mgr=self.device_mgr,
+                    cache_service=self.cache_service,
+                )
+                logger.debug("ActivityManager chargé")
+            return self._activity_mgr
 
     # DEPRECATED: AnnouncementManager removed (core.communication is empty)
     # @property
@@ -317,87 +419,119 @@ class Context:
     @property
     def calendar_manager(self) -> Optional["CalendarManager"]:
         """Gestionnaire de calendrier (lazy-loaded)."""
-        if self._calendar_mgr is None and self.auth:
-            from core.calendar import CalendarManager
-
-            self._calendar_mgr = CalendarManager(
-                self.auth,
-                config=self.config,
-                voice_service=self.voice_service,
-                device_manager=self.device_mgr,
-            )
-            logger.debug("CalendarManager chargé")
-        return self._calendar_mgr
+        with self._lock:
+            if self._calendar_mgr is None and self.auth:
+                from core.calendar import CalendarManager
+
+                self._calendar_mgr = CalendarManager(
+                    self.auth,
+                    config=self.config,
+                    voice_service=self.voice_service,
+                    device_manager=self.device_mgr,
+                )
+                logger.debug("CalendarManager chargé")
+            return self._calendar_mgr
 
     @property
     def routine_mgr(self) -> Optional["RoutineManager"]:
         """Gestionnaire de routines (lazy-loaded)."""
-        if self._routine_mgr is None and self.auth:
-            from core.routines import RoutineManager
+        with self._lock:
+            if self._routine_mgr is None and self.auth:
+                from core.routines import RoutineManager
 
-            self._routine_mgr = RoutineManager(
-                self.auth, self.config, self.state_machine, self.cache_service
-            )
-            logger.debug("RoutineManager chargé")
-        return self._routine_mgr
+                self._routine_mgr = RoutineManager(
+                    self.auth, self.config, self.state_machine, self.cache_service
+                )
+                logger.debug("RoutineManager chargé")
+            return self._routine_mgr
 
     @property
     def list_mgr(self) -> Optional["ListsManager"]:
         """Gestionnaire de listes (lazy-loaded)."""
-        if self._list_mgr is None and self.auth:
-            from core.lists.lists_manager import ListsManager
+        with self._lock:
+            if self._list_mgr is None and self.auth:
+                from core.lists.lists_manager import ListsManager
 
-            self._list_mgr = ListsManager(self.auth, self.config, self.state_machine)
-            logger.debug("ListsManager chargé")
-        return self._list_mgr
+                self._list_mgr = ListsManager(
+                    self.auth, self.config, self.state_machine, voice_service=self.voice_service
+                )
+                logger.debug("ListsManager chargé")
+            return self._list_mgr
 
     @property
     def equalizer_mgr(self) -> Optional["EqualizerManager"]:
         """Gestionnaire égaliseur (lazy-loaded)."""
-        if self._equalizer_mgr is None and self.auth:
-            from core.audio import EqualizerManager
+        with self._lock:
+            if self._equalizer_mgr is None and self.auth:
+                from core.audio import EqualizerManager
 
-            self._equalizer_mgr = EqualizerManager(self.auth, self.state_machine)
-            logger.debug("EqualizerManager chargé")
-        return self._equalizer_mgr
+                self._equalizer_mgr = EqualizerManager(self.auth, self.state_machine)
+                logger.debug("EqualizerManager chargé")
+            return self._equalizer_mgr
 
     @property
     def bluetooth_mgr(self) -> Optional["BluetoothManager"]:
         """Gestionnaire Bluetooth (lazy-loaded)."""
-        if self._bluetooth_mgr is None and self.auth:
-            from core.audio import BluetoothManager
+        with self._lock:
+            if self._bluetooth_mgr is None and self.auth:
+                from core.audio import BluetoothManager
 
-            self._bluetooth_mgr = BluetoothManager(self.auth, self.state_machine)
-            logger.debug("BluetoothManager chargé")
-        return self._bluetooth_mgr
+                self._bluetooth_mgr = BluetoothManager(self.auth, self.state_machine)
+                logger.debug("BluetoothManager chargé")
+            return self._bluetooth_mgr
 
     @property
     def device_settings_mgr(self) -> Optional["DeviceSettingsManager"]:
         """Gestionnaire paramètres appareils (lazy-loaded)."""
-        if self._device_settings_mgr is None and self.auth:
-            from core.settings import DeviceSettingsManager
+        with self._lock:
+            if self._device_settings_mgr is None and self.auth:
+                from core.settings import DeviceSettingsManager
 
-            self._device_settings_mgr = DeviceSettingsManager(
-                self.auth, self.config, self.state_machine
-            )
-            logger.debug("DeviceSettingsManager chargé")
-        return self._device_settings_mgr
+                self._device_settings_mgr = DeviceSettingsManager(
+                    self.auth, self.config, self.state_machine
+                )
+                logger.debug("DeviceSettingsManager chargé")
+            return self._device_settings_mgr
 
     @property
     def settings_mgr(self):
         """Alias pour device_settings_mgr (compatibilité commandes)."""
         return self.device_settings_mgr
 
+    @property
+    def fleet_status(self) -> Optional["FleetStatusService"]:
+        """Instantané d'état de tous les appareils (lazy-loaded)."""
+        with self._lock:
+            if self._fleet_status is None and self.auth and self.device_mgr:
+                from services.fleet_status import FleetStatusService
+
+                self._fleet_status = FleetStatusService(
+                    self.auth,
+                    self.device_mgr,
+                    playback_mgr=self.playback_mgr,
+                    dnd_mgr=self.dnd_mgr,
+                    settings_mgr=self.device_settings_mgr,
+                )
+                logger.debug("FleetStatusService chargé")
+            return self._fleet_status
+
     @property
     def sync_service(self):
         """Service de synchronisation (lazy-loaded)."""
 
         from services.sync_service import SyncService
 
-        if self._sync_service is None and self.auth:
-            self._sync_service = SyncService(self.auth, self.config, self.state_machine)
-            logger.debug("SyncService chargé")
-        return self._sync_service
+        with self._lock:
+            if self._sync_service is None and self.auth:
+                self._sync_service = SyncService(
+                    self.auth,
+                    self.config,
+                    self.state_machine,
+                    self.cache_service,
+                    notification_snapshot=self.notification_snapshot,
+                )
+                logger.debug("SyncService chargé")
+            return self._sync_service
 
     @property
     def voice_service(self):
@@ -413,12 +547,19 @@ class Context:
         Returns:
             VoiceCommandService instance ou None si pas authentifié
         """
-        if self._voice_service is None and self.auth:
-            from services.voice_command_service import VoiceCommandService
-
-            self._voice_service = VoiceCommandService(self.auth, self.config, self.state_machine)
-            logger.debug("VoiceCommandService chargé")
-        return self._voice_service
+        with self._lock:
+            if self._voice_service is None and self.auth:
+                from services.voice_command_service import VoiceCommandService
+
+                self._voice_service = VoiceCommandService(
+                    self.auth,
+                    self.config,
+                    self.state_machine,
+                    cache_service=self.cache_service,
+                    device_mgr=self.device_mgr,
+                )
+                logger.debug("VoiceCommandService chargé")
+            return self._voice_service
 
     # ========================================================================
     # MÉTHODES UTILITAIRES
@@ -444,6 +585,64 @@ class Context:
             except Exception as e:
                 logger.warning(f"⚠️  Erreur synchronisation initiale: {e}")
 
+    def load_saved_auth(self) -> bool:
+        """
+        Charge les cookies enregistrés et initialise l'authentification.
+
+        Si la session n'a pas encore été vérifiée pour ces cookies, un ping
+        sur /api/devices-v2/device la valide ; sinon aucune requête n'est faite
+        (un 401 ultérieur l'invalidera).
+
+        Returns:
+            True si le contexte est authentifié
+        """
+        from alexa_auth.alexa_auth import AlexaAuth
+        from core.state_machine import ConnectionState
+
+        auth = AlexaAuth(cache_service=self.cache_service, http_session=self.http_session)
+        if auth.load_cookies() and auth.session_known_good():
+            # Session déjà vérifiée pour ces cookies : pas de ping
+            self.state_machine.set_initial_state(ConnectionState.AUTHENTICATED)
+            self.initialize_auth(auth)
+            logger.debug(f"Authentification chargée (session connue): {auth.get_cookie_info()}")
+            return True
+
+        if not auth.cookies_loaded:
+            logger.debug("Pas de cookies valides trouvés")
+            return False
+
+        # Sanity check: tenter un ping minimal sur un endpoint devices
+        try:
+            resp = auth.get(f"https://{auth.amazon_domain}/api/devices-v2/device", timeout=10)
+        except Exception as e:
+            logger.warning(f"Cookies chargés mais vérification API échouée: {e}")
+            return False
+
+        if getattr(resp, "status_code", None) != 200:
+            logger.warning(
+                f"Cookies présents mais ping API a renvoyé {getattr(resp, 'status_code', 'unknown')}. "
+                "Ne pas définir comme authentifié"
+            )
+            return False
+
+        # Cookies et endpoint valides
+        self.state_machine.set_initial_state(ConnectionState.AUTHENTICATED)
+        self.initialize_auth(auth)
+        logger.debug(f"Authentification chargée: {auth.get_cookie_info()}")
+        return True
+
+    def breaker_for(self, name: str) -> CircuitBreaker:
+        """
+        Circuit breaker d'une fonctionnalité CLI (un circuit par commande).
+
+        Args:
+            name: Nom de la commande ou de la fonctionnalité (enregistré sous "cli.<name>")
+
+        Returns:
+            Breaker partagé, créé au premier appel
+        """
+        return self.breakers.breaker(f"cli.{name}", failure_threshold=3, timeout=30.0, half_open_max_calls=1)
+
     def cleanup(self):
         """Nettoie les ressources (appelé à la fermeture)."""
         logger.debug("Nettoyage du contexte")
@@ -456,6 +655,14 @@ class Context:
             except Exception as e:
                 logger.warning(f"Erreur lors de la déconnexion state machine: {e}")
 
+        # Détacher l'auth de la session HTTP partagée (hook de suivi, cookies)
+        if self.auth is not None:
+            try:
+                self.auth.close()
+            except Exception as e:
+                logger.warning(f"Erreur lors de la fermeture de l'authentification: {e}")
+            self.auth = None
+
         # Reset managers
         self._device_mgr_instance = None
         self._timer_mgr = None
@@ -476,6 +683,7 @@ class Context:
         self._equalizer_mgr = None
         self._bluetooth_mgr = None
         self._device_settings_mgr = None
+        self._fleet_status = None
 
         logger.info("Contexte nettoyé")
 
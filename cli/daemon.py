@@ -0,0 +1,268 @@
+"""
+Démon local de la CLI : un Context chaud derrière un socket Unix.
+
+Le démon construit une seule fois le contexte (cookies, CacheService,
+managers, session HTTP poolée) et le parser complet, puis exécute les
+commandes transmises par le script ``alexa`` (voir utils.daemon_ipc).
+Les commandes sont exécutées une par une ; leur sortie standard et
+d'erreur est capturée et renvoyée au client.
+
+Limites :
+- les options de journalisation (--debug, --verbose) sont celles du démon
+- les logs loguru restent dans la sortie du démon
+- les commandes interactives (auth) ne sont jamais transmises
+
+Usage:
+    alexa daemon start            # en arrière-plan
+    alexa daemon start --foreground
+    alexa daemon status
+    alexa daemon stop
+"""
+
+import io
+import json
+import os
+import socketserver
+import sys
+import time
+from contextlib import redirect_stderr, redirect_stdout
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from loguru import logger
+
+from cli.command_parser import CommandParser, create_parser
+from cli.context import Context, create_context
+from utils.daemon_ipc import DaemonError, DaemonUnavailable, request, socket_path
+from utils.http_guard import endpoint_guards
+from utils.lazy_loader import get_command_loader
+
+
+class _CapturedStream(io.StringIO):
+    """Tampon de sortie qui se présente comme un terminal si le client en est un."""
+
+    def __init__(self, tty: bool):
+        super().__init__()
+        self._tty = tty
+
+    def isatty(self) -> bool:
+        return self._tty
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    """Lit une requête JSON, la confie au démon et renvoie la réponse."""
+
+    server: "_DaemonServer"
+
+    def handle(self) -> None:
+        line = self.rfile.readline()
+        try:
+            payload = json.loads(line)
+        except ValueError:
+            response: Dict[str, Any] = {"error": "requête invalide"}
+        else:
+            response = self.server.daemon.handle(payload)
+        self.wfile.write(json.dumps(response).encode("utf-8") + b"\n")
+
+
+class _DaemonServer(socketserver.UnixStreamServer):
+    """Serveur séquentiel : une commande à la fois (stdout/stderr sont globaux)."""
+
+    daemon: "AlexaDaemon"
+
+
+class AlexaDaemon:
+    """
+    Démon gardant un Context chaud pour les invocations répétées de la CLI.
+
+    Example:
+        >>> AlexaDaemon().serve_forever()
+    """
+
+    def __init__(self, path: Optional[Path] = None, context: Optional[Context] = None):
+        """
+        Initialise le démon.
+
+        Args:
+            path: Socket d'écoute (défaut: utils.daemon_ipc.socket_path())
+            context: Contexte à réutiliser (défaut: créé au démarrage)
+        """
+        self.path = path or socket_path()
+        self.context = context
+        self.parser: Optional[CommandParser] = None
+        self.started_at = time.time()
+        self.requests = 0
+        self._running = False
+        self._cookie_mtime: Optional[float] = None
+
+    def handle(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Traite une requête du protocole (run, ping, shutdown).
+
+        Args:
+            payload: Requête décodée
+
+        Returns:
+            Réponse à renvoyer au client
+        """
+        op = payload.get("op")
+        if op == "run":
+            self.requests += 1
+            return self.run(list(payload.get("argv", [])), tty=bool(payload.get("tty", False)))
+        if op == "ping":
+            return self.status()
+        if op == "shutdown":
+            self._running = False
+            return {"ok": True}
+        return {"error": f"opération inconnue: {op}"}
+
+    def status(self) -> Dict[str, Any]:
+        """État du démon (pid, uptime, commandes servies, breakers et limiteurs)."""
+        return {
+            "pid": os.getpid(),
+            "uptime": round(time.time() - self.started_at, 1),
+            "requests": self.requests,
+            "authenticated": bool(self.context and self.context.auth),
+            "endpoints": endpoint_guards.get_stats(),
+        }
+
+    def run(self, argv: List[str], tty: bool = False) -> Dict[str, Any]:
+        """
+        Exécute une ligne de commande dans le contexte chaud.
+
+        Args:
+            argv: Arguments (sans le nom du script)
+            tty: Le client écrit dans un terminal (couleurs)
+
+        Returns:
+            {"exit_code", "stdout", "stderr"}
+        """
+        stdout, stderr = _CapturedStream(tty), _CapturedStream(tty)
+        start = time.perf_counter()
+        with redirect_stdout(stdout), redirect_stderr(stderr):
+            exit_code = self._execute(argv)
+
+        # Écritures du cache visibles des invocations locales (hors démon)
+        if self.context is not None:
+            self.context.cache_service.flush()
+
+        logger.debug(f"🛰️  {' '.join(argv)} -> {exit_code} en {(time.perf_counter() - start) * 1000:.1f} ms")
+        return {"exit_code": exit_code, "stdout": stdout.getvalue(), "stderr": stderr.getvalue()}
+
+    def _execute(self, argv: List[str]) -> int:
+        """Parse et exécute la commande ; retourne son code de sortie."""
+        if self.parser is None or self.context is None:
+            raise RuntimeError("Démon non démarré (serve_forever)")
+        try:
+            args = self.parser.parse_args(argv)
+            self._reload_auth_if_changed()
+            command_class = self.parser.get_command_class(args.category)
+            if not command_class:
+                print(f"❌ Erreur: Catégorie '{args.category}' non reconnue", file=sys.stderr)
+                return 1
+            return 0 if command_class(self.context).execute(args) else 1
+        except SystemExit as e:
+            # argparse (erreur de syntaxe) ou commande appelant sys.exit()
+            return e.code if isinstance(e.code, int) else (0 if e.code is None else 1)
+        except Exception as e:
+            logger.exception(f"Erreur non gérée pour: {' '.join(argv)}")
+            print(f"❌ Erreur inattendue: {e}", file=sys.stderr)
+            return 1
+
+    def _cookie_files_mtime(self) -> Optional[float]:
+        """Date de modification la plus récente des fichiers de cookies."""
+        from alexa_auth.alexa_auth import AlexaAuth
+
+        cookie_files = (AlexaAuth.DEFAULT_DATA_DIR / "cookie-resultat.json", AlexaAuth.DEFAULT_DATA_DIR / "cookie.txt")
+        mtimes = [path.stat().st_mtime for path in cookie_files if path.exists()]
+        return max(mtimes) if mtimes else None
+
+    def _reload_auth_if_changed(self) -> None:
+        """Recrée le contexte si les cookies ont changé depuis le chargement (alexa auth create)."""
+        mtime = self._cookie_files_mtime()
+        if mtime == self._cookie_mtime:
+            return
+        logger.info("🔑 Cookies modifiés : rechargement du contexte")
+        if self.context is not None:
+            self.context.cleanup()
+        # self.context peut être réutilisé par l'appelant (alexa daemon start) : en créer un neuf
+        self.context = create_context()
+        self._load_auth()
+
+    def _load_auth(self) -> None:
+        """Charge l'authentification du contexte courant."""
+        if self.context is None:
+            return
+        self._cookie_mtime = self._cookie_files_mtime()
+        try:
+            self.context.load_saved_auth()
+        except Exception as e:
+            logger.warning(f"Impossible de charger l'auth: {e}")
+
+    def _prepare(self) -> None:
+        """Construit le parser complet et le contexte chaud."""
+        self.parser = create_parser()
+        get_command_loader().register_commands(self.parser)
+
+        if self.context is None:
+            self.context = create_context()
+        self._load_auth()
+
+    def _claim_socket(self) -> None:
+        """
+        Supprime le socket s'il est orphelin ; refuse de remplacer un démon actif.
+
+        Raises:
+            RuntimeError: Si un processus accepte les connexions sur le socket
+        """
+        if not self.path.exists():
+            return
+        try:
+            status = request({"op": "ping"}, path=self.path, timeout=2)
+        except DaemonUnavailable:
+            # Socket orphelin d'un démon arrêté brutalement
+            self.path.unlink()
+            return
+        except DaemonError as e:
+            # Connexion acceptée : un démon occupé (ou un autre service) écoute déjà
+            raise RuntimeError(f"Socket {self.path} déjà utilisé: {e}") from e
+        raise RuntimeError(f"Démon déjà actif sur {self.path} (pid {status.get('pid')})")
+
+    def serve_forever(self) -> None:
+        """
+        Écoute le socket jusqu'à la requête shutdown (ou Ctrl+C).
+
+        Raises:
+            RuntimeError: Si la plateforme ne supporte pas les sockets Unix,
+                ou si un démon écoute déjà sur le socket
+        """
+        if not hasattr(socketserver, "UnixStreamServer"):
+            raise RuntimeError("Mode démon indisponible : sockets Unix non supportés sur cette plateforme")
+
+        self._claim_socket()
+        self._prepare()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+        # Socket créé directement en 0600 : aucune fenêtre où un autre utilisateur pourrait s'y connecter
+        previous_umask = os.umask(0o177)
+        try:
+            server = _DaemonServer(str(self.path), _RequestHandler)
+        finally:
+            os.umask(previous_umask)
+        server.daemon = self
+        server.timeout = 1.0
+        os.chmod(self.path, 0o600)
+        self._running = True
+        logger.info(f"🛰️  Démon Alexa à l'écoute sur {self.path} (pid {os.getpid()})")
+        try:
+            while self._running:
+                server.handle_request()
+        except KeyboardInterrupt:
+            logger.info("Interruption du démon")
+        finally:
+            server.server_close()
+            if self.path.exists():
+                self.path.unlink()
+            if self.context is not None:
+                self.context.cleanup()
+            logger.info(f"🛰️  Démon arrêté ({self.requests} commande(s) servie(s))")
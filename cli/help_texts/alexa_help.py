@@ -80,6 +80,8 @@ def get_main_help() -> str:
                 {"name": "activity", "desc": "Historique d'activité"},
                 {"name": "calendar", "desc": "Gestion du calendrier"},
                 {"name": "cache", "desc": "Gestion du cache local"},
+                {"name": "batch", "desc": "Exécution en lot (fichier ou entrée standard, JSON lines)"},
+                {"name": "daemon", "desc": "Démon local (contexte chaud, start/status/stop)"},
             ]
         )
     )
@@ -0,0 +1,31 @@
+# ruff: noqa: E501
+"""Aide simplifiée pour la catégorie BATCH.
+
+\033[1;30m──────────────────────────────────────────────────────────────────────\033[0m
+\033[1;90mUsage:\033[0m
+
+  \033[1;90malexa\033[0m \033[1;35m[OPTIONS_GLOBALES]\033[0m \033[1;32mbatch\033[0m \033[0;34m[OPTIONS]\033[0m
+
+\033[1;34mOptions disponibles:\033[0m
+
+  • \033[0;34m-f, --file\033[0m FICHIER                 : \033[0;90mFichier de commandes (défaut: entrée standard)\033[0m
+  • \033[0;34m-p, --parallel\033[0m N                   : \033[0;90mGroupes indépendants exécutés en parallèle (défaut: 1)\033[0m
+  • \033[0;34m-o, --output\033[0m FICHIER               : \033[0;90mÉcrire les résultats JSON lines dans un fichier\033[0m
+  • \033[0;34m--stop-on-error\033[0m                     : \033[0;90mNe plus lancer de commande après le premier échec\033[0m
+
+\033[1;34mFormat:\033[0m
+
+  Une commande par ligne, sans le mot \033[1;90malexa\033[0m ; lignes vides et \033[0;90m# commentaires\033[0m ignorés.
+  En parallèle, les commandes d'un même appareil ou d'une même entité
+  (ou d'une même catégorie sans cible) gardent l'ordre du fichier.
+
+\033[1;90mExemples:\033[0m
+
+  \033[1;90malexa\033[0m \033[1;32mbatch\033[0m \033[0;34m-f\033[0m soir.txt
+  \033[1;90mprintf 'dnd enable -d Salon\\ndevice volume set -d Salon --level 20\\n' | alexa\033[0m \033[1;32mbatch\033[0m
+  \033[1;90malexa\033[0m \033[1;32mbatch\033[0m \033[0;34m-f\033[0m soir.txt \033[0;34m--parallel\033[0m 4 \033[0;34m-o\033[0m resultats.jsonl
+\033[1;30m──────────────────────────────────────────────────────────────────────\033[0m
+"""
+
+# Description courte utilisée par le parser
+BATCH_DESCRIPTION = "Aide pour la catégorie 'batch' — plusieurs commandes dans un seul processus."
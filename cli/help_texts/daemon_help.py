@@ -0,0 +1,31 @@
+# ruff: noqa: E501
+"""Aide simplifiée pour la catégorie DAEMON.
+
+\033[1;30m──────────────────────────────────────────────────────────────────────\033[0m
+\033[1;90mUsage:\033[0m
+
+  \033[1;90malexa\033[0m \033[1;35m[OPTIONS_GLOBALES]\033[0m \033[1;32mdaemon\033[0m \033[1;34m<ACTION>\033[0m \033[0;34m[OPTIONS_ACTION]\033[0m
+
+\033[1;34mActions et options disponibles:\033[0m
+
+  • \033[1;34mstart\033[0m                               : \033[0;90mDémarrer le démon en arrière-plan\033[0m
+  • \033[1;34mstart\033[0m \033[0;34m--foreground\033[0m                  : \033[0;90mDémarrer le démon dans le terminal courant\033[0m
+  • \033[1;34mstatus\033[0m                              : \033[0;90mÉtat du démon (commandes servies, circuits, limiteurs)\033[0m
+  • \033[1;34mstop\033[0m                                : \033[0;90mArrêter le démon\033[0m
+
+\033[1;90mExemples:\033[0m
+
+  \033[1;90malexa\033[0m \033[1;32mdaemon\033[0m \033[1;34mstart\033[0m
+  \033[1;90malexa\033[0m \033[1;32mdevice\033[0m \033[1;34mlist\033[0m                 \033[0;90m# exécuté par le démon\033[0m
+  \033[1;90mALEXA_NO_DAEMON=1 alexa\033[0m \033[1;32mdevice\033[0m \033[1;34mlist\033[0m \033[0;90m# exécution locale forcée\033[0m
+  \033[1;90malexa\033[0m \033[1;32mdaemon\033[0m \033[1;34mstop\033[0m
+\033[1;30m──────────────────────────────────────────────────────────────────────\033[0m
+"""
+
+# Description courte utilisée par le parser
+DAEMON_DESCRIPTION = "Aide pour la catégorie 'daemon' — contexte CLI persistant (socket Unix)."
+
+# Placeholders pour compatibilité avec le code existant
+START_HELP = "Voir aide principale: alexa daemon -h"
+STATUS_HELP = "Voir aide principale: alexa daemon -h"
+STOP_HELP = "Voir aide principale: alexa daemon -h"
@@ -18,6 +18,7 @@ Aide simplifiée pour la catégorie DEVICE.
   • \033[1;34mlist\033[0m \033[0;34m--filter\033[0m \033[0;34m"PATTERN"\033[0m                       : \033[0;90mFiltrer les appareils par nom (recherche partielle)\033[0m
   • \033[1;34mlist\033[0m \033[0;34m--online-only\033[0m                            : \033[0;90mAfficher uniquement les appareils en ligne\033[0m
   • \033[1;34minfo\033[0m \033[0;36m--device "DEVICE"\033[0m                        : \033[0;90mAfficher les informations d'un appareil\033[0m
+  • \033[1;34msnapshot\033[0m \033[0;34m--concurrency N\033[0m                      : \033[0;90mÉtat JSON de tous les appareils (lecture, volume, DND)\033[0m
   • \033[1;34mvolume\033[0m \033[1;33mget\033[0m \033[0;36m--device "DEVICE"\033[0m                  : \033[0;90mRécupérer le volume d'un appareil\033[0m
   • \033[1;34mvolume\033[0m \033[1;33mset\033[0m \033[0;36m--device "DEVICE"\033[0m \033[0;33m--level VOLUME\033[0m   : \033[0;90mParamétrer le volume d'un appareil en % (0-100)\033[0m
 
@@ -28,6 +29,7 @@ Aide simplifiée pour la catégorie DEVICE.
   \033[1;90malexa\033[0m \033[1;32mdevice\033[0m \033[1;34mlist\033[0m \033[0;34m--filter\033[0m \033[0;34m"Echo"\033[0m
   \033[1;90malexa\033[0m \033[1;32mdevice\033[0m \033[1;34mlist\033[0m \033[0;34m--online-only\033[0m
   \033[1;90malexa\033[0m \033[1;32mdevice\033[0m \033[1;34minfo\033[0m \033[0;36m--device "Salon Echo"\033[0m
+  \033[1;90malexa\033[0m \033[1;32mdevice\033[0m \033[1;34msnapshot\033[0m \033[0;34m--online-only\033[0m
   \033[1;90malexa\033[0m \033[1;32mdevice\033[0m \033[1;34mvolume\033[0m \033[1;33mget\033[0m \033[0;36m--device "Salon Echo"\033[0m
   \033[1;90malexa\033[0m \033[1;32mdevice\033[0m \033[1;34mvolume\033[0m \033[1;33mset\033[0m \033[0;36m--device "Salon Echo"\033[0m \033[0;33m--level\033[0m \033[0;33m50\033[0m
 
@@ -44,6 +46,7 @@ Aide simplifiée pour la catégorie DEVICE.
 INFO_HELP = "Voir aide principale: alexa device -h"
 LIST_HELP = "Voir aide principale: alexa device -h"
 VOLUME_HELP = "Voir aide principale: alexa device -h"
+SNAPSHOT_HELP = "Voir aide principale: alexa device -h"
 
 # Description constant exported for CLI help imports
 DEVICE_DESCRIPTION = (
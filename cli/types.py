@@ -26,6 +26,8 @@ class ContextProtocol(Protocol):
     # Common lazy-loaded resources used widely by commands
     breaker: object
 
+    def breaker_for(self, name: str) -> Any: ...
+
     # Many resources in the concrete Context are exposed as @property
     # (read-only). Declare them as properties in the Protocol so structural
     # subtyping matches and mypy does not complain about settable vs read-only.
@@ -1,33 +1,55 @@
-"""Core modules for Alexa CLI - robust and thread-safe components."""
+"""Core modules for Alexa CLI - robust and thread-safe components.
 
-# Core infrastructure
-from .activity_manager import ActivityManager
+Les managers sont importés à la première utilisation (PEP 562) : importer
+core.circuit_breaker ou core.config ne charge plus tous les managers.
+"""
 
-# Audio package
-from .audio import BluetoothManager, EqualizerManager
-from .circuit_breaker import CircuitBreaker, CircuitBreakerError, CircuitState
+import importlib
+from typing import Any, Dict
 
-# DND Manager
-from .dnd_manager import DNDManager
-
-# Lists package
-from .lists import ListsManager
-
-# Music package
-from .music import PlaybackManager, TuneInManager
-
-# Notifications & Activity managers
-from .notification_manager import NotificationManager
+# Nom exporté -> sous-module qui le définit
+_EXPORTS: Dict[str, str] = {
+    # Core infrastructure
+    "AlexaStateMachine": ".state_machine",
+    "ConnectionState": ".state_machine",
+    "StateTransitionError": ".state_machine",
+    "CircuitBreaker": ".circuit_breaker",
+    "CircuitBreakerError": ".circuit_breaker",
+    "CircuitState": ".circuit_breaker",
+    # Notifications & Activity
+    "NotificationManager": ".notification_manager",
+    "DNDManager": ".dnd_manager",
+    "ActivityManager": ".activity_manager",
+    # Timers package
+    "TimerManager": ".timers",
+    "AlarmManager": ".timers",
+    "ReminderManager": ".timers",
+    # Smart Home package
+    "LightController": ".smart_home",
+    "ThermostatController": ".smart_home",
+    "SmartDeviceController": ".smart_home",
+    # Music package
+    "PlaybackManager": ".music",
+    "TuneInManager": ".music",
+    # Lists package
+    "ListsManager": ".lists",
+    # Audio package
+    "EqualizerManager": ".audio",
+    "BluetoothManager": ".audio",
+    # Settings package
+    "DeviceSettingsManager": ".settings",
+}
 
-# Settings package
-from .settings import DeviceSettingsManager
 
-# Smart Home package
-from .smart_home import LightController, SmartDeviceController, ThermostatController
-from .state_machine import AlexaStateMachine, ConnectionState, StateTransitionError
+def __getattr__(name: str) -> Any:
+    """Importe le sous-module d'un nom exporté au premier accès."""
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
 
-# Timers package
-from .timers import AlarmManager, ReminderManager, TimerManager
 
 __all__ = [
     # Core infrastructure
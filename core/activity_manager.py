@@ -16,10 +16,14 @@ from .state_machine import AlexaStateMachine
 class ActivityManager:
     """Gestionnaire thread-safe de l'historique d'activités."""
 
-    def __init__(self, auth, config, state_machine=None):
+    def __init__(self, auth, config, state_machine=None, device_mgr=None, cache_service=None):
         self.auth = auth
         self.config = config
         self.state_machine: AlexaStateMachine = state_machine or AlexaStateMachine()
+        # DeviceManager du contexte : résolution serial -> appareil via son index
+        self.device_mgr = device_mgr
+        # CacheService du contexte (lecture de l'entrée "devices" sans DeviceManager)
+        self.cache_service = cache_service
         self.breaker = CircuitBreaker(failure_threshold=3, timeout=30)
         self._lock = threading.RLock()
         logger.info("ActivityManager initialisé")
@@ -490,21 +494,24 @@ class ActivityManager:
             Informations de l'appareil ou None si non trouvé
         """
         try:
-            # Accéder au cache des appareils via le contexte
-            # L'ActivityManager n'a pas directement accès au contexte, mais on peut utiliser le cache service
-            # Pour l'instant, on va utiliser une approche simple en important le cache directement
-            import json
-            from pathlib import Path
-
-            cache_file = Path("data/cache/devices.json")
-            if cache_file.exists():
-                with open(cache_file, encoding="utf-8") as f:
-                    cache_data = json.load(f)
-
-                devices = cache_data.get("devices", [])
-                for device in devices:
-                    if device.get("serialNumber") == serial_number:
-                        return device
+            # Index du DeviceManager (O(1) par enregistrement)
+            if self.device_mgr is not None:
+                index = self.device_mgr.get_index()
+                return index.get_by_serial(serial_number) if index else None
+
+            # Sans DeviceManager : entrée "devices" du CacheService (la copie JSON n'est
+            # plus écrite en mode haut débit)
+            from utils.device_index import Device
+
+            if self.cache_service is None:
+                from services.cache_service import CacheService
+
+                self.cache_service = CacheService()
+            cache_data = self.cache_service.get("devices", ignore_ttl=True) or {}
+            for row in cache_data.get("devices", []):
+                device = Device.from_row(row)
+                if device.serial_number == serial_number:
+                    return device
 
             return None
 
@@ -15,6 +15,7 @@ from loguru import logger
 from core.circuit_breaker import CircuitBreaker
 from core.state_machine import AlexaStateMachine, ConnectionState
 from services.cache_service import CacheService
+from services.notification_snapshot import NotificationSnapshotService
 from core.base_manager import BaseManager
 
 
@@ -31,6 +32,7 @@ class AlarmManager(BaseManager[Dict[str, Any]]):
         state_machine: Machine à états pour la connexion
         breaker: Circuit breaker pour la résilience
         cache_service: Service de cache pour la persistance
+        notifications: Snapshot partagé de /api/notifications
         _lock: Verrou pour la thread-safety
         _alarms_cache: Cache mémoire des alarmes
         _cache_timestamp: Timestamp du dernier refresh du cache
@@ -43,6 +45,7 @@ class AlarmManager(BaseManager[Dict[str, Any]]):
         config: Any,
         state_machine: Optional[AlexaStateMachine] = None,
         cache_service: Optional[CacheService] = None,
+        notification_snapshot: Optional[NotificationSnapshotService] = None,
     ) -> None:
         """
         Initialise le gestionnaire d'alarmes.
@@ -52,6 +55,7 @@ class AlarmManager(BaseManager[Dict[str, Any]]):
             config: Instance Config avec paramètres
             state_machine: Machine à états optionnelle (créée si None)
             cache_service: Service de cache optionnel (créé si None)
+            notification_snapshot: Snapshot /api/notifications partagé (créé si None)
         """
         # Backwards-compatible: if auth has a `session` attribute, wrap it
         # into a minimal http_client that exposes get/post/put/delete and csrf.
@@ -83,6 +87,7 @@ class AlarmManager(BaseManager[Dict[str, Any]]):
         # Keep legacy attribute for compatibility
         self.auth = auth
         self.breaker = CircuitBreaker(failure_threshold=3, timeout=30, half_open_max_calls=1)
+        self.notifications = notification_snapshot or NotificationSnapshotService(self.cache_service)
 
         # Backwards-compatible in-memory cache attributes used by existing methods
         self._alarms_cache: Optional[List[Dict[str, Any]]] = None
@@ -187,8 +192,8 @@ class AlarmManager(BaseManager[Dict[str, Any]]):
                 result = response.json()
                 logger.success(f"Alarme créée pour {device_serial}")
 
-                # Invalider le cache
-                self._alarms_cache = None
+                # Invalider le cache (et le snapshot partagé)
+                self._invalidate_notifications()
 
                 return result
 
@@ -244,45 +249,44 @@ class AlarmManager(BaseManager[Dict[str, Any]]):
 
             return alarms
 
-    def _refresh_alarms_cache(self) -> List[Dict[str, Any]]:
+    def _fetch_notifications(self) -> Any:
+        """Appel HTTP brut vers /api/notifications (protégé par le circuit breaker)."""
+        return self.breaker.call(
+            self.http_client.get,
+            f"https://{self.config.alexa_domain}/api/notifications",
+            headers={
+                "Content-Type": "application/json; charset=UTF-8",
+                "Referer": f"https://alexa.{self.config.amazon_domain}/spa/index.html",
+                "csrf": getattr(self.http_client, "csrf", None),
+            },
+            timeout=10,
+        )
+
+    def _invalidate_notifications(self) -> None:
+        """Invalide les caches alarmes et le snapshot partagé après une écriture."""
+        self._alarms_cache = None
+        self.cache_service.invalidate("alarms")
+        self.notifications.invalidate()
+
+    def _refresh_alarms_cache(self, force: bool = False) -> List[Dict[str, Any]]:
         """
-        Rafraîchit le cache des alarmes en effectuant un appel API.
+        Rafraîchit le cache des alarmes depuis le snapshot partagé des notifications.
 
-        Les alarmes sont récupérées depuis /api/notifications et filtrées par type "Alarm".
+        Les alarmes sont extraites du snapshot /api/notifications (type "Alarm").
+        Le snapshot n'est retéléchargé que s'il est expiré ou si force=True.
+
+        Args:
+            force: Forcer le téléchargement d'un nouveau snapshot
 
         Returns:
             Liste des alarmes ou liste vide en cas d'erreur
         """
         try:
-            logger.debug("🌐 Récupération de toutes les alarmes depuis l'API notifications")
-
-            response = self.breaker.call(
-                self.http_client.get,
-                f"https://{self.config.alexa_domain}/api/notifications",
-                headers={
-                    "Content-Type": "application/json; charset=UTF-8",
-                    "Referer": f"https://alexa.{self.config.amazon_domain}/spa/index.html",
-                    "csrf": getattr(self.http_client, "csrf", None),
-                },
-                timeout=10,
-            )
-            response.raise_for_status()
+            logger.debug("🌐 Récupération de toutes les alarmes depuis le snapshot notifications")
 
-            # Gérer le cas où la réponse est vide
-            if not response.content.strip():
-                logger.info("Aucune alarme trouvée (réponse vide)")
-                alarms = []
-            else:
-                data = response.json()
-                # Les alarmes sont dans la liste des notifications
-                notifications = data.get("notifications", [])
-
-                # Filtrer pour ne garder que les alarmes (type="Alarm")
-                alarms = [
-                    notification
-                    for notification in notifications
-                    if notification.get("type") == "Alarm"
-                ]
+            snapshot = self.notifications.get_snapshot(self._fetch_notifications, force_refresh=force)
+            # Filtrer pour ne garder que les alarmes (type="Alarm")
+            alarms = snapshot.select("Alarm")
 
             # Mise à jour cache mémoire (Niveau 1)
             self._alarms_cache = alarms
@@ -340,8 +344,8 @@ class AlarmManager(BaseManager[Dict[str, Any]]):
 
                 logger.success(f"Alarme {alarm_id} supprimée")
 
-                # Invalider le cache
-                self._alarms_cache = None
+                # Invalider le cache (et le snapshot partagé)
+                self._invalidate_notifications()
 
                 return True
 
@@ -402,8 +406,8 @@ class AlarmManager(BaseManager[Dict[str, Any]]):
 
                 logger.success(f"Alarme {alarm_id} modifiée")
 
-                # Invalider le cache
-                self._alarms_cache = None
+                # Invalider le cache (et le snapshot partagé)
+                self._invalidate_notifications()
 
                 return True
 
@@ -454,8 +458,8 @@ class AlarmManager(BaseManager[Dict[str, Any]]):
                 action = "activée" if enabled else "désactivée"
                 logger.success(f"Alarme {alarm_id} {action}")
 
-                # Invalider le cache
-                self._alarms_cache = None
+                # Invalider le cache (et le snapshot partagé)
+                self._invalidate_notifications()
 
                 return True
 
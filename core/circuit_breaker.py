@@ -6,12 +6,22 @@ Implémentation thread-safe du pattern Circuit Breaker qui :
 - Ouvre le circuit après un seuil d'erreurs
 - Permet des tentatives de récupération
 - Protège le système contre les surcharges
+
+Deux modes de déclenchement :
+- par défaut : N échecs consécutifs (failure_threshold)
+- fenêtre glissante (window_size et/ou window_seconds) : taux d'échec sur
+  les derniers appels, avec percentiles de latence dans get_stats()
+
+En état CLOSED, la vérification d'admission et l'enregistrement d'un
+succès ne prennent pas le verrou.
 """
 
+import math
 import threading
 import time
+from collections import deque
 from enum import Enum, auto
-from typing import Any, Callable, TypeVar
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional, Tuple, TypeVar
 
 # Utiliser logger standard si loguru n'est pas disponible
 try:
@@ -24,6 +34,15 @@ except ImportError:
 
 T = TypeVar("T")
 
+# Nombre maximal d'appels conservés par une fenêtre purement temporelle
+MAX_WINDOW_CALLS = 1000
+
+
+def _percentile(sorted_values: List[float], pct: float) -> float:
+    """Percentile (rang le plus proche) d'une liste triée non vide."""
+    rank = max(1, math.ceil(pct / 100 * len(sorted_values)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
 
 class CircuitState(Enum):
     """États du circuit breaker."""
@@ -47,6 +66,9 @@ class CircuitBreaker:
         @breaker.protected
         def api_call():
             return requests.get("https://api.example.com")
+
+        # Mode taux : ouvre à 50% d'échecs sur les 20 derniers appels (10 minimum)
+        breaker = CircuitBreaker(window_size=20, failure_rate_threshold=0.5, min_calls=10)
     """
 
     def __init__(
@@ -54,14 +76,22 @@ class CircuitBreaker:
         failure_threshold: int = 5,
         timeout: float = 60.0,
         half_open_max_calls: int = 1,
+        window_size: Optional[int] = None,
+        window_seconds: Optional[float] = None,
+        failure_rate_threshold: float = 0.5,
+        min_calls: int = 10,
     ):
         """
         Initialise le circuit breaker.
 
         Args:
-            failure_threshold: Nombre d'échecs avant d'ouvrir le circuit
+            failure_threshold: Nombre d'échecs consécutifs avant d'ouvrir le circuit
             timeout: Durée en secondes avant de tenter la récupération
             half_open_max_calls: Nombre d'appels autorisés en mode HALF_OPEN
+            window_size: Fenêtre glissante sur les N derniers appels (active le mode taux)
+            window_seconds: Fenêtre glissante sur les T dernières secondes (active le mode taux)
+            failure_rate_threshold: Taux d'échec (0-1) qui ouvre le circuit en mode fenêtre
+            min_calls: Nombre minimal d'appels dans la fenêtre avant de décider
         """
         self._failure_threshold = failure_threshold
         self._timeout = timeout
@@ -72,11 +102,23 @@ class CircuitBreaker:
         self._last_failure_time: float = 0
         self._half_open_calls = 0
 
+        # Fenêtre glissante : (horodatage perf_counter, succès, latence en secondes)
+        self._window_seconds = window_seconds
+        self._failure_rate_threshold = failure_rate_threshold
+        self._min_calls = min_calls
+        self._window: Optional[Deque[Tuple[float, bool, float]]] = None
+        if window_size is not None or window_seconds is not None:
+            self._window = deque(maxlen=window_size or MAX_WINDOW_CALLS)
+
         self._lock = threading.RLock()
 
-        logger.info(
-            f"🔧 Circuit Breaker initialisé: threshold={failure_threshold}, timeout={timeout}s"
-        )
+        if self._window is None:
+            logger.info(f"🔧 Circuit Breaker initialisé: threshold={failure_threshold}, timeout={timeout}s")
+        else:
+            logger.info(
+                f"🔧 Circuit Breaker initialisé: taux={failure_rate_threshold:.0%} "
+                f"(fenêtre={window_size or '-'} appels/{window_seconds or '-'}s), timeout={timeout}s"
+            )
 
     @property
     def state(self) -> CircuitState:
@@ -110,6 +152,47 @@ class CircuitBreaker:
         Raises:
             CircuitBreakerError: Si le circuit est ouvert
         """
+        self._before_call()
+        start = time.perf_counter() if self._window is not None else 0.0
+
+        # Exécuter la fonction
+        try:
+            result = func(*args, **kwargs)
+        except Exception:
+            self._on_failure(start)
+            raise
+        self._on_success(start)
+        return result
+
+    async def call_async(self, func: Callable[..., Awaitable[T]], *args: Any, **kwargs: Any) -> T:
+        """
+        Variante asyncio de call() : attend la coroutine func(*args, **kwargs).
+
+        Raises:
+            CircuitBreakerError: Si le circuit est ouvert
+        """
+        self._before_call()
+        start = time.perf_counter() if self._window is not None else 0.0
+
+        try:
+            result = await func(*args, **kwargs)
+        except Exception:
+            self._on_failure(start)
+            raise
+        self._on_success(start)
+        return result
+
+    def _before_call(self) -> None:
+        """
+        Vérifie que le circuit autorise un appel (transition OPEN -> HALF_OPEN si timeout écoulé).
+
+        Raises:
+            CircuitBreakerError: Si le circuit est ouvert ou HALF_OPEN saturé
+        """
+        # Chemin rapide : la lecture de l'état est atomique, pas de verrou en régime nominal
+        if self._state is CircuitState.CLOSED:
+            return
+
         with self._lock:
             # Vérifier si on peut tenter une récupération
             if self._state == CircuitState.OPEN:
@@ -129,26 +212,43 @@ class CircuitBreaker:
                     raise CircuitBreakerError("Circuit HALF_OPEN saturé")
                 self._half_open_calls += 1
 
-        # Exécuter la fonction
-        try:
-            result = func(*args, **kwargs)
-            self._on_success()
-            return result
-        except Exception as e:
-            self._on_failure()
-            raise e
-
-    def _on_success(self) -> None:
+    def _record(self, start: float, success: bool) -> None:
+        """Ajoute l'appel à la fenêtre glissante (deque.append est atomique)."""
+        if self._window is not None:
+            now = time.perf_counter()
+            self._window.append((now, success, now - start))
+
+    def _window_calls(self) -> List[Tuple[float, bool, float]]:
+        """Appels de la fenêtre, limités aux window_seconds dernières secondes si défini."""
+        if self._window is None:
+            return []
+        calls = list(self._window)
+        if self._window_seconds is not None:
+            cutoff = time.perf_counter() - self._window_seconds
+            calls = [entry for entry in calls if entry[0] >= cutoff]
+        return calls
+
+    def _on_success(self, start: float = 0.0) -> None:
         """Appelé après un succès."""
+        self._record(start, True)
+
+        # Chemin rapide : rien à mettre à jour en régime nominal
+        if self._state is CircuitState.CLOSED and self._failure_count == 0:
+            return
+
         with self._lock:
             if self._state == CircuitState.HALF_OPEN:
                 logger.log("SUCCESS", "Circuit HALF_OPEN  CLOSED (rcupration russie)")
                 self._state = CircuitState.CLOSED
+                if self._window is not None:
+                    self._window.clear()
 
             self._failure_count = 0
 
-    def _on_failure(self) -> None:
+    def _on_failure(self, start: float = 0.0) -> None:
         """Appelé après un échec."""
+        self._record(start, False)
+
         with self._lock:
             self._failure_count += 1
             self._last_failure_time = time.time()
@@ -158,10 +258,51 @@ class CircuitBreaker:
                 self._state = CircuitState.OPEN
                 return
 
-            if self._failure_count >= self._failure_threshold:
-                logger.error(f"❌ Circuit CLOSED → OPEN ({self._failure_count} échecs consécutifs)")
+            if self._state != CircuitState.CLOSED:
+                return
+
+            if self._window is None:
+                if self._failure_count >= self._failure_threshold:
+                    logger.error(f"❌ Circuit CLOSED → OPEN ({self._failure_count} échecs consécutifs)")
+                    self._state = CircuitState.OPEN
+                return
+
+            calls = self._window_calls()
+            failures = sum(1 for _, success, _ in calls if not success)
+            if len(calls) >= self._min_calls and failures / len(calls) >= self._failure_rate_threshold:
+                logger.error(f"❌ Circuit CLOSED → OPEN ({failures}/{len(calls)} échecs dans la fenêtre)")
                 self._state = CircuitState.OPEN
 
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Retourne l'état du circuit (métriques).
+
+        Returns:
+            Dict avec state, failure_count, failure_threshold, timeout et, en mode
+            fenêtre, window {calls, failures, failure_rate, p50_ms, p95_ms, p99_ms}
+        """
+        with self._lock:
+            stats: Dict[str, Any] = {
+                "state": self._state.name,
+                "failure_count": self._failure_count,
+                "failure_threshold": self._failure_threshold,
+                "timeout": self._timeout,
+            }
+
+        if self._window is not None:
+            calls = self._window_calls()
+            failures = sum(1 for _, success, _ in calls if not success)
+            window: Dict[str, Any] = {
+                "calls": len(calls),
+                "failures": failures,
+                "failure_rate": round(failures / len(calls), 3) if calls else 0.0,
+            }
+            latencies = sorted(latency for _, _, latency in calls)
+            for pct in (50, 95, 99):
+                window[f"p{pct}_ms"] = round(_percentile(latencies, pct) * 1000, 2) if latencies else None
+            stats["window"] = window
+        return stats
+
     def reset(self) -> None:
         """Réinitialise le circuit breaker."""
         with self._lock:
@@ -170,6 +311,8 @@ class CircuitBreaker:
             self._failure_count = 0
             self._half_open_calls = 0
             self._last_failure_time = 0
+            if self._window is not None:
+                self._window.clear()
 
     def protected(self, func: Callable[..., T]) -> Callable[..., T]:
         """
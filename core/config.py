@@ -68,6 +68,10 @@ class Config:
         # === Durées de vie ===
         self.cookie_lifetime_seconds = 24 * 60 * 60  # 24 heures
         self.devlist_cache_seconds = 3600  # 1 heure
+        # Âge maximal d'une liste (appareils, smart home) servie périmée pendant
+        # son rafraîchissement en arrière-plan (0 = désactivé, toujours attendre l'API ;
+        # ex. MAXSTALENESS=86400 pour l'activer)
+        self.max_staleness_seconds = self._get_int_env("MAXSTALENESS", 0, min_val=0)
 
         # === Configuration du volume ===
         self.speak_volume = self._get_int_env("SPEAKVOL", 0, min_val=0, max_val=100)
@@ -88,6 +92,12 @@ class Config:
         self.api_max_retries = 3
         self.api_retry_delay_seconds = 1
 
+        # === Session HTTP partagée (pool de connexions, cache HTTP par endpoint) ===
+        self.http_pool_connections = self._get_int_env("HTTPPOOL", 10, min_val=1)
+        self.http_pool_maxsize = self._get_int_env("HTTPPOOLMAX", 20, min_val=1)
+        # Cache HTTP SQLite (TTL par endpoint de OptimizedHTTPSession.CACHE_TTL) : 0 = désactivé
+        self.http_cache_enabled = self._get_int_env("HTTPCACHE", 0, min_val=0, max_val=1) == 1
+
         # === Circuit Breaker ===
         self.circuit_breaker_threshold = 5
         self.circuit_breaker_timeout_seconds = 60
@@ -235,6 +245,9 @@ class Config:
         logger.debug(f"  - Répertoire temp: {self.tmp_dir}")
         logger.debug(f"  - Timeout API: {self.api_timeout_seconds}s")
         logger.debug(f"  - Max retries: {self.api_max_retries}")
+        logger.debug(
+            f"  - Pool HTTP: {self.http_pool_connections}/{self.http_pool_maxsize} (cache: {self.http_cache_enabled})"
+        )
 
     def get_api_base_url(self) -> str:
         """Retourne l'URL de base de l'API Alexa."""
@@ -4,28 +4,36 @@ Gestionnaire des appareils Alexa.
 Ce module gère toutes les opérations liées aux appareils Amazon Alexa :
 - Récupération de la liste des appareils
 - Informations détaillées sur un appareil
-- Recherche d'appareils par nom
+- Recherche d'appareils par nom (index O(1), voir utils.device_index)
 - Gestion du cache multi-niveaux (mémoire + disque)
 
 Le DeviceManager maintient un cache hybride pour optimiser les performances :
 - Niveau 1 : Cache mémoire (rapide, volatile)
 - Niveau 2 : Cache disque persistant (survit aux redémarrages)
 
+En mode stale-while-revalidate, une liste périmée (dans la limite de
+max_staleness) est servie immédiatement et un unique rafraîchissement est
+lancé en arrière-plan.
+
 Auteur: M@nu
 Date: 7 octobre 2025
 """
 
 import time
 from threading import RLock
-from typing import TYPE_CHECKING, Any, Dict, List, Optional
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
 
 from loguru import logger
 
 from services.cache_service import CacheService
+from utils.background_refresh import background_refresher
+from utils.device_index import Device, DeviceIndex
+from utils.single_flight import request_key, single_flight
 
 if TYPE_CHECKING:
     from alexa_auth.alexa_auth import AlexaAuth
     from core.state_machine import AlexaStateMachine
+    from utils.async_http import AsyncAlexaClient
 
 
 class DeviceManager:
@@ -37,10 +45,13 @@ class DeviceManager:
     Attributes:
         auth: Gestionnaire d'authentification AlexaAuth
         state_machine: Machine d'états AlexaStateMachine
-        _devices_cache: Cache des appareils (thread-safe)
+        _devices_cache: Cache des appareils, enregistrements Device compacts (thread-safe)
         _cache_timestamp: Timestamp du dernier refresh du cache
         _cache_ttl: Durée de vie du cache en secondes (défaut: 300s = 5min)
         _lock: Verrou pour accès thread-safe au cache
+        _index: Index nom/serial/type/famille de la liste en cache
+        stale_while_revalidate: Servir une liste périmée et rafraîchir en arrière-plan
+        max_staleness: Âge maximal (secondes) d'une liste servie périmée
 
     Example:
         >>> device_mgr = DeviceManager(auth, state_machine)
@@ -51,12 +62,18 @@ class DeviceManager:
         >>> print(f"Serial: {salon['serialNumber']}")
     """
 
+    # Score minimal d'une correspondance partielle (0.6 = la requête est un fragment du nom,
+    # voir utils.name_search) : une faute de frappe ne doit pas viser un autre appareil
+    PARTIAL_MIN_SCORE = 0.6
+
     def __init__(
         self,
         auth: "AlexaAuth",
         state_machine: "AlexaStateMachine",
         cache_ttl: int = 300,
         cache_service: Optional[CacheService] = None,
+        stale_while_revalidate: bool = False,
+        max_staleness: float = 86400,
     ):
         """
         Initialise le gestionnaire d'appareils.
@@ -66,6 +83,10 @@ class DeviceManager:
             state_machine: Instance AlexaStateMachine pour gérer l'état
             cache_ttl: Durée de vie du cache mémoire en secondes (défaut: 300)
             cache_service: Service de cache persistant (créé si None)
+            stale_while_revalidate: Servir une liste périmée immédiatement et la
+                rafraîchir en arrière-plan (défaut: False)
+            max_staleness: Au-delà de cet âge (secondes), la liste n'est plus servie
+                périmée et get_devices() attend l'API (défaut: 24h)
 
         Raises:
             ValueError: Si auth ou state_machine est None
@@ -79,15 +100,23 @@ class DeviceManager:
         self.state_machine: AlexaStateMachine = state_machine
         self._cache_ttl = cache_ttl
         self._cache_service = cache_service or CacheService()
+        self.stale_while_revalidate = stale_while_revalidate
+        self.max_staleness = max_staleness
 
         # Cache mémoire thread-safe (Niveau 1)
-        self._devices_cache: Optional[List[Dict[str, Any]]] = None
+        self._devices_cache: Optional[List[Device]] = None
         self._cache_timestamp: float = 0.0
         self._lock: RLock = RLock()
 
+        # Index de la dernière liste retournée par get_devices() (mis à jour de façon incrémentale)
+        self._index = DeviceIndex()
+        self._indexed_devices: Optional[List[Device]] = None
+        # Index de recherche lu avec le cache disque (évite de le reconstruire au démarrage)
+        self._search_state: Optional[Dict[str, Any]] = None
+
         logger.debug(f"DeviceManager initialisé (cache_ttl={cache_ttl}s)")
 
-    def get_devices(self, force_refresh: bool = False) -> Optional[List[Dict[str, Any]]]:
+    def get_devices(self, force_refresh: bool = False) -> Optional[List[Device]]:
         """
         Récupère la liste de tous les appareils Alexa.
 
@@ -100,6 +129,10 @@ class DeviceManager:
         un force_refresh. Il n'a pas de durée d'expiration et est mis à jour
         uniquement lors d'un appel API.
 
+        En mode stale-while-revalidate, une liste plus vieille que le TTL mais
+        plus jeune que max_staleness est retournée immédiatement et un
+        rafraîchissement unique est lancé en arrière-plan.
+
         Args:
             force_refresh: Force le refresh du cache (ignore tous les niveaux)
 
@@ -111,26 +144,122 @@ class DeviceManager:
             >>> online_devices = [d for d in devices if d.get('online')]
             >>> print(f"{len(online_devices)} appareils en ligne")
         """
+        if not force_refresh:
+            cached = self._get_cached_devices()
+            if cached is not None:
+                return cached
+
+        # Niveau 3 : API, hors verrou pour que les appels concurrents partagent une seule requête
+        return self._api_fallback(self._refresh_cache())
+
+    async def get_devices_async(
+        self, client: "AsyncAlexaClient", force_refresh: bool = False
+    ) -> Optional[List[Device]]:
+        """
+        Variante asyncio de get_devices() (mêmes niveaux de cache, appel API via client).
+
+        Args:
+            client: Client HTTP asynchrone
+            force_refresh: Force le refresh du cache (ignore tous les niveaux)
+
+        Returns:
+            Liste des appareils ou None en cas d'erreur
+        """
+        if not force_refresh:
+            cached = self._get_cached_devices()
+            if cached is not None:
+                return cached
+
+        url, params = self._devices_endpoint()
+        try:
+            response = await client.get(url, params=params)
+            if response.status_code != 200:
+                logger.error(f"Échec de récupération des appareils (status: {response.status_code})")
+                devices = None
+            else:
+                devices = self._store_devices(response.json().get("devices", []))
+        except Exception:
+            logger.exception("Erreur lors de la récupération des appareils")
+            devices = None
+        return self._api_fallback(devices)
+
+    def _get_cached_devices(self) -> Optional[List[Device]]:
+        """
+        Niveaux 1 et 2 : cache mémoire, liste périmée (stale-while-revalidate) ou cache disque.
+
+        Returns:
+            Liste des appareils ou None si l'API doit être appelée
+        """
         with self._lock:
             # Niveau 1 : Cache mémoire (avec TTL)
-            if not force_refresh and self._is_cache_valid() and self._devices_cache is not None:
+            if self._is_cache_valid() and self._devices_cache is not None:
                 logger.debug(f"✅ Cache mémoire: {len(self._devices_cache)} appareils")
                 return self._devices_cache
 
+            if self.stale_while_revalidate:
+                # L'âge du cache disque est borné par max_staleness
+                return self._get_stale_devices()
+
             # Niveau 2 : Cache disque (SANS TTL - toujours valide si présent)
             # Utilisé uniquement si cache mémoire expiré/absent
-            if not force_refresh:
-                disk_cache = self._cache_service.get("devices", ignore_ttl=True)
-                if disk_cache and "devices" in disk_cache:
-                    logger.debug(
-                        f"💾 Cache disque: {len(disk_cache['devices'])} appareils (fallback)"
-                    )
-                    self._devices_cache = disk_cache["devices"]
-                    self._cache_timestamp = time.time()
+            disk_cache = self._cache_service.get("devices", ignore_ttl=True)
+            if disk_cache and "devices" in disk_cache:
+                logger.debug(
+                    f"💾 Cache disque: {len(disk_cache['devices'])} appareils (fallback)"
+                )
+                self._load_disk_entry(disk_cache)
+                self._cache_timestamp = time.time()
+                return self._devices_cache
+            return None
+
+    def _api_fallback(self, devices: Optional[List[Device]]) -> Optional[List[Device]]:
+        """Sert la liste périmée si l'API a échoué en mode stale-while-revalidate."""
+        if devices is None and self.stale_while_revalidate:
+            with self._lock:
+                if self._devices_cache is not None:
+                    logger.warning("API indisponible, liste d'appareils périmée servie")
                     return self._devices_cache
+        return devices
+
+    def _get_stale_devices(self) -> Optional[List[Device]]:
+        """
+        Retourne la dernière liste connue (mémoire puis disque) si elle est assez récente.
 
-            # Niveau 3 : API
-            return self._refresh_cache()
+        Déclenche un rafraîchissement en arrière-plan si la liste a dépassé le TTL.
+        Doit être appelé sous self._lock.
+
+        Returns:
+            Liste des appareils ou None si aucune liste assez récente
+        """
+        if self._devices_cache is None:
+            disk_cache = self._cache_service.get("devices", ignore_ttl=True)
+            if disk_cache and "devices" in disk_cache:
+                age = self._cache_service.get_age("devices") or 0.0
+                self._load_disk_entry(disk_cache)
+                self._cache_timestamp = time.time() - age
+
+        if self._devices_cache is None:
+            return None
+
+        age = time.time() - self._cache_timestamp
+        if age > self.max_staleness:
+            logger.debug(f"Liste d'appareils trop ancienne ({age:.0f}s > {self.max_staleness}s)")
+            return None
+
+        if age >= self._cache_ttl:
+            background_refresher.trigger("devices", self._refresh_cache)
+        logger.debug(f"⏳ Liste d'appareils servie (âge: {age:.0f}s): {len(self._devices_cache)} appareils")
+        return self._devices_cache
+
+    def _load_disk_entry(self, disk_cache: Dict[str, Any]) -> None:
+        """
+        Charge la liste du cache disque en mémoire (doit être appelé sous self._lock).
+
+        Les dicts API sont convertis en enregistrements compacts (Device) ; l'index
+        de recherche persisté est gardé pour la prochaine synchronisation de l'index.
+        """
+        self._devices_cache = [Device.from_row(row) for row in disk_cache["devices"]]
+        self._search_state = disk_cache.get("search_index")
 
     def _is_cache_valid(self) -> bool:
         """
@@ -150,59 +279,111 @@ class DeviceManager:
 
         return is_valid
 
-    def _refresh_cache(self) -> Optional[List[Dict[str, Any]]]:
+    def _refresh_cache(self) -> Optional[List[Device]]:
         """
         Rafraîchit le cache en effectuant un appel API.
 
-        Sauvegarde dans cache mémoire ET cache disque.
+        Sauvegarde dans cache mémoire ET cache disque. Les appels concurrents
+        (threads, rafraîchissement en arrière-plan) partagent la même requête.
 
         Returns:
             Liste des appareils ou None en cas d'erreur
         """
+        url, params = self._devices_endpoint()
         try:
-            logger.debug("🌐 Récupération de la liste des appareils depuis l'API")
-
-            # Appel API pour récupérer les appareils (type: ignore pour auth qui est Any)
-            response = self.auth.get(  # type: ignore[attr-defined]
-                f"https://alexa.{self.auth.amazon_domain}/api/devices-v2/device",  # type: ignore[attr-defined]
-                params={"cached": "false"},
-            )
-
-            if not response or response.status_code != 200:  # type: ignore[attr-defined]
-                logger.error(
-                    f"Échec de récupération des appareils (status: {response.status_code if response else 'None'})"  # type: ignore[attr-defined]
-                )
-                return None
+            devices = single_flight.do(request_key("GET", url, params), lambda: self._fetch_devices(url, params))
+        except Exception:
+            logger.exception("Erreur lors de la récupération des appareils")
+            return None
+        if devices is None:
+            return None
+        return self._store_devices(devices)
 
-            data: Dict[str, Any] = response.json()  # type: ignore[attr-defined]
-            devices: List[Dict[str, Any]] = data.get("devices", [])
+    def _devices_endpoint(self) -> Tuple[str, Dict[str, str]]:
+        """Retourne l'URL et les paramètres de l'API des appareils."""
+        return (
+            f"https://alexa.{self.auth.amazon_domain}/api/devices-v2/device",  # type: ignore[attr-defined]
+            {"cached": "false"},
+        )
 
+    def _store_devices(self, payload: List[Dict[str, Any]]) -> List[Device]:
+        """Met à jour le cache mémoire (niveau 1) et le cache disque (niveau 2)."""
+        devices = [Device.from_dict(data) for data in payload]
+        with self._lock:
             # Mise à jour cache mémoire (Niveau 1)
             self._devices_cache = devices
             self._cache_timestamp = time.time()
+            self._sync_index(devices)
+            search_state = self._index.search_state()
 
-            # Mise à jour cache disque (Niveau 2) - TTL 1h
-            self._cache_service.set("devices", {"devices": devices}, ttl_seconds=3600)
+        # Mise à jour cache disque (Niveau 2) - TTL 1h, dicts API (lisibles) et index de recherche
+        self._cache_service.set("devices", {"devices": payload, "search_index": search_state}, ttl_seconds=3600)
 
-            logger.info(f"✅ {len(devices)} appareils récupérés et mis en cache (mémoire + disque)")
-            return devices
+        logger.info(f"✅ {len(devices)} appareils récupérés et mis en cache (mémoire + disque)")
+        return devices
 
-        except Exception:
-            logger.exception("Erreur lors de la récupération des appareils")
+    def _fetch_devices(self, url: str, params: Dict[str, str]) -> Optional[List[Dict[str, Any]]]:
+        """
+        Appelle l'API des appareils.
+
+        Returns:
+            Liste des appareils ou None si la réponse est invalide
+        """
+        logger.debug("🌐 Récupération de la liste des appareils depuis l'API")
+
+        # Appel API pour récupérer les appareils (type: ignore pour auth qui est Any)
+        response = self.auth.get(url, params=params)  # type: ignore[attr-defined]
+
+        if not response or response.status_code != 200:  # type: ignore[attr-defined]
+            logger.error(
+                f"Échec de récupération des appareils (status: {response.status_code if response else 'None'})"  # type: ignore[attr-defined]
+            )
             return None
 
-    def find_device_by_name(self, device_name: str) -> Optional[Dict[str, Any]]:
+        data: Dict[str, Any] = response.json()  # type: ignore[attr-defined]
+        return data.get("devices", [])
+
+    def get_index(self) -> Optional[DeviceIndex]:
+        """
+        Retourne l'index de la liste d'appareils courante.
+
+        L'index suit la liste retournée par get_devices() : il est mis à jour
+        (incrémentalement) dès que cette liste change.
+
+        Returns:
+            DeviceIndex à jour, ou None si aucun appareil n'est disponible
+        """
+        devices = self.get_devices()
+        if not devices:
+            return None
+        with self._lock:
+            self._sync_index(devices)
+        return self._index
+
+    def _sync_index(self, devices: List[Device]) -> None:
+        """Met l'index à jour si la liste a changé (doit être appelé sous self._lock)."""
+        if devices is self._indexed_devices:
+            return
+        self._index.update(devices, search_state=self._search_state)
+        self._indexed_devices = devices
+        self._search_state = None
+
+    def find_device_by_name(self, device_name: str, partial: bool = True) -> Optional[Device]:
         """
         Recherche un appareil par son nom (accountName).
 
-        La recherche est insensible à la casse et cherche une correspondance exacte.
-        Si aucune correspondance exacte n'est trouvée, cherche une correspondance partielle.
+        La recherche est insensible à la casse et cherche une correspondance exacte
+        (O(1) via l'index). Si aucune correspondance exacte n'est trouvée et que
+        partial est vrai, retourne le meilleur résultat de la recherche classée
+        parmi les noms contenant la requête (accents ignorés, débuts de mots,
+        fragment) ; un nom seulement ressemblant n'est pas retenu.
 
         Args:
             device_name: Nom de l'appareil à rechercher
+            partial: Accepter une correspondance partielle en repli (défaut: True)
 
         Returns:
-            Dictionnaire de l'appareil ou None si non trouvé
+            Appareil (lisible comme le dict API) ou None si non trouvé
 
         Example:
             >>> device = device_mgr.find_device_by_name("Salon")
@@ -215,39 +396,38 @@ class DeviceManager:
             logger.warning("Nom d'appareil vide fourni à find_device_by_name")
             return None
 
-        devices = self.get_devices()
-        if not devices:
+        index = self.get_index()
+        if index is None:
             logger.warning("Aucun appareil disponible pour la recherche")
             return None
 
-        device_name_lower = device_name.lower()
-
         # Correspondance exacte (insensible à la casse)
-        for device in devices:
-            account_name = device.get("accountName", "")
-            if account_name.lower() == device_name_lower:
-                logger.debug(f"Appareil trouvé (exact): {account_name}")
-                return device
-
-        # Correspondance partielle (fallback)
-        for device in devices:
-            account_name = device.get("accountName", "")
-            if device_name_lower in account_name.lower():
-                logger.debug(f"Appareil trouvé (partiel): {account_name}")
+        device = index.get_by_name(device_name)
+        if device is not None:
+            logger.debug(f"Appareil trouvé (exact): {device.account_name}")
+            return device
+
+        # Correspondance partielle (fallback), meilleur score : les noms seulement
+        # proches (fautes de frappe, trigrammes) ne sont jamais retenus
+        if partial:
+            ranked = index.search_ranked(device_name, limit=1, min_score=self.PARTIAL_MIN_SCORE)
+            if ranked:
+                device, score = ranked[0]
+                logger.debug(f"Appareil trouvé (partiel, score {score}): {device.account_name}")
                 return device
 
         logger.warning(f"Appareil '{device_name}' non trouvé")
         return None
 
-    def find_device_by_serial(self, serial_number: str) -> Optional[Dict[str, Any]]:
+    def find_device_by_serial(self, serial_number: str) -> Optional[Device]:
         """
-        Recherche un appareil par son numéro de série.
+        Recherche un appareil par son numéro de série (O(1) via l'index).
 
         Args:
             serial_number: Numéro de série de l'appareil
 
         Returns:
-            Dictionnaire de l'appareil ou None si non trouvé
+            Appareil (lisible comme le dict API) ou None si non trouvé
 
         Example:
             >>> device = device_mgr.find_device_by_serial("G091UC0123456789")
@@ -257,14 +437,14 @@ class DeviceManager:
             logger.warning("Serial number vide fourni à find_device_by_serial")
             return None
 
-        devices = self.get_devices()
-        if not devices:
+        index = self.get_index()
+        if index is None:
             return None
 
-        for device in devices:
-            if device.get("serialNumber") == serial_number:
-                logger.debug(f"Appareil trouvé par serial: {device.get('accountName')}")
-                return device
+        device = index.get_by_serial(serial_number)
+        if device is not None:
+            logger.debug(f"Appareil trouvé par serial: {device.account_name}")
+            return device
 
         logger.warning(f"Appareil avec serial '{serial_number}' non trouvé")
         return None
@@ -285,13 +465,13 @@ class DeviceManager:
         """
         device = self.find_device_by_name(device_name)
         if device:
-            serial = device.get("serialNumber")
+            serial = device.serial_number
             logger.debug(f"Serial pour '{device_name}': {serial}")
             return serial
 
         return None
 
-    def get_online_devices(self) -> List[Dict[str, Any]]:
+    def get_online_devices(self) -> List[Device]:
         """
         Récupère uniquement les appareils en ligne.
 
@@ -306,11 +486,11 @@ class DeviceManager:
         if not devices:
             return []
 
-        online = [d for d in devices if d.get("online", False)]
+        online = [device for device in devices if device.get("online", False)]
         logger.debug(f"{len(online)}/{len(devices)} appareils en ligne")
         return online
 
-    def get_device_info(self, device_name: str) -> Optional[Dict[str, Any]]:
+    def get_device_info(self, device_name: str) -> Optional[Device]:
         """
         Récupère les informations complètes d'un appareil.
 
@@ -318,7 +498,7 @@ class DeviceManager:
             device_name: Nom de l'appareil
 
         Returns:
-            Dictionnaire avec toutes les infos ou None si non trouvé
+            Appareil (dict API complet via device.raw) ou None si non trouvé
 
         Example:
             >>> info = device_mgr.get_device_info("Salon")
@@ -342,6 +522,9 @@ class DeviceManager:
         with self._lock:
             self._devices_cache = None
             self._cache_timestamp = 0.0
+            self._index.clear()
+            self._indexed_devices = None
+            self._search_state = None
             self._cache_service.invalidate("devices")
             logger.info("🗑️ Cache appareils invalidé (mémoire + disque)")
 
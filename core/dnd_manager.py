@@ -3,13 +3,16 @@ Gestionnaire DND (Do Not Disturb) Alexa - Thread-safe.
 """
 
 import threading
-from typing import Dict, Optional
+from typing import TYPE_CHECKING, Dict, Optional
 
 from loguru import logger
 
 from .circuit_breaker import CircuitBreaker
 from .state_machine import AlexaStateMachine
 
+if TYPE_CHECKING:
+    from utils.async_http import AsyncAlexaClient
+
 
 class DNDManager:
     """Gestionnaire thread-safe du mode Ne Pas Déranger."""
@@ -35,15 +38,54 @@ class DNDManager:
                     timeout=10,
                 )
                 response.raise_for_status()
-                statuses = response.json().get("doNotDisturbDeviceStatusList", [])
-                for status in statuses:
-                    if status.get("deviceSerialNumber") == device_serial:
-                        return status
-                return None
+                return self.find_dnd_status(response.json(), device_serial)
             except Exception as e:
                 logger.error(f"Erreur récupération DND: {e}")
                 return None
 
+    async def get_dnd_status_async(self, client: "AsyncAlexaClient", device_serial: str) -> Optional[Dict]:
+        """
+        Variante asyncio de get_dnd_status().
+
+        L'endpoint couvre tous les appareils : les appels simultanés pour
+        plusieurs appareils partagent une seule requête.
+        """
+        data = await self.get_all_dnd_status_async(client)
+        return None if data is None else self.find_dnd_status(data, device_serial)
+
+    async def get_all_dnd_status_async(self, client: "AsyncAlexaClient") -> Optional[Dict]:
+        """
+        Récupère la réponse /api/dnd/status de tout le compte (voir find_dnd_status).
+
+        Permet d'interroger l'endpoint une seule fois pour plusieurs appareils.
+        """
+        if not self.state_machine.can_execute_commands:
+            return None
+        try:
+            response = await self.breaker.call_async(client.get, f"https://{self.config.alexa_domain}/api/dnd/status")
+            response.raise_for_status()
+            return response.json()
+        except Exception as e:
+            logger.error(f"Erreur récupération DND: {e}")
+            return None
+
+    @staticmethod
+    def find_dnd_status(data: Dict, device_serial: str) -> Optional[Dict]:
+        """
+        Extrait le statut DND d'un appareil de la réponse /api/dnd/status.
+
+        Args:
+            data: Réponse de get_all_dnd_status_async()
+            device_serial: Numéro de série de l'appareil
+
+        Returns:
+            Statut DND de l'appareil ou None s'il est absent
+        """
+        for status in data.get("doNotDisturbDeviceStatusList", []):
+            if status.get("deviceSerialNumber") == device_serial:
+                return status
+        return None
+
     def enable_dnd(self, device_serial: str, device_type: str) -> bool:
         """Active le mode DND."""
         return self._set_dnd(device_serial, device_type, enabled=True)
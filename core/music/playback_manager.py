@@ -14,14 +14,19 @@ Fonctionnalités:
 Note: Aucune fallback VoiceCommand - si l'API échoue, la commande échoue.
 """
 
+import asyncio
 import threading
-from typing import Dict, List, Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
 
 from loguru import logger
 
 from ..circuit_breaker import CircuitBreaker
 from ..state_machine import AlexaStateMachine
 
+if TYPE_CHECKING:
+    from utils.async_http import AsyncAlexaClient
+
 
 class PlaybackManager:
     """Gestionnaire de lecture musicale - API directe uniquement.
@@ -30,35 +35,33 @@ class PlaybackManager:
     Pas de fallback VoiceCommand - plus rapide mais moins tolérant aux erreurs.
     """
 
-    def __init__(self, auth, config, state_machine=None):
+    # Endpoints interrogés par get_state() : clé du résultat -> (chemin, paramètres player ou média)
+    STATE_ENDPOINTS = {
+        "player": ("/api/np/player", "player"),
+        "media": ("/api/media/state", "media"),
+        "queue": ("/api/np/queue", "media"),
+    }
+
+    def __init__(self, auth, config, state_machine=None, voice_service=None):
         self.auth = auth
         self.config = config
         self.state_machine = state_machine or AlexaStateMachine()
         self.breaker = CircuitBreaker(failure_threshold=3, timeout=30)
         self._lock = threading.RLock()
 
-        # Initialiser VoiceCommandService pour les contrôles de lecture
-        from services.voice_command_service import VoiceCommandService
+        # VoiceCommandService pour les contrôles de lecture (celui du contexte s'il est fourni)
+        if voice_service is None:
+            from services.voice_command_service import VoiceCommandService
 
-        self.voice_service = VoiceCommandService(auth, config, state_machine)
+            voice_service = VoiceCommandService(auth, config, state_machine)
+        self.voice_service = voice_service
 
         logger.info("PlaybackManager initialisé avec VoiceCommandService")
 
     def _send_np_command(self, command_data: Dict, device_serial: str, device_type: str) -> bool:
         """Envoie une commande directe à /api/np/command (comme le script shell)."""
         try:
-            # Headers complets comme le script shell - CRITIQUE pour éviter 403/404
-            headers = {
-                "csrf": self.auth.csrf,
-                "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:1.0) bash-script/1.0",
-                "DNT": "1",
-                "Connection": "keep-alive",
-                "Referer": f"https://{self.config.alexa_domain}/spa/index.html",
-                "Origin": f"https://{self.config.alexa_domain}",
-                "Content-Type": "application/json; charset=UTF-8",
-                "Accept": "application/json",
-                "Accept-Language": "fr-FR,fr;q=0.9",
-            }
+            headers = self._shell_headers()
 
             response = self.breaker.call(
                 self.auth.session.post,
@@ -225,94 +228,164 @@ class PlaybackManager:
         device_type: str,
         parent_id: Optional[str] = None,
         parent_type: Optional[str] = None,
+        include_queue: bool = True,
     ) -> Optional[Dict]:
         """Récupère l'état complet de la lecture (comme le script shell).
 
-        Interroge 3 endpoints pour avoir toutes les informations:
+        Interroge en parallèle 3 endpoints indépendants :
         1. /api/np/player - État du player (morceau, artiste, progression)
         2. /api/media/state - État média détaillé
-        3. /api/np/queue - File d'attente complète
+        3. /api/np/queue - File d'attente complète (sauf mode léger)
+
+        Un endpoint en échec n'annule pas les autres : sa clé vaut None.
 
         Args:
             device_serial: Numéro de série de l'appareil
             device_type: Type de l'appareil
             parent_id: ID du parent multiroom (optionnel)
             parent_type: Type du parent multiroom (optionnel)
+            include_queue: False = mode léger, sans la file d'attente ('queue' à None)
 
         Returns:
-            Dict avec les clés 'player', 'media', 'queue' ou None si erreur
+            Dict avec les clés 'player', 'media', 'queue' ou None si tous les endpoints échouent
         """
         with self._lock:
             if not self.state_machine.can_execute_commands:
                 return None
 
-            try:
-                # Construire params comme le script shell
-                params = {"deviceSerialNumber": device_serial, "deviceType": device_type}
-
-                # Ajouter parent si multiroom (comme le script shell)
-                if parent_id:
-                    params["lemurId"] = parent_id
-                    if parent_type is not None:
-                        params["lemurDeviceType"] = parent_type
-
-                # Headers complets comme le script shell - CRITIQUE pour éviter 403
-                headers = {
-                    "csrf": self.auth.csrf,
-                    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:1.0) bash-script/1.0",
-                    "DNT": "1",
-                    "Connection": "keep-alive",
-                    "Referer": f"https://{self.config.alexa_domain}/spa/index.html",
-                    "Origin": f"https://{self.config.alexa_domain}",
-                    "Content-Type": "application/json; charset=UTF-8",
-                    "Accept": "application/json",
-                    "Accept-Language": "fr-FR,fr;q=0.9",
-                }
+        requests_by_key = self._state_requests(device_serial, device_type, parent_id, parent_type, include_queue)
+        headers = self._shell_headers()
 
-                # 1. État du player (comme show_queue() du shell)
-                logger.debug(f"Récupération état player pour {device_serial}")
-                player_response = self.breaker.call(
-                    self.auth.session.get,
-                    f"https://{self.config.alexa_domain}/api/np/player",
-                    params=params,
-                    headers=headers,
-                    timeout=10,
-                )
-                player_response.raise_for_status()
-                player_data = player_response.json()
+        # Requêtes hors verrou, en parallèle : la latence est celle de l'endpoint le plus lent
+        with ThreadPoolExecutor(max_workers=len(requests_by_key), thread_name_prefix="np-state") as executor:
+            futures = {
+                key: executor.submit(self._fetch_state_part, url, params, headers)
+                for key, (url, params) in requests_by_key.items()
+            }
+            results = {}
+            for key, future in futures.items():
+                try:
+                    results[key] = future.result()
+                except Exception as e:
+                    results[key] = e
 
-                # 2. État média
-                logger.debug(f"Récupération état média pour {device_serial}")
-                media_params = {"deviceSerialNumber": device_serial, "deviceType": device_type}
-                media_response = self.breaker.call(
-                    self.auth.session.get,
-                    f"https://{self.config.alexa_domain}/api/media/state",
-                    params=media_params,
-                    headers=headers,
-                    timeout=10,
-                )
-                media_response.raise_for_status()
-                media_data = media_response.json()
+        return self._combine_state(device_serial, results)
 
-                # 3. Queue complète
-                logger.debug(f"Récupération queue pour {device_serial}")
-                queue_response = self.breaker.call(
-                    self.auth.session.get,
-                    f"https://{self.config.alexa_domain}/api/np/queue",
-                    params=media_params,
-                    headers=headers,
-                    timeout=10,
-                )
-                queue_response.raise_for_status()
-                queue_data = queue_response.json()
+    async def get_state_async(
+        self,
+        client: "AsyncAlexaClient",
+        device_serial: str,
+        device_type: str,
+        parent_id: Optional[str] = None,
+        parent_type: Optional[str] = None,
+        include_queue: bool = True,
+    ) -> Optional[Dict]:
+        """Variante asyncio de get_state() (mêmes endpoints parallèles et résultats partiels).
+
+        Args:
+            client: Client HTTP asynchrone
+            device_serial: Numéro de série de l'appareil
+            device_type: Type de l'appareil
+            parent_id: ID du parent multiroom (optionnel)
+            parent_type: Type du parent multiroom (optionnel)
+            include_queue: False = mode léger, sans la file d'attente
+
+        Returns:
+            Dict avec les clés 'player', 'media', 'queue' ou None si tous les endpoints échouent
+        """
+        if not self.state_machine.can_execute_commands:
+            return None
 
-                # Combiner les 3 réponses (comme le script shell)
-                result = {"player": player_data, "media": media_data, "queue": queue_data}
+        requests_by_key = self._state_requests(device_serial, device_type, parent_id, parent_type, include_queue)
+        headers = self._shell_headers()
 
-                logger.success(f"État complet récupéré pour {device_serial}")
-                return result
+        async def fetch(url: str, params: Dict[str, str]) -> Dict:
+            response = await self.breaker.call_async(client.get, url, params=params, headers=headers)
+            response.raise_for_status()
+            return response.json()
 
-            except Exception as e:
-                logger.error(f"Erreur récupération état complet: {e}")
-                logger.debug(f"Détails erreur: {type(e).__name__}: {str(e)}")
-                return None
+        values = await asyncio.gather(
+            *(fetch(url, params) for url, params in requests_by_key.values()), return_exceptions=True
+        )
+        return self._combine_state(device_serial, dict(zip(requests_by_key, values)))
+
+    def _state_requests(
+        self,
+        device_serial: str,
+        device_type: str,
+        parent_id: Optional[str],
+        parent_type: Optional[str],
+        include_queue: bool,
+    ) -> Dict[str, Tuple[str, Dict[str, str]]]:
+        """Construit les requêtes de get_state() : clé -> (URL, paramètres)."""
+        player_params, media_params = self._state_params(device_serial, device_type, parent_id, parent_type)
+        params_by_kind = {"player": player_params, "media": media_params}
+        return {
+            key: (f"https://{self.config.alexa_domain}{path}", params_by_kind[kind])
+            for key, (path, kind) in self.STATE_ENDPOINTS.items()
+            if include_queue or key != "queue"
+        }
+
+    def _fetch_state_part(self, url: str, params: Dict[str, str], headers: Dict[str, str]) -> Dict:
+        """Interroge un endpoint d'état via le circuit breaker."""
+        logger.debug(f"Récupération {url} pour {params.get('deviceSerialNumber')}")
+        response = self.breaker.call(self.auth.session.get, url, params=params, headers=headers, timeout=10)
+        response.raise_for_status()
+        return response.json()
+
+    def _combine_state(self, device_serial: str, results: Dict[str, Any]) -> Optional[Dict]:
+        """
+        Combine les réponses (comme le script shell) ; une exception devient None.
+
+        Returns:
+            Dict 'player', 'media', 'queue' ou None si aucun endpoint n'a répondu
+        """
+        state: Dict[str, Optional[Dict]] = {key: None for key in self.STATE_ENDPOINTS}
+        failed = []
+        for key, value in results.items():
+            if isinstance(value, BaseException):
+                logger.warning(f"Échec récupération '{key}' pour {device_serial}: {value}")
+                failed.append(key)
+            else:
+                state[key] = value
+
+        if len(failed) == len(results):
+            logger.error(f"Erreur récupération état complet pour {device_serial}: aucun endpoint disponible")
+            return None
+        if failed:
+            logger.info(f"État partiel récupéré pour {device_serial} (manquant: {', '.join(failed)})")
+        else:
+            logger.success(f"État récupéré pour {device_serial}")
+        return state
+
+    def _state_params(
+        self,
+        device_serial: str,
+        device_type: str,
+        parent_id: Optional[str] = None,
+        parent_type: Optional[str] = None,
+    ) -> Tuple[Dict[str, str], Dict[str, str]]:
+        """Construit les paramètres (player, média/queue) comme le script shell."""
+        media_params = {"deviceSerialNumber": device_serial, "deviceType": device_type}
+        player_params = dict(media_params)
+
+        # Ajouter parent si multiroom (comme le script shell)
+        if parent_id:
+            player_params["lemurId"] = parent_id
+            if parent_type is not None:
+                player_params["lemurDeviceType"] = parent_type
+        return player_params, media_params
+
+    def _shell_headers(self) -> Dict[str, str]:
+        """Headers complets comme le script shell - CRITIQUE pour éviter 403/404."""
+        return {
+            "csrf": self.auth.csrf,
+            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:1.0) bash-script/1.0",
+            "DNT": "1",
+            "Connection": "keep-alive",
+            "Referer": f"https://{self.config.alexa_domain}/spa/index.html",
+            "Origin": f"https://{self.config.alexa_domain}",
+            "Content-Type": "application/json; charset=UTF-8",
+            "Accept": "application/json",
+            "Accept-Language": "fr-FR,fr;q=0.9",
+        }
@@ -16,6 +16,7 @@ from loguru import logger
 from core.circuit_breaker import CircuitBreaker
 from core.state_machine import AlexaStateMachine, ConnectionState
 from services.cache_service import CacheService
+from services.notification_snapshot import NotificationSnapshotService
 from core.base_manager import BaseManager
 from typing import Any, Dict, List, Optional
 
@@ -33,6 +34,7 @@ class ReminderManager(BaseManager[Dict[str, Any]]):
         state_machine: Machine à états pour la connexion
         breaker: Circuit breaker pour la résilience
         cache_service: Service de cache pour la persistance
+        notifications: Snapshot partagé de /api/notifications
         _lock: Verrou pour la thread-safety
         _reminders_cache: Cache mémoire des rappels
         _cache_timestamp: Timestamp du dernier refresh du cache
@@ -45,6 +47,7 @@ class ReminderManager(BaseManager[Dict[str, Any]]):
         config,
         state_machine: Optional[AlexaStateMachine] = None,
         cache_service: Optional[CacheService] = None,
+        notification_snapshot: Optional[NotificationSnapshotService] = None,
     ):
         """
         Initialise le gestionnaire de rappels.
@@ -54,6 +57,7 @@ class ReminderManager(BaseManager[Dict[str, Any]]):
             config: Instance Config avec paramètres
             state_machine: Machine à états optionnelle (créée si None)
             cache_service: Service de cache optionnel (créé si None)
+            notification_snapshot: Snapshot /api/notifications partagé (créé si None)
         """
         # compatibility: wrap legacy auth.session into http_client if needed
         if hasattr(auth, "session"):
@@ -82,6 +86,7 @@ class ReminderManager(BaseManager[Dict[str, Any]]):
 
         self.auth = auth
         self.breaker = CircuitBreaker(failure_threshold=3, timeout=30, half_open_max_calls=1)
+        self.notifications = notification_snapshot or NotificationSnapshotService(self.cache_service)
 
         # compatibility memory cache attrs
         self._reminders_cache: Optional[List[Dict[str, Any]]] = None
@@ -167,8 +172,8 @@ class ReminderManager(BaseManager[Dict[str, Any]]):
                 result = response.json()
                 logger.success(f"Rappel créé pour {device_serial}")
 
-                # Invalider le cache
-                self._reminders_cache = None
+                # Invalider le cache (et le snapshot partagé)
+                self._invalidate_notifications()
 
                 return result
 
@@ -233,8 +238,8 @@ class ReminderManager(BaseManager[Dict[str, Any]]):
                 result = response.json()
                 logger.success(f"Rappel récurrent créé pour {device_serial}")
 
-                # Invalider le cache
-                self._reminders_cache = None
+                # Invalider le cache (et le snapshot partagé)
+                self._invalidate_notifications()
 
                 return result
 
@@ -293,45 +298,44 @@ class ReminderManager(BaseManager[Dict[str, Any]]):
 
             return reminders
 
-    def _refresh_reminders_cache(self) -> List[Dict[str, Any]]:
+    def _fetch_notifications(self) -> Any:
+        """Appel HTTP brut vers /api/notifications (protégé par le circuit breaker)."""
+        return self.breaker.call(
+            self.http_client.get,
+            f"https://{self.config.alexa_domain}/api/notifications",
+            headers={
+                "Content-Type": "application/json; charset=UTF-8",
+                "Referer": f"https://alexa.{self.config.amazon_domain}/spa/index.html",
+                "csrf": getattr(self.http_client, "csrf", None),
+            },
+            timeout=10,
+        )
+
+    def _invalidate_notifications(self) -> None:
+        """Invalide les caches rappels et le snapshot partagé après une écriture."""
+        self._reminders_cache = None
+        self.cache_service.invalidate("reminders")
+        self.notifications.invalidate()
+
+    def _refresh_reminders_cache(self, force: bool = False) -> List[Dict[str, Any]]:
         """
-        Rafraîchit le cache des rappels en effectuant un appel API.
+        Rafraîchit le cache des rappels depuis le snapshot partagé des notifications.
 
-        Les rappels sont récupérés depuis /api/notifications et filtrés par type "Reminder".
+        Les rappels sont extraits du snapshot /api/notifications (type "Reminder").
+        Le snapshot n'est retéléchargé que s'il est expiré ou si force=True.
+
+        Args:
+            force: Forcer le téléchargement d'un nouveau snapshot
 
         Returns:
             Liste des rappels ou liste vide en cas d'erreur
         """
         try:
-            logger.debug("🌐 Récupération de tous les rappels depuis l'API notifications")
-
-            response = self.breaker.call(
-                self.http_client.get,
-                f"https://{self.config.alexa_domain}/api/notifications",
-                headers={
-                    "Content-Type": "application/json; charset=UTF-8",
-                    "Referer": f"https://alexa.{self.config.amazon_domain}/spa/index.html",
-                    "csrf": getattr(self.http_client, "csrf", None),
-                },
-                timeout=10,
-            )
-            response.raise_for_status()
+            logger.debug("🌐 Récupération de tous les rappels depuis le snapshot notifications")
 
-            # Gérer le cas où la réponse est vide
-            if not response.content.strip():
-                logger.info("Aucun rappel trouvé (réponse vide)")
-                reminders = []
-            else:
-                data = response.json()
-                # Les rappels sont dans la liste des notifications
-                notifications = data.get("notifications", [])
-
-                # Filtrer pour ne garder que les rappels (type="Reminder")
-                reminders = [
-                    notification
-                    for notification in notifications
-                    if notification.get("type") == "Reminder"
-                ]
+            snapshot = self.notifications.get_snapshot(self._fetch_notifications, force_refresh=force)
+            # Filtrer pour ne garder que les rappels (type="Reminder")
+            reminders = snapshot.select("Reminder")
 
             # Mise à jour cache mémoire (Niveau 1)
             self._reminders_cache = reminders
@@ -387,8 +391,8 @@ class ReminderManager(BaseManager[Dict[str, Any]]):
 
                 logger.success(f"Rappel {reminder_id} supprimé")
 
-                # Invalider le cache
-                self._reminders_cache = None
+                # Invalider le cache (et le snapshot partagé)
+                self._invalidate_notifications()
 
                 return True
 
@@ -433,8 +437,8 @@ class ReminderManager(BaseManager[Dict[str, Any]]):
 
                 logger.success(f"Rappel {reminder_id} marqué comme complété")
 
-                # Invalider le cache
-                self._reminders_cache = None
+                # Invalider le cache (et le snapshot partagé)
+                self._invalidate_notifications()
 
                 return True
 
@@ -17,6 +17,7 @@ from loguru import logger
 from core.circuit_breaker import CircuitBreaker
 from core.state_machine import AlexaStateMachine
 from services.cache_service import CacheService
+from utils.single_flight import request_key, single_flight
 
 
 class RoutineManager:
@@ -105,8 +106,8 @@ class RoutineManager:
                     logger.debug(f"{len(routines)} routine(s) depuis cache disque")
                     return self._filter_routines(routines, enabled_only, disabled_only, limit)
 
-            # 3. API Amazon (fallback + refresh cache)
-            return self._refresh_routines(enabled_only, disabled_only, limit)
+        # 3. API Amazon (fallback + refresh cache), hors verrou : les appels concurrents partagent la requête
+        return self._refresh_routines(enabled_only, disabled_only, limit)
 
     def _refresh_routines(
         self,
@@ -136,19 +137,11 @@ class RoutineManager:
             # Endpoint API routines (v2 automations)
             url = f"https://{self.config.alexa_domain}/api/behaviors/v2/automations"
 
-            response = self.breaker.call(
-                self.auth.session.get,
-                url,
-                headers={"csrf": self.auth.csrf},
-                timeout=15,
-            )
-            response.raise_for_status()
-
-            data = response.json()
-            routines = data if isinstance(data, list) else []
+            routines = single_flight.do(request_key("GET", url), lambda: self._fetch_routines(url))
 
             # Sauvegarde cache double
-            self._update_memory_cache(routines)
+            with self._lock:
+                self._update_memory_cache(routines)
             self.cache_service.set("routines", {"routines": routines}, ttl_seconds=3600)
 
             logger.success(f"{len(routines)} routine(s) récupérées depuis API")
@@ -158,6 +151,19 @@ class RoutineManager:
             logger.error(f"Erreur récupération routines: {e}")
             return []
 
+    def _fetch_routines(self, url: str) -> List[Dict]:
+        """Appelle l'API routines (via circuit breaker) et retourne la liste brute."""
+        response = self.breaker.call(
+            self.auth.session.get,
+            url,
+            headers={"csrf": self.auth.csrf},
+            timeout=15,
+        )
+        response.raise_for_status()
+
+        data = response.json()
+        return data if isinstance(data, list) else []
+
     def execute_routine(
         self,
         automation_id: str,
@@ -4,17 +4,22 @@ Gestionnaire des paramètres d'appareils - Thread-safe.
 
 import json
 import threading
-from typing import Dict, Optional
+from typing import TYPE_CHECKING, Dict, Optional
 
 from loguru import logger
 
 from ..circuit_breaker import CircuitBreaker
 from ..state_machine import AlexaStateMachine
 
+if TYPE_CHECKING:
+    from utils.async_http import AsyncAlexaClient
+
 
 class DeviceSettingsManager:
     """Gestionnaire thread-safe des paramètres d'appareils."""
 
+    VOLUMES_PATH = "/api/devices/deviceType/dsn/audio/v1/allDeviceVolumes"
+
     def __init__(self, auth, config, state_machine=None):
         self.auth = auth
         self.config = config
@@ -189,51 +194,80 @@ class DeviceSettingsManager:
             try:
                 response = self.breaker.call(
                     self.auth.session.get,
-                    f"https://{self.config.alexa_domain}/api/devices/deviceType/dsn/audio/v1/allDeviceVolumes",
+                    f"https://{self.config.alexa_domain}{self.VOLUMES_PATH}",
                     headers={"csrf": self.auth.csrf},
                     timeout=10,
                 )
                 response.raise_for_status()
-                data = response.json()
-
-                # Chercher le volume pour le device serial spécifié
-                if "volumes" in data:
-                    for volume_info in data["volumes"]:
-                        if volume_info.get("dsn") == device_serial:
-                            return volume_info.get("speakerVolume")
-
-                return None
+                return self.find_volume(response.json(), device_serial)
 
             except Exception as e:
                 logger.error(f"Erreur récupération volume: {e}")
                 return None
 
+    async def get_volume_async(self, client: "AsyncAlexaClient", device_serial: str, device_type: str) -> Optional[int]:
+        """
+        Variante asyncio de get_volume().
+
+        L'endpoint couvre tous les appareils : les appels simultanés pour
+        plusieurs appareils partagent une seule requête.
+        """
+        data = await self.get_all_volumes_async(client)
+        return None if data is None else self.find_volume(data, device_serial)
+
+    async def get_all_volumes_async(self, client: "AsyncAlexaClient") -> Optional[Dict]:
+        """
+        Récupère la réponse allDeviceVolumes de tout le compte (voir find_volume).
+
+        Permet d'interroger l'endpoint une seule fois pour plusieurs appareils.
+        """
+        if not self.state_machine.can_execute_commands:
+            return None
+        try:
+            url = f"https://{self.config.alexa_domain}{self.VOLUMES_PATH}"
+            response = await self.breaker.call_async(client.get, url)
+            response.raise_for_status()
+            return response.json()
+        except Exception as e:
+            logger.error(f"Erreur récupération volume: {e}")
+            return None
+
+    @staticmethod
+    def find_volume(data: Dict, device_serial: str) -> Optional[int]:
+        """
+        Cherche le volume du device serial spécifié dans la réponse allDeviceVolumes.
+
+        Args:
+            data: Réponse de get_all_volumes_async()
+            device_serial: Numéro de série de l'appareil
+
+        Returns:
+            Volume (0-100) ou None si l'appareil est absent
+        """
+        for volume_info in data.get("volumes", []):
+            if volume_info.get("dsn") == device_serial:
+                return volume_info.get("speakerVolume")
+        return None
+
     def _get_customer_id(self) -> Optional[str]:
         """
-        Récupère le customer ID via /api/bootstrap.
+        Récupère le customer ID du bootstrap partagé par l'authentification.
+
+        /api/bootstrap n'est appelé que si aucun bootstrap n'est connu pour les
+        cookies chargés (voir AlexaAuth.get_bootstrap).
 
         Returns:
             Customer ID ou None si erreur
         """
         try:
-            url = f"https://{self.config.alexa_domain}/api/bootstrap?version=0"
-            response = self.breaker.call(
-                self.auth.session.get,
-                url,
-                headers={"csrf": self.auth.csrf},
-                timeout=10,
-            )
-            response.raise_for_status()
-            data = response.json()
-
-            customer_id = data.get("authentication", {}).get("customerId")
-            if customer_id:
-                logger.debug(f"Customer ID: {customer_id}")
-                return customer_id
-            else:
-                logger.warning("Customer ID non trouvé dans bootstrap")
-                return None
-
+            bootstrap = self.breaker.call(self.auth.get_bootstrap) or {}
         except Exception as e:
             logger.error(f"Erreur récupération customer ID: {e}")
             return None
+
+        customer_id = bootstrap.get("customerId")
+        if customer_id:
+            logger.debug(f"Customer ID: {customer_id}")
+            return customer_id
+        logger.warning("Customer ID non trouvé dans bootstrap")
+        return None
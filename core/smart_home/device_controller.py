@@ -8,16 +8,24 @@ from typing import Any, Dict, List, Optional
 from loguru import logger
 
 from services.cache_service import CacheService
+from utils.background_refresh import background_refresher
 
 from ..circuit_breaker import CircuitBreaker
 from ..state_machine import AlexaStateMachine
+from .entities import SMART_HOME_CACHE_KEY, refresh_smart_home_cache
 
 
 class SmartDeviceController:
     """Contrôleur thread-safe pour appareils connectés (serrures, volets, etc.)."""
 
     def __init__(
-        self, auth, config, state_machine=None, cache_service: Optional[CacheService] = None
+        self,
+        auth,
+        config,
+        state_machine=None,
+        cache_service: Optional[CacheService] = None,
+        stale_while_revalidate: bool = False,
+        max_staleness: float = 86400,
     ):
         self.auth = auth
         self.config = config
@@ -28,6 +36,10 @@ class SmartDeviceController:
         self._locks_cache: Optional[List[Dict[str, Any]]] = None
         self._plugs_cache: Optional[List[Dict[str, Any]]] = None
         self._all_devices_cache: Optional[List[Dict[str, Any]]] = None
+        # Stale-while-revalidate: servir smart_home_all expiré (âge <= max_staleness)
+        # et le rafraîchir en arrière-plan
+        self.stale_while_revalidate = stale_while_revalidate
+        self.max_staleness = max_staleness
         logger.info("SmartDeviceController initialisé")
 
     def get_smart_home_devices(self) -> list:
@@ -35,22 +47,41 @@ class SmartDeviceController:
         Récupère tous les appareils Smart Home (lazy loading).
 
         Utilise le SyncService pour charger les données à la demande.
+        En mode stale-while-revalidate, un cache expiré mais assez récent est
+        servi et rafraîchi en arrière-plan.
         """
         with self._lock:
             if self._all_devices_cache:
                 return self._all_devices_cache
 
             # Utiliser le cache directement (hérité de l'ancienne implémentation)
-            smart_home_data = self.cache_service.get("smart_home_all")
+            smart_home_data = self.cache_service.get(SMART_HOME_CACHE_KEY)
             if smart_home_data:
                 devices = smart_home_data.get("devices", [])
                 self._all_devices_cache = devices
                 logger.debug(f"{len(devices)} appareils Smart Home depuis cache")
                 return devices
 
+            if self.stale_while_revalidate:
+                age = self.cache_service.get_age(SMART_HOME_CACHE_KEY)
+                stale_data = self.cache_service.get(SMART_HOME_CACHE_KEY, ignore_ttl=True)
+                if stale_data and age is not None and age <= self.max_staleness:
+                    background_refresher.trigger(SMART_HOME_CACHE_KEY, self._revalidate_smart_home)
+                    devices = stale_data.get("devices", [])
+                    logger.debug(f"⏳ {len(devices)} appareils Smart Home servis (âge: {age:.0f}s)")
+                    return devices
+
             logger.warning("Aucun cache smart_home_all trouvé")
             return []
 
+    def _revalidate_smart_home(self) -> None:
+        """Rafraîchit smart_home_all depuis l'API et vide les caches mémoire dérivés."""
+        refresh_smart_home_cache(self.auth, self.config, self.cache_service, self.breaker)
+        with self._lock:
+            self._all_devices_cache = None
+            self._locks_cache = None
+            self._plugs_cache = None
+
     def get_all_locks(self) -> list:
         """Récupère toutes les serrures depuis smart_home_all cache."""
         with self._lock:
@@ -0,0 +1,75 @@
+"""
+Récupération des entités Smart Home partagée par les contrôleurs.
+
+Les contrôleurs (lumières, appareils génériques) lisent le cache disque
+``smart_home_all`` alimenté par SyncService. En mode stale-while-revalidate,
+ils le rafraîchissent en arrière-plan via refresh_smart_home_cache(), au
+même format que SyncService.
+"""
+
+from typing import Any, Dict, List, Optional
+
+from loguru import logger
+
+from services.cache_service import CacheService
+from utils.single_flight import request_key, single_flight
+
+from ..circuit_breaker import CircuitBreaker
+
+SMART_HOME_CACHE_KEY = "smart_home_all"
+SMART_HOME_CACHE_TTL = 1800  # 30 minutes, comme SyncService
+
+
+def fetch_smart_home_entities(auth, config, breaker: Optional[CircuitBreaker] = None) -> List[Dict[str, Any]]:
+    """
+    Récupère la liste brute des entités Smart Home depuis l'API.
+
+    Les appels concurrents (y compris ceux de SyncService) partagent la même requête.
+
+    Args:
+        auth: Instance AlexaAuth (session, csrf)
+        config: Configuration (alexa_domain, amazon_domain)
+        breaker: Circuit breaker optionnel
+
+    Returns:
+        Liste des entités
+
+    Raises:
+        Exception: Erreur réseau ou HTTP (à gérer par l'appelant)
+    """
+    kwargs = {
+        "headers": {
+            "Content-Type": "application/json; charset=UTF-8",
+            "Referer": f"https://alexa.{config.amazon_domain}/spa/index.html",
+            "Origin": f"https://alexa.{config.amazon_domain}",
+            "csrf": auth.csrf,
+        },
+        "timeout": 10,
+    }
+    url = f"https://{config.alexa_domain}/api/behaviors/entities?skillId=amzn1.ask.1p.smarthome"
+
+    def fetch() -> List[Dict[str, Any]]:
+        if breaker is not None:
+            response = breaker.call(auth.session.get, url, **kwargs)
+        else:
+            response = auth.session.get(url, **kwargs)
+        response.raise_for_status()
+        return response.json()
+
+    # Même clé que SyncService : contrôleurs et synchronisation partagent la requête en cours
+    return single_flight.do(request_key("GET", url), fetch)
+
+
+def refresh_smart_home_cache(
+    auth, config, cache_service: CacheService, breaker: Optional[CircuitBreaker] = None
+) -> List[Dict[str, Any]]:
+    """
+    Récupère les entités Smart Home et met à jour le cache disque smart_home_all.
+
+    Returns:
+        Liste des entités
+    """
+    devices = fetch_smart_home_entities(auth, config, breaker)
+    cache_service.set(SMART_HOME_CACHE_KEY, {"devices": devices}, ttl_seconds=SMART_HOME_CACHE_TTL)
+    logger.debug(f"🔄 Cache {SMART_HOME_CACHE_KEY} rafraîchi: {len(devices)} entité(s)")
+    return devices
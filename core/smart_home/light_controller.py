@@ -10,9 +10,12 @@ from loguru import logger
 
 from services.cache_service import CacheService
 from services.voice_command_service import VoiceCommandService
+from utils.background_refresh import background_refresher
+from utils.device_index import SmartDeviceIndex
 
 from ..circuit_breaker import CircuitBreaker
 from ..state_machine import AlexaStateMachine
+from .entities import SMART_HOME_CACHE_KEY, fetch_smart_home_entities, refresh_smart_home_cache
 
 # Couleurs prédéfinies (HSB)
 COLOR_PRESETS = {
@@ -31,7 +34,14 @@ class LightController:
     """Contrôleur thread-safe pour lumières connectées."""
 
     def __init__(
-        self, auth, config, state_machine=None, cache_service: Optional[CacheService] = None
+        self,
+        auth,
+        config,
+        state_machine=None,
+        cache_service: Optional[CacheService] = None,
+        stale_while_revalidate: bool = False,
+        max_staleness: float = 86400,
+        voice_service: Optional[VoiceCommandService] = None,
     ):
         self.auth = auth
         self.config = config
@@ -45,8 +55,19 @@ class LightController:
         self._cache_timestamp = 0.0
         self._cache_ttl = 300  # 5 minutes (mémoire)
 
-        # Voice Command Service pour contrôles
-        self._voice_service = VoiceCommandService(auth, config, state_machine)
+        # Index nom/entityId de la liste de lumières courante (reconstruit quand elle change)
+        self._light_index = SmartDeviceIndex()
+        self._indexed_lights: Optional[List[Dict]] = None
+
+        # Stale-while-revalidate: servir la dernière liste connue (âge <= max_staleness)
+        # et rafraîchir smart_home_all en arrière-plan
+        self.stale_while_revalidate = stale_while_revalidate
+        self.max_staleness = max_staleness
+
+        # Voice Command Service pour contrôles (celui du contexte s'il est fourni)
+        self._voice_service = voice_service or VoiceCommandService(
+            auth, config, state_machine, cache_service=self._cache_service
+        )
 
         logger.log("SUCCESS", "LightController (Voice Commands)")
 
@@ -212,19 +233,21 @@ class LightController:
         """Résout entity_id ou nom -> friendly name."""
         lights = self.get_all_lights()
 
-        # 1. Si c'est déjà un nom friendly
-        name_lower = name_or_id.lower().strip()
-        for light in lights:
-            friendly = light.get("friendlyName", "").lower().strip()
-            if friendly == name_lower:
-                return light.get("friendlyName")
+        with self._lock:
+            if lights is not self._indexed_lights:
+                self._light_index.build_index(lights)
+                self._indexed_lights = lights
+
+            # 1. Si c'est déjà un nom friendly, 2. si c'est un entity_id
+            light = self._light_index.get_by_name(name_or_id) or self._light_index.get_by_id(name_or_id)
 
-        # 2. Si c'est un entity_id
-        for light in lights:
-            if light.get("entityId") == name_or_id:
-                return light.get("friendlyName")
+            # 3. Nom identique aux accents et à la ponctuation près ("lumiere salon")
+            if light is None:
+                ranked = self._light_index.search_ranked(name_or_id, limit=1)
+                if ranked and ranked[0][1] >= 1.0:
+                    light = ranked[0][0]
 
-        return None
+        return light.get("friendlyName") if light else None
 
     def get_all_lights(self, force_refresh: bool = False) -> List[Dict]:
         """Récupère toutes les lumières connectées (avec cache)."""
@@ -237,9 +260,50 @@ class LightController:
                 logger.debug("📦 Lumières depuis cache mémoire")
                 return self._lights_cache
 
+            if not force_refresh and self.stale_while_revalidate:
+                stale = self._get_stale_lights()
+                if stale is not None:
+                    return stale
+
             # Refresh depuis cache smart_home_all ou API
             return self._refresh_lights_cache()
 
+    def _get_stale_lights(self) -> Optional[List[Dict]]:
+        """
+        Retourne la dernière liste de lumières connue si elle est assez récente.
+
+        Sources: cache mémoire, puis smart_home_all même expiré. Si la liste
+        a dépassé son TTL, un rafraîchissement unique de smart_home_all est
+        lancé en arrière-plan. Doit être appelé sous self._lock.
+        """
+        if not self.state_machine.can_execute_commands:
+            return None
+
+        if self._lights_cache is None:
+            cached_all = self._cache_service.get(SMART_HOME_CACHE_KEY, ignore_ttl=True)
+            if cached_all is None:
+                return None
+            age = self._cache_service.get_age(SMART_HOME_CACHE_KEY) or 0.0
+            self._lights_cache = self._filter_lights(cached_all.get("devices", []))
+            self._cache_timestamp = time.time() - age
+
+        age = time.time() - self._cache_timestamp
+        if age > self.max_staleness:
+            return None
+
+        if age >= self._cache_ttl:
+            background_refresher.trigger(SMART_HOME_CACHE_KEY, self._revalidate_lights)
+        logger.debug(f"⏳ Lumières servies (âge: {age:.0f}s)")
+        return self._lights_cache
+
+    def _revalidate_lights(self) -> None:
+        """Rafraîchit smart_home_all depuis l'API puis le cache mémoire des lumières."""
+        devices = refresh_smart_home_cache(self.auth, self.config, self._cache_service, self.breaker)
+        lights = self._filter_lights(devices)
+        with self._lock:
+            self._lights_cache = lights
+            self._cache_timestamp = time.time()
+
     def _refresh_lights_cache(self) -> List[Dict]:
         """Rafraîchit le cache des lumières depuis l'API."""
         if not self.state_machine.can_execute_commands:
@@ -247,7 +311,7 @@ class LightController:
 
         # D'abord essayer de récupérer depuis le cache smart_home_all
         # (synchronisé au login par SyncService)
-        cached_all = self._cache_service.get("smart_home_all")
+        cached_all = self._cache_service.get(SMART_HOME_CACHE_KEY)
         if cached_all is not None:
             all_devices = cached_all.get("devices", [])
             logger.debug(f"📦 Utilisation cache smart_home_all ({len(all_devices)} devices)")
@@ -255,23 +319,23 @@ class LightController:
             # Fallback: appel API direct
             try:
                 logger.debug("🌐 Récupération smart devices depuis API (fallback)")
-                response = self.breaker.call(
-                    self.auth.session.get,
-                    f"https://{self.config.alexa_domain}/api/behaviors/entities?skillId=amzn1.ask.1p.smarthome",
-                    headers={
-                        "Content-Type": "application/json; charset=UTF-8",
-                        "Referer": f"https://alexa.{self.config.amazon_domain}/spa/index.html",
-                        "Origin": f"https://alexa.{self.config.amazon_domain}",
-                        "csrf": self.auth.csrf,
-                    },
-                    timeout=10,
-                )
-                response.raise_for_status()
-                all_devices = response.json()
+                all_devices = fetch_smart_home_entities(self.auth, self.config, self.breaker)
             except Exception as e:
                 logger.error(f"Erreur récupération smart home: {e}")
                 return []
 
+        lights = self._filter_lights(all_devices)
+
+        # Sauvegarder UNIQUEMENT dans cache mémoire
+        # Le cache disque smart_home_all est géré par SyncService
+        self._lights_cache = lights
+        self._cache_timestamp = time.time()
+
+        logger.info(f"🔄 {len(lights)} lumière(s) filtrée(s)")
+        return lights
+
+    def _filter_lights(self, all_devices: List[Dict]) -> List[Dict]:
+        """Filtre les lumières parmi les entités Smart Home."""
         # Filtrer uniquement les lumières
         lights = []
         for device in all_devices:
@@ -304,12 +368,6 @@ class LightController:
                     }
                 )
 
-        # Sauvegarder UNIQUEMENT dans cache mémoire
-        # Le cache disque smart_home_all est géré par SyncService
-        self._lights_cache = lights
-        self._cache_timestamp = time.time()
-
-        logger.info(f"🔄 {len(lights)} lumière(s) filtrée(s)")
         return lights
 
     def invalidate_lights_cache(self) -> None:
@@ -15,6 +15,7 @@ from loguru import logger
 from core.circuit_breaker import CircuitBreaker
 from core.state_machine import AlexaStateMachine, ConnectionState
 from services.cache_service import CacheService
+from services.notification_snapshot import NotificationSnapshotService
 from core.base_manager import BaseManager
 
 
@@ -31,6 +32,7 @@ class TimerManager(BaseManager[Dict[str, Any]]):
         state_machine: Machine à états pour la connexion
         breaker: Circuit breaker pour la résilience
         cache_service: Service de cache pour la persistance
+        notifications: Snapshot partagé de /api/notifications
         _lock: Verrou pour la thread-safety
         _timers_cache: Cache mémoire des timers
         _cache_timestamp: Timestamp du dernier refresh du cache
@@ -43,6 +45,7 @@ class TimerManager(BaseManager[Dict[str, Any]]):
         config,
         state_machine: Optional[AlexaStateMachine] = None,
         cache_service: Optional[CacheService] = None,
+        notification_snapshot: Optional[NotificationSnapshotService] = None,
     ):
         """
         Initialise le gestionnaire de timers.
@@ -52,6 +55,7 @@ class TimerManager(BaseManager[Dict[str, Any]]):
             config: Instance Config avec paramètres
             state_machine: Machine à états optionnelle (créée si None)
             cache_service: Service de cache optionnel (créé si None)
+            notification_snapshot: Snapshot /api/notifications partagé (créé si None)
         """
         # compatibility: wrap legacy auth.session into http_client if needed
         if hasattr(auth, "session"):
@@ -80,6 +84,7 @@ class TimerManager(BaseManager[Dict[str, Any]]):
 
         self.auth = auth
         self.breaker = CircuitBreaker(failure_threshold=3, timeout=30, half_open_max_calls=1)
+        self.notifications = notification_snapshot or NotificationSnapshotService(self.cache_service)
 
         # compatibility memory cache attrs
         self._timers_cache: Optional[List[Dict[str, Any]]] = None
@@ -172,6 +177,7 @@ class TimerManager(BaseManager[Dict[str, Any]]):
                 response.raise_for_status()
 
                 timer_data = response.json()
+                self._invalidate_notifications()
                 logger.success(f"Timer '{label}' créé ({duration_minutes} min)")
                 return timer_data
 
@@ -225,7 +231,7 @@ class TimerManager(BaseManager[Dict[str, Any]]):
                     else:
                         timers = self._refresh_timers_cache()
                 else:
-                    timers = self._refresh_timers_cache()
+                    timers = self._refresh_timers_cache(force=True)
 
             # Filtrer par appareil si spécifié
             if device_serial:
@@ -233,46 +239,46 @@ class TimerManager(BaseManager[Dict[str, Any]]):
 
             return timers
 
-    def _refresh_timers_cache(self) -> List[Dict[str, Any]]:
+    def _fetch_notifications(self) -> Any:
+        """Appel HTTP brut vers /api/notifications (protégé par le circuit breaker)."""
+        response = self.breaker.call(
+            self.http_client.get,
+            f"https://{self.config.alexa_domain}/api/notifications",
+            headers={
+                "Content-Type": "application/json; charset=UTF-8",
+                "Referer": f"https://alexa.{self.config.amazon_domain}/spa/index.html",
+                "csrf": getattr(self.http_client, "csrf", None),
+            },
+            timeout=10,
+        )
+        assert response is not None
+        return response
+
+    def _invalidate_notifications(self) -> None:
+        """Invalide les caches timers et le snapshot partagé après une écriture."""
+        self._timers_cache = None
+        self.cache_service.invalidate("timers")
+        self.notifications.invalidate()
+
+    def _refresh_timers_cache(self, force: bool = False) -> List[Dict[str, Any]]:
         """
-        Rafraîchit le cache des timers en effectuant un appel API.
+        Rafraîchit le cache des timers depuis le snapshot partagé des notifications.
 
-        Les timers sont récupérés depuis /api/notifications et filtrés par type "Timer" et status "ON".
+        Les timers sont extraits du snapshot /api/notifications (type "Timer" et status "ON").
+        Le snapshot n'est retéléchargé que s'il est expiré ou si force=True.
+
+        Args:
+            force: Forcer le téléchargement d'un nouveau snapshot
 
         Returns:
             Liste des timers ou liste vide en cas d'erreur
         """
         try:
-            logger.debug("🌐 Récupération de tous les timers depuis l'API notifications")
-
-            response = self.breaker.call(
-                self.http_client.get,
-                f"https://{self.config.alexa_domain}/api/notifications",
-                headers={
-                    "Content-Type": "application/json; charset=UTF-8",
-                    "Referer": f"https://alexa.{self.config.amazon_domain}/spa/index.html",
-                    "csrf": getattr(self.http_client, "csrf", None),
-                },
-                timeout=10,
-            )
-            assert response is not None
-            response.raise_for_status()
-
-            # Gérer le cas où la réponse est vide
-            if not response.content.strip():
-                logger.info("Aucun timer trouvé (réponse vide)")
-                timers = []
-            else:
-                data = response.json()
-                # Les timers sont dans la liste des notifications
-                notifications = data.get("notifications", [])
+            logger.debug("🌐 Récupération de tous les timers depuis le snapshot notifications")
 
-                # Filtrer pour ne garder que les timers actifs (type="Timer" et status="ON")
-                timers = [
-                    notification
-                    for notification in notifications
-                    if notification.get("type") == "Timer" and notification.get("status") == "ON"
-                ]
+            snapshot = self.notifications.get_snapshot(self._fetch_notifications, force_refresh=force)
+            # Filtrer pour ne garder que les timers actifs (type="Timer" et status="ON")
+            timers = snapshot.select("Timer", status="ON")
 
             # Mise à jour cache mémoire (Niveau 1)
             self._timers_cache = timers
@@ -365,6 +371,7 @@ class TimerManager(BaseManager[Dict[str, Any]]):
                 assert response is not None
                 response.raise_for_status()
 
+                self._invalidate_notifications()
                 logger.success(f"Timer {timer_id} annulé")
                 return True
 
@@ -408,6 +415,7 @@ class TimerManager(BaseManager[Dict[str, Any]]):
                 assert response is not None
                 response.raise_for_status()
 
+                self._invalidate_notifications()
                 logger.success(f"Timer {timer_id} mis en pause")
                 return True
 
@@ -451,6 +459,7 @@ class TimerManager(BaseManager[Dict[str, Any]]):
                 assert response is not None
                 response.raise_for_status()
 
+                self._invalidate_notifications()
                 logger.success(f"Timer {timer_id} repris")
                 return True
 
@@ -3,10 +3,12 @@ Services de l'application Alexa CLI.
 
 Ce package contient les services transversaux :
 - CacheService : Gestion du cache persistant
+- NotificationSnapshotService : Snapshot partagé de /api/notifications
 - AuthService : Gestion de l'authentification (futur)
 - StateService : Gestion de l'état de l'application (futur)
 """
 
 from .cache_service import CacheService
+from .notification_snapshot import NotificationSnapshotService
 
-__all__ = ["CacheService"]
+__all__ = ["CacheService", "NotificationSnapshotService"]
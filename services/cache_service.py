@@ -2,21 +2,48 @@
 Service de cache persistant multi-niveaux.
 
 Gère le cache disque avec TTL, thread-safe et statistiques.
-Optimisé avec compression gzip pour réduire la taille des fichiers.
+Optimisé avec compression (gzip, zstd ou lz4) pour réduire la taille des fichiers.
+
+Un niveau mémoire (LRU d'entrées sérialisées, non compressées) est placé devant
+les fichiers : une relecture de la même clé dans le même processus évite
+l'ouverture et la décompression. Il garde sa propre copie sérialisée et chaque
+lecture en décode un objet neuf : modifier la valeur passée à set() ou rendue
+par get() n'altère jamais le cache. Chaque entrée mémoire est validée par la
+signature (mtime, taille) du fichier, ce qui détecte les écritures d'autres
+processus. Un mode write-behind optionnel persiste les écritures sur disque
+par lots, depuis un thread dédié.
+
+Le mode haut débit (``high_throughput``) sérialise chaque entrée une seule
+fois, sans fsync, n'écrit la copie JSON lisible qu'à la demande
+(``write_json_copy``) et regroupe les sauvegardes de metadata.
+
+Metadata est stocké en deux parties : un snapshot ``.metadata.json`` et un
+journal append-only ``.metadata.journal`` (une ligne JSON par clé modifiée).
+Mettre à jour une clé ne coûte qu'un ajout de ligne ; le journal est
+périodiquement compacté dans le snapshot.
+
+Le codec (orjson, msgpack, json) et le compresseur (zstd, lz4, gzip, zlib)
+sont interchangeables (voir utils.serialization) ; le format de chaque
+entrée est déduit du suffixe de son fichier et noté dans metadata, si bien
+que les anciens fichiers ``.json.gz`` restent lisibles.
 """
 
-import gzip
+import atexit
 import json
 import os
 import time
 import tempfile
+import weakref
+from collections import OrderedDict
 from pathlib import Path
-from threading import RLock
-from typing import Any, Dict, List, Optional
+from threading import Event, RLock, Thread
+from typing import Any, Dict, List, Optional, Set, Tuple
 from contextlib import contextmanager
 
 from loguru import logger
 
+from utils import serialization
+from utils.expiry import ExpiryHeap, Reaper
 from utils.logger import SharedIcons
 
 # Optional inter-process locking: use portalocker when available
@@ -25,6 +52,26 @@ try:
 except Exception:
     _portalocker = None
 
+# Instances à persister à la sortie du processus (write-behind, haut débit).
+# Références faibles : un seul hook atexit, qui ne prolonge pas leur durée de vie.
+_flush_on_exit: "weakref.WeakSet[CacheService]" = weakref.WeakSet()
+
+
+@atexit.register
+def _flush_all_on_exit() -> None:
+    """Persiste les écritures en attente de toutes les instances encore vivantes."""
+    for cache in list(_flush_on_exit):
+        try:
+            cache.flush()
+        except Exception as e:
+            logger.error(f"Erreur flush cache à la sortie: {e}")
+
+
+def _release_writer(flush_event: Event, released: Event) -> None:
+    """Réveille et arrête le thread write-behind d'une instance collectée."""
+    released.set()
+    flush_event.set()
+
 
 class CacheService:
     """
@@ -36,6 +83,17 @@ class CacheService:
     - Auto-expiration basée sur timestamps
     - Invalidation manuelle
     - Statistiques hits/misses
+    - Niveau mémoire LRU validé par signature de fichier
+    - Write-behind optionnel (persistance groupée hors du thread appelant)
+    - Mode haut débit (sérialisation unique, copie JSON à la demande,
+      commit groupé de metadata)
+    - Metadata journalisé (append-only, compaction périodique)
+    - Codec et compresseur interchangeables, enregistrés par entrée
+    - Échéances dans un tas min (nettoyage O(k log n)), reaper optionnel
+
+    Note:
+        Les objets retournés par get() sont partagés avec le niveau mémoire :
+        ils doivent être traités en lecture seule.
 
     Example:
         >>> cache = CacheService()
@@ -49,14 +107,37 @@ class CacheService:
         cache_dir: Optional[Path] = None,
         use_compression: bool = True,
         save_json_copy: bool = True,
+        memory_max_entries: int = 64,
+        write_behind: bool = False,
+        write_behind_delay: float = 0.2,
+        high_throughput: bool = False,
+        metadata_commit_interval: float = 1.0,
+        journal_compact_threshold: int = 256,
+        codec: Optional[str] = None,
+        compressor: Optional[str] = None,
+        reaper_interval: Optional[float] = None,
     ):
         """
         Initialise le service de cache.
 
         Args:
             cache_dir: Répertoire de cache (défaut: data/cache)
-            use_compression: Activer la compression gzip (défaut: True, réduit ~70% taille)
+            use_compression: Activer la compression (défaut: True, réduit ~70% taille)
             save_json_copy: Sauvegarder aussi une copie JSON lisible (défaut: True)
+            memory_max_entries: Taille du niveau mémoire LRU (0 = désactivé)
+            write_behind: Différer et regrouper les écritures disque (défaut: False)
+            write_behind_delay: Fenêtre de regroupement des écritures en secondes
+            high_throughput: Sérialisation unique sans fsync, copie JSON à la demande
+                et commit groupé de metadata (défaut: False)
+            metadata_commit_interval: Intervalle minimal entre deux sauvegardes de
+                metadata en mode haut débit (secondes)
+            journal_compact_threshold: Nombre de lignes du journal metadata au-delà
+                duquel il est compacté dans le snapshot
+            codec: "orjson", "msgpack" ou "json" (défaut: le plus rapide installé)
+            compressor: "zstd", "lz4", "gzip" ou "zlib" (défaut: le plus rapide
+                installé, gzip niveau 1 sinon) ; ignoré sans compression
+            reaper_interval: Si défini, un thread supprime les entrées expirées
+                (au plus tard toutes les reaper_interval secondes)
         """
         if cache_dir is None:
             # Déterminer le chemin relatif au script principal
@@ -67,8 +148,11 @@ class CacheService:
         self.cache_dir.mkdir(parents=True, exist_ok=True)
         self.use_compression = use_compression
         self.save_json_copy = save_json_copy
+        self.codec = serialization.get_codec(codec)
+        self.compressor = serialization.get_compressor(compressor if use_compression else "none")
 
         self.metadata_file = self.cache_dir / ".metadata.json"
+        self.journal_file = self.cache_dir / ".metadata.journal"
         self._lock = RLock()
         # Whether inter-process file locking is available
         self._portalocker_enabled = _portalocker is not None
@@ -78,6 +162,7 @@ class CacheService:
             )
         self._stats = {
             "hits": 0,
+            "memory_hits": 0,
             "misses": 0,
             "writes": 0,
             "invalidations": 0,
@@ -85,16 +170,72 @@ class CacheService:
         }
         self.metadata: Dict[str, Dict[str, Any]] = {}
 
+        # Mode haut débit et commit groupé de metadata
+        self.high_throughput = high_throughput
+        self.metadata_commit_interval = metadata_commit_interval
+        self._last_metadata_commit = 0.0
+
+        # Journal metadata: clés modifiées non encore journalisées, lignes du journal
+        self.journal_compact_threshold = journal_compact_threshold
+        self._dirty_keys: Set[str] = set()
+        self._journal_entries = 0
+
+        # Échéances des entrées (tas min) et reaper optionnel
+        self._expiry = ExpiryHeap()
+        self._reaper: Optional[Reaper] = None
+
+        # Ratio de compression moyen maintenu incrémentalement (somme, nombre)
+        self._ratio_sum = 0.0
+        self._ratio_count = 0
+
+        # Niveau mémoire: clé → (données sérialisées par self.codec, signature (mtime_ns, taille) du fichier)
+        self.memory_max_entries = memory_max_entries
+        self._memory: "OrderedDict[str, Tuple[bytes, Optional[Tuple[int, int]]]]" = OrderedDict()
+
+        # Write-behind: clé → (données sérialisées, ttl) en attente de persistance
+        self.write_behind = write_behind
+        self.write_behind_delay = write_behind_delay
+        self._pending: Dict[str, Tuple[bytes, int]] = {}
+        self._flush_event = Event()
+        self._writer: Optional[Thread] = None
+        if write_behind:
+            # Le thread ne garde qu'une référence faible ; il s'arrête avec l'instance
+            released = Event()
+            self._writer = Thread(
+                target=self._write_behind_loop,
+                args=(weakref.ref(self), self._flush_event, released),
+                name="cache-write-behind",
+                daemon=True,
+            )
+            self._writer.start()
+            weakref.finalize(self, _release_writer, self._flush_event, released)
+        if write_behind or high_throughput:
+            # Persister écritures différées et metadata en attente à la sortie
+            _flush_on_exit.add(self)
+
         self._load_metadata()
+        for key, meta in self.metadata.items():
+            self._update_compression_totals(None, meta)
+            self._expiry.push(key, meta.get("expires_at"))
+        if reaper_interval is not None:
+            self.start_reaper(reaper_interval)
 
         # S'assurer que le fichier metadata existe
         if not self.metadata_file.exists():
             self._save_metadata()
 
-        compression_status = "avec compression" if use_compression else "sans compression"
-        json_copy_status = "avec copie JSON" if save_json_copy else "sans copie JSON"
+        compression_status = (
+            f"avec compression {self.compressor.name}" if use_compression else "sans compression"
+        )
+        if save_json_copy:
+            json_copy_status = "copie JSON à la demande" if high_throughput else "avec copie JSON"
+        else:
+            json_copy_status = "sans copie JSON"
+        write_status = ", write-behind" if write_behind else ""
+        write_status += ", haut débit" if high_throughput else ""
         logger.debug(
-            f"CacheService initialisé: {self.cache_dir} ({compression_status}, {json_copy_status})"
+            f"CacheService initialisé: {self.cache_dir} ({self.codec.name}, {compression_status}, "
+            f"{json_copy_status}{write_status})"
         )
 
     def get(self, key: str, ignore_ttl: bool = False) -> Optional[Dict[str, Any]]:
@@ -115,48 +256,46 @@ class CacheService:
             >>> # Récupérer même si expiré (fallback)
             >>> devices = cache.get("devices", ignore_ttl=True)
         """
-        # Use in-process lock plus optional inter-process file lock per-key
         with self._lock:
+            # Vérifier expiration (sauf si ignore_ttl=True)
+            if not ignore_ttl and self._is_expired(key):
+                logger.debug(f"📦 Cache MISS (expired): {key}")
+                self._stats["misses"] += 1
+                return None
+
+            # Niveau mémoire: copie décodée de l'entrée, sans I/O ni verrou fichier
+            data = self._memory_get(key)
+            if data is not None:
+                logger.debug(f"⚡ Cache HIT (memory): {key}")
+                self._stats["hits"] += 1
+                self._stats["memory_hits"] += 1
+                return data
+
+            # Use in-process lock plus optional inter-process file lock per-key
             with self._file_lock(key):
-                # Vérifier expiration (sauf si ignore_ttl=True)
-                if not ignore_ttl and self._is_expired(key):
-                    logger.debug(f"📦 Cache MISS (expired): {key}")
+                # Chercher le fichier de l'entrée (compressé en priorité)
+                located = self._locate_entry(key)
+                if located is None:
+                    logger.debug(f"📦 Cache MISS (not found): {key}")
                     self._stats["misses"] += 1
                     return None
 
-                # Chercher fichier compressé ou non compressé
-                cache_file_gz = self.cache_dir / f"{key}.json.gz"
-                cache_file = self.cache_dir / f"{key}.json"
-
-                # Priorité au fichier compressé
-                if cache_file_gz.exists():
-                    try:
-                        with gzip.open(cache_file_gz, "rt", encoding="utf-8") as f:
-                            data = json.load(f)
-                        ttl_info = " (ignoring TTL)" if ignore_ttl else ""
-                        logger.debug(f"✅ Cache HIT (compressed): {key}{ttl_info}")
-                        self._stats["hits"] += 1
-                        return data
-                    except (json.JSONDecodeError, OSError) as e:
-                        logger.error(f"Erreur lecture cache compressé {key}: {e}")
-                        self._stats["misses"] += 1
-                        return None
-                elif cache_file.exists():
-                    try:
-                        data = json.loads(cache_file.read_text(encoding="utf-8"))
-                        ttl_info = " (ignoring TTL)" if ignore_ttl else ""
-                        logger.debug(f"✅ Cache HIT: {key}{ttl_info}")
-                        self._stats["hits"] += 1
-                        return data
-                    except (json.JSONDecodeError, OSError) as e:
-                        logger.error(f"Erreur lecture cache {key}: {e}")
-                        self._stats["misses"] += 1
-                        return None
-                else:
-                    logger.debug(f"📦 Cache MISS (not found): {key}")
+                cache_file, st = located
+                try:
+                    data = serialization.decode(
+                        cache_file.read_bytes(), *serialization.format_for_path(cache_file)
+                    )
+                except (ValueError, OSError) as e:
+                    logger.error(f"Erreur lecture cache {cache_file.name}: {e}")
                     self._stats["misses"] += 1
                     return None
 
+                ttl_info = " (ignoring TTL)" if ignore_ttl else ""
+                logger.debug(f"✅ Cache HIT ({cache_file.name}): {key}{ttl_info}")
+                self._stats["hits"] += 1
+                self._memory_put(key, self.codec.dumps(data), (st.st_mtime_ns, st.st_size))
+                return data
+
     def set(self, key: str, data: Dict[str, Any], ttl_seconds: int):
         """
         Sauvegarde une donnée dans le cache avec TTL et compression optionnelle.
@@ -171,135 +310,208 @@ class CacheService:
             >>> # Cache valide pendant 1 heure, compressé automatiquement
         """
         with self._lock:
+            if self.write_behind:
+                # Mode write-behind: servi immédiatement depuis la mémoire, persisté par lot.
+                # Sérialiser dès maintenant fige une copie privée des données.
+                try:
+                    payload = self.codec.dumps(data)
+                except TypeError as e:
+                    logger.error(f"Erreur sauvegarde cache {key}: {e}")
+                    return
+                self._pending[key] = (payload, ttl_seconds)
+                current_time = time.time()
+                self.metadata[key] = {
+                    **self.metadata.get(key, {}),
+                    "timestamp": current_time,
+                    "ttl": ttl_seconds,
+                    "expires_at": current_time + ttl_seconds,
+                }
+                self._expiry.push(key, current_time + ttl_seconds)
+                self._flush_event.set()
+                logger.debug(f"{SharedIcons.SAVE} Cache queued (write-behind): {key}")
+                return
+
             # Acquire per-key file lock to avoid concurrent writers/readers
             with self._file_lock(key):
-                try:
-                    # Sérialiser JSON (compact, sans indentation pour meilleure compression)
-                    json_str = json.dumps(data, separators=(",", ":"), ensure_ascii=False)
-                    original_size = len(json_str.encode("utf-8"))
-
-                    if self.use_compression:
-                        # Sauvegarder version compressée de façon atomique
-                        cache_file = self.cache_dir / f"{key}.json.gz"
-                        tmp_fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, prefix=f"{key}.", suffix='.json.gz.tmp')
-                        try:
-                            # write compressed bytes to temp file
-                            compressed_bytes = gzip.compress(json_str.encode('utf-8'))
-                            with os.fdopen(tmp_fd, 'wb') as tf:
-                                tf.write(compressed_bytes)
-                                tf.flush()
-                                os.fsync(tf.fileno())
-                            # atomic replace
-                            os.replace(tmp_path, str(cache_file))
-                            compressed_size = cache_file.stat().st_size
-                        finally:
-                            # ensure tmp file removed if something went wrong
-                            if os.path.exists(tmp_path):
-                                try:
-                                    os.remove(tmp_path)
-                                except OSError:
-                                    pass
-                        compression_ratio = (
-                            (1 - compressed_size / original_size) * 100 if original_size > 0 else 0
-                        )
-
-                        # Supprimer ancienne version non compressée si existe
-                        old_file = self.cache_dir / f"{key}.json"
-                        if old_file.exists():
-                            old_file.unlink()
-
-                        log_msg_prefix = f"{SharedIcons.SAVE} Cache saved (compressed): {key}"
-                        log_msg_details_part1 = f" (TTL: {ttl_seconds}s, {original_size}→{compressed_size} bytes,"
-                        log_msg_details_part2 = f" -{compression_ratio:.1f}%)"
-                        log_msg = log_msg_prefix + log_msg_details_part1 + log_msg_details_part2
-                    else:
-                        # Sauvegarder version non compressée de façon atomique (indentée pour lisibilité)
-                        cache_file = self.cache_dir / f"{key}.json"
-                        tmp_fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, prefix=f"{key}.", suffix='.json.tmp')
-                        try:
-                            with os.fdopen(tmp_fd, 'w', encoding='utf-8') as tf:
-                                tf.write(json.dumps(data, indent=2, ensure_ascii=False))
-                                tf.flush()
-                                os.fsync(tf.fileno())
-                            os.replace(tmp_path, str(cache_file))
-                            compressed_size = cache_file.stat().st_size
-                        finally:
-                            if os.path.exists(tmp_path):
-                                try:
-                                    os.remove(tmp_path)
-                                except OSError:
-                                    pass
-                        compression_ratio = 0
-
-                        # Supprimer ancienne version compressée si existe
-                        old_file = self.cache_dir / f"{key}.json.gz"
-                        if old_file.exists():
-                            old_file.unlink()
-
-                        log_msg = (
-                            f"{SharedIcons.SAVE} Cache saved: {key}"
-                            f" (TTL: {ttl_seconds}s, Size: {compressed_size} bytes)"
-                        )
-
-                    # Sauvegarder aussi une copie JSON lisible si demandé
-                    if self.save_json_copy and self.use_compression:
-                        # Write JSON copy atomically as well
-                        json_file = self.cache_dir / f"{key}.json"
-                        tmp_fd, tmp_path = tempfile.mkstemp(
-                            dir=self.cache_dir, prefix=f"{key}._copy.", suffix='.json.tmp'
-                        )
-                        try:
-                            with os.fdopen(tmp_fd, 'w', encoding='utf-8') as tf:
-                                tf.write(json.dumps(data, indent=2, ensure_ascii=False))
-                                tf.flush()
-                                os.fsync(tf.fileno())
-                            os.replace(tmp_path, str(json_file))
-                            logger.debug(f"{SharedIcons.FILE} Copie JSON sauvegardée: {key}.json")
-                        except OSError as e:
-                            logger.warning(f"Impossible de sauvegarder copie JSON {key}: {e}")
-                        finally:
-                            if os.path.exists(tmp_path):
-                                try:
-                                    os.remove(tmp_path)
-                                except OSError:
-                                    pass
-
-                    # Mettre à jour metadata
-                    current_time = time.time()
-                    self.metadata[key] = {
-                        "timestamp": current_time,
-                        "ttl": ttl_seconds,
-                        "expires_at": current_time + ttl_seconds,
-                        "size_bytes": compressed_size,
-                        "compressed": self.use_compression,
-                        "original_size": original_size if self.use_compression else compressed_size,
-                        "compression_ratio": compression_ratio,
-                        "has_json_copy": self.save_json_copy and self.use_compression,
-                    }
+                if self._write_entry(key, data, ttl_seconds):
+                    self._commit_metadata()
 
-                    # Save metadata under file lock to avoid concurrent metadata updates
-                    with self._file_lock('.metadata'):
-                        self._save_metadata()
-                    self._stats["writes"] += 1
-
-                    # Mettre à jour ratio compression moyen
-                    if self.use_compression:
-                        total_ratio = sum(
-                            meta.get("compression_ratio", 0)
-                            for meta in self.metadata.values()
-                            if meta.get("compressed", False)
-                        )
-                        compressed_count = sum(
-                            1 for meta in self.metadata.values() if meta.get("compressed", False)
-                        )
-                        self._stats["compression_ratio"] = (
-                            total_ratio / compressed_count if compressed_count > 0 else 0
-                        )
-
-                    logger.info(log_msg)
-
-                except (OSError, TypeError) as e:
-                    logger.error(f"Erreur sauvegarde cache {key}: {e}")
+    def _write_entry(
+        self, key: str, data: Dict[str, Any], ttl_seconds: int, encoded: Optional[bytes] = None
+    ) -> bool:
+        """
+        Écrit une entrée sur disque et met à jour metadata en mémoire.
+
+        Doit être appelé sous self._lock et le verrou fichier de la clé.
+        La sauvegarde du fichier metadata est laissée à l'appelant.
+
+        Args:
+            encoded: Données déjà sérialisées par self.codec (write-behind), sinon calculées ici
+
+        Returns:
+            True si l'écriture a réussi
+        """
+        try:
+            # Sérialiser une seule fois (compact, sans indentation pour meilleure compression)
+            if encoded is None:
+                encoded = self.codec.dumps(data)
+            payload = encoded
+            original_size = len(payload)
+            cache_file = self._entry_path(key)
+
+            if self.compressor.name != "none":
+                # Sauvegarder version compressée de façon atomique
+                stored_size = self._atomic_write(cache_file, self.compressor.compress(payload), prefix=f"{key}.")
+                compression_ratio = (
+                    (1 - stored_size / original_size) * 100 if original_size > 0 else 0
+                )
+
+                log_msg_prefix = f"{SharedIcons.SAVE} Cache saved ({self.codec.name}/{self.compressor.name}): {key}"
+                log_msg_details_part1 = f" (TTL: {ttl_seconds}s, {original_size}→{stored_size} bytes,"
+                log_msg_details_part2 = f" -{compression_ratio:.1f}%)"
+                log_msg = log_msg_prefix + log_msg_details_part1 + log_msg_details_part2
+            else:
+                # Sauvegarder version non compressée de façon atomique
+                # (JSON indenté pour lisibilité, sauf en mode haut débit)
+                if cache_file.suffix == ".json" and not self.high_throughput:
+                    payload = json.dumps(data, indent=2, ensure_ascii=False).encode("utf-8")
+                stored_size = self._atomic_write(cache_file, payload, prefix=f"{key}.")
+                compression_ratio = 0
+
+                log_msg = (
+                    f"{SharedIcons.SAVE} Cache saved ({self.codec.name}): {key}"
+                    f" (TTL: {ttl_seconds}s, Size: {stored_size} bytes)"
+                )
+
+            # Supprimer les versions dans d'autres formats (et la copie JSON désormais périmée)
+            self._remove_entry_files(key, keep=cache_file)
+
+            # Sauvegarder aussi une copie JSON lisible si demandé (à la demande en mode haut débit)
+            has_json_copy = False
+            if self.save_json_copy and cache_file.suffix != ".json" and not self.high_throughput:
+                has_json_copy = self._write_json_copy_file(key, data)
+
+            # Mettre à jour metadata
+            current_time = time.time()
+            previous_meta = self.metadata.get(key)
+            self.metadata[key] = {
+                "timestamp": current_time,
+                "ttl": ttl_seconds,
+                "expires_at": current_time + ttl_seconds,
+                "size_bytes": stored_size,
+                "compressed": self.compressor.name != "none",
+                "original_size": original_size if self.compressor.name != "none" else stored_size,
+                "compression_ratio": compression_ratio,
+                "has_json_copy": has_json_copy,
+                "codec": self.codec.name,
+                "compressor": self.compressor.name,
+            }
+
+            self._dirty_keys.add(key)
+            self._expiry.push(key, self.metadata[key]["expires_at"])
+            self._stats["writes"] += 1
+
+            # Mettre à jour ratio compression moyen (incrémental, O(1))
+            self._update_compression_totals(previous_meta, self.metadata[key])
+
+            # Niveau mémoire: la forme sérialisée sert les lectures suivantes
+            self._memory_put(key, encoded, self._file_signature(key))
+
+            logger.info(log_msg)
+            return True
+
+        except (OSError, TypeError) as e:
+            logger.error(f"Erreur sauvegarde cache {key}: {e}")
+            return False
+
+    def write_json_copy(self, key: str) -> Optional[Path]:
+        """
+        Écrit à la demande la copie JSON lisible (indentée) d'une entrée.
+
+        En mode haut débit, la copie n'est jamais écrite par set() : elle est
+        produite ici, par exemple depuis `alexa cache show`.
+
+        Args:
+            key: Clé du cache
+
+        Returns:
+            Chemin de la copie JSON, ou None si l'entrée n'existe pas
+
+        Example:
+            >>> path = cache.write_json_copy("smart_home_all")
+        """
+        with self._lock:
+            located = self._locate_entry(key)
+            if located is not None and located[0].suffix == ".json":
+                # Le fichier de cache est déjà un JSON lisible
+                return located[0]
+
+            data = self.get(key, ignore_ttl=True)
+            if data is None:
+                return None
+
+            with self._file_lock(key):
+                if not self._write_json_copy_file(key, data):
+                    return None
+                if key in self.metadata:
+                    self.metadata[key]["has_json_copy"] = True
+                    self._dirty_keys.add(key)
+                    self._commit_metadata()
+            return self.cache_dir / f"{key}.json"
+
+    def _write_json_copy_file(self, key: str, data: Dict[str, Any]) -> bool:
+        """Écrit la copie JSON lisible d'une entrée compressée ou binaire (atomique)."""
+        json_file = self.cache_dir / f"{key}.json"
+        try:
+            payload = json.dumps(data, indent=2, ensure_ascii=False).encode("utf-8")
+            self._atomic_write(json_file, payload, prefix=f"{key}._copy.")
+            logger.debug(f"{SharedIcons.FILE} Copie JSON sauvegardée: {key}.json")
+            return True
+        except OSError as e:
+            logger.warning(f"Impossible de sauvegarder copie JSON {key}: {e}")
+            return False
+
+    def _atomic_write(self, path: Path, payload: bytes, prefix: str) -> int:
+        """
+        Écrit des octets de façon atomique (fichier temporaire + os.replace).
+
+        Le fsync est omis en mode haut débit : le remplacement reste atomique,
+        seule la durabilité en cas de coupure de courant est relâchée.
+
+        Returns:
+            Taille du fichier écrit en octets
+        """
+        tmp_fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, prefix=prefix, suffix=f"{path.suffix}.tmp")
+        try:
+            with os.fdopen(tmp_fd, "wb") as tf:
+                tf.write(payload)
+                if not self.high_throughput:
+                    tf.flush()
+                    os.fsync(tf.fileno())
+            # atomic replace
+            os.replace(tmp_path, str(path))
+            return len(payload)
+        finally:
+            # ensure tmp file removed if something went wrong
+            if os.path.exists(tmp_path):
+                try:
+                    os.remove(tmp_path)
+                except OSError:
+                    pass
+
+    def _update_compression_totals(
+        self, old_meta: Optional[Dict[str, Any]], new_meta: Optional[Dict[str, Any]]
+    ) -> None:
+        """Met à jour le ratio de compression moyen en retirant old_meta et en ajoutant new_meta."""
+        if old_meta and old_meta.get("compressed", False):
+            self._ratio_sum -= old_meta.get("compression_ratio", 0)
+            self._ratio_count -= 1
+        if new_meta and new_meta.get("compressed", False):
+            self._ratio_sum += new_meta.get("compression_ratio", 0)
+            self._ratio_count += 1
+        self._stats["compression_ratio"] = (
+            self._ratio_sum / self._ratio_count if self._ratio_count > 0 else 0
+        )
 
     def invalidate(self, key: str) -> bool:
         """
@@ -315,34 +527,21 @@ class CacheService:
             >>> cache.invalidate("devices")  # Force refresh au prochain get()
         """
         with self._lock:
+            # Retirer du niveau mémoire et des écritures en attente
+            self._memory.pop(key, None)
+            self._pending.pop(key, None)
+
             # Acquire per-key lock to avoid races with writers
             with self._file_lock(key):
-                cache_file_gz = self.cache_dir / f"{key}.json.gz"
-                cache_file_json = self.cache_dir / f"{key}.json"
-                deleted = False
-
-                # Supprimer fichier compressé
-                if cache_file_gz.exists():
-                    try:
-                        cache_file_gz.unlink()
-                        deleted = True
-                    except OSError as e:
-                        logger.error(f"Erreur suppression cache compressé {key}: {e}")
-
-                # Supprimer fichier JSON lisible
-                if cache_file_json.exists():
-                    try:
-                        cache_file_json.unlink()
-                        deleted = True
-                    except OSError as e:
-                        logger.error(f"Erreur suppression cache JSON {key}: {e}")
+                # Supprimer fichier de l'entrée (tous formats) et copie JSON lisible
+                deleted = self._remove_entry_files(key) > 0
 
                 # Supprimer metadata
                 if key in self.metadata:
-                    del self.metadata[key]
-                    # update metadata with metadata lock
-                    with self._file_lock('.metadata'):
-                        self._save_metadata()
+                    self._update_compression_totals(self.metadata.pop(key), None)
+                    self._expiry.discard(key)
+                    self._dirty_keys.add(key)
+                    self._commit_metadata()
                     deleted = True
 
                 if deleted:
@@ -380,6 +579,9 @@ class CacheService:
         """
         Supprime uniquement les caches expirés.
 
+        Les clés expirées sont extraites du tas des échéances : le coût est
+        proportionnel au nombre d'entrées expirées, pas au nombre total.
+
         Returns:
             Nombre de caches expirés supprimés
 
@@ -389,9 +591,7 @@ class CacheService:
         """
         with self._lock:
             count = 0
-            expired_keys = [key for key in self.metadata if self._is_expired(key)]
-
-            for key in expired_keys:
+            for key in self._expiry.pop_expired():
                 if self.invalidate(key):
                     count += 1
 
@@ -400,6 +600,90 @@ class CacheService:
 
             return count
 
+    def get_age(self, key: str) -> Optional[float]:
+        """
+        Retourne l'âge en secondes de la dernière écriture d'une entrée, ou None.
+
+        Example:
+            >>> if (cache.get_age("devices") or 0) > 300:
+            ...     refresh_devices()
+        """
+        with self._lock:
+            meta = self.metadata.get(key)
+            if meta is None or "timestamp" not in meta:
+                return None
+            return time.time() - meta["timestamp"]
+
+    def next_expiry(self) -> Optional[float]:
+        """
+        Retourne la prochaine échéance (timestamp) parmi les entrées, ou None.
+
+        Example:
+            >>> due = cache.next_expiry()
+        """
+        with self._lock:
+            return self._expiry.next_expiry()
+
+    def start_reaper(self, interval: float = 60.0) -> None:
+        """
+        Démarre le thread de nettoyage des entrées expirées (processus longs).
+
+        Le thread se réveille à la prochaine échéance, ou au plus tard
+        toutes les ``interval`` secondes, et appelle clean_expired().
+
+        Args:
+            interval: Délai maximal entre deux passages (secondes)
+        """
+        with self._lock:
+            if self._reaper is not None and self._reaper.is_alive():
+                return
+            self._reaper = Reaper(self.clean_expired, interval, self.next_expiry, "cache-reaper")
+            self._reaper.start()
+            logger.debug(f"Reaper cache démarré (intervalle: {interval}s)")
+
+    def stop_reaper(self) -> None:
+        """Arrête le thread de nettoyage s'il tourne."""
+        reaper = self._reaper
+        self._reaper = None
+        if reaper is not None:
+            reaper.stop()
+
+    def flush(self) -> int:
+        """
+        Persiste immédiatement les écritures différées (mode write-behind)
+        et la metadata en attente de commit groupé (mode haut débit).
+
+        Les clés sont écrites une par une (le verrou est relâché entre deux
+        clés pour laisser passer les lectures), puis metadata est sauvegardé
+        une seule fois pour tout le lot.
+
+        Returns:
+            Nombre d'entrées persistées
+
+        Example:
+            >>> cache.flush()  # avant de quitter un processus long
+        """
+        with self._lock:
+            keys = list(self._pending)
+
+        written = 0
+        for key in keys:
+            with self._lock:
+                pending = self._pending.pop(key, None)
+                if pending is None:
+                    continue
+                encoded, ttl_seconds = pending
+                with self._file_lock(key):
+                    if self._write_entry(key, self.codec.loads(encoded), ttl_seconds, encoded=encoded):
+                        written += 1
+
+        with self._lock:
+            if self._dirty_keys:
+                self._commit_metadata(force=True)
+        if written:
+            logger.debug(f"{SharedIcons.SAVE} Write-behind: {written} entrée(s) persistée(s)")
+        return written
+
     def get_stats(self) -> Dict[str, Any]:
         """
         Retourne les statistiques du cache.
@@ -428,8 +712,10 @@ class CacheService:
                     }
                 )
 
+            next_expiry = self._expiry.next_expiry()
             return {
                 "hits": self._stats["hits"],
+                "memory_hits": self._stats["memory_hits"],
                 "misses": self._stats["misses"],
                 "writes": self._stats["writes"],
                 "invalidations": self._stats["invalidations"],
@@ -437,46 +723,282 @@ class CacheService:
                 "compression_enabled": self.use_compression,
                 "avg_compression_ratio": self._stats.get("compression_ratio", 0),
                 "total_entries": len(entries),
+                "expired_entries": self._expiry.count_expired(),
+                "next_expiry_in_seconds": (
+                    max(0, int(next_expiry - time.time())) if next_expiry is not None else None
+                ),
+                "memory_entries": len(self._memory),
+                "pending_writes": len(self._pending),
+                "write_behind": self.write_behind,
+                "codec": self.codec.name,
+                "compressor": self.compressor.name,
                 "entries": entries,
             }
 
+    def _file_signature(self, key: str) -> Optional[Tuple[int, int]]:
+        """Retourne (mtime_ns, taille) du fichier lu par get() pour cette clé, ou None."""
+        located = self._locate_entry(key)
+        if located is None:
+            return None
+        st = located[1]
+        return (st.st_mtime_ns, st.st_size)
+
+    def _entry_path(self, key: str) -> Path:
+        """Chemin du fichier de l'entrée pour le codec et compresseur configurés."""
+        return self.cache_dir / f"{key}{self.codec.suffix}{self.compressor.suffix}"
+
+    def _locate_entry(self, key: str) -> Optional[Tuple[Path, os.stat_result]]:
+        """
+        Trouve le fichier de l'entrée, quel que soit son format.
+
+        Le format configuré est essayé d'abord, puis tous les suffixes connus
+        (anciens fichiers .json.gz, entrées écrites par une autre configuration).
+
+        Returns:
+            Tuple (chemin, stat) ou None si aucun fichier
+        """
+        preferred = f"{self.codec.suffix}{self.compressor.suffix}"
+        for suffix in (preferred, *serialization.ENTRY_SUFFIXES):
+            path = self.cache_dir / f"{key}{suffix}"
+            try:
+                return path, path.stat()
+            except OSError:
+                continue
+        return None
+
+    def _remove_entry_files(self, key: str, keep: Optional[Path] = None) -> int:
+        """
+        Supprime les fichiers de l'entrée dans tous les formats connus, sauf keep.
+
+        Returns:
+            Nombre de fichiers supprimés
+        """
+        removed = 0
+        for suffix in serialization.ENTRY_SUFFIXES:
+            path = self.cache_dir / f"{key}{suffix}"
+            if path == keep:
+                continue
+            try:
+                path.unlink()
+                removed += 1
+            except FileNotFoundError:
+                continue
+            except OSError as e:
+                logger.error(f"Erreur suppression cache {path.name}: {e}")
+        return removed
+
+    def _memory_get(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Lit une entrée du niveau mémoire si elle est encore à jour.
+
+        Une écriture en attente (write-behind) fait autorité. Sinon la
+        signature du fichier doit être inchangée, ce qui détecte les
+        écritures ou suppressions faites par d'autres processus.
+
+        Chaque appel décode un nouvel objet : l'appelant peut le modifier
+        sans altérer le cache.
+        """
+        pending = self._pending.get(key)
+        if pending is not None:
+            return self.codec.loads(pending[0])
+
+        entry = self._memory.get(key)
+        if entry is None:
+            return None
+
+        encoded, signature = entry
+        if signature != self._file_signature(key):
+            logger.debug(f"Cache mémoire périmé (fichier modifié): {key}")
+            del self._memory[key]
+            return None
+
+        self._memory.move_to_end(key)
+        return self.codec.loads(encoded)
+
+    def _memory_put(self, key: str, encoded: bytes, signature: Optional[Tuple[int, int]]) -> None:
+        """Insère une entrée sérialisée dans le niveau mémoire et applique l'éviction LRU."""
+        if self.memory_max_entries <= 0:
+            return
+
+        self._memory[key] = (encoded, signature)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_max_entries:
+            self._memory.popitem(last=False)
+
+    @staticmethod
+    def _write_behind_loop(
+        cache_ref: "weakref.ReferenceType[CacheService]", flush_event: Event, released: Event
+    ) -> None:
+        """Boucle du thread write-behind: regroupe puis persiste les écritures."""
+        while True:
+            flush_event.wait()
+            cache = cache_ref()
+            if cache is None:
+                return
+            delay = cache.write_behind_delay
+            del cache
+            # Laisser les écritures rapprochées s'accumuler dans le même lot
+            if released.wait(delay):
+                return
+            flush_event.clear()
+            cache = cache_ref()
+            if cache is None:
+                return
+            try:
+                cache.flush()
+            except Exception as e:
+                logger.error(f"Erreur write-behind: {e}")
+            del cache
+
     def _is_expired(self, key: str) -> bool:
         """Vérifie si une entrée de cache est expirée."""
         if key not in self.metadata:
             return True
         return time.time() > self.metadata[key]["expires_at"]
 
+    def _commit_metadata(self, force: bool = False) -> None:
+        """
+        Journalise les clés metadata modifiées, avec commit groupé en mode haut débit.
+
+        Chaque commit ajoute une ligne par clé modifiée au journal (O(1) par
+        clé, quel que soit le nombre d'entrées). Le journal est compacté dans
+        le snapshot quand il dépasse journal_compact_threshold lignes.
+
+        En mode haut débit, les commits rapprochés de moins de
+        metadata_commit_interval sont regroupés ; le dernier est fait
+        par flush() (appelé aussi à la sortie du processus).
+        """
+        if not self._dirty_keys:
+            return
+        if (
+            self.high_throughput
+            and not force
+            and time.time() - self._last_metadata_commit < self.metadata_commit_interval
+        ):
+            return
+
+        keys = sorted(self._dirty_keys)
+        # Append under metadata lock: lignes complètes, compaction exclusive
+        with self._file_lock('.metadata'):
+            if not self._append_journal(keys):
+                return
+            if self._journal_entries >= self.journal_compact_threshold:
+                self._compact_metadata()
+        self._dirty_keys.difference_update(keys)
+        self._last_metadata_commit = time.time()
+
+    def _append_journal(self, keys: List[str]) -> bool:
+        """
+        Ajoute au journal l'état courant des clés (None = clé supprimée).
+
+        Returns:
+            True si l'ajout a réussi
+        """
+        lines = "".join(
+            json.dumps({"key": key, "meta": self.metadata.get(key)}, ensure_ascii=False) + "\n"
+            for key in keys
+        )
+        try:
+            with open(self.journal_file, "a", encoding="utf-8") as jf:
+                jf.write(lines)
+                if not self.high_throughput:
+                    jf.flush()
+                    os.fsync(jf.fileno())
+            self._journal_entries += len(keys)
+            return True
+        except OSError as e:
+            logger.error(f"Erreur écriture journal metadata: {e}")
+            return False
+
+    def _compact_metadata(self) -> None:
+        """
+        Réécrit le snapshot metadata à partir de l'état disque et vide le journal.
+
+        L'état est relu depuis le disque (snapshot + journal) afin de conserver
+        les mises à jour journalisées par d'autres processus. Doit être appelé
+        sous le verrou fichier '.metadata'.
+        """
+        merged, _, _ = self._read_metadata_files()
+        if not self._save_metadata(merged):
+            return
+        try:
+            # Tronquer le journal seulement une fois le snapshot remplacé
+            with open(self.journal_file, "w", encoding="utf-8"):
+                pass
+            self._journal_entries = 0
+            logger.debug(f"Journal metadata compacté: {len(merged)} entrée(s)")
+        except OSError as e:
+            logger.error(f"Erreur compaction journal metadata: {e}")
+
+    def _read_metadata_files(self) -> Tuple[Dict[str, Dict[str, Any]], int, bool]:
+        """
+        Lit le snapshot metadata puis rejoue le journal.
+
+        Les lignes illisibles (ex: dernière ligne tronquée par un crash) sont ignorées.
+
+        Returns:
+            Tuple (metadata, nombre de lignes du journal, journal intact)
+        """
+        metadata: Dict[str, Dict[str, Any]] = {}
+        if self.metadata_file.exists():
+            try:
+                metadata = json.loads(self.metadata_file.read_text(encoding="utf-8"))
+            except (json.JSONDecodeError, OSError) as e:
+                logger.warning(f"Erreur chargement metadata: {e}, réinitialisation")
+                metadata = {}
+
+        entries = 0
+        intact = True
+        if self.journal_file.exists():
+            try:
+                with open(self.journal_file, encoding="utf-8") as jf:
+                    for line in jf:
+                        entries += 1
+                        try:
+                            record = json.loads(line)
+                        except json.JSONDecodeError:
+                            logger.debug("Ligne de journal metadata ignorée (illisible)")
+                            intact = False
+                            continue
+                        if record.get("meta") is None:
+                            metadata.pop(record.get("key"), None)
+                        else:
+                            metadata[record["key"]] = record["meta"]
+            except OSError as e:
+                logger.warning(f"Erreur lecture journal metadata: {e}")
+
+        return metadata, entries, intact
+
     def _load_metadata(self):
-        """Charge le fichier metadata au démarrage."""
+        """Charge metadata au démarrage (snapshot + rejeu du journal)."""
         # Load metadata under metadata lock to avoid partial reads during writes
         with self._file_lock('.metadata'):
-            if self.metadata_file.exists():
-                try:
-                    self.metadata = json.loads(self.metadata_file.read_text(encoding="utf-8"))
-                    logger.debug(f"Metadata chargé: {len(self.metadata)} entrée(s)")
-                except (json.JSONDecodeError, OSError) as e:
-                    logger.warning(f"Erreur chargement metadata: {e}, réinitialisation")
-                    self.metadata = {}
-
-    def _save_metadata(self):
-        """Sauvegarde le fichier metadata."""
+            self.metadata, self._journal_entries, intact = self._read_metadata_files()
+            if not intact:
+                # Compacter pour que les ajouts suivants ne prolongent pas une ligne tronquée
+                self._compact_metadata()
+            if self.metadata:
+                logger.debug(f"Metadata chargé: {len(self.metadata)} entrée(s)")
+
+    def _save_metadata(self, metadata: Optional[Dict[str, Dict[str, Any]]] = None) -> bool:
+        """
+        Sauvegarde le snapshot metadata (atomique).
+
+        Args:
+            metadata: Contenu à écrire (défaut: self.metadata)
+
+        Returns:
+            True si la sauvegarde a réussi
+        """
         try:
-            # Write metadata atomically
-            tmp_fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, prefix='.metadata.', suffix='.tmp')
-            try:
-                with os.fdopen(tmp_fd, 'w', encoding='utf-8') as tf:
-                    tf.write(json.dumps(self.metadata, indent=2, ensure_ascii=False))
-                    tf.flush()
-                    os.fsync(tf.fileno())
-                os.replace(tmp_path, str(self.metadata_file))
-            finally:
-                if os.path.exists(tmp_path):
-                    try:
-                        os.remove(tmp_path)
-                    except OSError:
-                        pass
+            payload = json.dumps(
+                self.metadata if metadata is None else metadata, indent=2, ensure_ascii=False
+            ).encode("utf-8")
+            self._atomic_write(self.metadata_file, payload, prefix='.metadata.')
+            return True
         except OSError as e:
             logger.error(f"Erreur sauvegarde metadata: {e}")
+            return False
 
     @contextmanager
     def _file_lock(self, name: str, timeout: float = 5.0):
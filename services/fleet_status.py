@@ -0,0 +1,204 @@
+"""
+Instantané d'état de tous les appareils Alexa (flotte).
+
+Rassemble en un seul passage, pour chaque appareil de DeviceManager :
+- état en ligne
+- lecture en cours (mode léger, sans file d'attente)
+- volume
+- Ne Pas Déranger
+
+Les requêtes de lecture partent en parallèle (client asynchrone, concurrence
+bornée). Volume et DND sont servis par des endpoints couvrant tout le compte :
+chacun est interrogé une seule fois par instantané, puis chaque appareil y
+est recherché.
+
+Usage:
+    from services.fleet_status import FleetStatusService
+
+    fleet = FleetStatusService(auth, device_mgr, playback_mgr, dnd_mgr, settings_mgr)
+    document = fleet.snapshot()
+"""
+
+import asyncio
+import time
+from datetime import datetime, timezone
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
+
+from loguru import logger
+
+from utils.async_http import AsyncAlexaClient
+
+if TYPE_CHECKING:
+    from core.device_manager import DeviceManager
+    from core.dnd_manager import DNDManager
+    from core.music.playback_manager import PlaybackManager
+    from core.settings.device_settings_manager import DeviceSettingsManager
+
+
+class FleetStatusService:
+    """
+    Construit un document JSON décrivant l'état de tous les appareils.
+
+    Example:
+        >>> fleet = FleetStatusService(auth, device_mgr, playback_mgr, dnd_mgr, settings_mgr)
+        >>> document = fleet.snapshot(max_concurrency=10)
+        >>> document["device_count"]
+        30
+    """
+
+    def __init__(
+        self,
+        auth: Any,
+        device_mgr: "DeviceManager",
+        playback_mgr: Optional["PlaybackManager"] = None,
+        dnd_mgr: Optional["DNDManager"] = None,
+        settings_mgr: Optional["DeviceSettingsManager"] = None,
+    ):
+        """
+        Initialise le service.
+
+        Args:
+            auth: Instance AlexaAuth (cookies et csrf du client asynchrone)
+            device_mgr: Source de la liste des appareils
+            playback_mgr: Lecture en cours (None = non collectée)
+            dnd_mgr: Statut Ne Pas Déranger (None = non collecté)
+            settings_mgr: Volume (None = non collecté)
+        """
+        self.auth = auth
+        self.device_mgr = device_mgr
+        self.playback_mgr = playback_mgr
+        self.dnd_mgr = dnd_mgr
+        self.settings_mgr = settings_mgr
+
+    def snapshot(self, max_concurrency: int = 10, online_only: bool = False) -> Dict[str, Any]:
+        """
+        Version bloquante de snapshot_async() (CLI).
+
+        Args:
+            max_concurrency: Nombre maximal d'appareils interrogés simultanément
+            online_only: Exclure les appareils hors ligne du document
+
+        Returns:
+            Document de l'instantané
+        """
+        return asyncio.run(self.snapshot_async(max_concurrency=max_concurrency, online_only=online_only))
+
+    async def snapshot_async(
+        self,
+        client: Optional[AsyncAlexaClient] = None,
+        max_concurrency: int = 10,
+        online_only: bool = False,
+    ) -> Dict[str, Any]:
+        """
+        Collecte l'état de tous les appareils.
+
+        Args:
+            client: Client asynchrone à réutiliser (défaut: client temporaire)
+            max_concurrency: Nombre maximal d'appareils interrogés simultanément
+            online_only: Exclure les appareils hors ligne du document
+
+        Returns:
+            Document {"generated_at", "duration_ms", "device_count", "online_count", "devices"}
+        """
+        start = time.perf_counter()
+        if client is None:
+            async with AsyncAlexaClient(self.auth, max_concurrency=max_concurrency) as own_client:
+                devices = await self._collect(own_client, max_concurrency, online_only)
+        else:
+            devices = await self._collect(client, max_concurrency, online_only)
+
+        duration_ms = round((time.perf_counter() - start) * 1000)
+        logger.info(f"📊 Instantané de {len(devices)} appareil(s) en {duration_ms} ms")
+        return {
+            "generated_at": datetime.now(timezone.utc).isoformat(),
+            "duration_ms": duration_ms,
+            "device_count": len(devices),
+            "online_count": sum(1 for device in devices if device["online"]),
+            "devices": devices,
+        }
+
+    async def _collect(
+        self, client: AsyncAlexaClient, max_concurrency: int, online_only: bool
+    ) -> List[Dict[str, Any]]:
+        """Interroge tous les appareils avec une concurrence bornée."""
+        devices = await self.device_mgr.get_devices_async(client) or []
+        if online_only:
+            devices = [device for device in devices if device.get("online", False)]
+
+        # Endpoints de compte (volume, DND) : une requête chacun pour tout l'instantané
+        volumes: Optional[Dict[str, Any]] = None
+        dnd: Optional[Dict[str, Any]] = None
+        if any(device.get("online", False) for device in devices):
+            volumes, dnd = await asyncio.gather(self._fetch_volumes(client), self._fetch_dnd(client))
+
+        semaphore = asyncio.Semaphore(max(1, max_concurrency))
+
+        async def bounded(device: Dict[str, Any]) -> Dict[str, Any]:
+            async with semaphore:
+                return await self._device_status(client, device, volumes, dnd)
+
+        return list(await asyncio.gather(*(bounded(device) for device in devices)))
+
+    async def _device_status(
+        self,
+        client: AsyncAlexaClient,
+        device: Dict[str, Any],
+        volumes: Optional[Dict[str, Any]],
+        dnd: Optional[Dict[str, Any]],
+    ) -> Dict[str, Any]:
+        """
+        Construit l'entrée d'un appareil ; les appareils hors ligne ne sont pas interrogés.
+
+        Volume et DND sont lus dans les réponses de compte déjà récupérées par _collect().
+        """
+        serial = device.get("serialNumber", "")
+        device_type = device.get("deviceType", "")
+        online = bool(device.get("online", False))
+        status: Dict[str, Any] = {
+            "name": device.get("accountName"),
+            "serial": serial,
+            "type": device_type,
+            "family": device.get("deviceFamily"),
+            "online": online,
+            "playback": None,
+            "volume": None,
+            "dnd": None,
+        }
+        if not online:
+            return status
+
+        status["playback"] = await self._playback(client, serial, device_type)
+        if volumes is not None and self.settings_mgr is not None:
+            status["volume"] = self.settings_mgr.find_volume(volumes, serial)
+        if dnd is not None and self.dnd_mgr is not None:
+            dnd_status = self.dnd_mgr.find_dnd_status(dnd, serial)
+            status["dnd"] = None if dnd_status is None else bool(dnd_status.get("enabled"))
+        return status
+
+    async def _playback(self, client: AsyncAlexaClient, serial: str, device_type: str) -> Optional[Dict[str, Any]]:
+        """Résumé de la lecture en cours (état, titre, artiste, service)."""
+        if self.playback_mgr is None:
+            return None
+        state = await self.playback_mgr.get_state_async(client, serial, device_type, include_queue=False)
+        player_info = ((state or {}).get("player") or {}).get("playerInfo")
+        if not player_info:
+            return None
+        info_text = player_info.get("infoText") or {}
+        return {
+            "state": player_info.get("state"),
+            "title": info_text.get("title"),
+            "artist": info_text.get("subText1"),
+            "provider": (player_info.get("provider") or {}).get("providerName"),
+        }
+
+    async def _fetch_volumes(self, client: AsyncAlexaClient) -> Optional[Dict[str, Any]]:
+        """Réponse allDeviceVolumes du compte (None = non collectée ou erreur)."""
+        if self.settings_mgr is None:
+            return None
+        return await self.settings_mgr.get_all_volumes_async(client)
+
+    async def _fetch_dnd(self, client: AsyncAlexaClient) -> Optional[Dict[str, Any]]:
+        """Réponse /api/dnd/status du compte (None = non collectée ou erreur)."""
+        if self.dnd_mgr is None:
+            return None
+        return await self.dnd_mgr.get_all_dnd_status_async(client)
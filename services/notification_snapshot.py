@@ -0,0 +1,194 @@
+"""
+Snapshot partagé de l'endpoint /api/notifications.
+
+Timers, alarmes et rappels sont tous servis par le même endpoint
+/api/notifications. Ce service télécharge la charge utile une seule fois,
+la partitionne par type et par appareil, et la sert à tous les consommateurs
+(TimerManager, AlarmManager, ReminderManager, SyncService) tant que le TTL
+n'est pas écoulé. Toute écriture via un manager invalide le snapshot.
+
+Le snapshot est aussi persisté dans le CacheService sous la clé
+``alarms_and_reminders`` (format historique de SyncService), ce qui permet
+à deux invocations CLI successives de partager le même téléchargement.
+"""
+
+import time
+from dataclasses import dataclass, field
+from threading import RLock
+from typing import Any, Callable, Dict, List, Optional
+
+from loguru import logger
+
+from services.cache_service import CacheService
+
+
+@dataclass
+class NotificationSnapshot:
+    """
+    Copie figée des notifications Alexa avec partitions pré-calculées.
+
+    Attributes:
+        notifications: Liste brute des notifications
+        fetched_at: Timestamp de récupération
+        by_type: Index type ("Timer", "Alarm", "Reminder"...) → notifications
+        by_device: Index deviceSerialNumber → notifications
+    """
+
+    notifications: List[Dict[str, Any]]
+    fetched_at: float
+    by_type: Dict[str, List[Dict[str, Any]]] = field(default_factory=dict)
+    by_device: Dict[str, List[Dict[str, Any]]] = field(default_factory=dict)
+
+    def __post_init__(self) -> None:
+        """Construit les partitions par type et par appareil."""
+        for notification in self.notifications:
+            self.by_type.setdefault(notification.get("type", ""), []).append(notification)
+            serial = notification.get("deviceSerialNumber")
+            if serial:
+                self.by_device.setdefault(serial, []).append(notification)
+
+    def age(self) -> float:
+        """Retourne l'âge du snapshot en secondes."""
+        return time.time() - self.fetched_at
+
+    def select(
+        self,
+        notification_type: Optional[str] = None,
+        device_serial: Optional[str] = None,
+        status: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Sélectionne les notifications correspondant aux filtres.
+
+        Args:
+            notification_type: Type de notification (ex: "Timer")
+            device_serial: Numéro de série de l'appareil
+            status: Statut (ex: "ON")
+
+        Returns:
+            Nouvelle liste des notifications correspondantes
+        """
+        if notification_type is not None:
+            candidates = self.by_type.get(notification_type, [])
+        elif device_serial is not None:
+            candidates = self.by_device.get(device_serial, [])
+        else:
+            candidates = self.notifications
+
+        return [
+            n
+            for n in candidates
+            if (device_serial is None or n.get("deviceSerialNumber") == device_serial)
+            and (status is None or n.get("status") == status)
+        ]
+
+
+class NotificationSnapshotService:
+    """
+    Service thread-safe partageant un snapshot unique de /api/notifications.
+
+    Le téléchargement est fourni par l'appelant (``fetch``) afin que chaque
+    manager conserve son propre client HTTP et son circuit breaker ; il n'est
+    invoqué que si le snapshot est absent ou expiré. Les appels concurrents
+    attendent le verrou puis réutilisent le snapshot fraîchement construit.
+
+    Example:
+        >>> snapshots = NotificationSnapshotService(cache_service)
+        >>> snap = snapshots.get_snapshot(fetch=lambda: session.get(url))
+        >>> timers = snap.select("Timer", status="ON")
+        >>> snapshots.invalidate()  # après une écriture
+    """
+
+    CACHE_KEY = "alarms_and_reminders"
+    DEFAULT_TTL = 300  # 5 minutes, comme les caches disque des managers
+
+    def __init__(self, cache_service: Optional[CacheService] = None, ttl_seconds: int = DEFAULT_TTL):
+        """
+        Initialise le service de snapshot.
+
+        Args:
+            cache_service: Service de cache persistant (créé si None)
+            ttl_seconds: Durée de validité du snapshot (mémoire et disque)
+        """
+        self.cache_service = cache_service or CacheService()
+        self.ttl_seconds = ttl_seconds
+        self._snapshot: Optional[NotificationSnapshot] = None
+        self._lock = RLock()
+        self._stats = {"fetches": 0, "memory_hits": 0, "disk_hits": 0, "invalidations": 0}
+
+    def get_snapshot(self, fetch: Callable[[], Any], force_refresh: bool = False) -> NotificationSnapshot:
+        """
+        Retourne le snapshot courant, en le téléchargeant si nécessaire.
+
+        Args:
+            fetch: Callable sans argument retournant la réponse HTTP de /api/notifications
+            force_refresh: Ignorer mémoire et disque et retélécharger
+
+        Returns:
+            NotificationSnapshot valide
+
+        Raises:
+            Toute exception levée par ``fetch``, ``raise_for_status`` ou le parsing JSON
+        """
+        with self._lock:
+            if not force_refresh:
+                snapshot = self._snapshot
+                if snapshot is not None and snapshot.age() < self.ttl_seconds:
+                    self._stats["memory_hits"] += 1
+                    return snapshot
+
+                cached = self.cache_service.get(self.CACHE_KEY)
+                if isinstance(cached, dict) and isinstance(cached.get("notifications"), list):
+                    self._stats["disk_hits"] += 1
+                    self._snapshot = NotificationSnapshot(
+                        cached["notifications"], cached.get("fetched_at", time.time())
+                    )
+                    logger.debug(f"💾 Snapshot notifications (disque): {len(cached['notifications'])}")
+                    return self._snapshot
+
+            logger.debug("🌐 Récupération du snapshot /api/notifications")
+            response = fetch()
+            response.raise_for_status()
+
+            notifications: List[Dict[str, Any]]
+            if not response.content.strip():
+                notifications = []
+            else:
+                notifications = response.json().get("notifications", [])
+
+            return self.store(notifications)
+
+    def store(self, notifications: List[Dict[str, Any]]) -> NotificationSnapshot:
+        """
+        Remplace le snapshot par une liste de notifications fraîche.
+
+        Args:
+            notifications: Liste brute renvoyée par l'API
+
+        Returns:
+            Le nouveau snapshot
+        """
+        with self._lock:
+            self._stats["fetches"] += 1
+            snapshot = NotificationSnapshot(notifications, time.time())
+            self._snapshot = snapshot
+            self.cache_service.set(
+                self.CACHE_KEY,
+                {"notifications": notifications, "fetched_at": snapshot.fetched_at},
+                ttl_seconds=self.ttl_seconds,
+            )
+            logger.debug(f"Snapshot notifications: {len(notifications)} entrée(s)")
+            return snapshot
+
+    def invalidate(self) -> None:
+        """Invalide le snapshot (mémoire + disque), à appeler après toute écriture."""
+        with self._lock:
+            self._snapshot = None
+            self._stats["invalidations"] += 1
+            self.cache_service.invalidate(self.CACHE_KEY)
+            logger.debug("Snapshot notifications invalidé")
+
+    def get_stats(self) -> Dict[str, int]:
+        """Retourne les compteurs fetches / hits / invalidations."""
+        with self._lock:
+            return dict(self._stats)
@@ -17,11 +17,16 @@ Date: 7 octobre 2025
 """
 
 import time
-from typing import Any, Callable, Dict, List, Optional, Tuple, cast
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 from loguru import logger
 
+from core.circuit_breaker import CircuitBreaker
+from core.smart_home.entities import refresh_smart_home_cache
 from services.cache_service import CacheService
+from services.notification_snapshot import NotificationSnapshotService
+from utils.device_index import Device
 from utils.logger import SharedIcons
 
 
@@ -39,9 +44,21 @@ class SyncService:
         cache_service: Service de cache
         state_machine: Machine à états
         _lazy_loaded: Dictionnaire des données déjà chargées
+        max_workers: Taille maximale du pool de threads en mode parallèle
     """
 
-    def __init__(self, auth: Any, config: Any, state_machine: Any, cache_service: Optional[CacheService] = None):
+    # Taille par défaut du pool pour le préchargement parallèle
+    DEFAULT_MAX_WORKERS = 5
+
+    def __init__(
+        self,
+        auth: Any,
+        config: Any,
+        state_machine: Any,
+        cache_service: Optional[CacheService] = None,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        notification_snapshot: Optional[NotificationSnapshotService] = None,
+    ):
         """
         Initialise le service de synchronisation.
 
@@ -50,12 +67,18 @@ class SyncService:
             config: Config instance
             state_machine: AlexaStateMachine instance
             cache_service: CacheService (optionnel, créé si None)
+            max_workers: Nombre maximum de fetchs simultanés en mode parallèle
+            notification_snapshot: Snapshot /api/notifications partagé (créé si None)
         """
         self.auth: Any = auth
         self.config: Any = config
         self.state_machine: Any = state_machine
         # Assurer un type concret pour le service de cache
         self.cache_service: CacheService = cache_service or CacheService()
+        self.max_workers = max(1, max_workers)
+        self.notifications = notification_snapshot or NotificationSnapshotService(self.cache_service)
+        # Circuit breaker des entités smart home (même réglage que les contrôleurs)
+        self.smart_home_breaker = CircuitBreaker(failure_threshold=3, timeout=30)
 
         # Statistiques de sync
         self.last_sync_time = 0.0
@@ -91,6 +114,11 @@ class SyncService:
             logger.warning("⚠️  State machine non connectée, sync impossible")
             return {"success": False, "error": "not_connected"}
 
+        # Cache appareils encore valide : rien à faire (démarrage des commandes servies par le cache)
+        if not force and self.cache_service.get("devices"):
+            logger.debug("Cache appareils valide, synchronisation au démarrage ignorée")
+            return {"success": True, "skipped": True, "synced": {}, "failed": []}
+
         start_time = time.time()
         stats: Dict[str, Any] = {
             "success": True,
@@ -127,7 +155,7 @@ class SyncService:
 
         return stats
 
-    def sync_all(self, force: bool = False) -> Dict[str, Any]:
+    def sync_all(self, force: bool = False, parallel: bool = True) -> Dict[str, Any]:
         """
         Synchronise toutes les données Alexa (méthode legacy).
 
@@ -137,6 +165,7 @@ class SyncService:
 
         Args:
             force: Forcer la sync même si cache valide
+            parallel: Récupérer les catégories en parallèle (défaut: True)
 
         Returns:
             Dict avec statistiques de synchronisation
@@ -146,18 +175,15 @@ class SyncService:
         )
 
         # Forcer le chargement de toutes les données
-        self.get_smart_home_devices(force=force)
-        self.get_alarms_reminders(force=force)
-        self.get_lists(force=force)
-        self.get_routines(force=force)
-        self.get_activities(force=force)
+        preload_stats = self.preload_all_data(force=force, parallel=parallel)
+        self.sync_stats["preload"] = preload_stats
 
         # Retourner les stats globales
         return self.get_sync_stats()
 
     # ===== GETTERS LAZY =====
 
-    def get_smart_home_devices(self, force: bool = False) -> List[Dict[str, Any]]:
+    def get_smart_home_devices(self, force: bool = False, raise_errors: bool = False) -> List[Dict[str, Any]]:
         """
         Récupère les smart home devices (lazy loading).
 
@@ -165,6 +191,7 @@ class SyncService:
 
         Args:
             force: Forcer le refresh depuis l'API
+            raise_errors: Propager l'erreur de l'API au lieu de retourner []
 
         Returns:
             Liste des smart home devices
@@ -177,20 +204,23 @@ class SyncService:
 
         # Charger depuis l'API
         try:
-            devices = self._sync_smart_home_devices()
+            devices = self._sync_smart_home_devices(raise_errors)
             self._lazy_loaded["smart_home"] = True
             logger.debug(f"Lazy loaded: {len(devices)} smart home devices")
             return devices
         except Exception as e:
             logger.error(f"Erreur lazy loading smart home: {e}")
+            if raise_errors:
+                raise
             return []
 
-    def get_alarms_reminders(self, force: bool = False) -> List[Dict[str, Any]]:
+    def get_alarms_reminders(self, force: bool = False, raise_errors: bool = False) -> List[Dict[str, Any]]:
         """
         Récupère les alarmes et rappels (lazy loading).
 
         Args:
             force: Forcer le refresh depuis l'API
+            raise_errors: Propager l'erreur de l'API au lieu de retourner []
 
         Returns:
             Liste des alarmes et rappels
@@ -201,20 +231,23 @@ class SyncService:
                 return cached["notifications"]
 
         try:
-            notifications = self._sync_notifications()
+            notifications = self._sync_notifications(raise_errors)
             self._lazy_loaded["alarms_and_reminders"] = True
             logger.debug(f"Lazy loaded: {len(notifications)} alarmes et rappels")
             return notifications
         except Exception as e:
             logger.error(f"Erreur lazy loading alarmes et rappels: {e}")
+            if raise_errors:
+                raise
             return []
 
-    def get_lists(self, force: bool = False) -> List[Dict[str, Any]]:
+    def get_lists(self, force: bool = False, raise_errors: bool = False) -> List[Dict[str, Any]]:
         """
         Récupère les listes (courses, tâches) (lazy loading).
 
         Args:
             force: Forcer le refresh depuis l'API
+            raise_errors: Propager l'erreur de l'API au lieu de retourner []
 
         Returns:
             Liste des listes
@@ -231,14 +264,17 @@ class SyncService:
             return lists
         except Exception as e:
             logger.error(f"Erreur lazy loading listes: {e}")
+            if raise_errors:
+                raise
             return []
 
-    def get_routines(self, force: bool = False) -> List[Dict[str, Any]]:
+    def get_routines(self, force: bool = False, raise_errors: bool = False) -> List[Dict[str, Any]]:
         """
         Récupère les routines (lazy loading).
 
         Args:
             force: Forcer le refresh depuis l'API
+            raise_errors: Propager l'erreur de l'API au lieu de retourner []
 
         Returns:
             Liste des routines
@@ -249,21 +285,26 @@ class SyncService:
                 return cached["routines"]
 
         try:
-            routines = self._sync_routines()
+            routines = self._sync_routines(raise_errors)
             self._lazy_loaded["routines"] = True
             logger.debug(f"Lazy loaded: {len(routines)} routines")
             return routines
         except Exception as e:
             logger.error(f"Erreur lazy loading routines: {e}")
+            if raise_errors:
+                raise
             return []
 
-    def get_activities(self, force: bool = False, limit: int = 50) -> List[Dict[str, Any]]:
+    def get_activities(
+        self, force: bool = False, limit: int = 50, raise_errors: bool = False
+    ) -> List[Dict[str, Any]]:
         """
         Récupère les activités récentes (lazy loading).
 
         Args:
             force: Forcer le refresh depuis l'API
             limit: Nombre maximum d'activités à récupérer
+            raise_errors: Propager l'erreur de l'API au lieu de retourner []
 
         Returns:
             Liste des activités
@@ -280,6 +321,8 @@ class SyncService:
             return activities
         except Exception as e:
             logger.error(f"Erreur lazy loading activités: {e}")
+            if raise_errors:
+                raise
             return []
 
     def get_lazy_loading_status(self) -> Dict[str, bool]:
@@ -291,17 +334,24 @@ class SyncService:
         """
         return self._lazy_loaded.copy()
 
-    def preload_all_data(self, force: bool = False) -> Dict[str, Any]:
+    def preload_all_data(
+        self, force: bool = False, parallel: bool = True, max_workers: Optional[int] = None
+    ) -> Dict[str, Any]:
         """
         Précharge toutes les données (équivalent à l'ancienne sync_all).
 
         Utile pour les opérations qui nécessitent toutes les données.
+        En mode parallèle, les catégories (indépendantes entre elles) sont
+        récupérées simultanément dans un pool de threads borné : la durée
+        totale tend vers celle de l'endpoint le plus lent.
 
         Args:
             force: Forcer le refresh de toutes les données
+            parallel: Récupérer les catégories en parallèle (défaut: True)
+            max_workers: Taille du pool (défaut: self.max_workers)
 
         Returns:
-            Statistiques de préchargement
+            Statistiques de préchargement (compteurs, échecs, latence par catégorie)
         """
         logger.info(f"{SharedIcons.SYNC} Préchargement de toutes les données...")
 
@@ -309,8 +359,10 @@ class SyncService:
         stats: Dict[str, Any] = {
             "success": True,
             "timestamp": start_time,
+            "parallel": parallel,
             "preloaded": {},
             "failed": [],
+            "latency_ms": {},
         }
 
         # Précharger toutes les catégories
@@ -322,30 +374,27 @@ class SyncService:
             ("activities", self.get_activities),
         ]
 
-        for category, getter in categories:
-            try:
-                data: List[Dict[str, Any]]
-                if callable(getter):
-                    # getter peut être une méthode bound, on force le typage local
-                    data = getter(force=force)  # type: ignore[assignment]
-                    if data is None:
-                        data = []
-                else:
-                    logger.warning(f"Getter for {category} is not callable, skipping")
-                    data = []
-
-                # Mise à jour des préchargés avec types explicites
-                preloaded_raw = stats.get("preloaded", {})
-                preloaded = cast(Dict[str, int], preloaded_raw) if isinstance(preloaded_raw, dict) else {}
-                preloaded[category] = len(data)
-                stats["preloaded"] = preloaded
-                logger.debug(f"✅ {len(data)} {category} préchargés")
-            except Exception as e:
-                logger.error(f"❌ Erreur préchargement {category}: {e}")
-                failed_raw = stats.get("failed", [])
-                failed_list = cast(List[Dict[str, str]], failed_raw) if isinstance(failed_raw, list) else []
-                failed_list.append({"category": category, "error": str(e)})
-                stats["failed"] = failed_list
+        results: List[Dict[str, Any]]
+        if parallel and len(categories) > 1:
+            workers = min(max_workers or self.max_workers, len(categories))
+            with ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="sync") as executor:
+                futures = [
+                    executor.submit(self._preload_category, category, getter, force)
+                    for category, getter in categories
+                ]
+                results = [future.result() for future in futures]
+        else:
+            results = [self._preload_category(category, getter, force) for category, getter in categories]
+
+        # Agréger dans l'ordre des catégories (isolation des erreurs par catégorie)
+        for result in results:
+            category = result["category"]
+            stats["latency_ms"][category] = result["latency_ms"]
+            if result["error"] is None:
+                stats["preloaded"][category] = result["count"]
+            else:
+                stats["failed"].append({"category": category, "error": result["error"]})
+        stats["success"] = not stats["failed"]
 
         duration = time.time() - start_time
         stats["duration_seconds"] = round(duration, 2)
@@ -357,8 +406,39 @@ class SyncService:
 
         return stats
 
-    def _sync_alexa_devices(self) -> List[Dict[str, Any]]:
-        """Synchronise les appareils Alexa."""
+    def _preload_category(
+        self, category: str, getter: Callable[..., List[Dict[str, Any]]], force: bool
+    ) -> Dict[str, Any]:
+        """
+        Précharge une catégorie et mesure sa latence.
+
+        Ne lève jamais d'exception : l'erreur éventuelle est retournée
+        pour être isolée dans les statistiques.
+
+        Args:
+            category: Nom de la catégorie
+            getter: Getter lazy de la catégorie (appelé avec raise_errors=True)
+            force: Forcer le refresh depuis l'API
+
+        Returns:
+            Dict avec category, count, error et latency_ms
+        """
+        start = time.perf_counter()
+        count = 0
+        error: Optional[str] = None
+        try:
+            data = getter(force=force, raise_errors=True) or []
+            count = len(data)
+            logger.debug(f"✅ {count} {category} préchargés")
+        except Exception as e:
+            logger.error(f"❌ Erreur préchargement {category}: {e}")
+            error = str(e)
+
+        latency_ms = round((time.perf_counter() - start) * 1000, 1)
+        return {"category": category, "count": count, "error": error, "latency_ms": latency_ms}
+
+    def _sync_alexa_devices(self) -> List[Device]:
+        """Synchronise les appareils Alexa (enregistrements compacts, voir utils.device_index.Device)."""
         try:
             response = self.auth.session.get(
                 f"https://{self.config.alexa_domain}/api/devices-v2/device",
@@ -367,63 +447,59 @@ class SyncService:
             )
             response.raise_for_status()
             data = response.json()
-            devices = data.get("devices", [])
+            devices = [Device.from_dict(device) for device in data.get("devices", [])]
 
-            # Sauvegarder dans cache
-            self.cache_service.set("devices", {"devices": devices}, ttl_seconds=3600)  # 1h
+            # Sauvegarder dans cache (dicts API, même format que DeviceManager)
+            self.cache_service.set("devices", {"devices": data.get("devices", [])}, ttl_seconds=3600)  # 1h
 
             return devices
         except Exception as e:
             logger.error(f"Erreur récupération devices Alexa: {e}")
             return []
 
-    def _sync_smart_home_devices(self) -> List[Dict[str, Any]]:
-        """Synchronise les smart home devices."""
-        try:
-            response = self.auth.session.get(
-                f"https://{self.config.alexa_domain}/api/behaviors/entities?skillId=amzn1.ask.1p.smarthome",
-                headers={
-                    "Content-Type": "application/json; charset=UTF-8",
-                    "Referer": f"https://alexa.{self.config.amazon_domain}/spa/index.html",
-                    "Origin": f"https://alexa.{self.config.amazon_domain}",
-                    "csrf": self.auth.csrf,
-                },
-                timeout=10,
-            )
-            response.raise_for_status()
-            devices = response.json()
+    def _sync_smart_home_devices(self, raise_errors: bool = False) -> List[Dict[str, Any]]:
+        """
+        Synchronise les smart home devices.
 
-            # Sauvegarder UNIQUEMENT le fichier global
-            # Le tri par catégorie se fera à la demande par les controllers
-            self.cache_service.set(
-                "smart_home_all", {"devices": devices}, ttl_seconds=1800
-            )  # 30min
+        Passe par core.smart_home.entities (requête partagée avec les contrôleurs,
+        circuit breaker) ; seul le fichier global smart_home_all est sauvegardé,
+        le tri par catégorie se fait à la demande par les controllers.
 
-            return devices
+        Args:
+            raise_errors: Propager l'erreur au lieu de retourner []
+        """
+        try:
+            return refresh_smart_home_cache(self.auth, self.config, self.cache_service, self.smart_home_breaker)
         except Exception as e:
             logger.error(f"Erreur récupération smart home: {e}")
+            if raise_errors:
+                raise
             return []
 
-    def _sync_notifications(self) -> List[Dict[str, Any]]:
-        """Synchronise les alarmes et rappels."""
-        try:
-            response = self.auth.session.get(
-                f"https://{self.config.alexa_domain}/api/notifications",
-                headers={"csrf": self.auth.csrf},
-                timeout=10,
-            )
-            response.raise_for_status()
-            data = response.json()
-            notifications = data.get("notifications", [])
+    def _sync_notifications(self, raise_errors: bool = False) -> List[Dict[str, Any]]:
+        """
+        Synchronise les alarmes et rappels.
 
-            # Sauvegarder dans cache
-            self.cache_service.set(
-                "alarms_and_reminders", {"notifications": notifications}, ttl_seconds=600
-            )  # 10min
+        Force un nouveau snapshot partagé de /api/notifications : les managers
+        timers/alarmes/rappels le réutilisent ensuite sans nouvel appel réseau.
 
-            return notifications
+        Args:
+            raise_errors: Propager l'erreur au lieu de retourner []
+        """
+        try:
+            snapshot = self.notifications.get_snapshot(
+                lambda: self.auth.session.get(
+                    f"https://{self.config.alexa_domain}/api/notifications",
+                    headers={"csrf": self.auth.csrf},
+                    timeout=10,
+                ),
+                force_refresh=True,
+            )
+            return snapshot.notifications
         except Exception as e:
             logger.error(f"Erreur récupération alarmes et rappels: {e}")
+            if raise_errors:
+                raise
             return []
 
     def _sync_lists(self) -> List[Dict[str, Any]]:
@@ -438,8 +514,8 @@ class SyncService:
         # Retourner une liste vide pour éviter l'erreur
         return []
 
-    def _sync_routines(self) -> List[Dict[str, Any]]:
-        """Synchronise les routines Alexa."""
+    def _sync_routines(self, raise_errors: bool = False) -> List[Dict[str, Any]]:
+        """Synchronise les routines Alexa (raise_errors: propager l'erreur au lieu de retourner [])."""
         try:
             response = self.auth.session.get(
                 f"https://{self.config.alexa_domain}/api/behaviors/v2/automations",
@@ -461,6 +537,8 @@ class SyncService:
             return routines
         except Exception as e:
             logger.error(f"Erreur récupération routines: {e}")
+            if raise_errors:
+                raise
             return []
 
     def _sync_activities(self, limit: int = 50) -> List[Dict[str, Any]]:
@@ -13,6 +13,7 @@ from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple, cast
 
 from loguru import logger
 
+from utils.device_index import Device
 from utils.logger import SharedIcons
 
 if TYPE_CHECKING:
@@ -31,7 +32,14 @@ class VoiceCommandService:
     des commandes vocales par Alexa (TTS + exécution).
     """
 
-    def __init__(self, auth: Any, config: Any, state_machine: Optional[Any] = None):
+    def __init__(
+        self,
+        auth: Any,
+        config: Any,
+        state_machine: Optional[Any] = None,
+        cache_service: Optional[Any] = None,
+        device_mgr: Optional[Any] = None,
+    ):
         """
         Initialise le service.
 
@@ -39,9 +47,13 @@ class VoiceCommandService:
             auth: Service d'authentification
             config: Configuration
             state_machine: Machine à états (optionnel)
+            cache_service: CacheService partagé (défaut: créé au premier besoin)
+            device_mgr: DeviceManager partagé ; sinon la liste est lue dans le cache
         """
         self.auth = auth
         self.config = config
+        self.device_mgr = device_mgr
+        self._cache_service = cache_service
 
         # Import au runtime pour éviter cycles
         # Best-effort typing: initialize attributes as Any so mypy can track assignments
@@ -52,14 +64,16 @@ class VoiceCommandService:
         try:
             from core.circuit_breaker import CircuitBreaker
             from core.state_machine import AlexaStateMachine
+            from utils.http_guard import endpoint_guards
 
             # Use lowercase local names for runtime creation while keeping
             # the imported names CamelCase to satisfy linters.
-            cb = CircuitBreaker
             asm = AlexaStateMachine
 
             self.state_machine = state_machine or asm()
-            self.breaker = cb(failure_threshold=3, timeout=30)
+            # Breaker partagé par toutes les instances (PlaybackManager, contrôleurs...) :
+            # les échecs des commandes vocales n'ouvrent pas le circuit des autres services
+            self.breaker = endpoint_guards.breaker("service.voice", failure_threshold=3, timeout=30)
         except Exception:
             # If imports fail (import cycle), try to use names defined under TYPE_CHECKING
             # They may be None at runtime; guard their use accordingly.
@@ -76,6 +90,9 @@ class VoiceCommandService:
 
         self._lock: threading.RLock = threading.RLock()
         self._customer_id: Optional[str] = None
+        # Appareils par serial et Echo par défaut, calculés pour la liste _targets_source
+        self._targets: Optional[Tuple[Dict[str, Device], Optional[Dict[str, Any]]]] = None
+        self._targets_source: Optional[List[Any]] = None
 
         logger.info(f"{SharedIcons.GEAR} VoiceCommandService initialisé")
 
@@ -123,19 +140,13 @@ class VoiceCommandService:
                 if device_serial:
                     # Récupérer le deviceType depuis le cache pour ce serial
                     dsn = device_serial
-                    from services.cache_service import CacheService
-
-                    cache = CacheService()
-                    devices_data = cache.get("devices") or {}
-                    devices = devices_data.get("devices", []) if isinstance(devices_data, dict) else []
                     dtype = None
                     device_name = None
-                    for dev in devices:
-                        if dev.get("serialNumber") == device_serial:
-                            # IMPORTANT: utiliser deviceType (ex: A2UONLFQW0PADH) PAS deviceFamily !
-                            dtype = dev.get("deviceType")
-                            device_name = dev.get("accountName")
-                            break
+                    dev = self._find_device(device_serial)
+                    if dev is not None:
+                        # IMPORTANT: utiliser deviceType (ex: A2UONLFQW0PADH) PAS deviceFamily !
+                        dtype = dev.device_type
+                        device_name = dev.account_name
                     if not dtype:
                         logger.error(f"❌ Device {device_serial} introuvable dans le cache")
                         return False
@@ -253,18 +264,12 @@ class VoiceCommandService:
 
                 # Device serial et type
                 if device_serial:
-                    from services.cache_service import CacheService
-
-                    cache = CacheService()
-                    devices_data = cache.get("devices") or {}
-                    devices = devices_data.get("devices", [])
                     dtype = None
                     device_name = None
-                    for dev in devices:
-                        if dev.get("serialNumber") == device_serial:
-                            dtype = dev.get("deviceType")
-                            device_name = dev.get("accountName")
-                            break
+                    dev = self._find_device(device_serial)
+                    if dev is not None:
+                        dtype = dev.device_type
+                        device_name = dev.account_name
                     if not dtype:
                         logger.error(f"❌ Device {device_serial} introuvable dans le cache")
                         return False
@@ -335,91 +340,118 @@ class VoiceCommandService:
                 logger.error(f"❌ Erreur commande vocale simulée: {e}")
                 return False
 
-    def _get_default_echo_device(self) -> Optional[Dict[str, Any]]:
+    @property
+    def cache_service(self) -> Any:
+        """CacheService partagé (créé une seule fois s'il n'a pas été fourni)."""
+        if self._cache_service is None:
+            from services.cache_service import CacheService
+
+            self._cache_service = CacheService()
+        return self._cache_service
+
+    def _device_list(self) -> Optional[List[Any]]:
         """
-        Récupère un device Echo par défaut pour exécuter les commandes vocales.
+        Liste d'appareils courante : celle du DeviceManager, sinon l'entrée du cache.
 
-        Returns:
-            Dict avec {name, serial, type} ou None si aucun device disponible
+        Dans les deux cas, l'objet retourné garde la même identité tant que la
+        liste n'est pas rafraîchie (cache mémoire du DeviceManager ou du CacheService).
         """
-        try:
-            # Récupérer la liste des devices depuis le cache
-            from services.cache_service import CacheService
+        if self.device_mgr is not None:
+            return self.device_mgr.get_devices()
+        devices_data = self.cache_service.get("devices")
+        # ← FIX: devices_data contient déjà {"devices": [...]}
+        return devices_data.get("devices") if isinstance(devices_data, dict) else devices_data
 
-            cache = CacheService()
-            devices_data = cache.get("devices")
+    def _device_targets(self) -> Tuple[Dict[str, Device], Optional[Dict[str, Any]]]:
+        """
+        Appareils par serial et Echo par défaut, recalculés seulement quand la liste change.
 
-            if not devices_data:
-                logger.warning("⚠️ Aucun device en cache")
-                return None
+        Returns:
+            ({serial: Device}, {name, serial, type} ou None)
+        """
+        devices = self._device_list()
+        with self._lock:
+            if self._targets is None or devices is not self._targets_source:
+                self._targets = self._build_targets(devices or [])
+                self._targets_source = devices
+            return self._targets
+
+    @staticmethod
+    def _build_targets(devices: List[Any]) -> Tuple[Dict[str, Device], Optional[Dict[str, Any]]]:
+        """Indexe la liste par serial et choisit l'Echo par défaut (priorité: Salon, sinon premier Echo)."""
+        by_serial: Dict[str, Device] = {}
+        echo_devices: List[Dict[str, Any]] = []
+        for row in devices:
+            device = Device.from_row(row)
+            by_serial.setdefault(device.serial_number, device)
+            # KNIGHT, ROOK, etc. sont des familles Echo
+            if device.device_family in ["KNIGHT", "ROOK", "VOX", "ECHO"]:
+                echo_devices.append(
+                    {
+                        "name": device.account_name or "Unknown",
+                        "serial": device.serial_number,
+                        "type": device.device_type,  # ← IMPORTANT: deviceType, PAS deviceFamily !
+                    }
+                )
 
-            # ← FIX: devices_data contient déjà {"devices": [...]}
-            devices = (
-                devices_data.get("devices", []) if isinstance(devices_data, dict) else devices_data
-            )
-
-            # Chercher un Echo (priorité: Salon Echo, sinon premier Echo disponible)
-            echo_devices: List[Dict[str, Any]] = []
-            for device in devices:
-                device_family = device.get("deviceFamily", "")
-                # KNIGHT, ROOK, etc. sont des familles Echo
-                if device_family in ["KNIGHT", "ROOK", "VOX", "ECHO"]:
-                    echo_devices.append(
-                        {
-                            "name": device.get("accountName", "Unknown"),
-                            "serial": device.get("serialNumber", ""),
-                            "type": device.get(
-                                "deviceType"
-                            ),  # ← IMPORTANT: deviceType, PAS deviceFamily !
-                        }
-                    )
+        default = next((echo for echo in echo_devices if "salon" in echo["name"].lower()), None)
+        if default is None and echo_devices:
+            default = echo_devices[0]
+        return by_serial, default
 
-            if not echo_devices:
-                logger.error("❌ Aucun device Echo trouvé")
-                return None
-
-            # Priorité: "Salon Echo"
-            for echo in echo_devices:
-                if "salon" in echo["name"].lower():
-                    return echo
+    def _find_device(self, serial: str) -> Optional[Device]:
+        """Appareil d'un serial : index du DeviceManager s'il est partagé, sinon table des serials."""
+        try:
+            if self.device_mgr is not None:
+                index = self.device_mgr.get_index()
+                return index.get_by_serial(serial) if index else None
+            return self._device_targets()[0].get(serial)
+        except Exception as e:
+            logger.error(f"❌ Erreur recherche device {serial}: {e}")
+            return None
 
-            # Sinon, premier Echo disponible
-            return echo_devices[0]
+    def _get_default_echo_device(self) -> Optional[Dict[str, Any]]:
+        """
+        Récupère un device Echo par défaut pour exécuter les commandes vocales.
 
+        Returns:
+            Dict avec {name, serial, type} ou None si aucun device disponible
+        """
+        try:
+            by_serial, default = self._device_targets()
         except Exception as e:
             logger.error(f"❌ Erreur récupération device Echo: {e}")
             return None
 
+        if not by_serial:
+            logger.warning("⚠️ Aucun device en cache")
+        elif default is None:
+            logger.error("❌ Aucun device Echo trouvé")
+        return default
+
     def _get_customer_id(self) -> Optional[str]:
         """
-        Récupère le customer ID via /api/bootstrap.
+        Récupère le customer ID du bootstrap partagé par l'authentification.
+
+        /api/bootstrap n'est appelé que si aucun bootstrap n'est connu pour les
+        cookies chargés (voir AlexaAuth.get_bootstrap).
 
         Returns:
             Customer ID ou None si erreur
         """
         try:
-            url = f"https://{self.config.alexa_domain}/api/bootstrap?version=0"
-            response = self.breaker.call(
-                self.auth.session.get,
-                url,
-                headers={"csrf": self.auth.csrf},
-                timeout=10,
-            )
-            response.raise_for_status()
-            data = response.json()
-
-            customer_id = data.get("authentication", {}).get("customerId")
-            if customer_id:
-                logger.debug(f"✅ Customer ID: {customer_id}")
-                return customer_id
-            else:
-                logger.warning("⚠️ Customer ID non trouvé dans bootstrap")
-                return None
-
+            bootstrap = self.breaker.call(self.auth.get_bootstrap) or {}
         except Exception as e:
             logger.error(f"❌ Erreur récupération customer ID: {e}")
             return None
 
+        customer_id = bootstrap.get("customerId")
+        if customer_id:
+            logger.debug(f"✅ Customer ID: {customer_id}")
+            return customer_id
+        logger.warning("⚠️ Customer ID non trouvé dans bootstrap")
+        return None
+
     def turn_on_light(self, light_name: str, device_serial: Optional[str] = None) -> bool:
         """
         Allume une lumière.
@@ -539,7 +571,13 @@ class VoiceCommandService:
 
                 from core.activity_manager import ActivityManager
 
-                activity_mgr = ActivityManager(self.auth, self.config, self.state_machine)
+                activity_mgr = ActivityManager(
+                    self.auth,
+                    self.config,
+                    self.state_machine,
+                    device_mgr=self.device_mgr,
+                    cache_service=self.cache_service,
+                )
 
                 # Récupérer les activités depuis le timestamp d'envoi
                 activities = activity_mgr.get_activities(limit=20, start_time=timestamp_before)
@@ -0,0 +1,263 @@
+"""
+Client HTTP asynchrone pour l'API Alexa.
+
+Permet à un processus long (tableau de bord, démon) d'interroger de nombreux
+appareils en parallèle au lieu d'enchaîner les appels bloquants. Le client
+reprend les cookies, les en-têtes et le token CSRF d'une instance AlexaAuth
+déjà chargée.
+
+Backends (détectés à l'import, le premier disponible est utilisé) :
+- httpx : AsyncClient
+- aiohttp : ClientSession
+- threads : repli sans dépendance, exécute auth.session dans un pool de
+  threads dédié (conserve le pool de connexions et les retries de la session)
+
+Les GET identiques simultanés sont fusionnés (utils.single_flight).
+
+Usage:
+    from utils.async_http import AsyncAlexaClient
+
+    async with AsyncAlexaClient(auth) as client:
+        statuses = await asyncio.gather(
+            *(dnd_mgr.get_dnd_status_async(client, serial) for serial in serials)
+        )
+"""
+
+import asyncio
+import json
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Any, Dict, List, Mapping, Optional
+
+import requests
+from loguru import logger
+
+from utils.single_flight import request_key, single_flight
+
+BACKENDS: List[str] = []
+
+try:
+    import httpx
+
+    BACKENDS.append("httpx")
+except ImportError:  # pragma: no cover - dépend de l'environnement
+    httpx = None  # type: ignore[assignment]
+
+try:
+    import aiohttp
+
+    BACKENDS.append("aiohttp")
+except ImportError:  # pragma: no cover - dépend de l'environnement
+    aiohttp = None  # type: ignore[assignment]
+
+BACKENDS.append("threads")
+
+
+class AsyncResponse:
+    """
+    Réponse HTTP normalisée, quel que soit le backend.
+
+    Expose le sous-ensemble de requests.Response utilisé par les managers.
+    """
+
+    __slots__ = ("status_code", "content", "headers", "url")
+
+    def __init__(self, status_code: int, content: bytes, headers: Mapping[str, str], url: str):
+        self.status_code = status_code
+        self.content = content
+        self.headers = dict(headers)
+        self.url = url
+
+    @property
+    def ok(self) -> bool:
+        """True si le statut est < 400."""
+        return self.status_code < 400
+
+    def json(self) -> Any:
+        """Décode le corps JSON."""
+        return json.loads(self.content)
+
+    def raise_for_status(self) -> None:
+        """
+        Lève requests.HTTPError si le statut indique une erreur (comme requests).
+
+        Raises:
+            requests.HTTPError: Statut 4xx/5xx
+        """
+        if not self.ok:
+            message = f"{self.status_code} Error for url: {self.url}"
+            raise requests.HTTPError(message, response=self)  # type: ignore[arg-type]
+
+    def __repr__(self) -> str:
+        return f"<AsyncResponse [{self.status_code}]>"
+
+
+class AsyncAlexaClient:
+    """
+    Client asynchrone authentifié par une instance AlexaAuth.
+
+    Le client du backend est créé au premier appel, dans la boucle
+    d'événements courante ; le nombre de requêtes simultanées est borné par
+    max_concurrency.
+
+    Example:
+        >>> async with AsyncAlexaClient(auth, max_concurrency=20) as client:
+        ...     response = await client.get(url, params={"cached": "false"})
+        ...     devices = response.json()["devices"]
+    """
+
+    def __init__(
+        self,
+        auth: Any,
+        max_concurrency: int = 20,
+        timeout: float = 10.0,
+        backend: Optional[str] = None,
+    ):
+        """
+        Initialise le client.
+
+        Args:
+            auth: Instance AlexaAuth (session avec cookies, csrf)
+            max_concurrency: Nombre maximal de requêtes simultanées
+            timeout: Timeout par défaut (secondes)
+            backend: "httpx", "aiohttp" ou "threads" (défaut: premier disponible)
+
+        Raises:
+            ValueError: Si le backend demandé n'est pas disponible
+        """
+        backend = backend or BACKENDS[0]
+        if backend not in BACKENDS:
+            raise ValueError(f"Backend HTTP async indisponible: {backend} (disponibles: {', '.join(BACKENDS)})")
+
+        self.auth = auth
+        self.backend = backend
+        self.max_concurrency = max_concurrency
+        self.timeout = timeout
+        self._client: Any = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+        logger.debug(f"AsyncAlexaClient initialisé (backend={backend}, concurrence={max_concurrency})")
+
+    async def get(
+        self,
+        url: str,
+        params: Optional[Dict[str, Any]] = None,
+        headers: Optional[Dict[str, str]] = None,
+        timeout: Optional[float] = None,
+    ) -> AsyncResponse:
+        """
+        Requête GET ; les GET identiques simultanés partagent la même réponse.
+
+        Args:
+            url: URL à requêter
+            params: Paramètres de requête
+            headers: En-têtes additionnels
+            timeout: Timeout (défaut: celui du client)
+
+        Returns:
+            Réponse normalisée
+        """
+        return await single_flight.do_async(
+            request_key("GET", url, params),
+            partial(self.request, "GET", url, params=params, headers=headers, timeout=timeout),
+        )
+
+    async def post(self, url: str, **kwargs: Any) -> AsyncResponse:
+        """Requête POST (jamais fusionnée)."""
+        return await self.request("POST", url, **kwargs)
+
+    async def put(self, url: str, **kwargs: Any) -> AsyncResponse:
+        """Requête PUT (jamais fusionnée)."""
+        return await self.request("PUT", url, **kwargs)
+
+    async def request(
+        self,
+        method: str,
+        url: str,
+        params: Optional[Dict[str, Any]] = None,
+        headers: Optional[Dict[str, str]] = None,
+        json: Any = None,
+        timeout: Optional[float] = None,
+    ) -> AsyncResponse:
+        """
+        Exécute une requête avec les cookies et le CSRF de auth.
+
+        Args:
+            method: Méthode HTTP
+            url: URL à requêter
+            params: Paramètres de requête
+            headers: En-têtes additionnels (prioritaires)
+            json: Corps JSON
+            timeout: Timeout (défaut: celui du client)
+
+        Returns:
+            Réponse normalisée
+        """
+        merged = {"csrf": self.auth.csrf} if getattr(self.auth, "csrf", None) else {}
+        merged.update(headers or {})
+        timeout = self.timeout if timeout is None else timeout
+
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        async with self._semaphore:
+            logger.debug(f"📡 {method} (async/{self.backend}): {url}")
+            if self.backend == "httpx":
+                return await self._request_httpx(method, url, params, merged, json, timeout)
+            if self.backend == "aiohttp":
+                return await self._request_aiohttp(method, url, params, merged, json, timeout)
+            return await self._request_threads(method, url, params, merged, json, timeout)
+
+    async def _request_httpx(self, method, url, params, headers, body, timeout) -> AsyncResponse:
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                cookies=self.auth.session.cookies,
+                headers=dict(self.auth.session.headers),
+                limits=httpx.Limits(max_connections=self.max_concurrency),
+            )
+        response = await self._client.request(
+            method, url, params=params, headers=headers, json=body, timeout=timeout
+        )
+        return AsyncResponse(response.status_code, response.content, response.headers, str(response.url))
+
+    async def _request_aiohttp(self, method, url, params, headers, body, timeout) -> AsyncResponse:
+        if self._client is None:
+            self._client = aiohttp.ClientSession(
+                cookies={cookie.name: cookie.value for cookie in self.auth.session.cookies},
+                headers=dict(self.auth.session.headers),
+                connector=aiohttp.TCPConnector(limit=self.max_concurrency),
+            )
+        async with self._client.request(
+            method, url, params=params, headers=headers, json=body, timeout=aiohttp.ClientTimeout(total=timeout)
+        ) as response:
+            content = await response.read()
+            return AsyncResponse(response.status, content, response.headers, str(response.url))
+
+    async def _request_threads(self, method, url, params, headers, body, timeout) -> AsyncResponse:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_concurrency, thread_name_prefix="alexa-async")
+        call = partial(
+            self.auth.session.request, method, url, params=params, headers=headers, json=body, timeout=timeout
+        )
+        response = await asyncio.get_running_loop().run_in_executor(self._executor, call)
+        return AsyncResponse(response.status_code, response.content, response.headers, response.url)
+
+    async def aclose(self) -> None:
+        """Ferme le client du backend et le pool de threads."""
+        if self._client is not None:
+            if self.backend == "httpx":
+                await self._client.aclose()
+            else:
+                await self._client.close()
+            self._client = None
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+    async def __aenter__(self) -> "AsyncAlexaClient":
+        """Support async context manager."""
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        """Ferme le client à la sortie du contexte."""
+        await self.aclose()
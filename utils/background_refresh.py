@@ -0,0 +1,86 @@
+"""
+Rafraîchissements en arrière-plan dédupliqués (stale-while-revalidate).
+
+Les managers qui servent une liste périmée (appareils, entités smart home)
+déclenchent ici un rafraîchissement unique par clé : tant qu'un
+rafraîchissement est en cours pour une clé, les demandes suivantes sont
+ignorées.
+
+Les threads ne sont pas daemon : une commande CLI affiche immédiatement la
+liste périmée, puis le processus termine le rafraîchissement avant de
+sortir afin que l'invocation suivante trouve un cache à jour.
+
+Usage:
+    from utils.background_refresh import background_refresher
+
+    background_refresher.trigger("devices", device_mgr._refresh_cache)
+"""
+
+from threading import Lock, Thread, current_thread
+from typing import Any, Callable, Dict, Optional
+
+from loguru import logger
+
+
+class BackgroundRefresher:
+    """
+    Lance au plus un rafraîchissement en arrière-plan par clé.
+
+    Example:
+        >>> refresher = BackgroundRefresher()
+        >>> refresher.trigger("devices", fetch_devices)  # True: lancé
+        >>> refresher.trigger("devices", fetch_devices)  # False: déjà en cours
+    """
+
+    def __init__(self):
+        """Initialise le registre des rafraîchissements en cours."""
+        self._inflight: Dict[str, Thread] = {}
+        self._lock = Lock()
+
+    def trigger(self, key: str, refresh: Callable[[], Any]) -> bool:
+        """
+        Lance refresh() dans un thread si aucun rafraîchissement n'est en cours pour key.
+
+        Args:
+            key: Identifiant de la donnée rafraîchie (ex: "devices")
+            refresh: Fonction de rafraîchissement (exceptions journalisées)
+
+        Returns:
+            True si un rafraîchissement a été lancé
+        """
+        with self._lock:
+            thread = self._inflight.get(key)
+            if thread is not None and thread.is_alive():
+                return False
+            thread = Thread(target=self._run, args=(key, refresh), name=f"refresh-{key}")
+            self._inflight[key] = thread
+            thread.start()
+        logger.debug(f"🔄 Rafraîchissement en arrière-plan: {key}")
+        return True
+
+    def is_refreshing(self, key: str) -> bool:
+        """Indique si un rafraîchissement est en cours pour key."""
+        with self._lock:
+            thread = self._inflight.get(key)
+            return thread is not None and thread.is_alive()
+
+    def wait(self, key: str, timeout: Optional[float] = None) -> None:
+        """Attend la fin du rafraîchissement en cours pour key (s'il y en a un)."""
+        with self._lock:
+            thread = self._inflight.get(key)
+        if thread is not None:
+            thread.join(timeout)
+
+    def _run(self, key: str, refresh: Callable[[], Any]) -> None:
+        try:
+            refresh()
+        except Exception as e:
+            logger.warning(f"Rafraîchissement en arrière-plan '{key}' échoué: {e}")
+        finally:
+            with self._lock:
+                if self._inflight.get(key) is current_thread():
+                    del self._inflight[key]
+
+
+# Instance partagée : les managers d'un même processus dédupliquent entre eux
+background_refresher = BackgroundRefresher()
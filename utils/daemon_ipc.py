@@ -0,0 +1,155 @@
+"""
+Protocole et client du démon local de la CLI.
+
+Le démon (cli/daemon.py) garde un Context chaud (managers, caches mémoire,
+session HTTP) derrière un socket Unix. Quand il tourne, le script ``alexa``
+lui transmet la ligne de commande au lieu de reconstruire le contexte.
+
+Ce module ne dépend que de la bibliothèque standard : il est importé avant
+tout le reste par le script ``alexa`` pour que le chemin client reste de
+l'ordre de quelques millisecondes.
+
+Protocole : une requête JSON par connexion, terminée par un saut de ligne,
+suivie d'une réponse JSON sur une ligne.
+    {"op": "run", "argv": [...], "tty": bool}  -> {"exit_code", "stdout", "stderr"}
+    {"op": "ping"}                              -> {"pid", "uptime", "requests", ...}
+    {"op": "shutdown"}                          -> {"ok": true}
+
+Usage:
+    from utils.daemon_ipc import forward
+
+    exit_code = forward(sys.argv[1:])
+    if exit_code is not None:
+        sys.exit(exit_code)
+"""
+
+import json
+import os
+import socket
+import sys
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+# Catégories jamais transmises : authentification interactive, gestion du démon lui-même
+# et lots (lisent l'entrée standard et des fichiers relatifs au client)
+LOCAL_CATEGORIES = {"auth", "batch", "daemon"}
+
+SOCKET_ENV = "ALEXA_DAEMON_SOCKET"
+DISABLE_ENV = "ALEXA_NO_DAEMON"
+
+CONNECT_TIMEOUT = 0.5
+
+
+class DaemonError(Exception):
+    """Échange avec le démon interrompu ou réponse invalide."""
+
+
+class DaemonUnavailable(DaemonError):
+    """Connexion au démon impossible (aucune requête n'a été transmise)."""
+
+
+def is_supported() -> bool:
+    """True si la plateforme dispose des sockets Unix."""
+    return hasattr(socket, "AF_UNIX")
+
+
+def socket_path() -> Path:
+    """
+    Chemin du socket du démon.
+
+    Returns:
+        $ALEXA_DAEMON_SOCKET, sinon data/alexa-daemon.sock à la racine du projet
+    """
+    override = os.environ.get(SOCKET_ENV)
+    if override:
+        return Path(override)
+    return Path(__file__).parent.parent / "data" / "alexa-daemon.sock"
+
+
+def request(payload: Dict[str, Any], path: Optional[Path] = None, timeout: Optional[float] = None) -> Dict[str, Any]:
+    """
+    Envoie une requête au démon et retourne sa réponse.
+
+    Args:
+        payload: Requête (voir protocole)
+        path: Socket du démon (défaut: socket_path())
+        timeout: Délai de lecture de la réponse (None = illimité)
+
+    Returns:
+        Réponse décodée
+
+    Raises:
+        DaemonUnavailable: Connexion impossible (socket absent ou orphelin)
+        DaemonError: Connexion interrompue ou réponse invalide
+    """
+    path = path or socket_path()
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        try:
+            sock.settimeout(CONNECT_TIMEOUT)
+            sock.connect(str(path))
+        except OSError as e:
+            raise DaemonUnavailable(f"Démon injoignable ({path}): {e}") from e
+        try:
+            sock.settimeout(timeout)
+            sock.sendall(json.dumps(payload).encode("utf-8") + b"\n")
+            with sock.makefile("rb") as stream:
+                line = stream.readline()
+        except OSError as e:
+            raise DaemonError(f"Échange avec le démon interrompu: {e}") from e
+
+    if not line:
+        raise DaemonError("Connexion fermée par le démon sans réponse")
+    try:
+        response = json.loads(line)
+    except ValueError as e:
+        raise DaemonError(f"Réponse invalide du démon: {e}") from e
+    if not isinstance(response, dict):
+        raise DaemonError("Réponse invalide du démon")
+    return response
+
+
+def should_forward(argv: List[str]) -> bool:
+    """
+    Indique si la ligne de commande peut être exécutée par le démon.
+
+    Sont exécutées localement : l'aide, les catégories de LOCAL_CATEGORIES,
+    et toute commande quand ALEXA_NO_DAEMON est défini ou que le socket
+    n'existe pas.
+    """
+    if os.environ.get(DISABLE_ENV) or not is_supported():
+        return False
+    if any(arg in ("-h", "--help", "--version") for arg in argv):
+        return False
+    category = next((arg for arg in argv if not arg.startswith("-")), None)
+    if category is None or category in LOCAL_CATEGORIES:
+        return False
+    return socket_path().exists()
+
+
+def forward(argv: List[str]) -> Optional[int]:
+    """
+    Exécute la commande via le démon s'il tourne.
+
+    Args:
+        argv: Arguments de la ligne de commande (sans le nom du script)
+
+    Returns:
+        Code de sortie de la commande, ou None si elle doit s'exécuter localement
+        (démon absent, injoignable, ou commande non transmissible)
+    """
+    if not should_forward(argv):
+        return None
+    try:
+        response = request({"op": "run", "argv": argv, "tty": sys.stdout.isatty()})
+    except DaemonUnavailable:
+        # Socket orphelin (démon arrêté brutalement) : exécution locale
+        return None
+    except DaemonError as e:
+        # La commande a pu s'exécuter : ne pas la rejouer localement
+        print(f"❌ {e}", file=sys.stderr)
+        return 1
+
+    sys.stdout.write(response.get("stdout", ""))
+    sys.stderr.write(response.get("stderr", ""))
+    sys.stdout.flush()
+    return int(response.get("exit_code", 1))
@@ -2,36 +2,174 @@
 Index optimisé pour recherches rapides de devices.
 
 Optimisation Phase 2: Index HashMap O(1) au lieu de O(n).
+Recherche approchée classée (accents, préfixes, fautes de frappe) via
+utils.name_search.NameSearchIndex.
 
 Auteur: M@nu
 Date: 7 octobre 2025
 """
 
-from dataclasses import dataclass
-from typing import Dict, List, Optional
+import json
+from collections.abc import Mapping
+from threading import RLock
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
 
 from loguru import logger
 
+from utils.name_search import NameSearchIndex, fingerprint
 
-@dataclass
-class Device:
-    """Représentation simplifiée d'un appareil Alexa."""
 
-    serial_number: str
-    account_name: str
-    device_type: str
-    device_family: str
-    online: bool
+class Device(Mapping):
+    """
+    Enregistrement compact (__slots__) d'un appareil Alexa.
+
+    Seuls les champs utilisés par la CLI sont des attributs ; le dict API
+    complet est conservé en JSON compact et décodé au premier accès (raw).
+    L'enregistrement se lit aussi comme le dict API (device["accountName"],
+    device.get("capabilities")), ce qui le rend utilisable partout où l'on
+    attendait ce dict ; une clé absente du dict API lève KeyError, même pour
+    un champ attribut (valeur par défaut "").
+
+    Example:
+        >>> device = Device.from_dict({"serialNumber": "G0911", "accountName": "Echo Salon"})
+        >>> device.account_name, device.get("accountName")
+        ('Echo Salon', 'Echo Salon')
+        >>> Device.from_row(device.to_row()) == device
+        True
+    """
+
+    __slots__ = (
+        "serial_number",
+        "account_name",
+        "device_type",
+        "device_family",
+        "online",
+        "software_version",
+        "parent_clusters",
+        "_raw",
+    )
+
+    # Clé API -> attribut
+    FIELDS = {
+        "serialNumber": "serial_number",
+        "accountName": "account_name",
+        "deviceType": "device_type",
+        "deviceFamily": "device_family",
+        "online": "online",
+        "softwareVersion": "software_version",
+        "parentClusters": "parent_clusters",
+    }
+
+    def __init__(
+        self,
+        serial_number: str = "",
+        account_name: str = "",
+        device_type: str = "",
+        device_family: str = "",
+        online: bool = False,
+        software_version: str = "",
+        parent_clusters: Tuple[str, ...] = (),
+        raw: Union[str, Dict[str, Any], None] = None,
+    ):
+        self.serial_number = serial_number
+        self.account_name = account_name
+        self.device_type = device_type
+        self.device_family = device_family
+        self.online = online
+        self.software_version = software_version
+        self.parent_clusters = tuple(parent_clusters)
+        # JSON compact tant que raw n'a pas été lu, dict ensuite
+        self._raw = raw
 
     @classmethod
-    def from_dict(cls, data: dict) -> "Device":
-        """Crée un Device depuis un dict API."""
+    def from_dict(cls, data: Dict[str, Any]) -> "Device":
+        """Crée un Device depuis un dict API (le dict est ré-encodé en JSON compact)."""
         return cls(
-            serial_number=data.get("serialNumber", ""),
-            account_name=data.get("accountName", ""),
-            device_type=data.get("deviceType", ""),
-            device_family=data.get("deviceFamily", ""),
-            online=data.get("online", False),
+            serial_number=data.get("serialNumber") or "",
+            account_name=data.get("accountName") or "",
+            device_type=data.get("deviceType") or "",
+            device_family=data.get("deviceFamily") or "",
+            online=bool(data.get("online", False)),
+            software_version=data.get("softwareVersion") or "",
+            parent_clusters=data.get("parentClusters") or (),
+            raw=cls._encode(data),
+        )
+
+    @classmethod
+    def from_row(cls, row: Union[List[Any], Dict[str, Any], "Device"]) -> "Device":
+        """
+        Crée un Device depuis une entrée de la liste "devices" du cache disque.
+
+        Le cache disque contient les dicts API ; les lignes to_row() (écrites
+        par d'anciennes versions) et les Device sont aussi acceptés.
+        """
+        if isinstance(row, Device):
+            return row
+        if isinstance(row, dict):
+            return cls.from_dict(row)
+        serial, name, device_type, family, online, version, clusters, raw = row
+        return cls(serial, name, device_type, family, bool(online), version, clusters, raw)
+
+    def to_row(self) -> List[Any]:
+        """Ligne sérialisable compacte (relue par from_row sans décoder le dict API)."""
+        raw = self._raw if isinstance(self._raw, str) or self._raw is None else self._encode(self._raw)
+        return [
+            self.serial_number,
+            self.account_name,
+            self.device_type,
+            self.device_family,
+            self.online,
+            self.software_version,
+            list(self.parent_clusters),
+            raw,
+        ]
+
+    @staticmethod
+    def _encode(data: Dict[str, Any]) -> str:
+        return json.dumps(data, ensure_ascii=False, separators=(",", ":"))
+
+    @property
+    def raw(self) -> Dict[str, Any]:
+        """Dict API complet (décodé au premier accès)."""
+        raw = self._raw
+        if isinstance(raw, str):
+            raw = self._raw = json.loads(raw)
+        elif raw is None:
+            raw = self._raw = {key: getattr(self, attr) for key, attr in self.FIELDS.items()}
+            raw["parentClusters"] = list(self.parent_clusters)
+        return raw
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Copie du dict API (sérialisable en JSON)."""
+        return dict(self.raw)
+
+    def __getitem__(self, key: str) -> Any:
+        attr = self.FIELDS.get(key)
+        if attr is not None:
+            value = getattr(self, attr)
+            # Valeur par défaut d'un attribut : la clé peut être absente du dict API
+            if not value and key not in self.raw:
+                raise KeyError(key)
+            return list(value) if attr == "parent_clusters" else value
+        return self.raw[key]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.raw)
+
+    def __len__(self) -> int:
+        return len(self.raw)
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, Device):
+            return self is other or self.to_row() == other.to_row()
+        return Mapping.__eq__(self, other)
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        return (
+            f"Device(serial_number={self.serial_number!r}, account_name={self.account_name!r}, "
+            f"device_type={self.device_type!r}, device_family={self.device_family!r}, online={self.online!r})"
         )
 
 
@@ -47,6 +185,9 @@ class DeviceIndex:
 
     Gain estimé: 90% réduction temps recherche (100 devices)
 
+    L'index est mis à jour de façon incrémentale (update) : seuls les
+    appareils ajoutés, modifiés ou retirés sont réindexés.
+
     Example:
         >>> index = DeviceIndex()
         >>> index.build_index(devices_list)
@@ -57,61 +198,142 @@ class DeviceIndex:
     def __init__(self):
         """Initialise les index vides."""
         self._by_serial: Dict[str, Device] = {}
-        self._by_name: Dict[str, Device] = {}
+        # Plusieurs appareils peuvent porter le même nom (comptes multi-foyers) : le premier gagne
+        self._by_name: Dict[str, List[Device]] = {}
         self._by_type: Dict[str, List[Device]] = {}
         self._by_family: Dict[str, List[Device]] = {}
-        self._all_devices: List[Device] = []
+        self._all_devices: Dict[str, Device] = {}
+        # Recherche classée sur noms, serials et familles
+        self._search = NameSearchIndex()
         self._index_built = False
+        self._lock = RLock()
 
         logger.debug("DeviceIndex initialisé")
 
-    def build_index(self, devices: List[Dict]) -> None:
+    def build_index(self, devices: Iterable[Union[Device, Dict]]) -> None:
         """
         Construit tous les index à partir d'une liste de devices.
 
         Args:
-            devices: Liste de dictionnaires devices (format API)
+            devices: Liste de Device (ou de dictionnaires au format API)
 
         Example:
             >>> devices_data = [{"serialNumber": "ABC", "accountName": "Echo"}, ...]
             >>> index.build_index(devices_data)
         """
-        # Réinitialiser
-        self._by_serial.clear()
-        self._by_name.clear()
-        self._by_type.clear()
-        self._by_family.clear()
-        self._all_devices.clear()
-
-        # Construire index
-        for device_data in devices:
-            device = Device.from_dict(device_data)
-            self._all_devices.append(device)
+        with self._lock:
+            self.clear()
+            self.update(devices)
 
-            # Index par serial
-            self._by_serial[device.serial_number] = device
-
-            # Index par nom (insensible à la casse)
-            name_key = device.account_name.lower().strip()
-            self._by_name[name_key] = device
+        logger.info(
+            f"Index construit: {len(self._all_devices)} devices, "
+            f"{len(self._by_type)} types, {len(self._by_family)} familles"
+        )
 
-            # Index par type (multi-valeurs)
-            if device.device_type not in self._by_type:
-                self._by_type[device.device_type] = []
-            self._by_type[device.device_type].append(device)
+    def update(
+        self, devices: Iterable[Union[Device, Dict]], search_state: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, int]:
+        """
+        Met à jour l'index avec une nouvelle liste complète de devices.
 
-            # Index par famille (multi-valeurs)
-            if device.device_family not in self._by_family:
-                self._by_family[device.device_family] = []
-            self._by_family[device.device_family].append(device)
+        Les appareils inchangés ne sont pas réindexés.
 
-        self._index_built = True
+        Args:
+            devices: Liste de Device (ou de dictionnaires au format API)
+            search_state: Index de recherche persisté (search_state()) ; utilisé
+                seulement si l'index est vide et que l'état correspond à devices
 
-        logger.info(
-            f"Index construit: {len(self._all_devices)} devices, "
-            f"{len(self._by_type)} types, {len(self._by_family)} familles"
+        Returns:
+            Compteurs {"added", "updated", "removed"}
+        """
+        added = updated = 0
+        records = [Device.from_row(device) for device in devices]
+        with self._lock:
+            restored = (
+                search_state is not None
+                and not self._all_devices
+                and self._search.load_state(search_state, self.fingerprint(records))
+            )
+            seen = set()
+            for device in records:
+                seen.add(device.serial_number)
+                current = self._all_devices.get(device.serial_number)
+                if current is not None:
+                    if current == device:
+                        continue
+                    self._remove(current)
+                    updated += 1
+                else:
+                    added += 1
+                self._add(device, index_search=not restored)
+
+            removed_serials = [serial for serial in self._all_devices if serial not in seen]
+            for serial in removed_serials:
+                self._remove(self._all_devices[serial])
+            self._index_built = True
+
+        if added or updated or removed_serials:
+            logger.debug(
+                f"Index mis à jour: +{added} ~{updated} -{len(removed_serials)} devices"
+                + (" (recherche restaurée)" if restored else "")
+            )
+        return {"added": added, "updated": updated, "removed": len(removed_serials)}
+
+    def clear(self) -> None:
+        """Vide tous les index."""
+        with self._lock:
+            self._by_serial.clear()
+            self._by_name.clear()
+            self._by_type.clear()
+            self._by_family.clear()
+            self._all_devices.clear()
+            self._search.clear()
+            self._index_built = False
+
+    @staticmethod
+    def fingerprint(devices: Iterable[Device]) -> str:
+        """Empreinte des champs indexés pour la recherche (indépendante de l'ordre)."""
+        return fingerprint(
+            sorted(
+                f"{device.serial_number}\t{device.account_name}\t{device.device_family}" for device in devices
+            )
         )
 
+    def search_state(self) -> Dict[str, Any]:
+        """État sérialisable de l'index de recherche, à persister avec la liste des devices."""
+        with self._lock:
+            return self._search.get_state(self.fingerprint(self._all_devices.values()))
+
+    def _add(self, device: Device, index_search: bool = True) -> None:
+        """Ajoute un device à tous les index (verrou tenu)."""
+        if index_search:
+            self._search.add(
+                device.serial_number,
+                [(device.account_name, 1.0), (device.serial_number, 0.8), (device.device_family, 0.6)],
+            )
+        self._all_devices[device.serial_number] = device
+        self._by_serial[device.serial_number] = device
+        self._by_name.setdefault(device.account_name.lower().strip(), []).append(device)
+        self._by_type.setdefault(device.device_type, []).append(device)
+        self._by_family.setdefault(device.device_family, []).append(device)
+
+    def _remove(self, device: Device) -> None:
+        """Retire un device de tous les index (verrou tenu)."""
+        self._search.remove(device.serial_number)
+        self._all_devices.pop(device.serial_number, None)
+        self._by_serial.pop(device.serial_number, None)
+        for mapping, key in (
+            (self._by_name, device.account_name.lower().strip()),
+            (self._by_type, device.device_type),
+            (self._by_family, device.device_family),
+        ):
+            # Nouvelle liste (pas de retrait en place) : un lecteur sans verrou ne voit jamais de liste vidée
+            remaining = [other for other in mapping.get(key, []) if other is not device]
+            if remaining:
+                mapping[key] = remaining
+            else:
+                mapping.pop(key, None)
+
     def get_by_serial(self, serial: str) -> Optional[Device]:
         """
         Recherche par numéro de série (O(1)).
@@ -137,8 +359,8 @@ class DeviceIndex:
         Example:
             >>> device = index.get_by_name("echo salon")  # Insensible casse
         """
-        name_key = name.lower().strip()
-        return self._by_name.get(name_key)
+        matches = self._by_name.get(name.lower().strip())
+        return matches[0] if matches else None
 
     def get_by_type(self, device_type: str) -> List[Device]:
         """
@@ -150,7 +372,7 @@ class DeviceIndex:
         Returns:
             Liste de devices
         """
-        return self._by_type.get(device_type, [])
+        return list(self._by_type.get(device_type, []))
 
     def get_by_family(self, family: str) -> List[Device]:
         """
@@ -166,7 +388,7 @@ class DeviceIndex:
             >>> echos = index.get_by_family("ECHO")
             >>> tablets = index.get_by_family("TABLET")
         """
-        return self._by_family.get(family, [])
+        return list(self._by_family.get(family, []))
 
     def get_online_devices(self) -> List[Device]:
         """
@@ -175,7 +397,7 @@ class DeviceIndex:
         Returns:
             Liste de devices en ligne
         """
-        return [d for d in self._all_devices if d.online]
+        return [d for d in self.get_all() if d.online]
 
     def get_offline_devices(self) -> List[Device]:
         """
@@ -184,37 +406,49 @@ class DeviceIndex:
         Returns:
             Liste de devices hors ligne
         """
-        return [d for d in self._all_devices if not d.online]
+        return [d for d in self.get_all() if not d.online]
 
-    def search(self, query: str) -> List[Device]:
+    def search(self, query: str, limit: int = 10) -> List[Device]:
         """
-        Recherche flexible (nom partiel, serial partiel).
+        Recherche flexible et classée (nom, serial, famille ; accents et casse ignorés).
 
         Args:
-            query: Texte à rechercher
+            query: Texte à rechercher (mot entier, début de mot, fragment ou faute de frappe)
+            limit: Nombre maximal de résultats
 
         Returns:
-            Liste de devices correspondants
+            Liste de devices correspondants, du plus pertinent au moins pertinent
 
         Example:
-            >>> results = index.search("salon")  # Trouve "Echo Salon", etc.
+            >>> results = index.search("echo salo")  # Trouve "Écho Salon" en premier
         """
-        query_lower = query.lower()
-        results = []
+        return [device for device, _ in self.search_ranked(query, limit)]
+
+    def search_ranked(
+        self, query: str, limit: int = 10, min_score: Optional[float] = None
+    ) -> List[Tuple[Device, float]]:
+        """
+        Recherche classée avec scores (voir utils.name_search).
 
-        for device in self._all_devices:
-            if (
-                query_lower in device.account_name.lower()
-                or query_lower in device.serial_number.lower()
-                or query_lower in device.device_family.lower()
-            ):
-                results.append(device)
+        Args:
+            query: Texte à rechercher
+            limit: Nombre maximal de résultats
+            min_score: Score minimal (défaut: celui de l'index de recherche)
 
+        Returns:
+            [(device, score)] par score décroissant, score entre 0 et 1
+        """
+        results = []
+        for serial, score in self._search.search(query, limit=limit, min_score=min_score):
+            device = self._by_serial.get(serial)
+            if device is not None:
+                results.append((device, score))
         return results
 
     def get_all(self) -> List[Device]:
         """Retourne tous les devices."""
-        return self._all_devices.copy()
+        with self._lock:
+            return list(self._all_devices.values())
 
     def count(self) -> int:
         """Retourne le nombre total de devices."""
@@ -257,6 +491,8 @@ class SmartDeviceIndex:
         self._by_name: Dict[str, dict] = {}
         self._by_type: Dict[str, List[dict]] = {}
         self._all_devices: List[dict] = []
+        # Recherche classée partagée avec DeviceIndex (noms d'entités)
+        self._search = NameSearchIndex()
 
         logger.debug("SmartDeviceIndex initialisé")
 
@@ -271,6 +507,7 @@ class SmartDeviceIndex:
         self._by_name.clear()
         self._by_type.clear()
         self._all_devices.clear()
+        self._search.clear()
 
         for device in devices:
             self._all_devices.append(device)
@@ -288,6 +525,8 @@ class SmartDeviceIndex:
 
             # Index par type
             device_type = device.get("entityType") or device.get("type", "UNKNOWN")
+            if device_id:
+                self._search.add(device_id, [(name, 1.0), (device_type, 0.5)])
             if device_type not in self._by_type:
                 self._by_type[device_type] = []
             self._by_type[device_type].append(device)
@@ -306,6 +545,25 @@ class SmartDeviceIndex:
         name_key = name.lower().strip()
         return self._by_name.get(name_key)
 
+    def search(self, query: str, limit: int = 10) -> List[dict]:
+        """
+        Recherche classée par nom (accents, casse, préfixes et fautes de frappe tolérés).
+
+        Args:
+            query: Texte à rechercher (ex: "lumiere salo")
+            limit: Nombre maximal de résultats
+
+        Returns:
+            Devices du plus pertinent au moins pertinent
+        """
+        return [self._by_id[key] for key, _ in self._search.search(query, limit=limit) if key in self._by_id]
+
+    def search_ranked(self, query: str, limit: int = 10) -> List[Tuple[dict, float]]:
+        """Comme search(), avec le score de chaque résultat."""
+        return [
+            (self._by_id[key], score) for key, score in self._search.search(query, limit=limit) if key in self._by_id
+        ]
+
     def get_by_type(self, device_type: str) -> List[dict]:
         """Recherche par type (O(1))."""
         return self._by_type.get(device_type, [])
@@ -0,0 +1,185 @@
+"""
+Suivi des expirations pour les caches (tas min + reaper en arrière-plan).
+
+CacheService et SmartCache enregistrent l'échéance de chaque entrée dans un
+ExpiryHeap : le nettoyage des entrées expirées, leur décompte et la
+prochaine échéance ne parcourent plus toutes les clés. Un Reaper optionnel
+déclenche ce nettoyage depuis un thread dédié pour les processus longs.
+
+Usage:
+    from utils.expiry import ExpiryHeap, Reaper
+
+    heap = ExpiryHeap()
+    heap.push("devices", time.time() + 300)
+    expired = heap.pop_expired()  # O(k log n) pour k clés expirées
+"""
+
+import heapq
+import time
+from threading import Event, Thread
+from typing import Callable, Dict, List, Optional, Tuple
+
+from loguru import logger
+
+
+class ExpiryHeap:
+    """
+    Tas min (échéance, clé) à suppression paresseuse.
+
+    Une clé réécrite ou supprimée laisse son ancienne échéance dans le tas ;
+    elle est ignorée à la sortie car elle ne correspond plus à l'échéance
+    courante. Le tas est reconstruit quand ces restes dominent.
+
+    Note:
+        Non thread-safe : l'appelant protège les accès avec son propre verrou.
+
+    Example:
+        >>> heap = ExpiryHeap()
+        >>> heap.push("devices", time.time() + 300)
+        >>> heap.next_expiry()
+    """
+
+    def __init__(self):
+        """Initialise un tas vide."""
+        self._heap: List[Tuple[float, str]] = []
+        self._deadlines: Dict[str, float] = {}
+
+    def __len__(self) -> int:
+        """Nombre de clés suivies."""
+        return len(self._deadlines)
+
+    def push(self, key: str, expires_at: Optional[float]) -> None:
+        """Enregistre (ou remplace) l'échéance d'une clé ; None = n'expire pas."""
+        if expires_at is None:
+            self.discard(key)
+            return
+        self._deadlines[key] = expires_at
+        heapq.heappush(self._heap, (expires_at, key))
+        if len(self._heap) > 2 * len(self._deadlines) + 16:
+            self._compact()
+
+    def discard(self, key: str) -> None:
+        """Oublie l'échéance d'une clé (suppression paresseuse dans le tas)."""
+        self._deadlines.pop(key, None)
+
+    def clear(self) -> None:
+        """Vide le tas."""
+        self._heap.clear()
+        self._deadlines.clear()
+
+    def pop_expired(self, now: Optional[float] = None) -> List[str]:
+        """
+        Retire et retourne les clés dont l'échéance est passée.
+
+        Returns:
+            Clés expirées, de la plus ancienne à la plus récente
+        """
+        now = time.time() if now is None else now
+        expired: List[str] = []
+        while self._heap and self._heap[0][0] <= now:
+            expires_at, key = heapq.heappop(self._heap)
+            if self._deadlines.get(key) == expires_at:
+                del self._deadlines[key]
+                expired.append(key)
+        return expired
+
+    def next_expiry(self) -> Optional[float]:
+        """Retourne la prochaine échéance (timestamp), ou None si aucune."""
+        while self._heap:
+            expires_at, key = self._heap[0]
+            if self._deadlines.get(key) == expires_at:
+                return expires_at
+            heapq.heappop(self._heap)
+        return None
+
+    def count_expired(self, now: Optional[float] = None) -> int:
+        """
+        Compte les clés expirées sans les retirer.
+
+        Ne visite que les nœuds du tas dont l'échéance est passée.
+        """
+        now = time.time() if now is None else now
+        count = 0
+        stack = [0] if self._heap else []
+        while stack:
+            i = stack.pop()
+            expires_at, key = self._heap[i]
+            if expires_at > now:
+                continue
+            if self._deadlines.get(key) == expires_at:
+                count += 1
+            stack.extend(c for c in (2 * i + 1, 2 * i + 2) if c < len(self._heap))
+        return count
+
+    def _compact(self) -> None:
+        """Reconstruit le tas à partir des seules échéances courantes."""
+        self._heap = [(expires_at, key) for key, expires_at in self._deadlines.items()]
+        heapq.heapify(self._heap)
+
+
+class Reaper:
+    """
+    Thread daemon qui appelle périodiquement une fonction de nettoyage.
+
+    Le thread se réveille à la prochaine échéance connue (next_due) ou au
+    plus tard après ``interval`` secondes.
+
+    Example:
+        >>> reaper = Reaper(cache.clean_expired, 60.0, cache.next_expiry, "cache-reaper")
+        >>> reaper.start()
+        >>> reaper.stop()
+    """
+
+    def __init__(
+        self,
+        reap: Callable[[], int],
+        interval: float,
+        next_due: Optional[Callable[[], Optional[float]]] = None,
+        name: str = "cache-reaper",
+    ):
+        """
+        Initialise le reaper.
+
+        Args:
+            reap: Fonction de nettoyage (retourne le nombre d'entrées supprimées)
+            interval: Délai maximal entre deux passages (secondes)
+            next_due: Fonction retournant la prochaine échéance (timestamp) ou None
+            name: Nom du thread
+        """
+        self.reap = reap
+        self.interval = interval
+        self.next_due = next_due
+        self._stop = Event()
+        self._thread = Thread(target=self._run, name=name, daemon=True)
+
+    def start(self) -> None:
+        """Démarre le thread."""
+        self._thread.start()
+
+    def stop(self, timeout: float = 1.0) -> None:
+        """Arrête le thread et attend sa fin."""
+        self._stop.set()
+        if self._thread.is_alive():
+            self._thread.join(timeout)
+
+    def is_alive(self) -> bool:
+        """Indique si le thread tourne."""
+        return self._thread.is_alive()
+
+    def _run(self) -> None:
+        backoff = False
+        while not self._stop.is_set():
+            delay = self.interval
+            if self.next_due is not None and not backoff:
+                due = self.next_due()
+                if due is not None:
+                    delay = min(delay, max(due - time.time(), 0.0))
+            if self._stop.wait(delay):
+                return
+            try:
+                self.reap()
+                backoff = False
+            except Exception as e:
+                # Ne jamais tuer le thread : réessayer après un intervalle complet
+                logger.warning(f"Reaper {self._thread.name}: {e}")
+                backoff = True
@@ -0,0 +1,254 @@
+"""
+Protection des appels HTTP par famille d'endpoints.
+
+Chaque famille d'endpoints (namedLists, np, notifications, alexa-privacy...)
+a son propre circuit breaker et son propre limiteur de débit : un endpoint
+défaillant (ex: /api/namedLists en 503) n'ouvre plus le circuit des autres
+fonctionnalités, et une rafale de requêtes est ralentie au lieu d'être
+rejetée.
+
+Le contrôle est fait au niveau transport (GuardedHTTPAdapter, monté sur la
+session de AlexaAuth) ; il s'applique donc à tous les managers sans
+modifier leurs appels. Les réponses servies par le cache HTTP ne
+consomment aucun jeton.
+
+- 5xx / erreur réseau : échec pour le breaker de la famille
+- 429 : ralentissement du limiteur (Retry-After respecté, plafonné), pas un échec
+- circuit ouvert ou jeton non obtenu avant le timeout de la requête :
+  exceptions dérivées de requests.RequestException (EndpointCircuitOpen,
+  RateLimitTimeout), traitées comme les autres erreurs réseau par les managers
+
+Usage:
+    from utils.http_guard import endpoint_guards
+
+    breaker = endpoint_guards.breaker("voice")
+    stats = endpoint_guards.get_stats()
+"""
+
+from threading import Lock
+from typing import Any, Dict, Optional, Tuple
+from urllib.parse import urlsplit
+
+import requests
+from loguru import logger
+from requests.adapters import HTTPAdapter
+
+from core.circuit_breaker import CircuitBreaker, CircuitBreakerError
+from utils.rate_limiter import TokenBucket, parse_retry_after
+
+DEFAULT_FAMILY = "default"
+
+# Préfixes dont la famille diffère du premier segment après /api
+FAMILY_OVERRIDES: Dict[str, str] = {
+    "/api/behaviors/preview": "voice",
+    "/api/behaviors/entities": "phoenix",
+}
+
+
+def endpoint_family(url: str) -> str:
+    """
+    Détermine la famille d'un endpoint à partir de son URL.
+
+    Args:
+        url: URL complète ou chemin
+
+    Returns:
+        Famille, ex: "namedLists" pour /api/namedLists/..., "alexa-privacy"
+        pour /alexa-privacy/apd/rvh, DEFAULT_FAMILY sinon
+
+    Example:
+        >>> endpoint_family("https://alexa.amazon.fr/api/np/player?deviceSerialNumber=X")
+        'np'
+    """
+    path = urlsplit(url).path or "/"
+    for prefix, family in FAMILY_OVERRIDES.items():
+        if path.startswith(prefix):
+            return family
+    segments = [segment for segment in path.split("/") if segment]
+    if segments and segments[0] == "api":
+        segments = segments[1:]
+    return segments[0] if segments else DEFAULT_FAMILY
+
+
+class EndpointCircuitOpen(CircuitBreakerError, requests.exceptions.ConnectionError):
+    """Circuit ouvert pour la famille d'endpoints (aussi une erreur requests)."""
+
+
+class RateLimitTimeout(requests.exceptions.Timeout):
+    """Aucun jeton du limiteur obtenu avant le timeout de la requête."""
+
+
+def _acquire_timeout(timeout: Any) -> Optional[float]:
+    """Attente maximale d'un jeton : timeout de la requête (connexion si tuple), None si absent."""
+    if isinstance(timeout, tuple):
+        timeout = timeout[0]
+    if isinstance(timeout, (int, float)):
+        return float(timeout)
+    return None
+
+
+class _ServerError(Exception):
+    """Réponse 5xx comptée comme un échec par le breaker (transporte la réponse)."""
+
+    def __init__(self, response: requests.Response):
+        super().__init__(f"HTTP {response.status_code}")
+        self.response = response
+
+
+class EndpointGuards:
+    """
+    Registre des circuit breakers et limiteurs de débit, par famille.
+
+    Les entrées sont créées à la première utilisation avec les réglages par
+    défaut du registre.
+
+    Example:
+        >>> guards = EndpointGuards()
+        >>> breaker, bucket = guards.get("namedLists")
+        >>> guards.get_stats()["namedLists"]["breaker"]["state"]
+        'CLOSED'
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        timeout: float = 30.0,
+        rate: float = 10.0,
+        capacity: int = 20,
+        max_retry_after: float = 60.0,
+    ):
+        """
+        Initialise le registre.
+
+        Args:
+            failure_threshold: Échecs consécutifs avant ouverture d'un circuit
+            timeout: Durée (s) avant tentative de récupération d'un circuit
+            rate: Débit nominal par famille (requêtes par seconde)
+            capacity: Rafale maximale par famille
+            max_retry_after: Pause maximale (s) d'une famille après un 429
+        """
+        self.failure_threshold = failure_threshold
+        self.timeout = timeout
+        self.rate = rate
+        self.capacity = capacity
+        self.max_retry_after = max_retry_after
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._lock = Lock()
+
+    def breaker(self, family: str, **kwargs: Any) -> CircuitBreaker:
+        """
+        Retourne le circuit breaker d'une famille (créé si besoin).
+
+        Args:
+            family: Famille d'endpoints ou nom de fonctionnalité
+            **kwargs: Réglages CircuitBreaker utilisés à la création uniquement
+
+        Returns:
+            Breaker partagé par tous les appelants de la famille
+        """
+        with self._lock:
+            breaker = self._breakers.get(family)
+            if breaker is None:
+                kwargs.setdefault("failure_threshold", self.failure_threshold)
+                kwargs.setdefault("timeout", self.timeout)
+                breaker = self._breakers[family] = CircuitBreaker(**kwargs)
+            return breaker
+
+    def bucket(self, family: str) -> TokenBucket:
+        """Retourne le limiteur de débit d'une famille (créé si besoin)."""
+        with self._lock:
+            bucket = self._buckets.get(family)
+            if bucket is None:
+                bucket = self._buckets[family] = TokenBucket(
+                    rate=self.rate, capacity=self.capacity, max_pause=self.max_retry_after
+                )
+            return bucket
+
+    def get(self, family: str) -> Tuple[CircuitBreaker, TokenBucket]:
+        """Retourne le couple (breaker, limiteur) d'une famille."""
+        return self.breaker(family), self.bucket(family)
+
+    def get_stats(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Retourne l'état de chaque famille connue.
+
+        Returns:
+            {famille: {"breaker": {...} | None, "limiter": {...} | None}}
+        """
+        with self._lock:
+            breakers = dict(self._breakers)
+            buckets = dict(self._buckets)
+        return {
+            family: {
+                "breaker": breakers[family].get_stats() if family in breakers else None,
+                "limiter": buckets[family].get_stats() if family in buckets else None,
+            }
+            for family in sorted(set(breakers) | set(buckets))
+        }
+
+    def reset(self) -> None:
+        """Oublie toutes les familles (tests, changement de compte)."""
+        with self._lock:
+            self._breakers.clear()
+            self._buckets.clear()
+
+
+# Instance partagée : tous les managers d'un même processus partagent breakers et limiteurs
+endpoint_guards = EndpointGuards()
+
+
+class GuardedHTTPAdapter(HTTPAdapter):
+    """
+    HTTPAdapter qui fait passer chaque requête par le breaker et le limiteur de sa famille.
+
+    Les retries urllib3 (max_retries) restent appliqués à l'intérieur : le
+    breaker ne voit que le résultat final d'une requête.
+    """
+
+    def __init__(self, *args: Any, guards: Optional[EndpointGuards] = None, **kwargs: Any):
+        """
+        Initialise l'adapter.
+
+        Args:
+            guards: Registre à utiliser (défaut: endpoint_guards)
+            *args, **kwargs: Arguments de HTTPAdapter (pool, max_retries...)
+        """
+        self.guards = guards or endpoint_guards
+        super().__init__(*args, **kwargs)
+
+    def send(self, request: requests.PreparedRequest, **kwargs: Any) -> requests.Response:  # type: ignore[override]
+        """
+        Envoie la requête après obtention d'un jeton et vérification du circuit.
+
+        L'attente du jeton est bornée par le timeout de la requête.
+
+        Raises:
+            RateLimitTimeout: Si aucun jeton n'est disponible avant le timeout
+            EndpointCircuitOpen: Si le circuit de la famille est ouvert
+        """
+        family = endpoint_family(request.url or "")
+        breaker, bucket = self.guards.get(family)
+        if not bucket.acquire(timeout=_acquire_timeout(kwargs.get("timeout"))):
+            raise RateLimitTimeout(f"Famille {family} limitée : aucun jeton avant le timeout", request=request)
+
+        try:
+            response = breaker.call(self._send_checked, request, **kwargs)
+        except _ServerError as e:
+            return e.response
+        except CircuitBreakerError as e:
+            raise EndpointCircuitOpen(f"Circuit {family} ouvert: {e}", request=request) from e
+
+        if response.status_code == 429:
+            bucket.on_throttled(parse_retry_after(response.headers.get("Retry-After")))
+            logger.debug(f"Famille {family} limitée (429)")
+        else:
+            bucket.on_success()
+        return response
+
+    def _send_checked(self, request: requests.PreparedRequest, **kwargs: Any) -> requests.Response:
+        """Envoie la requête ; une réponse 5xx est levée pour compter comme échec."""
+        response = super().send(request, **kwargs)
+        if response.status_code >= 500:
+            raise _ServerError(response)
+        return response
@@ -11,15 +11,18 @@ Auteur: M@nu
 Date: 7 octobre 2025
 """
 
+import re
 from pathlib import Path
-from typing import Any, Optional
+from threading import Lock
+from typing import Any, Dict, Optional, Pattern
 
 import requests
 import requests_cache
 from loguru import logger
-from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
 
+from utils.http_guard import GuardedHTTPAdapter
+
 
 class OptimizedHTTPSession:
     """
@@ -95,9 +98,13 @@ class OptimizedHTTPSession:
             self.session = requests_cache.CachedSession(
                 cache_name=str(cache_dir / "http_cache"),
                 backend="sqlite",
-                expire_after=None,  # Géré manuellement par endpoint
+                # TTL par endpoint (CACHE_TTL) appliqué aussi aux appels directs sur
+                # self.session (AlexaAuth.session) ; endpoints inconnus non cachés
+                expire_after=requests_cache.DO_NOT_CACHE,
+                urls_expire_after=self._urls_expire_after(),
                 allowable_codes=[200, 203],
-                allowable_methods=["GET", "POST"],
+                # POST jamais caché (commandes) : post() désactivait déjà le cache
+                allowable_methods=["GET"],
                 match_headers=False,
                 stale_if_error=True,
             )
@@ -115,8 +122,8 @@ class OptimizedHTTPSession:
             raise_on_status=False,
         )
 
-        # Adapter avec connection pooling
-        adapter = HTTPAdapter(
+        # Adapter avec connection pooling, breaker et limiteur par famille d'endpoints
+        adapter = GuardedHTTPAdapter(
             pool_connections=pool_connections,
             pool_maxsize=pool_maxsize,
             max_retries=retry_strategy,
@@ -141,6 +148,14 @@ class OptimizedHTTPSession:
             f"pool={pool_connections}/{pool_maxsize}, retries={max_retries}"
         )
 
+    @classmethod
+    def _urls_expire_after(cls) -> Dict[Pattern[str], Any]:
+        """Convertit CACHE_TTL en motifs requests-cache (même correspondance que get_cache_ttl)."""
+        return {
+            re.compile(re.escape(endpoint)): ttl if ttl > 0 else requests_cache.DO_NOT_CACHE
+            for endpoint, ttl in cls.CACHE_TTL.items()
+        }
+
     def get_cache_ttl(self, url: str) -> int:
         """
         Détermine le TTL cache pour une URL donnée.
@@ -190,7 +205,7 @@ class OptimizedHTTPSession:
             else:
                 # Pas de cache pour cette requête
                 logger.debug(f"📡 API Call (no cache): {url}")
-                return self.session.get(url, expire_after=-1, **kwargs)
+                return self.session.get(url, expire_after=requests_cache.DO_NOT_CACHE, **kwargs)
         else:
             logger.debug(f"📡 API Call: {url}")
             return self.session.get(url, **kwargs)
@@ -302,3 +317,27 @@ class OptimizedHTTPSession:
     def __exit__(self, exc_type, exc_val, exc_tb):
         """Ferme session à la sortie du context."""
         self.close()
+
+
+_shared_session: Optional[OptimizedHTTPSession] = None
+_shared_lock = Lock()
+
+
+def get_shared_session(**kwargs: Any) -> OptimizedHTTPSession:
+    """
+    Retourne la session HTTP partagée du processus (créée au premier appel).
+
+    AlexaAuth et les managers qui passent par ``auth.session`` réutilisent
+    ainsi le même pool de connexions pendant toute une synchronisation.
+
+    Args:
+        **kwargs: Arguments de OptimizedHTTPSession (utilisés au premier appel uniquement)
+
+    Returns:
+        Session partagée
+    """
+    global _shared_session
+    with _shared_lock:
+        if _shared_session is None:
+            _shared_session = OptimizedHTTPSession(**kwargs)
+        return _shared_session
@@ -19,6 +19,7 @@ Usage:
 import importlib
 import logging
 import sys
+import time
 from typing import Any, Dict, Optional, Type
 
 logger = logging.getLogger(__name__)
@@ -36,34 +37,27 @@ class LazyCommandLoader:
         _loaded_commands: Cache des commandes déjà chargées
     """
 
-    # Mapping des commandes vers leurs modules
+    # Mapping des commandes vers leurs modules (ordre d'enregistrement dans le parser)
     COMMAND_MAP: Dict[str, str] = {
-        # Phase 1 - Sprint 1
         "auth": "cli.commands.auth.AuthCommand",
         "device": "cli.commands.device.DeviceCommand",
-        # Phase 2 - Sprint 2
         "music": "cli.commands.music.MusicCommand",
+        # alarm et reminder sont des sous-catégories de timers
         "timers": "cli.commands.timers.TimerCommand",
-        "alarm": "cli.commands.alarm.AlarmCommand",
-        # Phase 3 - Sprint 3
-        "light": "cli.commands.light.LightCommand",
-        "thermostat": "cli.commands.thermostat.ThermostatCommand",
         "smarthome": "cli.commands.smarthome.SmartHomeCommand",
-        # Phase 4 - Sprint 4
         "announcement": "cli.commands.announcement.AnnouncementCommand",
         "dnd": "cli.commands.dnd.DNDCommand",
-        # Phase 5 - Sprint 5
-        "lists": "cli.commands.list.ListCommand",
-        "reminder": "cli.commands.reminder.ReminderCommand",
         "activity": "cli.commands.activity.ActivityCommand",
-        # Phase 6 - Sprint 6
-        "settings": "cli.commands.settings.SettingsCommand",
-        "audio": "cli.commands.audio.AudioCommand",
-        # Phase 7 - Sprint 7
+        "calendar": "cli.commands.calendar.CalendarCommand",
+        "lists": "cli.commands.lists.ListsCommand",
         "routine": "cli.commands.routine.RoutineCommand",
         "multiroom": "cli.commands.multiroom.MultiroomCommand",
         # Cache management
         "cache": "cli.commands.cache.CacheCommand",
+        # Démon local
+        "daemon": "cli.commands.daemon.DaemonCommand",
+        # Exécution en lot
+        "batch": "cli.commands.batch.BatchCommand",
     }
 
     def __init__(self):
@@ -104,9 +98,7 @@ class LazyCommandLoader:
         module_name, class_name = module_path.rsplit(".", 1)
 
         try:
-            import time
-
-            start_time = time.time()
+            start_time = time.perf_counter()
 
             # Importer dynamiquement le module
             module = importlib.import_module(module_name)
@@ -118,7 +110,7 @@ class LazyCommandLoader:
             self._loaded_commands[command_name] = command_class
 
             # Enregistrer le temps d'import
-            import_time = (time.time() - start_time) * 1000  # en ms
+            import_time = (time.perf_counter() - start_time) * 1000  # en ms
             self._import_times[command_name] = import_time
 
             logger.debug(f"Commande '{command_name}' chargée en {import_time:.2f}ms")
@@ -151,6 +143,17 @@ class LazyCommandLoader:
             except Exception as e:
                 logger.warning(f"Impossible de précharger '{command_name}': {e}")
 
+    def register_commands(self, parser: Any, command_names: Optional[list[str]] = None) -> None:
+        """
+        Enregistre des commandes dans un CommandParser.
+
+        Args:
+            parser: CommandParser cible
+            command_names: Commandes à enregistrer (défaut: toutes, dans l'ordre de COMMAND_MAP)
+        """
+        for command_name in command_names or self.get_available_commands():
+            parser.register_command(command_name, self.load_command(command_name))
+
     def get_loaded_commands(self) -> list[str]:
         """
         Retourne la liste des commandes déjà chargées.
@@ -173,6 +176,9 @@ class LazyCommandLoader:
         """
         Retourne les statistiques d'import des commandes.
 
+        Le temps mesuré inclut les dépendances importées pour la première
+        fois par la commande (managers, services).
+
         Returns:
             Dictionnaire {nom_commande: temps_import_ms}
         """
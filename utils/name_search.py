@@ -0,0 +1,309 @@
+"""
+Index de recherche approchée sur des noms (appareils, entités smart home).
+
+Les textes sont normalisés (accents retirés, casse ignorée, ponctuation
+remplacée par des espaces) puis indexés de deux façons :
+- index inversé des mots (avec recherche par préfixe sur le vocabulaire trié)
+- index des trigrammes, pour les fautes de frappe et les fragments
+
+Seuls les candidats issus de ces index sont classés, ce qui garde une
+recherche sous la milliseconde pour quelques centaines de noms.
+
+Classement (meilleur champ de chaque clé, pondéré par le champ) :
+    1.0  nom identique          ("echo salon" / "Écho Salon")
+    0.9  le nom commence par la requête
+    0.8  tous les mots de la requête présents
+    0.7  tous les mots de la requête sont des débuts de mots du nom
+    0.6  la requête est un fragment du nom
+    <0.5 part des trigrammes de la requête trouvés dans le nom (fautes de frappe)
+
+Usage:
+    from utils.name_search import NameSearchIndex
+
+    index = NameSearchIndex()
+    index.add("G0911", [("Écho Salon", 1.0), ("ECHO", 0.6)])
+    index.search("echo salo")  # [("G0911", 0.9)]
+"""
+
+import hashlib
+import heapq
+import re
+import unicodedata
+from bisect import bisect_left
+from threading import RLock
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+STATE_VERSION = 1
+
+_NON_ALNUM = re.compile(r"[^0-9a-z]+")
+
+
+def normalize(text: str) -> str:
+    """
+    Normalise un texte pour la recherche.
+
+    Args:
+        text: Texte brut (ex: "Écho  Salon-2")
+
+    Returns:
+        Texte sans accents, en minuscules, mots séparés par un espace (ex: "echo salon 2")
+    """
+    decomposed = unicodedata.normalize("NFKD", text.casefold())
+    stripped = "".join(char for char in decomposed if not unicodedata.combining(char))
+    return _NON_ALNUM.sub(" ", stripped).strip()
+
+
+def trigrams(text: str) -> Set[str]:
+    """Trigrammes d'un texte normalisé (mots bordés d'espaces pour pondérer les débuts de mots)."""
+    grams: Set[str] = set()
+    for token in text.split():
+        padded = f"  {token} "
+        grams.update(padded[i : i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+def fingerprint(values: Iterable[str]) -> str:
+    """Empreinte stable d'une suite de textes (validation d'un état persisté)."""
+    digest = hashlib.sha1()
+    for value in values:
+        digest.update(value.encode("utf-8", "replace"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+class NameSearchIndex:
+    """
+    Index de recherche classée, thread-safe, sur les champs textuels de clés.
+
+    Chaque champ d'une clé est un document indexé séparément ; le score d'une
+    clé est celui de son meilleur champ, multiplié par le poids du champ.
+
+    Example:
+        >>> index = NameSearchIndex()
+        >>> index.add("A", [("Lumière Salon", 1.0)])
+        >>> index.search("lumiere")
+        [('A', 0.9)]
+    """
+
+    def __init__(self, min_score: float = 0.2):
+        """
+        Initialise l'index vide.
+
+        Args:
+            min_score: Score minimal d'un résultat de search()
+        """
+        self.min_score = min_score
+        # Un document par champ indexé : n° -> (clé, texte normalisé, poids)
+        self._docs: Dict[int, Tuple[str, str, float]] = {}
+        self._key_docs: Dict[str, List[int]] = {}
+        self._postings: Dict[str, Set[int]] = {}
+        self._trigrams: Dict[str, Set[int]] = {}
+        self._next_doc = 0
+        self._vocabulary: List[str] = []
+        self._vocabulary_dirty = False
+        self._lock = RLock()
+
+    def __len__(self) -> int:
+        return len(self._key_docs)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._key_docs
+
+    def add(self, key: str, fields: Iterable[Tuple[str, float]]) -> None:
+        """
+        Indexe (ou réindexe) une clé.
+
+        Args:
+            key: Identifiant (serial, entityId...)
+            fields: Textes à indexer avec leur poids (1.0 pour le nom principal)
+        """
+        normalized = [(normalize(text), weight) for text, weight in fields if text]
+        with self._lock:
+            self.remove(key)
+            doc_ids = self._key_docs[key] = []
+            for text, weight in normalized:
+                if not text:
+                    continue
+                doc = self._next_doc
+                self._next_doc += 1
+                self._docs[doc] = (key, text, weight)
+                doc_ids.append(doc)
+                for token in text.split():
+                    if token not in self._postings:
+                        self._vocabulary_dirty = True
+                    self._postings.setdefault(token, set()).add(doc)
+                for gram in trigrams(text):
+                    self._trigrams.setdefault(gram, set()).add(doc)
+
+    def remove(self, key: str) -> None:
+        """Retire une clé de l'index (sans effet si absente)."""
+        with self._lock:
+            for doc in self._key_docs.pop(key, ()):
+                _, text, _ = self._docs.pop(doc)
+                for token in text.split():
+                    self._discard(self._postings, token, doc)
+                for gram in trigrams(text):
+                    self._discard(self._trigrams, gram, doc)
+
+    def clear(self) -> None:
+        """Vide l'index."""
+        with self._lock:
+            self._docs.clear()
+            self._key_docs.clear()
+            self._postings.clear()
+            self._trigrams.clear()
+            self._next_doc = 0
+            self._vocabulary = []
+            self._vocabulary_dirty = False
+
+    def _discard(self, mapping: Dict[str, Set[int]], term: str, doc: int) -> None:
+        """Retire un document d'une liste de postings (verrou tenu)."""
+        docs = mapping.get(term)
+        if docs is None:
+            return
+        docs.discard(doc)
+        if not docs:
+            del mapping[term]
+            if mapping is self._postings:
+                self._vocabulary_dirty = True
+
+    def _prefixed(self, prefix: str) -> Iterable[str]:
+        """Mots du vocabulaire commençant par prefix (verrou tenu)."""
+        if self._vocabulary_dirty:
+            self._vocabulary = sorted(self._postings)
+            self._vocabulary_dirty = False
+        start = bisect_left(self._vocabulary, prefix)
+        for token in self._vocabulary[start:]:
+            if not token.startswith(prefix):
+                break
+            yield token
+
+    @staticmethod
+    def _token_score(query: str, query_tokens: List[str], text: str) -> float:
+        """Score d'un texte dont chaque mot de la requête débute un mot (1.0 à 0.7)."""
+        if text == query:
+            return 1.0
+        if text.startswith(query):
+            return 0.9
+        tokens = text.split()
+        if all(token in tokens for token in query_tokens):
+            return 0.8
+        return 0.7
+
+    def search(self, query: str, limit: int = 10, min_score: Optional[float] = None) -> List[Tuple[str, float]]:
+        """
+        Recherche classée.
+
+        Args:
+            query: Texte recherché (accents et casse indifférents)
+            limit: Nombre maximal de résultats
+            min_score: Score minimal (défaut: self.min_score)
+
+        Returns:
+            [(clé, score)] par score décroissant
+        """
+        normalized = normalize(query)
+        if not normalized:
+            return []
+        threshold = self.min_score if min_score is None else min_score
+        query_tokens = list(dict.fromkeys(normalized.split()))
+        best: Dict[str, float] = {}
+
+        def keep(key: str, score: float) -> None:
+            if score >= threshold and score > best.get(key, 0.0):
+                best[key] = score
+
+        with self._lock:
+            # 1. Documents dont chaque mot de la requête débute un mot (scores 0.7 à 1.0)
+            hits: Dict[int, int] = {}
+            for token in query_tokens:
+                matched: Set[int] = set()
+                for word in self._prefixed(token):
+                    matched |= self._postings[word]
+                for doc in matched:
+                    hits[doc] = hits.get(doc, 0) + 1
+            complete = {doc for doc, count in hits.items() if count == len(query_tokens)}
+            for doc in complete:
+                key, text, weight = self._docs[doc]
+                keep(key, weight * self._token_score(normalized, query_tokens, text))
+
+            # 2. Fragments et fautes de frappe (scores <= 0.6), inutiles si le top est déjà plein
+            if sum(1 for score in best.values() if score >= 0.6) < limit:
+                query_grams = trigrams(normalized)
+                overlap: Dict[int, int] = {}
+                for gram in query_grams:
+                    for doc in self._trigrams.get(gram, ()):
+                        overlap[doc] = overlap.get(doc, 0) + 1
+                for doc, shared in overlap.items():
+                    if doc in complete:
+                        continue
+                    key, text, weight = self._docs[doc]
+                    if normalized in text:
+                        keep(key, weight * 0.6)
+                    else:
+                        keep(key, weight * 0.5 * shared / len(query_grams))
+
+        ranked = heapq.nsmallest(limit, best.items(), key=lambda item: (-item[1], item[0]))
+        return [(key, round(score, 3)) for key, score in ranked]
+
+    def get_state(self, version_key: str = "") -> Dict[str, Any]:
+        """
+        État sérialisable (JSON) de l'index, pour persistance avec la liste source.
+
+        Les index inversés sont conservés tels quels (documents renumérotés) :
+        le chargement ne refait ni la normalisation ni le découpage en trigrammes.
+
+        Args:
+            version_key: Empreinte de la liste indexée (voir fingerprint())
+
+        Returns:
+            {"version", "fingerprint", "docs", "tokens", "trigrams"}
+        """
+        with self._lock:
+            numbers = {doc: number for number, doc in enumerate(self._docs)}
+            return {
+                "version": STATE_VERSION,
+                "fingerprint": version_key,
+                "docs": [list(entry) for entry in self._docs.values()],
+                "tokens": {term: [numbers[doc] for doc in docs] for term, docs in self._postings.items()},
+                "trigrams": {gram: [numbers[doc] for doc in docs] for gram, docs in self._trigrams.items()},
+            }
+
+    def load_state(self, state: Dict[str, Any], version_key: str = "") -> bool:
+        """
+        Restaure un état persisté.
+
+        Args:
+            state: Résultat de get_state()
+            version_key: Empreinte attendue de la liste indexée
+
+        Returns:
+            True si l'état a été chargé, False s'il est absent, d'une autre
+            version ou d'une autre liste (l'index est alors inchangé)
+        """
+        if not isinstance(state, dict) or state.get("version") != STATE_VERSION:
+            return False
+        if state.get("fingerprint") != version_key:
+            return False
+        try:
+            docs = {
+                number: (str(key), str(text), float(weight)) for number, (key, text, weight) in enumerate(state["docs"])
+            }
+            postings = {str(term): set(ids) for term, ids in state["tokens"].items()}
+            grams = {str(gram): set(ids) for gram, ids in state["trigrams"].items()}
+            if not all(doc in docs for ids in (*postings.values(), *grams.values()) for doc in ids):
+                return False
+        except (KeyError, TypeError, ValueError, AttributeError):
+            return False
+
+        key_docs: Dict[str, List[int]] = {}
+        for number, (key, _, _) in docs.items():
+            key_docs.setdefault(key, []).append(number)
+        with self._lock:
+            self._docs = docs
+            self._key_docs = key_docs
+            self._postings = postings
+            self._trigrams = grams
+            self._next_doc = len(docs)
+            self._vocabulary_dirty = True
+        return True
@@ -0,0 +1,208 @@
+"""
+Limiteur de débit adaptatif (token bucket).
+
+Chaque famille d'endpoints dispose d'un seau de jetons : une requête consomme
+un jeton, les jetons se reconstituent à débit constant. Quand l'API répond
+429, le débit est divisé par deux et le seau est suspendu jusqu'à la date
+indiquée par Retry-After (plafonnée à max_pause) ; il remonte ensuite progressivement à chaque
+succès. Les opérations en masse ralentissent donc d'elles-mêmes au lieu
+d'accumuler des erreurs.
+
+Usage:
+    from utils.rate_limiter import TokenBucket
+
+    bucket = TokenBucket(rate=10.0, capacity=20)
+    bucket.acquire()                    # attend un jeton si nécessaire
+    bucket.on_throttled(retry_after=5)  # réponse 429
+"""
+
+import math
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from threading import Condition
+from typing import Any, Dict, Optional
+
+from loguru import logger
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Convertit un en-tête Retry-After en nombre de secondes.
+
+    Args:
+        value: Délai en secondes ("5") ou date HTTP ("Wed, 21 Oct 2015 07:28:00 GMT")
+
+    Returns:
+        Secondes à attendre (>= 0), ou None si absent, illisible ou non fini ("inf", "nan")
+    """
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        seconds = float(value)
+    except ValueError:
+        pass
+    else:
+        return max(0.0, seconds) if math.isfinite(seconds) else None
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+class TokenBucket:
+    """
+    Seau de jetons thread-safe à débit adaptatif.
+
+    Example:
+        >>> bucket = TokenBucket(rate=10.0, capacity=20)
+        >>> bucket.try_acquire()
+        True
+    """
+
+    def __init__(
+        self,
+        rate: float = 10.0,
+        capacity: int = 20,
+        min_rate: float = 0.5,
+        recovery_step: float = 0.5,
+        default_retry_after: float = 2.0,
+        max_pause: float = 60.0,
+    ):
+        """
+        Initialise le seau (plein).
+
+        Args:
+            rate: Débit nominal (jetons par seconde)
+            capacity: Taille du seau (rafale maximale)
+            min_rate: Débit plancher après ralentissements successifs
+            recovery_step: Jetons/s regagnés à chaque succès jusqu'au débit nominal
+            default_retry_after: Pause (s) appliquée sur 429 sans Retry-After
+            max_pause: Pause maximale (s) sur 429, quel que soit le Retry-After demandé
+        """
+        self.base_rate = rate
+        self.capacity = capacity
+        self.min_rate = min(min_rate, rate)
+        self.recovery_step = recovery_step
+        self.default_retry_after = default_retry_after
+        self.max_pause = max_pause
+
+        self._rate = rate
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._throttled_count = 0
+        self._waited_seconds = 0.0
+        self._cond = Condition()
+
+    @property
+    def rate(self) -> float:
+        """Débit courant (jetons par seconde)."""
+        with self._cond:
+            return self._rate
+
+    @property
+    def fill(self) -> float:
+        """Remplissage du seau, entre 0.0 (vide) et 1.0 (plein)."""
+        with self._cond:
+            self._refill(time.monotonic())
+            return self._tokens / self.capacity
+
+    def _refill(self, now: float) -> None:
+        """Ajoute les jetons accumulés depuis la dernière mise à jour (verrou tenu)."""
+        start = max(self._updated, self._paused_until)
+        if now > start:
+            self._tokens = min(float(self.capacity), self._tokens + (now - start) * self._rate)
+        self._updated = max(self._updated, now)
+
+    def _delay(self, now: float) -> float:
+        """Attente nécessaire avant qu'un jeton soit disponible (verrou tenu)."""
+        if now < self._paused_until:
+            return self._paused_until - now
+        if self._tokens >= 1.0:
+            return 0.0
+        return (1.0 - self._tokens) / self._rate
+
+    def try_acquire(self) -> bool:
+        """
+        Consomme un jeton sans attendre.
+
+        Returns:
+            True si un jeton était disponible
+        """
+        return self.acquire(timeout=0)
+
+    def acquire(self, timeout: Optional[float] = None) -> bool:
+        """
+        Consomme un jeton, en attendant qu'il soit disponible.
+
+        Args:
+            timeout: Attente maximale en secondes (None = illimitée, 0 = aucune)
+
+        Returns:
+            True si un jeton a été obtenu, False si le délai est dépassé
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            while True:
+                now = time.monotonic()
+                self._refill(now)
+                delay = self._delay(now)
+                if delay <= 0:
+                    self._tokens -= 1.0
+                    return True
+                if deadline is not None:
+                    if now >= deadline:
+                        return False
+                    delay = min(delay, deadline - now)
+                self._waited_seconds += delay
+                self._cond.wait(delay)
+
+    def on_throttled(self, retry_after: Optional[float] = None) -> None:
+        """
+        Réagit à une réponse 429 : débit divisé par deux et pause jusqu'à Retry-After.
+
+        Args:
+            retry_after: Délai demandé par le serveur (défaut: default_retry_after,
+                plafonné à max_pause)
+        """
+        pause = self.default_retry_after if retry_after is None else retry_after
+        pause = min(max(0.0, pause), self.max_pause)
+        with self._cond:
+            now = time.monotonic()
+            self._refill(now)
+            self._rate = max(self.min_rate, self._rate / 2)
+            self._tokens = 0.0
+            self._paused_until = max(self._paused_until, now + pause)
+            self._throttled_count += 1
+            self._cond.notify_all()
+        logger.warning(f"🐢 Limitation 429 : pause {pause:.1f}s, débit réduit à {self._rate:.1f} req/s")
+
+    def on_success(self) -> None:
+        """Remonte progressivement le débit vers le débit nominal."""
+        with self._cond:
+            if self._rate < self.base_rate:
+                self._rate = min(self.base_rate, self._rate + self.recovery_step)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Retourne l'état du seau (métriques).
+
+        Returns:
+            Dict avec rate, base_rate, fill, paused_for, throttled, waited_seconds
+        """
+        with self._cond:
+            now = time.monotonic()
+            self._refill(now)
+            return {
+                "rate": round(self._rate, 2),
+                "base_rate": self.base_rate,
+                "fill": round(self._tokens / self.capacity, 3),
+                "paused_for": round(max(0.0, self._paused_until - now), 2),
+                "throttled": self._throttled_count,
+                "waited_seconds": round(self._waited_seconds, 2),
+            }
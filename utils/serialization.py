@@ -0,0 +1,214 @@
+"""
+Codecs et compresseurs interchangeables pour les caches disque.
+
+CacheService et SmartCache sérialisent leurs entrées via ce module plutôt
+que de coder en dur json + gzip. Le format d'un fichier est entièrement
+décrit par son suffixe (ex: ``.json.zst``, ``.msgpack.lz4``), ce qui permet
+de relire les anciens fichiers ``.json.gz`` / ``.json`` quel que soit le
+backend configuré.
+
+Backends:
+    - Codecs: orjson (si installé), msgpack (si installé), json (stdlib)
+    - Compresseurs: zstd / lz4 (si installés), gzip niveau 1, zlib niveau 1, none
+
+Usage:
+    from utils.serialization import get_codec, get_compressor, encode, decode
+
+    codec, compressor = get_codec(), get_compressor()
+    payload = encode(data, codec, compressor)
+    data = decode(payload, *format_for_path(path))
+"""
+
+import gzip
+import json
+import zlib
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# Backends optionnels: utilisés seulement s'ils sont installés
+try:
+    import orjson as _orjson  # type: ignore
+except ImportError:
+    _orjson = None
+
+try:
+    import msgpack as _msgpack  # type: ignore
+except ImportError:
+    _msgpack = None
+
+try:
+    import zstandard as _zstd  # type: ignore
+except ImportError:
+    _zstd = None
+
+try:
+    import lz4.frame as _lz4  # type: ignore
+except ImportError:
+    _lz4 = None
+
+
+class SerializationError(ValueError):
+    """Erreur d'encodage ou de décodage d'une entrée de cache."""
+
+
+@dataclass(frozen=True)
+class Codec:
+    """Sérialiseur objet ↔ octets."""
+
+    name: str
+    suffix: str
+    dumps: Callable[[Any], bytes]
+    loads: Callable[[bytes], Any]
+
+
+@dataclass(frozen=True)
+class Compressor:
+    """Compresseur octets ↔ octets."""
+
+    name: str
+    suffix: str
+    compress: Callable[[bytes], bytes]
+    decompress: Callable[[bytes], bytes]
+
+
+def _json_dumps(obj: Any) -> bytes:
+    return json.dumps(obj, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+def _json_loads(payload: bytes) -> Any:
+    # orjson lit aussi le JSON produit par la stdlib : toujours prendre le plus rapide
+    if _orjson is not None:
+        return _orjson.loads(payload)
+    return json.loads(payload)
+
+
+def _identity(payload: bytes) -> bytes:
+    return payload
+
+
+CODECS: Dict[str, Codec] = {"json": Codec("json", ".json", _json_dumps, _json_loads)}
+if _orjson is not None:
+    CODECS["orjson"] = Codec(
+        "orjson",
+        ".json",
+        lambda obj: _orjson.dumps(obj, option=_orjson.OPT_NON_STR_KEYS),
+        _json_loads,
+    )
+if _msgpack is not None:
+    CODECS["msgpack"] = Codec(
+        "msgpack",
+        ".msgpack",
+        lambda obj: _msgpack.packb(obj, use_bin_type=True),
+        lambda payload: _msgpack.unpackb(payload, raw=False, strict_map_key=False),
+    )
+
+COMPRESSORS: Dict[str, Compressor] = {
+    "none": Compressor("none", "", _identity, _identity),
+    "gzip": Compressor(
+        "gzip", ".gz", lambda payload: gzip.compress(payload, compresslevel=1, mtime=0), gzip.decompress
+    ),
+    "zlib": Compressor("zlib", ".zz", lambda payload: zlib.compress(payload, 1), zlib.decompress),
+}
+if _zstd is not None:
+    COMPRESSORS["zstd"] = Compressor(
+        "zstd",
+        ".zst",
+        lambda payload: _zstd.ZstdCompressor(level=1).compress(payload),
+        lambda payload: _zstd.ZstdDecompressor().decompress(payload),
+    )
+if _lz4 is not None:
+    COMPRESSORS["lz4"] = Compressor("lz4", ".lz4", _lz4.compress, _lz4.decompress)
+
+# Ordre de préférence quand aucun backend n'est imposé
+CODEC_PREFERENCE = ("orjson", "msgpack", "json")
+COMPRESSOR_PREFERENCE = ("zstd", "lz4", "gzip")
+
+# Tous les suffixes connus, par ordre de priorité de lecture :
+# fichiers compressés d'abord, le JSON brut (ou copie lisible) en dernier
+_CODEC_SUFFIXES = (".json", ".msgpack")
+_COMPRESSOR_SUFFIXES = (".gz", ".zst", ".lz4", ".zz")
+ENTRY_SUFFIXES: List[str] = [c + z for c in _CODEC_SUFFIXES for z in _COMPRESSOR_SUFFIXES] + [
+    ".msgpack",
+    ".json",
+]
+
+
+def get_codec(name: Optional[str] = None) -> Codec:
+    """
+    Retourne un codec par nom, ou le plus rapide disponible si name est None.
+
+    Raises:
+        ValueError: Codec inconnu ou non installé
+    """
+    if name is None:
+        return next(CODECS[n] for n in CODEC_PREFERENCE if n in CODECS)
+    if name not in CODECS:
+        raise ValueError(f"Codec '{name}' indisponible (disponibles: {', '.join(CODECS)})")
+    return CODECS[name]
+
+
+def get_compressor(name: Optional[str] = None) -> Compressor:
+    """
+    Retourne un compresseur par nom, ou le plus rapide disponible si name est None.
+
+    Raises:
+        ValueError: Compresseur inconnu ou non installé
+    """
+    if name is None:
+        return next(COMPRESSORS[n] for n in COMPRESSOR_PREFERENCE if n in COMPRESSORS)
+    if name not in COMPRESSORS:
+        raise ValueError(
+            f"Compresseur '{name}' indisponible (disponibles: {', '.join(COMPRESSORS)})"
+        )
+    return COMPRESSORS[name]
+
+
+def format_for_path(path: Path) -> Tuple[Codec, Compressor]:
+    """
+    Déduit codec et compresseur du suffixe d'un fichier de cache.
+
+    Raises:
+        SerializationError: Suffixe inconnu ou backend non installé
+    """
+    name = path.name
+    compressor = COMPRESSORS["none"]
+    for candidate in COMPRESSORS.values():
+        if candidate.suffix and name.endswith(candidate.suffix):
+            compressor = candidate
+            name = name[: -len(candidate.suffix)]
+            break
+    else:
+        if name.endswith(_COMPRESSOR_SUFFIXES):
+            raise SerializationError(f"Compresseur non installé pour {path.name}")
+
+    if name.endswith(".msgpack"):
+        if "msgpack" not in CODECS:
+            raise SerializationError(f"msgpack non installé pour {path.name}")
+        return CODECS["msgpack"], compressor
+    if name.endswith(".json"):
+        return CODECS["json"], compressor
+    raise SerializationError(f"Format de cache inconnu: {path.name}")
+
+
+def encode(obj: Any, codec: Codec, compressor: Compressor) -> bytes:
+    """
+    Sérialise puis compresse un objet.
+
+    Raises:
+        TypeError: Objet non sérialisable
+    """
+    return compressor.compress(codec.dumps(obj))
+
+
+def decode(payload: bytes, codec: Codec, compressor: Compressor) -> Any:
+    """
+    Décompresse puis désérialise des octets.
+
+    Raises:
+        SerializationError: Données corrompues ou format invalide
+    """
+    try:
+        return codec.loads(compressor.decompress(payload))
+    except Exception as e:
+        raise SerializationError(f"Décodage {codec.name}/{compressor.name} impossible: {e}") from e
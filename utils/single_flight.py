@@ -0,0 +1,168 @@
+"""
+Coalescence des requêtes identiques concurrentes (single-flight).
+
+Quand plusieurs appelants demandent la même ressource (même endpoint, mêmes
+paramètres) alors qu'une récupération est déjà en cours, ils attendent son
+résultat au lieu d'émettre chacun leur propre requête HTTP. Le premier
+appelant exécute la récupération ; les suivants reçoivent le même résultat
+(ou la même exception).
+
+Deux modèles sont couverts :
+- threads (managers, CLI) : do()
+- asyncio : do_async(), une récupération en cours par clé et par boucle
+
+Usage:
+    from utils.single_flight import request_key, single_flight
+
+    key = request_key("GET", url, {"cached": "false"})
+    devices = single_flight.do(key, fetch_devices)
+"""
+
+import asyncio
+from threading import Event, Lock
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple, TypeVar
+from urllib.parse import urlencode
+
+T = TypeVar("T")
+
+
+def request_key(method: str, url: str, params: Optional[Dict[str, Any]] = None) -> str:
+    """
+    Construit la clé de coalescence d'une requête (méthode + endpoint + paramètres).
+
+    Args:
+        method: Méthode HTTP (ex: "GET")
+        url: URL de l'endpoint
+        params: Paramètres de requête (l'ordre n'a pas d'importance)
+
+    Returns:
+        Clé normalisée, ex: "GET https://.../device?cached=false"
+    """
+    key = f"{method.upper()} {url}"
+    if params:
+        key += ("&" if "?" in url else "?") + urlencode(sorted(params.items()))
+    return key
+
+
+class _Call:
+    """Récupération en cours partagée par les appelants d'une même clé."""
+
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        self.done = Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """
+    Partage une seule exécution entre les appelants concurrents d'une même clé.
+
+    Seules les exécutions simultanées sont fusionnées : un appel qui arrive
+    après la fin de la récupération en relance une nouvelle (la mise en cache
+    reste l'affaire de l'appelant).
+
+    Example:
+        >>> flight = SingleFlight()
+        >>> flight.do("GET /api/devices-v2/device", fetch_devices)
+    """
+
+    def __init__(self):
+        """Initialise le registre des récupérations en cours."""
+        self._calls: Dict[str, _Call] = {}
+        self._async_calls: Dict[Tuple[int, str], "asyncio.Future[Any]"] = {}
+        self._lock = Lock()
+        self.shared_count = 0
+
+    def do(self, key: str, fn: Callable[[], T]) -> T:
+        """
+        Exécute fn() ou attend l'exécution déjà en cours pour key.
+
+        Args:
+            key: Clé de coalescence (voir request_key)
+            fn: Récupération à exécuter
+
+        Returns:
+            Résultat de fn(), partagé par tous les appelants concurrents
+
+        Raises:
+            Exception: Celle levée par fn(), propagée à tous les appelants
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = _Call()
+                self._calls[key] = call
+            else:
+                self.shared_count += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    async def do_async(self, key: str, fn: Callable[[], Awaitable[T]]) -> T:
+        """
+        Variante asyncio de do() : attend la coroutine déjà en cours pour key.
+
+        Les récupérations sont partagées au sein d'une même boucle d'événements.
+
+        Args:
+            key: Clé de coalescence (voir request_key)
+            fn: Fabrique de la coroutine de récupération
+
+        Returns:
+            Résultat de la coroutine, partagé par tous les appelants concurrents
+        """
+        loop = asyncio.get_running_loop()
+        slot = (id(loop), key)
+        with self._lock:
+            future = self._async_calls.get(slot)
+            leader = future is None
+            if leader:
+                future = loop.create_future()
+                self._async_calls[slot] = future
+            else:
+                self.shared_count += 1
+
+        if not leader:
+            # shield : l'annulation d'un appelant n'annule pas la récupération partagée
+            return await asyncio.shield(future)
+
+        try:
+            result = await fn()
+            future.set_result(result)
+            return result
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            future.exception()  # marque l'exception comme consommée s'il n'y a aucun appelant en attente
+            raise
+        finally:
+            with self._lock:
+                del self._async_calls[slot]
+
+    def in_flight(self) -> int:
+        """Nombre de récupérations en cours (threads et asyncio)."""
+        with self._lock:
+            return len(self._calls) + len(self._async_calls)
+
+
+# Instance partagée : les managers et services d'un même processus fusionnent leurs requêtes
+single_flight = SingleFlight()
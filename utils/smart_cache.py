@@ -6,11 +6,16 @@ Ce module implémente un système de cache avancé avec:
     - Invalidation ciblée par tag ou pattern
     - Dépendances entre caches
     - TTL personnalisable par tag
+    - Codec et compresseur interchangeables (voir utils.serialization)
+    - Index tags/dépendances persistés (manifeste chargé à la demande, fusionné
+      sous verrou fichier entre processus, écritures groupées avec batch())
+    - Échéances dans un tas min, reaper optionnel en arrière-plan
 
 Gains de performance:
     - Conservation des données valides lors d'invalidation
     - Réduction du nombre de requêtes API (2x)
     - Gestion fine de la fraîcheur des données
+    - Invalidation en cascade proportionnelle aux entrées touchées (index inverse)
 
 Usage:
     from utils.smart_cache import SmartCache
@@ -18,15 +23,32 @@ Usage:
     cache = SmartCache()
     cache.set('devices_list', data, tags=['devices', 'list'])
     cache.invalidate_by_tag('devices')  # Invalide uniquement les devices
+
+    with cache.batch():  # Une seule écriture du manifeste pour tout le lot
+        for device in devices:
+            cache.set(f"device_{device['serialNumber']}", device, tags=['devices'])
 """
 
-import gzip
 import json
 import logging
+import os
+import tempfile
+import time
+from contextlib import contextmanager
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Set
+from threading import RLock
+from typing import Any, Dict, Iterator, List, Optional, Set
+
+from utils import serialization
+from utils.expiry import ExpiryHeap, Reaper
+
+# Verrou inter-processus optionnel du manifeste (comme CacheService)
+try:
+    import portalocker as _portalocker  # type: ignore
+except Exception:
+    _portalocker = None
 
 logger = logging.getLogger(__name__)
 
@@ -75,7 +97,12 @@ class SmartCache:
         - Tags pour catégoriser les entrées
         - Invalidation par tag, pattern ou dépendance
         - TTL global et par tag
-        - Compression gzip optionnelle
+        - Compression optionnelle (zstd, lz4 ou gzip niveau 1)
+        - Index persistés entre processus (manifeste .smart_cache.manifest,
+          relu et fusionné sous verrou fichier à chaque sauvegarde)
+        - Écritures du manifeste groupées pendant un lot (batch())
+        - Nettoyage des expirations via tas min (clean_expired, reaper optionnel)
+        - Thread-safe (RLock)
         - Statistiques détaillées
 
     Examples:
@@ -98,32 +125,66 @@ class SmartCache:
         "auth": 3600,  # 1 heure
     }
 
+    # Manifeste des index (clé → tags, dépendances, expiration), hors motifs de clear_all
+    MANIFEST_NAME = ".smart_cache.manifest"
+
     def __init__(
         self,
         cache_dir: str | Path = "data/cache",
         use_compression: bool = True,
         default_ttl: int = 300,
+        codec: Optional[str] = None,
+        compressor: Optional[str] = None,
+        reaper_interval: Optional[float] = None,
     ):
         """
         Initialise le smart cache.
 
         Args:
             cache_dir: Répertoire de stockage du cache
-            use_compression: Activer compression gzip
+            use_compression: Activer la compression
             default_ttl: TTL par défaut en secondes
+            codec: "orjson", "msgpack" ou "json" (défaut: le plus rapide installé)
+            compressor: "zstd", "lz4", "gzip" ou "zlib" (défaut: le plus rapide installé)
+            reaper_interval: Si défini, un thread supprime les entrées expirées
+                (au plus tard toutes les reaper_interval secondes)
         """
         self.cache_dir = Path(cache_dir)
         self.cache_dir.mkdir(parents=True, exist_ok=True)
 
         self.use_compression = use_compression
         self.default_ttl = default_ttl
+        self.codec = serialization.get_codec(codec)
+        self.compressor = serialization.get_compressor(compressor if use_compression else "none")
 
         # Index: tag → set of keys
         self._tag_index: Dict[str, Set[str]] = {}
 
-        # Index: key → CacheEntry
+        # Index: key → CacheEntry (valeurs chargées en mémoire)
         self._entries: Dict[str, CacheEntry] = {}
 
+        # Index persisté: key → {"tags", "dependencies", "expires_at"} pour toutes
+        # les entrées connues, y compris celles écrites par d'autres processus
+        self._index: Dict[str, Dict[str, Any]] = {}
+
+        # Index inverse: key → set of dependent keys
+        self._dependents: Dict[str, Set[str]] = {}
+
+        # Le manifeste n'est lu qu'à la première opération qui a besoin des index
+        self._manifest_file = self.cache_dir / self.MANIFEST_NAME
+        self._index_loaded = False
+
+        # Clés modifiées depuis la dernière sauvegarde du manifeste (fusionnées
+        # dans la version disque), manifeste à vider (clear_all), profondeur de batch()
+        self._dirty_keys: Set[str] = set()
+        self._manifest_reset = False
+        self._batch_depth = 0
+
+        # Échéances des entrées indexées (tas min) et reaper optionnel
+        self._expiry = ExpiryHeap()
+        self._reaper: Optional[Reaper] = None
+        self._lock = RLock()
+
         # Statistiques
         self._stats = {
             "hits": 0,
@@ -132,6 +193,9 @@ class SmartCache:
             "expirations": 0,
         }
 
+        if reaper_interval is not None:
+            self.start_reaper(reaper_interval)
+
     def set(
         self,
         key: str,
@@ -158,46 +222,52 @@ class SmartCache:
             >>> cache.set('device_123', device, tags=['devices', 'echo'],
             ...           dependencies=['devices_list'])
         """
-        try:
-            # Créer l'entrée
-            entry = CacheEntry(key=key, value=value)
+        with self._lock:
+            try:
+                self._ensure_index()
 
-            # Ajouter les tags
-            if tags:
-                for tag in tags:
-                    entry.add_tag(tag)
+                # Créer l'entrée
+                entry = CacheEntry(key=key, value=value)
 
-                    # Indexer par tag
-                    if tag not in self._tag_index:
-                        self._tag_index[tag] = set()
-                    self._tag_index[tag].add(key)
+                # Ajouter les tags
+                if tags:
+                    for tag in tags:
+                        entry.add_tag(tag)
 
-            # Calculer TTL
-            if ttl is None:
-                # Utiliser TTL du premier tag si disponible
-                ttl = self.DEFAULT_TAG_TTL[tags[0]] if tags and tags[0] in self.DEFAULT_TAG_TTL else self.default_ttl
+                # Calculer TTL
+                if ttl is None:
+                    # Utiliser TTL du premier tag si disponible
+                    ttl = (
+                        self.DEFAULT_TAG_TTL[tags[0]]
+                        if tags and tags[0] in self.DEFAULT_TAG_TTL
+                        else self.default_ttl
+                    )
 
-            # Définir expiration
-            if ttl > 0:
-                entry.expires_at = datetime.now() + timedelta(seconds=ttl)
+                # Définir expiration
+                if ttl > 0:
+                    entry.expires_at = datetime.now() + timedelta(seconds=ttl)
 
-            # Ajouter dépendances
-            if dependencies:
-                for dep in dependencies:
-                    entry.add_dependency(dep)
+                # Ajouter dépendances
+                if dependencies:
+                    for dep in dependencies:
+                        entry.add_dependency(dep)
 
-            # Stocker en mémoire
-            self._entries[key] = entry
+                # Stocker en mémoire
+                self._entries[key] = entry
 
-            # Persister sur disque
-            self._persist_entry(entry)
+                # Persister sur disque
+                self._persist_entry(entry)
 
-            logger.debug(f"Cache SET: {key} (tags: {tags}, ttl: {ttl}s)")
-            return True
+                # Indexer par tag et dépendance, puis persister les index
+                self._index_entry(entry)
+                self._save_manifest()
 
-        except Exception as e:
-            logger.error(f"Erreur lors du stockage de '{key}': {e}")
-            return False
+                logger.debug(f"Cache SET: {key} (tags: {tags}, ttl: {ttl}s)")
+                return True
+
+            except Exception as e:
+                logger.error(f"Erreur lors du stockage de '{key}': {e}")
+                return False
 
     def get(self, key: str, default: Any = None) -> Any:
         """
@@ -210,34 +280,59 @@ class SmartCache:
         Returns:
             Valeur stockée ou default
         """
-        # Vérifier en mémoire
-        if key in self._entries:
-            entry = self._entries[key]
-
-            # Vérifier expiration
-            if entry.is_expired():
-                self._stats["expirations"] += 1
-                self.invalidate(key)
-                self._stats["misses"] += 1
-                return default
-
-            self._stats["hits"] += 1
-            return entry.value
-
-        # Charger depuis disque
-        loaded_entry = self._load_entry(key)
-        if loaded_entry is not None:
-            if not loaded_entry.is_expired():
-                # Mettre en cache mémoire
-                self._entries[key] = loaded_entry
+        with self._lock:
+            # Vérifier en mémoire
+            if key in self._entries:
+                entry = self._entries[key]
+
+                # Vérifier expiration
+                if entry.is_expired():
+                    self._stats["expirations"] += 1
+                    self.invalidate(key)
+                    self._stats["misses"] += 1
+                    return default
+
                 self._stats["hits"] += 1
-                return loaded_entry.value
-            else:
-                self._stats["expirations"] += 1
-                self.invalidate(key)
+                return entry.value
+
+            # Charger depuis disque
+            loaded_entry = self._load_entry(key)
+            if loaded_entry is not None:
+                if not loaded_entry.is_expired():
+                    # Mettre en cache mémoire (et indexer une entrée antérieure au manifeste)
+                    self._entries[key] = loaded_entry
+                    self._ensure_index()
+                    if key not in self._index:
+                        self._index_entry(loaded_entry)
+                        self._save_manifest()
+                    self._stats["hits"] += 1
+                    return loaded_entry.value
+                else:
+                    self._stats["expirations"] += 1
+                    self.invalidate(key)
+
+            self._stats["misses"] += 1
+            return default
+
+    @contextmanager
+    def batch(self) -> Iterator["SmartCache"]:
+        """
+        Regroupe les sauvegardes du manifeste d'un lot d'opérations (set en masse).
 
-        self._stats["misses"] += 1
-        return default
+        Le manifeste n'est écrit qu'une fois, à la sortie du bloc le plus externe.
+
+        Examples:
+            >>> with cache.batch():
+            ...     for key, value in items.items():
+            ...         cache.set(key, value, tags=['devices'])
+        """
+        with self._lock:
+            self._batch_depth += 1
+            try:
+                yield self
+            finally:
+                self._batch_depth -= 1
+                self._save_manifest()
 
     def invalidate(self, key: str) -> bool:
         """
@@ -249,50 +344,40 @@ class SmartCache:
         Returns:
             True si invalidée, False si non trouvée
         """
-        # Supprimer de la mémoire
-        if key in self._entries:
-            entry = self._entries[key]
-
-            # Retirer des index de tags
-            for tag in entry.tags:
-                if tag in self._tag_index:
-                    self._tag_index[tag].discard(key)
-
-            del self._entries[key]
-
-        # Supprimer du disque
-        file_path = self._get_cache_file_path(key)
-        if file_path.exists():
-            file_path.unlink()
-            self._stats["invalidations"] += 1
-            logger.debug(f"Cache INVALIDATE: {key}")
-            return True
-
-        return False
+        with self._lock:
+            self._ensure_index()
+            invalidated = self._invalidate_entry(key)
+            self._save_manifest()
+            return invalidated
 
     def invalidate_by_tag(self, tag: str) -> int:
         """
         Invalide toutes les entrées avec un tag spécifique.
 
+        Inclut les entrées persistées par des exécutions précédentes.
+
         Args:
             tag: Tag à invalider
 
         Returns:
             Nombre d'entrées invalidées
         """
-        if tag not in self._tag_index:
-            return 0
+        with self._lock:
+            self._ensure_index()
+            if tag not in self._tag_index:
+                return 0
 
-        # Copier les clés (car on modifie pendant l'itération)
-        keys_to_invalidate = list(self._tag_index[tag])
+            # Copier les clés (car on modifie pendant l'itération)
+            keys_to_invalidate = list(self._tag_index[tag])
 
-        count = 0
-        for key in keys_to_invalidate:
-            if self.invalidate(key):
-                count += 1
+            count = 0
+            for key in keys_to_invalidate:
+                if self._invalidate_entry(key):
+                    count += 1
+            self._save_manifest()
 
-        logger.info(f"Cache INVALIDATE_TAG: {tag} ({count} entrées)")
-        return count
+            logger.info(f"Cache INVALIDATE_TAG: {tag} ({count} entrées)")
+            return count
 
     def invalidate_by_pattern(self, pattern: str) -> int:
         """
@@ -304,37 +389,59 @@ class SmartCache:
         Returns:
             Nombre d'entrées invalidées
         """
-        import fnmatch
+        with self._lock:
+            import fnmatch
 
-        keys_to_invalidate = [key for key in self._entries if fnmatch.fnmatch(key, pattern)]
+            self._ensure_index()
+            known_keys = set(self._index) | set(self._entries)
+            keys_to_invalidate = [key for key in known_keys if fnmatch.fnmatch(key, pattern)]
 
-        count = 0
-        for key in keys_to_invalidate:
-            if self.invalidate(key):
-                count += 1
+            count = 0
+            for key in keys_to_invalidate:
+                if self._invalidate_entry(key):
+                    count += 1
+            self._save_manifest()
 
-        logger.info(f"Cache INVALIDATE_PATTERN: {pattern} ({count} entrées)")
-        return count
+            logger.info(f"Cache INVALIDATE_PATTERN: {pattern} ({count} entrées)")
+            return count
 
-    def invalidate_dependencies(self, key: str) -> int:
+    def invalidate_dependencies(self, key: str, recursive: bool = False) -> int:
         """
         Invalide toutes les entrées dépendant d'une clé.
 
+        Utilise l'index inverse : le coût est proportionnel au nombre
+        d'entrées touchées, pas au nombre total d'entrées.
+
         Args:
             key: Clé dont invalider les dépendances
+            recursive: Invalider aussi les dépendances des dépendances
 
         Returns:
             Nombre d'entrées invalidées
         """
-        dependent_keys = [k for k, entry in self._entries.items() if key in entry.dependencies]
-
-        count = 0
-        for dep_key in dependent_keys:
-            if self.invalidate(dep_key):
-                count += 1
-
-        logger.info(f"Cache INVALIDATE_DEPS: {key} ({count} dépendances)")
-        return count
+        with self._lock:
+            self._ensure_index()
+
+            affected: List[str] = []
+            seen: Set[str] = {key}
+            queue = list(self._dependents.get(key, ()))
+            while queue:
+                dep_key = queue.pop()
+                if dep_key in seen:
+                    continue
+                seen.add(dep_key)
+                affected.append(dep_key)
+                if recursive:
+                    queue.extend(self._dependents.get(dep_key, ()))
+
+            count = 0
+            for dep_key in affected:
+                if self._invalidate_entry(dep_key):
+                    count += 1
+            self._save_manifest()
+
+            logger.info(f"Cache INVALIDATE_DEPS: {key} ({count} dépendances)")
+            return count
 
     def clear_all(self) -> int:
         """
@@ -343,23 +450,85 @@ class SmartCache:
         Returns:
             Nombre d'entrées supprimées
         """
-        count = len(self._entries)
+        with self._lock:
+            self._ensure_index()
+            count = len(set(self._entries) | set(self._index))
+
+            # Vider mémoire
+            self._entries.clear()
+            self._tag_index.clear()
+            self._index.clear()
+            self._dependents.clear()
+            self._expiry.clear()
+            self._dirty_keys.clear()
+            self._manifest_reset = True
+
+            # Vider disque (hors fichiers cachés: metadata CacheService, manifeste)
+            patterns = [f"*{suffix}" for suffix in serialization.ENTRY_SUFFIXES]
+            for pattern in patterns:
+                for file_path in self.cache_dir.glob(pattern):
+                    if file_path.name.startswith("."):
+                        continue
+                    try:
+                        file_path.unlink()
+                    except Exception as e:
+                        logger.warning(f"Erreur suppression {file_path}: {e}")
+
+            self._save_manifest()
+            logger.info(f"Cache CLEAR_ALL: {count} entrées supprimées")
+            return count
+
+    def clean_expired(self) -> int:
+        """
+        Supprime les entrées expirées (mémoire, index, disque).
 
-        # Vider mémoire
-        self._entries.clear()
-        self._tag_index.clear()
+        Les clés sont extraites du tas des échéances : le coût est
+        proportionnel au nombre d'entrées expirées.
 
-        # Vider disque
-        patterns = ["*.json", "*.json.gz"]
-        for pattern in patterns:
-            for file_path in self.cache_dir.glob(pattern):
-                try:
-                    file_path.unlink()
-                except Exception as e:
-                    logger.warning(f"Erreur suppression {file_path}: {e}")
+        Returns:
+            Nombre d'entrées supprimées
+        """
+        with self._lock:
+            self._ensure_index()
+            expired = self._expiry.pop_expired()
+            if not expired:
+                return 0
+
+            count = 0
+            for key in expired:
+                if self._invalidate_entry(key):
+                    count += 1
+            self._stats["expirations"] += len(expired)
+            self._save_manifest()
+
+            logger.info(f"Cache CLEAN_EXPIRED: {count} entrées supprimées")
+            return count
+
+    def next_expiry(self) -> Optional[float]:
+        """Retourne la prochaine échéance (timestamp) parmi les entrées indexées, ou None."""
+        with self._lock:
+            self._ensure_index()
+            return self._expiry.next_expiry()
+
+    def start_reaper(self, interval: float = 60.0) -> None:
+        """
+        Démarre le thread de nettoyage des entrées expirées (processus longs).
 
-        logger.info(f"Cache CLEAR_ALL: {count} entrées supprimées")
-        return count
+        Args:
+            interval: Délai maximal entre deux passages (secondes)
+        """
+        with self._lock:
+            if self._reaper is not None and self._reaper.is_alive():
+                return
+            self._reaper = Reaper(self.clean_expired, interval, self.next_expiry, "smart-cache-reaper")
+            self._reaper.start()
+
+    def stop_reaper(self) -> None:
+        """Arrête le thread de nettoyage s'il tourne."""
+        reaper = self._reaper
+        self._reaper = None
+        if reaper is not None:
+            reaper.stop()
 
     def get_stats(self) -> Dict[str, Any]:
         """
@@ -368,24 +537,200 @@ class SmartCache:
         Returns:
             Dictionnaire avec statistiques
         """
-        total_requests = self._stats["hits"] + self._stats["misses"]
-        hit_rate = (self._stats["hits"] / total_requests * 100) if total_requests > 0 else 0
-
-        return {
-            **self._stats,
-            "total_requests": total_requests,
-            "hit_rate": hit_rate,
-            "entries_count": len(self._entries),
-            "tags_count": len(self._tag_index),
-            "compression_enabled": self.use_compression,
-        }
+        with self._lock:
+            self._ensure_index()
+            total_requests = self._stats["hits"] + self._stats["misses"]
+            hit_rate = (self._stats["hits"] / total_requests * 100) if total_requests > 0 else 0
+            next_expiry = self._expiry.next_expiry()
+
+            return {
+                **self._stats,
+                "total_requests": total_requests,
+                "hit_rate": hit_rate,
+                "entries_count": len(self._entries),
+                "indexed_count": len(self._index),
+                "tags_count": len(self._tag_index),
+                "expired_count": self._expiry.count_expired(),
+                "next_expiry_in_seconds": (
+                    max(0, int(next_expiry - time.time())) if next_expiry is not None else None
+                ),
+                "compression_enabled": self.use_compression,
+                "codec": self.codec.name,
+                "compressor": self.compressor.name,
+            }
+
+    def _invalidate_entry(self, key: str) -> bool:
+        """Invalide une entrée (mémoire, index, disque) sans sauvegarder le manifeste."""
+        # Supprimer de la mémoire
+        self._entries.pop(key, None)
+
+        # Retirer des index de tags et de dépendances
+        self._dirty_keys.add(key)
+        self._unindex_entry(key)
+
+        # Supprimer du disque (tous formats)
+        if self._remove_entry_files(key) > 0:
+            self._stats["invalidations"] += 1
+            logger.debug(f"Cache INVALIDATE: {key}")
+            return True
+
+        return False
+
+    def _ensure_index(self) -> None:
+        """Charge le manifeste des index au premier besoin (les entrées expirées seront nettoyées)."""
+        if self._index_loaded:
+            return
+        self._index_loaded = True
+
+        with self._manifest_lock():
+            manifest = self._read_manifest()
+        for key, meta in manifest.items():
+            self._add_to_index(key, meta)
+
+        if manifest:
+            logger.debug(f"Manifeste cache chargé: {len(self._index)} entrée(s)")
+
+    def _read_manifest(self) -> Dict[str, Dict[str, Any]]:
+        """Lit le manifeste sur disque ({} s'il est absent ou illisible)."""
+        if not self._manifest_file.exists():
+            return {}
+        try:
+            manifest = json.loads(self._manifest_file.read_text(encoding="utf-8"))
+        except (json.JSONDecodeError, OSError) as e:
+            logger.warning(f"Manifeste cache illisible, index reconstruits au fil des écritures: {e}")
+            return {}
+        return manifest if isinstance(manifest, dict) else {}
+
+    def _index_entry(self, entry: CacheEntry) -> None:
+        """Indexe une entrée par tag et par dépendance (remplace l'indexation précédente)."""
+        self._dirty_keys.add(entry.key)
+        self._add_to_index(
+            entry.key,
+            {
+                "tags": sorted(entry.tags),
+                "dependencies": sorted(entry.dependencies),
+                "expires_at": entry.expires_at.isoformat() if entry.expires_at else None,
+            },
+        )
+
+    def _add_to_index(self, key: str, meta: Dict[str, Any]) -> None:
+        """Ajoute une clé aux index tags, dépendances inverses et manifeste."""
+        self._unindex_entry(key)
+        self._index[key] = meta
+        for tag in meta.get("tags", []):
+            self._tag_index.setdefault(tag, set()).add(key)
+        for dep in meta.get("dependencies", []):
+            self._dependents.setdefault(dep, set()).add(key)
+        expires_at = meta.get("expires_at")
+        self._expiry.push(key, datetime.fromisoformat(expires_at).timestamp() if expires_at else None)
+
+    def _unindex_entry(self, key: str) -> None:
+        """Retire une clé des index (ses propres dépendants restent indexés)."""
+        meta = self._index.pop(key, None)
+        if meta is None:
+            return
+        self._expiry.discard(key)
+        for tag in meta.get("tags", []):
+            keys = self._tag_index.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tag_index[tag]
+        for dep in meta.get("dependencies", []):
+            dependents = self._dependents.get(dep)
+            if dependents is not None:
+                dependents.discard(key)
+                if not dependents:
+                    del self._dependents[dep]
+
+    def _save_manifest(self) -> None:
+        """
+        Fusionne les clés modifiées dans le manifeste sur disque, de façon atomique.
+
+        Le manifeste est relu sous verrou fichier : les entrées écrites par
+        d'autres processus sont conservées (et reprises dans les index locaux)
+        au lieu d'être écrasées. Sans effet pendant un batch() ou si rien n'a changé.
+        """
+        if self._batch_depth or not (self._dirty_keys or self._manifest_reset):
+            return
+
+        with self._manifest_lock():
+            manifest = {} if self._manifest_reset else self._read_manifest()
+            for key in self._dirty_keys:
+                meta = self._index.get(key)
+                if meta is None:
+                    manifest.pop(key, None)
+                else:
+                    manifest[key] = meta
+
+            try:
+                tmp_fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, prefix=".smart_cache.", suffix=".tmp")
+                try:
+                    with os.fdopen(tmp_fd, "w", encoding="utf-8") as f:
+                        json.dump(manifest, f, separators=(",", ":"), ensure_ascii=False)
+                    os.replace(tmp_path, self._manifest_file)
+                finally:
+                    if os.path.exists(tmp_path):
+                        os.remove(tmp_path)
+            except OSError as e:
+                logger.warning(f"Erreur sauvegarde manifeste cache: {e}")
+                return
+
+        self._dirty_keys.clear()
+        self._manifest_reset = False
+
+        # Reprendre les modifications des autres processus dans les index locaux
+        for key in [key for key in self._index if key not in manifest]:
+            self._unindex_entry(key)
+        for key, meta in manifest.items():
+            if self._index.get(key) != meta:
+                self._add_to_index(key, meta)
+
+    @contextmanager
+    def _manifest_lock(self) -> Iterator[None]:
+        """Verrou fichier exclusif du manifeste (sans effet si portalocker est absent)."""
+        if _portalocker is None:
+            yield
+            return
+
+        try:
+            lock_file = open(self._manifest_file.with_name(f"{self.MANIFEST_NAME}.lock"), "a")
+        except OSError as e:
+            logger.debug(f"Verrou manifeste indisponible: {e}")
+            yield
+            return
+
+        with lock_file:
+            try:
+                _portalocker.lock(lock_file, _portalocker.LOCK_EX)
+            except Exception as e:
+                logger.debug(f"Échec verrouillage manifeste: {e}")
+            try:
+                yield
+            finally:
+                try:
+                    _portalocker.unlock(lock_file)
+                except Exception:
+                    pass
 
     def _get_cache_file_path(self, key: str) -> Path:
-        """Retourne le chemin du fichier de cache."""
-        safe_key = key.replace("/", "_").replace("\\", "_")
-        if self.use_compression:
-            return self.cache_dir / f"{safe_key}.json.gz"
-        return self.cache_dir / f"{safe_key}.json"
+        """Retourne le chemin du fichier de cache (format configuré)."""
+        return self.cache_dir / f"{self._safe_key(key)}{self.codec.suffix}{self.compressor.suffix}"
+
+    @staticmethod
+    def _safe_key(key: str) -> str:
+        """Retourne la clé utilisable comme nom de fichier."""
+        return key.replace("/", "_").replace("\\", "_")
+
+    def _remove_entry_files(self, key: str, keep: Optional[Path] = None) -> int:
+        """Supprime les fichiers d'une entrée dans tous les formats connus, sauf keep."""
+        removed = 0
+        for suffix in serialization.ENTRY_SUFFIXES:
+            path = self.cache_dir / f"{self._safe_key(key)}{suffix}"
+            if path != keep and path.exists():
+                path.unlink()
+                removed += 1
+        return removed
 
     def _persist_entry(self, entry: CacheEntry) -> None:
         """Persiste une entrée sur disque."""
@@ -398,34 +743,30 @@ class SmartCache:
             "created_at": entry.created_at.isoformat(),
             "expires_at": entry.expires_at.isoformat() if entry.expires_at else None,
             "dependencies": list(entry.dependencies),
+            "codec": self.codec.name,
+            "compressor": self.compressor.name,
         }
 
-        json_data = json.dumps(data, separators=(",", ":"))
+        file_path.write_bytes(serialization.encode(data, self.codec, self.compressor))
 
-        if self.use_compression:
-            with gzip.open(file_path, "wt", encoding="utf-8") as f:
-                f.write(json_data)
-        else:
-            file_path.write_text(json_data, encoding="utf-8")
+        # Supprimer les versions dans d'autres formats
+        self._remove_entry_files(entry.key, keep=file_path)
 
     def _load_entry(self, key: str) -> Optional[CacheEntry]:
-        """Charge une entrée depuis le disque."""
+        """Charge une entrée depuis le disque (format déduit du suffixe)."""
         file_path = self._get_cache_file_path(key)
 
         if not file_path.exists():
-            # Essayer format non compressé
-            safe_key = key.replace("/", "_").replace("\\", "_")
-            alt_path = self.cache_dir / f"{safe_key}.json"
-            if not alt_path.exists():
+            # Essayer les autres formats (anciens fichiers .json.gz / .json)
+            candidates = (
+                self.cache_dir / f"{self._safe_key(key)}{suffix}" for suffix in serialization.ENTRY_SUFFIXES
+            )
+            file_path = next((path for path in candidates if path.exists()), None)
+            if file_path is None:
                 return None
-            file_path = alt_path
 
         try:
-            if file_path.suffix == ".gz":
-                with gzip.open(file_path, "rt", encoding="utf-8") as f:
-                    data = json.load(f)
-            else:
-                data = json.loads(file_path.read_text(encoding="utf-8"))
+            data = serialization.decode(file_path.read_bytes(), *serialization.format_for_path(file_path))
 
             entry = CacheEntry(
                 key=data["key"],